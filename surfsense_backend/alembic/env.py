@@ -97,7 +97,8 @@ def _fast_forward_fresh_db(connection: Connection) -> bool:
     connection.execute(sa.text("CREATE EXTENSION IF NOT EXISTS vector"))
     connection.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(bind=connection)
-    # Same core indexes migration 0 created (runtime setup_indexes() adds the
+    # Core indexes (migration 0's, with keyword search on the stored
+    # search_vector from migration 187; runtime setup_indexes() adds the
     # rest concurrently on app boot).
     connection.execute(
         sa.text(
@@ -107,8 +108,8 @@ def _fast_forward_fresh_db(connection: Connection) -> bool:
     )
     connection.execute(
         sa.text(
-            "CREATE INDEX IF NOT EXISTS document_search_index ON documents "
-            "USING gin (to_tsvector('english', content))"
+            "CREATE INDEX IF NOT EXISTS documents_search_vector_index ON documents "
+            "USING gin (search_vector)"
         )
     )
     connection.execute(
@@ -119,8 +120,8 @@ def _fast_forward_fresh_db(connection: Connection) -> bool:
     )
     connection.execute(
         sa.text(
-            "CREATE INDEX IF NOT EXISTS chucks_search_index ON chunks "
-            "USING gin (to_tsvector('english', content))"
+            "CREATE INDEX IF NOT EXISTS chunks_search_vector_index ON chunks "
+            "USING gin (search_vector)"
         )
     )
 
@@ -33,7 +33,7 @@ down_revision: str | None = "121"
 branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
-EMBEDDING_DIM = config.embedding_model_instance.dimension
+EMBEDDING_DIM = config.embedding_model_instance.schema_dimension
 
 _CATEGORY_TO_MARKER = {
     "fact": "fact",
@@ -23,7 +23,7 @@ branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
 # Embedding dimension is required to recreate the vector columns on downgrade.
-EMBEDDING_DIM = config.embedding_model_instance.dimension
+EMBEDDING_DIM = config.embedding_model_instance.schema_dimension
 
 
 def upgrade() -> None:
@@ -0,0 +1,141 @@
+"""Store the keyword-search tsvector on chunks and documents.
+
+Every keyword leg used to call ``to_tsvector('english', content)`` inline for
+both the ``@@`` filter and ``ts_rank_cd``, re-parsing each candidate's full
+text per query. The vector is now a stored ``search_vector`` column with its
+own GIN index, so ranking reads the stored value instead.
+
+Fresh schemas get a ``GENERATED ALWAYS ... STORED`` column from the model.
+Adding a generated column to an existing table rewrites it in one statement
+under an ACCESS EXCLUSIVE lock, which on a multi-million-row ``chunks`` table
+would stall ingestion for the whole rewrite. Existing deployments therefore
+get a plain column kept current by a trigger and backfilled in committed
+batches; reads are identical either way.
+
+Revision ID: 187
+Revises: 186
+"""
+
+import logging
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "187"
+down_revision: str | None = "186"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+_BACKFILL_BATCH = 5000
+
+# (table, new GIN index, superseded expression index)
+_TABLES: list[tuple[str, str, str]] = [
+    ("chunks", "chunks_search_vector_index", "chucks_search_index"),
+    ("documents", "documents_search_vector_index", "document_search_index"),
+]
+
+_TRIGGER_FUNCTION = "search_vector_refresh"
+
+
+def _column_state(table: str) -> str | None:
+    """``None`` if absent, else ``information_schema.columns.is_generated``."""
+    return (
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT is_generated
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = :table
+                  AND column_name = 'search_vector'
+                """
+            ),
+            {"table": table},
+        )
+        .scalar()
+    )
+
+
+def _backfill(table: str) -> None:
+    """Fill ``search_vector`` in id-range batches, one commit per batch.
+
+    Only NULL rows are touched, so an interrupted run resumes where it
+    stopped; rows written meanwhile are already covered by the trigger.
+    """
+    bind = op.get_bind()
+    bounds = bind.execute(sa.text(f"SELECT min(id), max(id) FROM {table}")).first()
+    if bounds is None or bounds[0] is None:
+        return
+    low, high = bounds
+    updated = 0
+    for start in range(low, high + 1, _BACKFILL_BATCH):
+        result = bind.execute(
+            sa.text(
+                f"""
+                UPDATE {table}
+                SET search_vector = to_tsvector('english', content)
+                WHERE id >= :start AND id < :stop AND search_vector IS NULL
+                """
+            ),
+            {"start": start, "stop": start + _BACKFILL_BATCH},
+        )
+        updated += result.rowcount or 0
+    logger.info("backfilled search_vector on %s rows of %s", f"{updated:,}", table)
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {_TRIGGER_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('english', NEW.content);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, _, _ in _TABLES:
+        # A create_all-built schema already has the generated column; a
+        # trigger writing to it would be rejected.
+        if _column_state(table) == "ALWAYS":
+            continue
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector"
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_refresh ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_vector_refresh
+            BEFORE INSERT OR UPDATE OF content ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {_TRIGGER_FUNCTION}()
+            """
+        )
+
+    # Batches and concurrent index builds must each commit on their own.
+    with op.get_context().autocommit_block():
+        for table, index, superseded in _TABLES:
+            _backfill(table)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+                f"ON {table} USING gin (search_vector)"
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{superseded}"')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, index, superseded in _TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {superseded} "
+                f"ON {table} USING gin (to_tsvector('english', content))"
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index}"')
+    for table, _, _ in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_refresh ON {table}")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    op.execute(f"DROP FUNCTION IF EXISTS {_TRIGGER_FUNCTION}()")
@@ -0,0 +1,48 @@
+"""add embedding_cache_vectors table for per-chunk embedding reuse
+
+Revision ID: 188
+Revises: 187
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "188"
+down_revision: str | None = "187"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_cache_vectors (
+            id SERIAL PRIMARY KEY,
+            text_sha256 VARCHAR(64) NOT NULL,
+            embedding_model VARCHAR(255) NOT NULL,
+            embedding_dim INTEGER NOT NULL,
+            vector BYTEA NOT NULL,
+            times_reused BIGINT NOT NULL DEFAULT 0,
+            last_used_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            CONSTRAINT uq_embedding_cache_vectors_key
+                UNIQUE (text_sha256, embedding_model, embedding_dim)
+        );
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_embedding_cache_vectors_last_used_at "
+        "ON embedding_cache_vectors(last_used_at);"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_embedding_cache_vectors_created_at "
+        "ON embedding_cache_vectors(created_at);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_embedding_cache_vectors_created_at;")
+    op.execute("DROP INDEX IF EXISTS ix_embedding_cache_vectors_last_used_at;")
+    op.execute("DROP TABLE IF EXISTS embedding_cache_vectors;")
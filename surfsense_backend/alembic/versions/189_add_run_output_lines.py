@@ -0,0 +1,78 @@
+"""store run and spill payloads line by line
+
+Adds ``run_output_lines`` / ``tool_output_spill_lines`` so read_run/search_run
+fetch only the lines they need, plus a ``line_count`` marker on both parents.
+Existing rows keep their text blob (``line_count`` NULL) until retention
+removes them.
+
+Revision ID: 189
+Revises: 188
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "189"
+down_revision: str | None = "188"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE runs ADD COLUMN IF NOT EXISTS line_count INTEGER;")
+    op.execute(
+        "ALTER TABLE tool_output_spills ADD COLUMN IF NOT EXISTS line_count INTEGER;"
+    )
+    op.execute("ALTER TABLE tool_output_spills ALTER COLUMN content DROP NOT NULL;")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_output_lines (
+            run_id UUID NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            line_no INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            PRIMARY KEY (run_id, line_no)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tool_output_spill_lines (
+            spill_id UUID NOT NULL
+                REFERENCES tool_output_spills(id) ON DELETE CASCADE,
+            line_no INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            PRIMARY KEY (spill_id, line_no)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    # Fold line-stored payloads back into their text columns first.
+    op.execute(
+        """
+        UPDATE runs SET output_text = agg.body
+        FROM (
+            SELECT run_id, string_agg(content, E'\\n' ORDER BY line_no) AS body
+            FROM run_output_lines GROUP BY run_id
+        ) AS agg
+        WHERE runs.id = agg.run_id;
+        """
+    )
+    op.execute(
+        """
+        UPDATE tool_output_spills SET content = agg.body
+        FROM (
+            SELECT spill_id, string_agg(content, E'\\n' ORDER BY line_no) AS body
+            FROM tool_output_spill_lines GROUP BY spill_id
+        ) AS agg
+        WHERE tool_output_spills.id = agg.spill_id;
+        """
+    )
+    op.execute("DROP TABLE IF EXISTS tool_output_spill_lines;")
+    op.execute("DROP TABLE IF EXISTS run_output_lines;")
+    op.execute("UPDATE tool_output_spills SET content = '' WHERE content IS NULL;")
+    op.execute("ALTER TABLE tool_output_spills ALTER COLUMN content SET NOT NULL;")
+    op.execute("ALTER TABLE tool_output_spills DROP COLUMN IF EXISTS line_count;")
+    op.execute("ALTER TABLE runs DROP COLUMN IF EXISTS line_count;")
@@ -0,0 +1,34 @@
+"""Add a trigram index on chunk content for the agent filesystem's grep.
+
+``grep`` over the knowledge base filters chunks with ``ILIKE '%text%'`` (or
+``~*`` for ``/regex/`` patterns), which without an index is a sequential scan
+of every chunk in the database. A ``gin_trgm_ops`` index serves both
+operators.
+
+Revision ID: 190
+Revises: 189
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "190"
+down_revision: str | None = "189"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built concurrently so chunk writes keep flowing on large tables.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_content_trgm "
+            "ON chunks USING gin (content gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_content_trgm")
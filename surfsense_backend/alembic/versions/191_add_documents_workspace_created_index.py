@@ -0,0 +1,33 @@
+"""Index documents on (workspace_id, created_at DESC, id DESC).
+
+The document list endpoints page newest-first with a keyset cursor on
+``(created_at, id)``; this index lets each page start at the cursor and read
+exactly ``page_size`` rows instead of sorting the workspace.
+
+Revision ID: 191
+Revises: 190
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "191"
+down_revision: str | None = "190"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_workspace_created_id "
+            "ON documents (workspace_id, created_at DESC, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_documents_workspace_created_id"
+        )
@@ -0,0 +1,50 @@
+"""add etl_cache_image_descriptions table for cross-document picture reuse
+
+Revision ID: 192
+Revises: 191
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "192"
+down_revision: str | None = "191"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS etl_cache_image_descriptions (
+            id SERIAL PRIMARY KEY,
+            image_sha256 VARCHAR(64) NOT NULL,
+            vision_model VARCHAR(255) NOT NULL,
+            prompt_version INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            ocr_service VARCHAR(32),
+            ocr_text TEXT,
+            times_reused BIGINT NOT NULL DEFAULT 0,
+            last_used_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            CONSTRAINT uq_etl_cache_image_descriptions_key
+                UNIQUE (image_sha256, vision_model, prompt_version)
+        );
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_etl_cache_image_descriptions_last_used_at "
+        "ON etl_cache_image_descriptions(last_used_at);"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_etl_cache_image_descriptions_created_at "
+        "ON etl_cache_image_descriptions(created_at);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_etl_cache_image_descriptions_created_at;")
+    op.execute("DROP INDEX IF EXISTS ix_etl_cache_image_descriptions_last_used_at;")
+    op.execute("DROP TABLE IF EXISTS etl_cache_image_descriptions;")
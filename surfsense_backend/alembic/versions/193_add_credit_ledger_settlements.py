@@ -0,0 +1,44 @@
+"""add credit_ledger_settlements table for idempotent Redis ledger settlement
+
+Revision ID: 193
+Revises: 192
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "193"
+down_revision: str | None = "192"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS credit_ledger_settlements (
+            id SERIAL PRIMARY KEY,
+            batch_id VARCHAR(32) NOT NULL,
+            user_id UUID NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+            amount_micros BIGINT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            CONSTRAINT credit_ledger_settlements_batch_id_key UNIQUE (batch_id)
+        );
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_credit_ledger_settlements_user_id "
+        "ON credit_ledger_settlements(user_id);"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_credit_ledger_settlements_created_at "
+        "ON credit_ledger_settlements(created_at);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_credit_ledger_settlements_created_at;")
+    op.execute("DROP INDEX IF EXISTS ix_credit_ledger_settlements_user_id;")
+    op.execute("DROP TABLE IF EXISTS credit_ledger_settlements;")
@@ -0,0 +1,105 @@
+"""Denormalize workspace_id onto chunks.
+
+Chunk searches filter by workspace through a join to ``documents``, so the
+HNSW scan over ``chucks_vector_index`` walks every tenant's vectors and drops
+the foreign ones afterwards. Carrying ``workspace_id`` on the chunk lets the
+filter run on the chunk itself and lets ``scripts/partition_chunks.py``
+hash-partition the table by it.
+
+Only new and moved chunks get the column here: the ALTER stays metadata-only
+and the foreign key is added ``NOT VALID``. Existing rows are filled in
+batches by ``python scripts/partition_chunks.py backfill --yes``, which also
+validates the key. Searches keep joining ``documents`` until
+``CHUNKS_WORKSPACE_FILTER_ENABLED`` is turned on.
+
+Revision ID: 194
+Revises: 193
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "194"
+down_revision: str | None = "193"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE chunks ADD COLUMN IF NOT EXISTS workspace_id INTEGER")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'chunks_workspace_id_fkey'
+            ) THEN
+                ALTER TABLE chunks
+                    ADD CONSTRAINT chunks_workspace_id_fkey
+                    FOREIGN KEY (workspace_id) REFERENCES workspaces(id)
+                    ON DELETE CASCADE NOT VALID;
+            END IF;
+        END
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION chunks_set_workspace_id() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' OR NEW.workspace_id IS NULL THEN
+                NEW.workspace_id := (
+                    SELECT workspace_id FROM documents WHERE id = NEW.document_id
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION documents_sync_chunk_workspace_id()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE chunks SET workspace_id = NEW.workspace_id
+            WHERE document_id = NEW.id
+              AND workspace_id IS DISTINCT FROM NEW.workspace_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS chunks_set_workspace_id ON chunks")
+    op.execute(
+        """
+        CREATE TRIGGER chunks_set_workspace_id
+            BEFORE INSERT OR UPDATE OF document_id ON chunks
+            FOR EACH ROW EXECUTE FUNCTION chunks_set_workspace_id();
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS documents_sync_chunk_workspace_id ON documents")
+    op.execute(
+        """
+        CREATE TRIGGER documents_sync_chunk_workspace_id
+            AFTER UPDATE OF workspace_id ON documents
+            FOR EACH ROW EXECUTE FUNCTION documents_sync_chunk_workspace_id();
+        """
+    )
+    # Built concurrently so chunk writes keep flowing on large tables.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_workspace_id "
+            "ON chunks (workspace_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_workspace_id")
+    op.execute("DROP TRIGGER IF EXISTS documents_sync_chunk_workspace_id ON documents")
+    op.execute("DROP TRIGGER IF EXISTS chunks_set_workspace_id ON chunks")
+    op.execute("DROP FUNCTION IF EXISTS documents_sync_chunk_workspace_id()")
+    op.execute("DROP FUNCTION IF EXISTS chunks_set_workspace_id()")
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS workspace_id")
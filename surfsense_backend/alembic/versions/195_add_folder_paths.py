@@ -0,0 +1,106 @@
+"""Persist each folder's ``/documents`` path in ``folder_paths``.
+
+``build_path_index`` used to select every folder and document of a workspace
+and rebuild the path map on every call. The folder half now lives in this
+table, kept current by the ORM flush that creates, renames or moves a folder;
+a subtree is one range scan on ``(workspace_id, path)`` under the ``C``
+collation.
+
+Existing folders are backfilled here. Folders are few next to documents, so
+one pass in Python is fine; the segment rule is a frozen copy of
+``safe_folder_segment`` as of this revision.
+
+Revision ID: 195
+Revises: 194
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "195"
+down_revision: str | None = "194"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_DOCUMENTS_ROOT = "/documents"
+_INVALID_CHARS = re.compile(r"[\\/:*?\"<>|]+")
+_WHITESPACE_RUN = re.compile(r"\s+")
+_BATCH = 1000
+
+
+def _segment(value: str) -> str:
+    name = _INVALID_CHARS.sub("_", value).strip()
+    name = _WHITESPACE_RUN.sub(" ", name)
+    if not name:
+        return "folder"
+    if len(name) > 180:
+        name = name[:180].rstrip()
+    encoded = name.encode("utf-8")
+    if len(encoded) > 255:
+        name = encoded[:255].decode("utf-8", "ignore")
+    return name.rstrip()
+
+
+def _backfill() -> None:
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, name, parent_id, workspace_id FROM folders")
+    ).all()
+    by_id = {row.id: row for row in rows}
+    paths: dict[int, str] = {}
+
+    def resolve(folder_id: int) -> str:
+        if folder_id in paths:
+            return paths[folder_id]
+        parts: list[str] = []
+        cursor: int | None = folder_id
+        visited: set[int] = set()
+        while cursor is not None and cursor in by_id and cursor not in visited:
+            visited.add(cursor)
+            parts.append(_segment(str(by_id[cursor].name)))
+            cursor = by_id[cursor].parent_id
+        paths[folder_id] = _DOCUMENTS_ROOT + "/" + "/".join(reversed(parts))
+        return paths[folder_id]
+
+    values = [
+        {
+            "folder_id": fid,
+            "workspace_id": by_id[fid].workspace_id,
+            "path": resolve(fid),
+        }
+        for fid in by_id
+    ]
+    insert = sa.text(
+        "INSERT INTO folder_paths (folder_id, workspace_id, path) "
+        "VALUES (:folder_id, :workspace_id, :path) "
+        "ON CONFLICT (folder_id) DO NOTHING"
+    )
+    for start in range(0, len(values), _BATCH):
+        conn.execute(insert, values[start : start + _BATCH])
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS folder_paths (
+            folder_id INTEGER PRIMARY KEY
+                REFERENCES folders(id) ON DELETE CASCADE,
+            workspace_id INTEGER NOT NULL
+                REFERENCES workspaces(id) ON DELETE CASCADE,
+            path TEXT COLLATE "C" NOT NULL
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_folder_paths_workspace_path "
+        "ON folder_paths (workspace_id, path)"
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS folder_paths")
@@ -16,7 +16,7 @@ branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
 # Get embedding dimension from config
-EMBEDDING_DIM = config.embedding_model_instance.dimension
+EMBEDDING_DIM = config.embedding_model_instance.schema_dimension
 
 
 def upgrade() -> None:
@@ -10,7 +10,7 @@ down_revision: str | None = "95"
 branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
-EMBEDDING_DIM = config.embedding_model_instance.dimension
+EMBEDDING_DIM = config.embedding_model_instance.schema_dimension
 
 
 def upgrade() -> None:
@@ -19,6 +19,7 @@ import contextlib
 import fnmatch
 import logging
 import re
+from collections.abc import Iterable
 from datetime import UTC
 from typing import Any
 
@@ -39,7 +40,8 @@ from deepagents.backends.utils import (
     update_file_data,
 )
 from langchain.tools import ToolRuntime
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, or_, select
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.chat.multi_agent_chat.shared.citations import (
@@ -55,6 +57,7 @@ from app.agents.chat.multi_agent_chat.shared.document_render import (
 from app.db import Chunk, Document, shielded_async_session
 from app.knowledge_store.paths import (
     DOCUMENTS_ROOT,
+    PathIndex,
     build_path_index,
     doc_to_virtual_path,
     virtual_path_to_doc,
@@ -65,6 +68,10 @@ logger = logging.getLogger(__name__)
 _TEMP_PREFIX = "temp_"
 _GREP_MAX_TOTAL_MATCHES = 50
 _GREP_MAX_PER_DOC = 5
+_GREP_STREAM_BATCH = 100
+"""Chunk rows fetched per round trip; the scan stops once enough matched."""
+# SQLSTATE of Postgres's invalid_regular_expression.
+_INVALID_REGEX_SQLSTATE = "2201B"
 
 _EMPTY_DOCUMENT_NOTICE = "(This document has no readable content.)"
 
@@ -93,6 +100,83 @@ def _is_under(child: str, parent: str) -> bool:
     return child == parent or child.startswith(parent.rstrip("/") + "/")
 
 
+def parse_grep_pattern(pattern: str) -> tuple[str, bool]:
+    """Split a grep pattern into ``(text, is_regex)``.
+
+    Patterns are literal; ``/expr/`` opts into a case-insensitive regular
+    expression (Postgres ``~*``, served by the chunk trigram index like the
+    literal ``ILIKE``). Any pattern wrapped in slashes is one, so ``/api/``
+    searches for ``api``; ``/\\/api\\//`` matches the slashes too.
+    """
+    if len(pattern) > 2 and pattern.startswith("/") and pattern.endswith("/"):
+        return pattern[1:-1], True
+    return pattern, False
+
+
+def _invalid_regex_reason(exc: DBAPIError) -> str | None:
+    """Postgres's complaint when ``exc`` rejected a ``~*`` pattern, else None.
+
+    Python's ``re`` accepts syntax Postgres's regex flavour does not (named
+    groups, ``\\Z``), so some bad patterns only fail in the scan.
+    """
+    orig = exc.orig
+    if getattr(orig, "sqlstate", None) != _INVALID_REGEX_SQLSTATE:
+        return None
+    return str(orig.__cause__ or orig)
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _folders_in_scope(index: PathIndex, normalized: str) -> set[int | None]:
+    """Folders whose documents can sit at or under ``normalized``.
+
+    ``None`` stands for the ``/documents`` root. The parent folder is
+    included so a ``normalized`` that names a single document still finds it.
+    """
+    parent = normalized.rstrip("/").rsplit("/", 1)[0]
+    folder_ids: set[int | None] = {
+        folder_id
+        for folder_id, folder_path in index.folder_paths.items()
+        if _is_under(folder_path, normalized) or folder_path == parent
+    }
+    if _is_under(DOCUMENTS_ROOT, normalized) or parent == DOCUMENTS_ROOT:
+        folder_ids.add(None)
+    return folder_ids
+
+
+def _in_folders(folder_ids: Iterable[int | None]) -> ColumnElement[bool]:
+    ids = set(folder_ids)
+    clauses = [Document.folder_id.in_([fid for fid in ids if fid is not None])]
+    if None in ids:
+        clauses.append(Document.folder_id.is_(None))
+    return or_(*clauses)
+
+
+_GLOB_WILDCARDS = re.compile(r"\[[^\]]*\]|[*?]")
+_TITLE_FRAGMENT = re.compile(r"[A-Za-z0-9-]*[A-Za-z][A-Za-z0-9-]*")
+
+
+def glob_title_fragment(pattern: str) -> str | None:
+    """A literal run every matching path must contain, or ``None``.
+
+    Only letters, digits and ``-`` — characters ``safe_filename`` keeps as-is
+    and that can't straddle a ``/`` — so a path containing the run has it in
+    a folder segment or in the title itself, never only in the ``.xml``
+    extension, the ``untitled`` fallback or a ``" (<id>)"`` collision suffix.
+    Runs from the last segment win, as that is where titles are matched.
+    """
+    candidates = [
+        (segment_no, len(run), run)
+        for segment_no, segment in enumerate(pattern.split("/"))
+        for part in _GLOB_WILDCARDS.split(segment)
+        for run in _TITLE_FRAGMENT.findall(part)
+        if len(run) >= 3 and run.lower() not in "untitled.xml"
+    ]
+    return max(candidates)[2] if candidates else None
+
+
 def paginate_listing(
     infos: list[FileInfo],
     *,
@@ -405,7 +489,14 @@ class KBPostgresBackend(BackendProtocol):
         if not normalized_path.startswith(DOCUMENTS_ROOT):
             return [], set()
 
-        index = await build_path_index(session, self.workspace_id)
+        # Rows are derived in id order below, which fills the occupants of the
+        # one folder listed exactly as a workspace-wide index would.
+        index = await build_path_index(
+            session,
+            self.workspace_id,
+            populate_occupants=False,
+            under=normalized_path,
+        )
         target_folder_id: int | None = None
         if normalized_path != DOCUMENTS_ROOT:
             target_path = normalized_path
@@ -424,6 +515,7 @@ class KBPostgresBackend(BackendProtocol):
                 if target_folder_id is not None
                 else Document.folder_id.is_(None)
             )
+            .order_by(Document.id)
         )
         rows = result.all()
 
@@ -667,19 +759,18 @@ class KBPostgresBackend(BackendProtocol):
         if normalized.startswith(DOCUMENTS_ROOT) or normalized == "/":
             try:
                 async with shielded_async_session() as session:
-                    index = await build_path_index(session, self.workspace_id)
-                    rows = await session.execute(
-                        select(Document.id, Document.title, Document.folder_id).where(
-                            Document.workspace_id == self.workspace_id
-                        )
+                    index = await build_path_index(
+                        session,
+                        self.workspace_id,
+                        populate_occupants=False,
+                        under=normalized,
                     )
-                    for row in rows.all():
-                        candidate = doc_to_virtual_path(
-                            doc_id=row.id,
-                            title=str(row.title or "untitled"),
-                            folder_id=row.folder_id,
-                            index=index,
-                        )
+                    for _doc_id, candidate in await self._folder_document_paths(
+                        session,
+                        index,
+                        _folders_in_scope(index, normalized),
+                        glob_title_fragment(pattern),
+                    ):
                         if (
                             candidate in seen
                             or candidate in moved_removed
@@ -710,6 +801,51 @@ class KBPostgresBackend(BackendProtocol):
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:  # type: ignore[override]
         return asyncio.run(self.aglob_info(pattern, path))
 
+    async def _folder_document_paths(
+        self,
+        session: AsyncSession,
+        index: PathIndex,
+        folder_ids: set[int | None],
+        title_fragment: str | None = None,
+    ) -> list[tuple[int, str]]:
+        """``(doc_id, virtual_path)`` for the documents in ``folder_ids``.
+
+        Collisions only happen between documents sharing a folder, so
+        deriving one folder's documents in id order yields the same paths as
+        a workspace-wide index. With ``title_fragment``, folders whose own
+        path lacks it load only titles containing it (trigram-indexed).
+        """
+        if not folder_ids:
+            return []
+        scope = _in_folders(folder_ids)
+        if title_fragment is not None:
+            fragment = title_fragment.lower()
+            scope = scope & or_(
+                _in_folders(
+                    fid
+                    for fid in folder_ids
+                    if fragment in index.folder_paths.get(fid, DOCUMENTS_ROOT).lower()
+                ),
+                Document.title.ilike(f"%{_like_escape(title_fragment)}%", escape="\\"),
+            )
+        rows = await session.execute(
+            select(Document.id, Document.title, Document.folder_id)
+            .where(Document.workspace_id == self.workspace_id, scope)
+            .order_by(Document.id)
+        )
+        return [
+            (
+                row.id,
+                doc_to_virtual_path(
+                    doc_id=row.id,
+                    title=str(row.title or "untitled"),
+                    folder_id=row.folder_id,
+                    index=index,
+                ),
+            )
+            for row in rows.all()
+        ]
+
     async def agrep_raw(  # type: ignore[override]
         self,
         pattern: str,
@@ -718,6 +854,13 @@ class KBPostgresBackend(BackendProtocol):
     ) -> list[GrepMatch] | str:
         if not pattern:
             return "Error: pattern cannot be empty"
+        text, is_regex = parse_grep_pattern(pattern)
+        line_re: re.Pattern[str] | None = None
+        if is_regex:
+            try:
+                line_re = re.compile(text, re.IGNORECASE)
+            except re.error as exc:
+                return f"Error: invalid regex /{text}/: {exc}"
 
         normalized = self._normalize_listing_path(path or "/")
         matches: list[GrepMatch] = []
@@ -737,7 +880,7 @@ class KBPostgresBackend(BackendProtocol):
             if not isinstance(fd, dict):
                 continue
             for line_no, line in enumerate(fd.get("content") or [], 1):
-                if pattern in line:
+                if line_re.search(line) if line_re is not None else text in line:
                     matches.append(
                         GrepMatch(path=path_key, line=int(line_no), text=str(line))
                     )
@@ -747,75 +890,104 @@ class KBPostgresBackend(BackendProtocol):
         if normalized.startswith(DOCUMENTS_ROOT) or normalized == "/":
             try:
                 async with shielded_async_session() as session:
-                    index = await build_path_index(session, self.workspace_id)
-                    sub = (
-                        select(Chunk.document_id, Chunk.id, Chunk.content)
-                        .join(Document, Document.id == Chunk.document_id)
-                        .where(Document.workspace_id == self.workspace_id)
-                        .where(Chunk.content.ilike(f"%{pattern}%"))
-                        .order_by(Chunk.document_id, Chunk.position, Chunk.id)
+                    await self._grep_chunks(
+                        session,
+                        text,
+                        is_regex=is_regex,
+                        normalized=normalized,
+                        glob_re=glob_re,
+                        skip_paths=moved_removed,
+                        deleted_dirs=deleted_dirs,
+                        matches=matches,
                     )
-                    chunk_rows = await session.execute(sub)
-                    per_doc: dict[int, int] = {}
-                    doc_id_to_path: dict[int, str] = {}
-                    needed_doc_ids: set[int] = set()
-                    chunk_buffer: list[tuple[int, int, str]] = []
-                    for row in chunk_rows.all():
-                        per_doc.setdefault(row.document_id, 0)
-                        if per_doc[row.document_id] >= _GREP_MAX_PER_DOC:
-                            continue
-                        per_doc[row.document_id] += 1
-                        chunk_buffer.append((row.document_id, row.id, row.content))
-                        needed_doc_ids.add(row.document_id)
-                        if sum(per_doc.values()) >= _GREP_MAX_TOTAL_MATCHES - len(
-                            matches
-                        ):
-                            break
-                    if needed_doc_ids:
-                        doc_rows = await session.execute(
-                            select(
-                                Document.id, Document.title, Document.folder_id
-                            ).where(Document.id.in_(list(needed_doc_ids)))
-                        )
-                        for row in doc_rows.all():
-                            doc_id_to_path[row.id] = doc_to_virtual_path(
-                                doc_id=row.id,
-                                title=str(row.title or "untitled"),
-                                folder_id=row.folder_id,
-                                index=index,
-                            )
-                    for doc_id, chunk_id, content in chunk_buffer:
-                        candidate = doc_id_to_path.get(doc_id)
-                        if (
-                            not candidate
-                            or candidate in moved_removed
-                            or self._is_dir_suppressed(candidate, deleted_dirs)
-                        ):
-                            continue
-                        if not _is_under(candidate, normalized):
-                            continue
-                        if glob_re is not None and not glob_re.match(
-                            _basename(candidate)
-                        ):
-                            continue
-                        snippet = " ".join(str(content).split())[:240]
-                        matches.append(
-                            GrepMatch(
-                                path=candidate,
-                                line=0,
-                                text=(
-                                    f"<chunk-match in {candidate} chunk_id={chunk_id}>: "
-                                    f"{snippet}"
-                                ),
-                            )
-                        )
-                        if len(matches) >= _GREP_MAX_TOTAL_MATCHES:
-                            break
+            except DBAPIError as exc:
+                reason = _invalid_regex_reason(exc) if is_regex else None
+                if reason is not None:
+                    return f"Error: invalid regex /{text}/: {reason}"
+                logger.warning("KBPostgresBackend.agrep_raw DB error: %s", exc)
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning("KBPostgresBackend.agrep_raw DB error: %s", exc)
 
         return matches
 
+    async def _grep_chunks(
+        self,
+        session: AsyncSession,
+        text: str,
+        *,
+        is_regex: bool,
+        normalized: str,
+        glob_re: re.Pattern[str] | None,
+        skip_paths: set[str],
+        deleted_dirs: set[str],
+        matches: list[GrepMatch],
+    ) -> None:
+        """Append chunk matches until the caps are hit, streaming the scan.
+
+        The ``ILIKE``/``~*`` predicate is served by ``ix_chunks_content_trgm``;
+        rows arrive in batches so a common pattern stops after the first
+        few hundred chunks instead of materialising every hit.
+        """
+        index = await build_path_index(
+            session, self.workspace_id, populate_occupants=False, under=normalized
+        )
+        folder_ids = _folders_in_scope(index, normalized)
+        if not folder_ids:
+            return
+        predicate = (
+            Chunk.content.regexp_match(text, flags="i")
+            if is_regex
+            else Chunk.content.ilike(f"%{_like_escape(text)}%", escape="\\")
+        )
+        stmt = (
+            select(Chunk.document_id, Chunk.id, Chunk.content, Document.folder_id)
+            .join(Document, Document.id == Chunk.document_id)
+            .where(Document.workspace_id == self.workspace_id, _in_folders(folder_ids))
+            .where(predicate)
+            .order_by(Chunk.document_id, Chunk.position, Chunk.id)
+            .execution_options(yield_per=_GREP_STREAM_BATCH)
+        )
+        doc_paths: dict[int, str] = {}
+        loaded_folders: set[int | None] = set()
+        per_doc: dict[int, int] = {}
+        result = await session.stream(stmt)
+        try:
+            async for row in result:
+                if per_doc.get(row.document_id, 0) >= _GREP_MAX_PER_DOC:
+                    continue
+                if row.folder_id not in loaded_folders:
+                    loaded_folders.add(row.folder_id)
+                    doc_paths.update(
+                        await self._folder_document_paths(
+                            session, index, {row.folder_id}
+                        )
+                    )
+                candidate = doc_paths.get(row.document_id)
+                if (
+                    not candidate
+                    or candidate in skip_paths
+                    or self._is_dir_suppressed(candidate, deleted_dirs)
+                    or not _is_under(candidate, normalized)
+                ):
+                    continue
+                if glob_re is not None and not glob_re.match(_basename(candidate)):
+                    continue
+                per_doc[row.document_id] = per_doc.get(row.document_id, 0) + 1
+                snippet = " ".join(str(row.content).split())[:240]
+                matches.append(
+                    GrepMatch(
+                        path=candidate,
+                        line=0,
+                        text=(
+                            f"<chunk-match in {candidate} chunk_id={row.id}>: {snippet}"
+                        ),
+                    )
+                )
+                if len(matches) >= _GREP_MAX_TOTAL_MATCHES:
+                    break
+        finally:
+            await result.close()
+
     def grep_raw(  # type: ignore[override]
         self,
         pattern: str,
@@ -849,14 +1021,24 @@ class KBPostgresBackend(BackendProtocol):
 
         try:
             async with shielded_async_session() as session:
-                index = await build_path_index(session, self.workspace_id)
+                index = await build_path_index(
+                    session,
+                    self.workspace_id,
+                    populate_occupants=False,
+                    under=normalized,
+                )
                 doc_rows_raw = await session.execute(
                     select(
                         Document.id,
                         Document.title,
                         Document.folder_id,
                         Document.updated_at,
-                    ).where(Document.workspace_id == self.workspace_id)
+                    )
+                    .where(
+                        Document.workspace_id == self.workspace_id,
+                        _in_folders(_folders_in_scope(index, normalized)),
+                    )
+                    .order_by(Document.id)
                 )
                 doc_rows = list(doc_rows_raw.all())
         except Exception as exc:  # pragma: no cover
@@ -927,13 +1109,19 @@ class KBPostgresBackend(BackendProtocol):
                     return {"entries": entries, "truncated": True}
 
         if include_files:
-            for row in sorted(doc_rows, key=lambda r: str(r.title or "")):
-                candidate = doc_to_virtual_path(
+            # Derive in id order (the occupants are built as they go), then
+            # list by title.
+            doc_paths = {
+                row.id: doc_to_virtual_path(
                     doc_id=row.id,
                     title=str(row.title or "untitled"),
                     folder_id=row.folder_id,
                     index=index,
                 )
+                for row in doc_rows
+            }
+            for row in sorted(doc_rows, key=lambda r: str(r.title or "")):
+                candidate = doc_paths[row.id]
                 if candidate in moved_removed or self._is_dir_suppressed(
                     candidate, deleted_dirs
                 ):
@@ -10,6 +10,12 @@ Searches both your in-memory edits and the indexed chunks in Postgres.
 State-cached file matches include real line numbers; database hits return
 `line=0` because their position depends on per-document XML layout — call
 `read_file(path)` afterwards to find the exact line.
+
+Wrap the pattern in slashes (`/error\\s+\\d+/`) to match a case-insensitive
+PostgreSQL regular expression instead. Any pattern starting and ending with `/`
+is a regex: `/api/` finds `api`; write `/\\/api\\//` to match the slashes.
+Results stop at 50 matches (5 chunk hits per document), so narrow with `path`
+or `glob` if a pattern is common.
 """
 
 _DESKTOP_DESCRIPTION = """Search for a literal text pattern across files.
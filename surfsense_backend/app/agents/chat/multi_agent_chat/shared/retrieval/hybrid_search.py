@@ -7,17 +7,18 @@ in this corpus and require no separate search leg.
 
 from __future__ import annotations
 
-import asyncio
 import contextlib
 import time
+from typing import Any
 
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from app.config import config
 from app.db import Chunk, Document, DocumentType
 from app.observability import metrics, otel
+from app.retriever.query_embedding import embed_query
+from app.retriever.scoping import enable_iterative_scan, scope_chunks
+from app.retriever.vector_ranking import nearest
 from app.utils.perf import get_perf_logger
 
 from .models import ChunkHit, DocumentHit, SearchScope
@@ -27,6 +28,19 @@ _CANDIDATE_MULTIPLIER = 5  # fused-chunk pool size relative to top_k
 _MAX_PASSAGES_PER_DOC = 12
 _SURFACE = "chunks"
 
+# Everything ``_group_into_documents`` reads, as plain columns: fused rows come
+# back as tuples, never ORM objects, so neither the document's ``content`` /
+# ``source_markdown`` nor any vector column is ever transferred.
+_HIT_COLUMNS = (
+    Chunk.id.label("chunk_id"),
+    Chunk.content,
+    Chunk.position,
+    Document.id.label("document_id"),
+    Document.title,
+    Document.document_type,
+    Document.document_metadata,
+)
+
 
 async def search_chunks(
     db_session: AsyncSession,
@@ -87,16 +101,14 @@ async def _search(
         return []
 
     if query_embedding is None:
-        query_embedding = await asyncio.to_thread(
-            config.embedding_model_instance.embed, query
-        )
+        query_embedding = await embed_query(query)
 
-    conditions = _base_conditions(workspace_id, scope, document_types)
     rows = await _fused_chunks(
         db_session,
         query=query,
         query_embedding=query_embedding,
-        conditions=conditions,
+        workspace_id=workspace_id,
+        document_conditions=_document_conditions(scope, document_types),
         candidate_pool=top_k * _CANDIDATE_MULTIPLIER,
     )
     return _group_into_documents(rows, top_k=top_k)
@@ -115,16 +127,12 @@ def _resolve_document_types(
     return resolved
 
 
-def _base_conditions(
-    workspace_id: int,
+def _document_conditions(
     scope: SearchScope,
     document_types: list[DocumentType] | None,
 ) -> list:
-    """Filters shared by both search legs."""
-    conditions = [
-        Document.workspace_id == workspace_id,
-        func.coalesce(Document.status["state"].astext, "ready") != "deleting",
-    ]
+    """Document filters shared by both search legs, beyond the workspace."""
+    conditions = []
     if document_types:
         conditions.append(Document.document_type.in_(document_types))
     if scope.document_ids:
@@ -141,37 +149,32 @@ async def _fused_chunks(
     *,
     query: str,
     query_embedding: list[float],
-    conditions: list,
+    workspace_id: int,
+    document_conditions: list,
     candidate_pool: int,
 ):
-    """Run semantic + keyword legs and fuse them with RRF; return (Chunk, score) rows."""
-    tsvector = func.to_tsvector("english", Chunk.content)
+    """Run semantic + keyword legs and fuse them with RRF; return projected hit rows."""
+    tsvector = Chunk.search_vector
     tsquery = func.plainto_tsquery("english", query)
 
-    semantic = (
-        select(
-            Chunk.id,
-            func.rank()
-            .over(order_by=Chunk.embedding.op("<=>")(query_embedding))
-            .label("rank"),
-        )
-        .join(Document, Chunk.document_id == Document.id)
-        .where(*conditions)
-        .order_by(Chunk.embedding.op("<=>")(query_embedding))
-        .limit(candidate_pool)
-        .cte("semantic_search")
-    )
+    semantic = nearest(
+        scope_chunks(select(Chunk.id), workspace_id, *document_conditions),
+        Chunk.embedding,
+        query_embedding,
+        candidate_pool,
+    ).cte("semantic_search")
 
     keyword = (
-        select(
-            Chunk.id,
-            func.rank()
-            .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
-            .label("rank"),
+        scope_chunks(
+            select(
+                Chunk.id,
+                func.rank()
+                .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
+                .label("rank"),
+            ).where(tsvector.op("@@")(tsquery)),
+            workspace_id,
+            *document_conditions,
         )
-        .join(Document, Chunk.document_id == Document.id)
-        .where(*conditions)
-        .where(tsvector.op("@@")(tsquery))
         .order_by(func.ts_rank_cd(tsvector, tsquery).desc())
         .limit(candidate_pool)
         .cte("keyword_search")
@@ -179,7 +182,7 @@ async def _fused_chunks(
 
     fused = (
         select(
-            Chunk,
+            *_HIT_COLUMNS,
             (
                 func.coalesce(1.0 / (_RRF_K + semantic.c.rank), 0.0)
                 + func.coalesce(1.0 / (_RRF_K + keyword.c.rank), 0.0)
@@ -189,11 +192,12 @@ async def _fused_chunks(
             semantic.outerjoin(keyword, semantic.c.id == keyword.c.id, full=True)
         )
         .join(Chunk, Chunk.id == func.coalesce(semantic.c.id, keyword.c.id))
-        .options(joinedload(Chunk.document))
+        .join(Document, Chunk.document_id == Document.id)
         .order_by(text("score DESC"))
         .limit(candidate_pool)
     )
 
+    await enable_iterative_scan(db_session)
     result = await db_session.execute(fused)
     return result.all()
 
@@ -201,32 +205,32 @@ async def _fused_chunks(
 def _group_into_documents(rows, *, top_k: int) -> list[DocumentHit]:
     """Group fused chunks by document, keep the top_k best, order chunks for reading."""
     chunks_by_doc: dict[int, list[ChunkHit]] = {}
-    document_by_id: dict[int, Document] = {}
+    first_row: dict[int, Any] = {}
     best_score: dict[int, float] = {}
     order: list[int] = []
 
-    for chunk, score in rows:
-        document_id = chunk.document.id
+    for row in rows:
+        document_id = row.document_id
         if document_id not in chunks_by_doc:
             chunks_by_doc[document_id] = []
-            document_by_id[document_id] = chunk.document
-            best_score[document_id] = float(score)
+            first_row[document_id] = row
+            best_score[document_id] = float(row.score)
             order.append(document_id)
         chunks_by_doc[document_id].append(
             ChunkHit(
-                chunk_id=chunk.id,
-                content=chunk.content,
-                position=chunk.position,
-                score=float(score),
+                chunk_id=row.chunk_id,
+                content=row.content,
+                position=row.position,
+                score=float(row.score),
             )
         )
 
     return [
         DocumentHit(
             document_id=document_id,
-            title=document_by_id[document_id].title,
-            document_type=_type_value(document_by_id[document_id]),
-            metadata=document_by_id[document_id].document_metadata or {},
+            title=first_row[document_id].title,
+            document_type=_type_value(first_row[document_id].document_type),
+            metadata=first_row[document_id].document_metadata or {},
             score=best_score[document_id],
             chunks=_reading_order(chunks_by_doc[document_id]),
         )
@@ -242,8 +246,7 @@ def _reading_order(chunks: list[ChunkHit]) -> list[ChunkHit]:
     return sorted(most_relevant, key=lambda c: c.position)
 
 
-def _type_value(document: Document) -> str | None:
-    document_type = getattr(document, "document_type", None)
+def _type_value(document_type: DocumentType | None) -> str | None:
     return document_type.value if document_type is not None else None
 
 
@@ -14,7 +14,7 @@ if TYPE_CHECKING:
     from app.services.reranker_service import RerankerService
 
 
-def rerank_hits(
+async def rerank_hits(
     query: str,
     hits: list[DocumentHit],
     reranker: RerankerService | None,
@@ -24,7 +24,9 @@ def rerank_hits(
         return hits
 
     hit_by_id = {_reranker_id(hit): hit for hit in hits}
-    ranked = reranker.rerank_documents(query, [_as_document(hit) for hit in hits])
+    ranked = await reranker.arerank_documents(
+        query, [_as_document(hit) for hit in hits]
+    )
     reordered = [
         hit_by_id[doc["document_id"]]
         for doc in ranked
@@ -40,7 +42,7 @@ def _reranker_id(hit: DocumentHit) -> str:
 
 
 def _as_document(hit: DocumentHit) -> dict[str, Any]:
-    """The minimal dict shape ``RerankerService.rerank_documents`` scores on."""
+    """The minimal dict shape ``RerankerService.arerank_documents`` scores on."""
     return {
         "document_id": _reranker_id(hit),
         "content": "\n\n".join(chunk.content for chunk in hit.chunks),
@@ -23,7 +23,7 @@ if TYPE_CHECKING:
     from app.services.reranker_service import RerankerService
 
 
-def build_context(
+async def build_context(
     query: str,
     hits: list[DocumentHit],
     registry: CitationRegistry,
@@ -31,7 +31,7 @@ def build_context(
     reranker: RerankerService | None = None,
 ) -> str | None:
     """Rerank → adapt → render. Pure given ``hits``, so it is unit-testable."""
-    ranked = rerank_hits(query, hits, reranker)
+    ranked = await rerank_hits(query, hits, reranker)
     documents = [to_renderable_document(hit) for hit in ranked]
     return render_search_context(documents, registry)
 
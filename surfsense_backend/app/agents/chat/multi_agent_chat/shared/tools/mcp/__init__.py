@@ -4,4 +4,5 @@ Split by responsibility:
 - ``client``: the low-level :class:`MCPClient` connection wrapper.
 - ``tool``: discovery + LangChain tool construction and cache invalidation.
 - ``cache``: the connector tool-cache refresh helpers.
+- ``pool``: open sessions reused across tool calls, per connector.
 """
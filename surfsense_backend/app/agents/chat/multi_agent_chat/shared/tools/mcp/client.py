@@ -177,6 +177,8 @@ class MCPClient:
         tool_name: str,
         arguments: dict[str, Any],
         timeout: float = 60.0,
+        *,
+        session: ClientSession | None = None,
     ) -> Any:
         """Call a tool on the MCP server.
 
@@ -184,6 +186,8 @@ class MCPClient:
             tool_name: Name of the tool to call
             arguments: Arguments to pass to the tool
             timeout: Maximum seconds to wait for the tool to respond
+            session: An already-open session (e.g. a pooled one) to call on
+                instead of the one opened by ``connect()``
 
         Returns:
             Tool execution result
@@ -192,7 +196,8 @@ class MCPClient:
             RuntimeError: If not connected to server
 
         """
-        if not self.session:
+        session = session or self.session
+        if not session:
             raise RuntimeError(
                 "Not connected to MCP server. Use 'async with client.connect():'"
             )
@@ -203,7 +208,7 @@ class MCPClient:
             )
 
             response = await asyncio.wait_for(
-                self.session.call_tool(tool_name, arguments=arguments),
+                session.call_tool(tool_name, arguments=arguments),
                 timeout=timeout,
             )
 
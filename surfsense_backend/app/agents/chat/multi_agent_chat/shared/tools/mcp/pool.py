@@ -0,0 +1,316 @@
+"""Per-connector pool of open MCP client sessions.
+
+Every MCP tool call used to open its own transport — a TLS handshake plus the
+MCP ``initialize`` round trip for HTTP servers, a process spawn for stdio ones —
+and an agent turn can call Linear/Jira/Gmail tools dozens of times. Calls now
+borrow a session kept open per (event loop, connector, connection fingerprint).
+
+Each session is entered and exited by a dedicated owner task: the MCP
+transports are anyio task groups, which must be exited by the task that
+entered them. Concurrent calls share one session, since MCP multiplexes
+requests by id. Idle sessions close after ``MCP_SESSION_IDLE_SECONDS``; a
+session whose transport dies closes itself and leaves the pool.
+
+Only a lost connection retires a session. A tool's own error (an ``McpError``
+result, a failure the server reports) leaves it pooled, and a call is only
+retried when it provably never reached the server: tool calls can have side
+effects, and an approved one must not run twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from app.config import config
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+SessionOpener = Callable[[], AbstractAsyncContextManager[ClientSession]]
+
+_PING_TIMEOUT_SECONDS = 5.0
+
+_PoolKey = tuple[asyncio.AbstractEventLoop, Hashable, str]
+
+
+def connection_fingerprint(*parts: Any) -> str:
+    """Digest of what a session is opened with (URL, headers, command, env).
+
+    Sessions are keyed by it, so a rotated token or an edited server config
+    never reuses a session opened with the old one, and no secret is kept as
+    a dict key.
+    """
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass(eq=False)
+class _Entry:
+    key: _PoolKey
+    ready: asyncio.Future
+    closing: asyncio.Event = field(default_factory=asyncio.Event)
+    session: ClientSession | None = None
+    error: BaseException | None = None
+    users: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    retired: bool = False
+    idle_timer: asyncio.TimerHandle | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.key[0]
+
+
+class MCPSessionPool:
+    """Open MCP sessions reused across tool calls.
+
+    ``scope`` groups the sessions :meth:`invalidate` drops together (a
+    connector id); ``fingerprint`` tells apart sessions opened with different
+    URLs or credentials within a scope.
+    """
+
+    def __init__(self, *, idle_seconds: float, ping_after_seconds: float) -> None:
+        self._idle_seconds = max(0.0, idle_seconds)
+        self._ping_after = max(0.0, ping_after_seconds)
+        self._entries: dict[_PoolKey, _Entry] = {}
+        self._owners: set[asyncio.Task] = set()
+
+    async def run(
+        self,
+        scope: Hashable,
+        fingerprint: str,
+        open_session: SessionOpener,
+        use: Callable[[ClientSession], Awaitable[T]],
+        *,
+        transport: str,
+    ) -> T:
+        """Return ``await use(session)`` on a pooled session.
+
+        A session whose connection is lost during a call is discarded. If it
+        was a reused one the server may simply have dropped it, so the call is
+        retried once on a fresh session — but only when the request never got
+        written to the transport. Tool and protocol errors, timeouts and
+        failures after the request was sent are raised as they are.
+        """
+        if not config.MCP_SESSION_POOL_ENABLED:
+            metrics.record_mcp_session_acquire(transport=transport, outcome="opened")
+            async with open_session() as session:
+                return await use(session)
+
+        entry, outcome = await self._acquire(scope, fingerprint, open_session)
+        metrics.record_mcp_session_acquire(transport=transport, outcome=outcome)
+        try:
+            return await self._use(entry, use)
+        except Exception as exc:
+            if outcome != "reused" or not _never_sent(exc):
+                raise
+            logger.debug(
+                "Pooled MCP session for %r failed a call; reconnecting",
+                scope,
+                exc_info=True,
+            )
+
+        entry, _ = await self._acquire(scope, fingerprint, open_session)
+        metrics.record_mcp_session_acquire(transport=transport, outcome="reconnected")
+        return await self._use(entry, use)
+
+    def invalidate(self, scope: Hashable | None = None) -> None:
+        """Close the sessions of ``scope`` (all sessions when ``None``).
+
+        Sessions with calls in flight close once those calls finish.
+        """
+        for entry in list(self._entries.values()):
+            if scope is None or entry.key[1] == scope:
+                self._retire(entry)
+
+    async def _use(
+        self, entry: _Entry, use: Callable[[ClientSession], Awaitable[T]]
+    ) -> T:
+        try:
+            return await use(cast(ClientSession, entry.session))
+        except Exception as exc:
+            if entry.error is None and not _connection_lost(exc):
+                # The tool's own failure: the session is fine.
+                raise
+            self._retire(entry)
+            # A dead transport fails the call with a generic "connection
+            # closed"; its own error (an HTTP 401, say) is the useful one.
+            if entry.error is not None and entry.error is not exc:
+                raise _leaf(entry.error) from exc
+            raise
+        finally:
+            self._release(entry)
+
+    async def _acquire(
+        self, scope: Hashable, fingerprint: str, open_session: SessionOpener
+    ) -> tuple[_Entry, str]:
+        loop = asyncio.get_running_loop()
+        self._drop_closed_loops()
+        key = (loop, scope, fingerprint)
+
+        outcome = "opened"
+        entry = self._entries.get(key)
+        if entry is not None:
+            await self._pin(entry)
+            if await self._healthy(entry):
+                return entry, "reused"
+            self._retire(entry)
+            self._release(entry)
+            outcome = "reconnected"
+
+        entry = _Entry(key=key, ready=loop.create_future())
+        self._entries[key] = entry
+        owner = loop.create_task(self._own(entry, open_session))
+        # Held so the owner is not garbage-collected while the session is open.
+        self._owners.add(owner)
+        owner.add_done_callback(self._owners.discard)
+        await self._pin(entry)
+        return entry, outcome
+
+    async def _pin(self, entry: _Entry) -> None:
+        """Count a caller on ``entry`` and wait until its session is open."""
+        entry.users += 1
+        try:
+            # Shielded: one caller going away must not abort an open that
+            # others are waiting on.
+            await asyncio.shield(entry.ready)
+        except BaseException:
+            self._release(entry)
+            raise
+
+    async def _healthy(self, entry: _Entry) -> bool:
+        if entry.retired or entry.session is None:
+            return False
+        if time.monotonic() - entry.last_used < self._ping_after:
+            return True
+        # Stamped first so concurrent callers don't all ping.
+        entry.last_used = time.monotonic()
+        try:
+            await asyncio.wait_for(entry.session.send_ping(), _PING_TIMEOUT_SECONDS)
+        except Exception:
+            logger.debug("Pooled MCP session failed its ping", exc_info=True)
+            return False
+        return not entry.retired
+
+    async def _own(self, entry: _Entry, open_session: SessionOpener) -> None:
+        try:
+            async with open_session() as session:
+                entry.session = session
+                entry.ready.set_result(None)
+                await entry.closing.wait()
+        except Exception as exc:
+            entry.error = exc
+            if not entry.ready.done():
+                entry.ready.set_exception(exc)
+            else:
+                logger.debug("Pooled MCP session closed with an error: %s", exc)
+        finally:
+            self._forget(entry)
+            if not entry.ready.done():
+                entry.ready.cancel()
+
+    def _release(self, entry: _Entry) -> None:
+        entry.users -= 1
+        if entry.users:
+            return
+        if entry.retired:
+            self._close(entry)
+            return
+        entry.last_used = time.monotonic()
+        if entry.idle_timer is not None:
+            entry.idle_timer.cancel()
+        entry.idle_timer = entry.loop.call_later(
+            self._idle_seconds, self._expire, entry
+        )
+
+    def _expire(self, entry: _Entry) -> None:
+        if entry.users == 0:
+            self._retire(entry)
+
+    def _retire(self, entry: _Entry) -> None:
+        self._forget(entry)
+        if entry.users == 0:
+            self._close(entry)
+
+    def _forget(self, entry: _Entry) -> None:
+        entry.retired = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+    def _close(self, entry: _Entry) -> None:
+        if entry.idle_timer is not None:
+            entry.idle_timer.cancel()
+            entry.idle_timer = None
+        if not entry.loop.is_closed():
+            # Thread-safe: invalidation can come from another loop's thread.
+            entry.loop.call_soon_threadsafe(entry.closing.set)
+
+    def _drop_closed_loops(self) -> None:
+        # Celery runs each task on its own loop; its sessions die with it.
+        for key in [key for key in self._entries if key[0].is_closed()]:
+            del self._entries[key]
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    """Whether a call failed because the session's connection is gone."""
+    exc = _leaf(exc)
+    if isinstance(exc, McpError):
+        return exc.error.code == CONNECTION_CLOSED
+    return isinstance(
+        exc,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            ConnectionError,
+        ),
+    )
+
+
+def _never_sent(exc: BaseException) -> bool:
+    """Whether a call failed before its request left for the server.
+
+    A closed or broken write stream refuses the request outright, so the
+    server cannot have applied it. ``exc`` may be the transport's own error
+    raised from the call's (see :meth:`MCPSessionPool._use`).
+    """
+    unsent = (
+        anyio.ClosedResourceError,
+        anyio.BrokenResourceError,
+        ConnectionRefusedError,
+    )
+    return any(
+        isinstance(_leaf(err), unsent)
+        for err in (exc, exc.__cause__)
+        if err is not None
+    )
+
+
+def _leaf(exc: BaseException) -> BaseException:
+    """The error inside single-error anyio task-group wrappers."""
+    while isinstance(exc, BaseExceptionGroup) and len(exc.exceptions) == 1:
+        exc = exc.exceptions[0]
+    return exc
+
+
+mcp_session_pool = MCPSessionPool(
+    idle_seconds=config.MCP_SESSION_IDLE_SECONDS,
+    ping_after_seconds=config.MCP_SESSION_PING_AFTER_SECONDS,
+)
+
+
+__all__ = ["MCPSessionPool", "connection_fingerprint", "mcp_session_pool"]
@@ -20,6 +20,8 @@ import asyncio
 import logging
 import time
 from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -43,6 +45,10 @@ from app.agents.chat.multi_agent_chat.shared.tools.mcp.cache import (
     write_cached_tools,
 )
 from app.agents.chat.multi_agent_chat.shared.tools.mcp.client import MCPClient
+from app.agents.chat.multi_agent_chat.shared.tools.mcp.pool import (
+    connection_fingerprint,
+    mcp_session_pool,
+)
 from app.capabilities.core import ActivityDescriptor
 from app.db import SearchSourceConnector
 from app.services.mcp_oauth.registry import MCP_SERVICES, get_service_by_connector_type
@@ -77,6 +83,19 @@ def _mcp_activity_descriptor(
     ).as_metadata(kind="connector.action")
 
 
+@asynccontextmanager
+async def _open_http_session(
+    url: str, headers: dict[str, str]
+) -> AsyncIterator[ClientSession]:
+    """Connect and initialize a streamable-HTTP MCP session."""
+    async with (
+        streamablehttp_client(url, headers=headers) as (read, write, _),
+        ClientSession(read, write) as session,
+    ):
+        await session.initialize()
+        yield session
+
+
 def _evict_expired_mcp_cache() -> None:
     """Remove expired entries from the MCP tools cache to prevent unbounded growth."""
     now = time.monotonic()
@@ -218,9 +237,22 @@ async def _create_mcp_tool_from_definition_stdio(
         last_error: Exception | None = None
         for attempt in range(_TOOL_CALL_MAX_RETRIES):
             try:
-                async with mcp_client.connect():
-                    result = await mcp_client.call_tool(tool_name, call_kwargs)
-                    return str(result)
+                result = await mcp_session_pool.run(
+                    connector_id if connector_id is not None else mcp_client.command,
+                    connection_fingerprint(
+                        mcp_client.command, mcp_client.args, mcp_client.env
+                    ),
+                    # A client of its own: ``connect()`` binds the session to
+                    # the client, and this one is shared by every tool.
+                    lambda: MCPClient(
+                        mcp_client.command, mcp_client.args, mcp_client.env
+                    ).connect(),
+                    lambda session: mcp_client.call_tool(
+                        tool_name, call_kwargs, session=session
+                    ),
+                    transport="stdio",
+                )
+                return str(result)
             except Exception as e:
                 last_error = e
                 if attempt < _TOOL_CALL_MAX_RETRIES - 1:
@@ -317,17 +349,18 @@ async def _create_mcp_tool_from_definition_http(
         call_kwargs: dict[str, Any],
         timeout: float = 60.0,
     ) -> str:
-        """Execute a single MCP HTTP call with the given headers."""
+        """Execute a single MCP HTTP call with the given headers.
+
+        The session comes from the connector's pool; ``acquire`` in the perf
+        log is ~0 when an open one was reused.
+        """
         call_start = time.perf_counter()
-        async with (
-            streamablehttp_client(url, headers=call_headers) as (read, write, _),
-            ClientSession(read, write) as session,
-        ):
-            init_start = time.perf_counter()
-            await session.initialize()
-            init_elapsed = time.perf_counter() - init_start
+        acquire_elapsed = tool_elapsed = 0.0
 
+        async def _call(session: ClientSession) -> str:
+            nonlocal acquire_elapsed, tool_elapsed
             tool_start = time.perf_counter()
+            acquire_elapsed = tool_start - call_start
             response = await asyncio.wait_for(
                 session.call_tool(original_tool_name, arguments=call_kwargs),
                 timeout=timeout,
@@ -343,13 +376,21 @@ async def _create_mcp_tool_from_definition_http(
                 else:
                     result.append(str(content))
 
-            payload = "\n".join(result) if result else ""
+            return "\n".join(result) if result else ""
+
+        payload = await mcp_session_pool.run(
+            connector_id if connector_id is not None else url,
+            connection_fingerprint(url, call_headers),
+            lambda: _open_http_session(url, call_headers),
+            _call,
+            transport="http",
+        )
 
         _perf_log.info(
-            "[mcp_http_call] connector=%s tool=%s init=%.3fs call=%.3fs total=%.3fs out_chars=%d",
+            "[mcp_http_call] connector=%s tool=%s acquire=%.3fs call=%.3fs total=%.3fs out_chars=%d",
             connector_id,
             original_tool_name,
-            init_elapsed,
+            acquire_elapsed,
             tool_elapsed,
             time.perf_counter() - call_start,
             len(payload),
@@ -792,7 +833,7 @@ async def _refresh_connector_token(
     - Calling the token endpoint
     - Encrypting and persisting the new tokens
     - Clearing ``auth_expired`` if it was set
-    - Invalidating the MCP tools cache
+    - Invalidating the MCP tools cache and the connector's pooled sessions
 
     Returns the **plaintext** new access token on success, or ``None`` on
     failure (no refresh token, IdP error, etc.).
@@ -857,6 +898,8 @@ async def _refresh_connector_token(
     await session.refresh(connector)
 
     invalidate_mcp_tools_cache(connector.workspace_id)
+    # Open sessions authenticated with the old token; the next call reconnects.
+    mcp_session_pool.invalidate(connector.id)
 
     return new_access
 
@@ -1033,6 +1076,7 @@ async def _mark_connector_auth_expired(connector_id: int) -> None:
                 connector_id,
             )
             invalidate_mcp_tools_cache(connector.workspace_id)
+            mcp_session_pool.invalidate(connector_id)
 
     except Exception:
         logger.warning(
@@ -154,7 +154,7 @@ def create_search_knowledge_base_tool(
                 scope=scope,
                 top_k=clamped_top_k,
             )
-            rendered = build_context(cleaned_query, hits, registry)
+            rendered = await build_context(cleaned_query, hits, registry)
 
         _perf_log.info(
             "[search_knowledge_base] tool query=%r sources=%d in %.3fs",
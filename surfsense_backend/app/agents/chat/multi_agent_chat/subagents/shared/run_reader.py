@@ -1,14 +1,15 @@
 """``read_run`` / ``search_run`` / ``export_run``: work with a stored run or spill.
 
 Scraper capability outputs and evicted context spills are stored full in Postgres
-(``runs`` / ``tool_output_spills``); the model only ever sees a capped preview plus
-a reference like ``run_<uuid>`` or ``spill_<uuid>``. The read tools retrieve the
-rest on demand — line-based paging and pattern search — without ever loading the
-whole payload into context. ``export_run`` goes one step further for bulk
-datasets: it converts the stored items (or their nested link records) to CSV
-**in code** and saves the file as a workspace document, so hundreds of rows never
-flow through the model at all. Every lookup is scoped to the caller's workspace
-(the trust boundary).
+(``runs`` / ``tool_output_spills``, one row per line); the model only ever sees a
+capped preview plus a reference like ``run_<uuid>`` or ``spill_<uuid>``. The read
+tools retrieve the rest on demand — line-based paging and pattern search — without
+ever loading the whole payload into context, or into this process: a page fetches
+only its lines and a search streams the lines through in bounded batches.
+``export_run`` goes one step further for bulk datasets: it converts the stored
+items (or their nested link records) to CSV **in code** and saves the file as a
+workspace document, so hundreds of rows never flow through the model at all.
+Every lookup is scoped to the caller's workspace (the trust boundary).
 """
 
 from __future__ import annotations
@@ -22,10 +23,15 @@ from typing import Annotated, Any
 from uuid import UUID
 
 from langchain_core.tools import BaseTool, StructuredTool
-from sqlalchemy import select
 
-from app.capabilities.core.runs import RUN_OUTPUT_CHAR_CAP
-from app.db import Run, ToolOutputSpill, shielded_async_session
+from app.capabilities.core.runs import (
+    RUN_OUTPUT_CHAR_CAP,
+    StoredPayload,
+    load_payload,
+    read_payload_lines,
+    stream_payload_lines,
+)
+from app.db import shielded_async_session
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +59,8 @@ def _parse_ref(ref: str) -> tuple[str, UUID] | None:
     return None
 
 
-async def _load_body(ref: str, workspace_id: int) -> tuple[str, str] | str:
-    """Return ``(body_text, kind)`` for a ref, or an error string.
+async def _open_payload(session, ref: str, workspace_id: int) -> StoredPayload | str:
+    """Resolve a ref to its stored payload, or return an error string.
 
     Workspace-scoped: a ref belonging to another workspace reads as not found.
     """
@@ -65,27 +71,10 @@ async def _load_body(ref: str, workspace_id: int) -> tuple[str, str] | str:
             "Expected 'run_<uuid>' or 'spill_<uuid>'."
         )
     kind, ref_id = parsed
-    async with shielded_async_session() as session:
-        if kind == "run":
-            row = (
-                await session.execute(
-                    select(Run.output_text).where(
-                        Run.id == ref_id, Run.workspace_id == workspace_id
-                    )
-                )
-            ).scalar_one_or_none()
-        else:
-            row = (
-                await session.execute(
-                    select(ToolOutputSpill.content).where(
-                        ToolOutputSpill.id == ref_id,
-                        ToolOutputSpill.workspace_id == workspace_id,
-                    )
-                )
-            ).scalar_one_or_none()
-    if row is None:
+    payload = await load_payload(session, kind, ref_id, workspace_id)
+    if payload is None:
         return f"Error: {ref} not found in this workspace."
-    return (row or ""), kind
+    return payload
 
 
 def _cap(body: str) -> str:
@@ -99,29 +88,27 @@ def _cap(body: str) -> str:
     )
 
 
-def _rows_from_body(body: str, rows: str) -> list[dict[str, Any]]:
-    """Deterministically flatten stored JSONL into export rows.
+def _rows_from_line(line: str, rows: str) -> list[dict[str, Any]]:
+    """Deterministically flatten one stored JSONL line into export rows.
 
-    ``rows="items"`` → one row per stored item. ``rows="links"`` → explode each
-    item's ``links`` records, prefixing every row with the page it came from.
-    Non-JSON lines (plain-text spills) are skipped.
+    ``rows="items"`` → the item itself. ``rows="links"`` → explode the item's
+    ``links`` records, prefixing every row with the page it came from.
+    Non-JSON lines (plain-text spills) yield nothing.
     """
-    out: list[dict[str, Any]] = []
-    for line in body.split("\n"):
-        try:
-            item = json.loads(line)
-        except (json.JSONDecodeError, ValueError):
-            continue
-        if not isinstance(item, dict):
-            continue
-        if rows == "items":
-            out.append(item)
-            continue
-        page = str(item.get("url") or "")
-        for link in item.get("links") or []:
-            if isinstance(link, dict):
-                out.append({"page": page, **link})
-    return out
+    try:
+        item = json.loads(line)
+    except (json.JSONDecodeError, ValueError):
+        return []
+    if not isinstance(item, dict):
+        return []
+    if rows == "items":
+        return [item]
+    page = str(item.get("url") or "")
+    return [
+        {"page": page, **link}
+        for link in item.get("links") or []
+        if isinstance(link, dict)
+    ]
 
 
 def _cell(value: Any) -> str:
@@ -231,16 +218,16 @@ def build_run_reader_tools(*, workspace_id: int) -> list[BaseTool]:
             "(the truncation note tells you the next char_offset).",
         ] = 0,
     ) -> str:
-        loaded = await _load_body(ref, workspace_id)
-        if isinstance(loaded, str):
-            return loaded
-        body, _kind = loaded
-        lines = body.split("\n")
         start = max(0, offset)
         count = min(max(1, limit), _MAX_LIMIT)
-        window = lines[start : start + count]
+        async with shielded_async_session() as session:
+            payload = await _open_payload(session, ref, workspace_id)
+            if isinstance(payload, str):
+                return payload
+            window = await read_payload_lines(session, payload, start, start + count)
+        total = payload.line_count
         if not window:
-            return f"No lines at offset {start} (total {len(lines)} lines in {ref})."
+            return f"No lines at offset {start} (total {total} lines in {ref})."
         window_body = "\n".join(window)
         start_char = max(0, char_offset)
         if start_char >= len(window_body) > 0:
@@ -251,7 +238,7 @@ def build_run_reader_tools(*, workspace_id: int) -> list[BaseTool]:
         remaining = window_body[start_char:]
         shown = remaining[:RUN_OUTPUT_CHAR_CAP]
         header = (
-            f"Showing lines {start}-{start + len(window) - 1} of {len(lines)} in {ref}"
+            f"Showing lines {start}-{start + len(window) - 1} of {total} in {ref}"
             + (f", from char {start_char} of this window" if start_char else "")
             + ":\n"
         )
@@ -271,24 +258,23 @@ def build_run_reader_tools(*, workspace_id: int) -> list[BaseTool]:
         pattern: Annotated[str, "Substring or regular expression to match per line."],
         max_matches: Annotated[int, "Max matching lines to return (default 20)."] = 20,
     ) -> str:
-        loaded = await _load_body(ref, workspace_id)
-        if isinstance(loaded, str):
-            return loaded
-        body, _kind = loaded
         pattern = (pattern or "").strip()
-        if not pattern:
-            return "Error: provide a non-empty search pattern."
-
         matcher = _build_matcher(pattern)
         limit = min(max(1, max_matches), _MAX_LIMIT)
         matches: list[str] = []
         total = 0
-        for idx, line in enumerate(body.split("\n")):
-            span = matcher(line)
-            if span is not None:
-                total += 1
-                if len(matches) < limit:
-                    matches.append(f"[{idx}] {_excerpt(line, span)}")
+        async with shielded_async_session() as session:
+            payload = await _open_payload(session, ref, workspace_id)
+            if isinstance(payload, str):
+                return payload
+            if not pattern:
+                return "Error: provide a non-empty search pattern."
+            async for idx, line in stream_payload_lines(session, payload):
+                span = matcher(line)
+                if span is not None:
+                    total += 1
+                    if len(matches) < limit:
+                        matches.append(f"[{idx}] {_excerpt(line, span)}")
         if not matches:
             return f"No lines in {ref} matched {pattern!r}."
         header = (
@@ -326,24 +312,24 @@ def build_run_reader_tools(*, workspace_id: int) -> list[BaseTool]:
             str | None, "Drop rows matching this substring/regex."
         ] = None,
     ) -> str:
-        loaded = await _load_body(ref, workspace_id)
-        if isinstance(loaded, str):
-            return loaded
-        body, _kind = loaded
         if rows not in ("items", "links"):
             return "Error: rows must be 'items' or 'links'."
-
-        records = _rows_from_body(body, rows)
-        if include_pattern:
-            inc = _build_matcher(include_pattern.strip())
-            records = [
-                r for r in records if inc(" ".join(map(_cell, r.values()))) is not None
-            ]
-        if exclude_pattern:
-            exc = _build_matcher(exclude_pattern.strip())
-            records = [
-                r for r in records if exc(" ".join(map(_cell, r.values()))) is None
-            ]
+        inc = _build_matcher(include_pattern.strip()) if include_pattern else None
+        exc = _build_matcher(exclude_pattern.strip()) if exclude_pattern else None
+
+        def _keep(record: dict[str, Any]) -> bool:
+            combined = " ".join(map(_cell, record.values()))
+            if inc is not None and inc(combined) is None:
+                return False
+            return exc is None or exc(combined) is None
+
+        records: list[dict[str, Any]] = []
+        async with shielded_async_session() as session:
+            payload = await _open_payload(session, ref, workspace_id)
+            if isinstance(payload, str):
+                return payload
+            async for _idx, line in stream_payload_lines(session, payload):
+                records.extend(r for r in _rows_from_line(line, rows) if _keep(r))
         if not records:
             return (
                 f"Error: no rows to export from {ref} "
@@ -8,6 +8,7 @@ below the agent packages, both the boundary and the agents may depend on them
 
 Contents:
 - ``checkpointer``      LangGraph Postgres checkpoint saver (boundary lifespan)
+- ``checkpoint_retention`` pruning of old checkpoints and orphaned blobs
 - ``llm_config``        LLM provider/model configuration resolution
 - ``prompt_caching``    LiteLLM prompt-caching configuration
 - ``errors``            agent-runtime error contracts (raised by MW, caught at boundary)
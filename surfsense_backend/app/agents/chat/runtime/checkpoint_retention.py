@@ -0,0 +1,239 @@
+"""Retention for the LangGraph Postgres checkpointer tables.
+
+``AsyncPostgresSaver`` writes a ``checkpoints`` row per super-step and a
+``checkpoint_blobs`` row per changed channel, and never deletes either, so a
+long thread accumulates thousands of rows. Per ``(thread_id, checkpoint_ns)``
+:func:`prune_checkpoints` keeps:
+
+- the newest ``keep_latest`` checkpoints;
+- the newest checkpoint of every turn (metadata ``turn_id``): edit and
+  regenerate rewind to the last checkpoint before a turn, see
+  ``_find_pre_turn_checkpoint_id`` in ``new_chat_routes``;
+- any checkpoint with an ``__interrupt__`` write and no ``__resume__`` write,
+  i.e. a HITL prompt still waiting for an answer.
+
+Writes of pruned checkpoints go with them. A blob is deleted only when a pruned
+checkpoint referenced its version and no surviving one does. The saver writes
+blobs ahead of their checkpoint row outside a transaction, so sweeping every
+unreferenced blob could eat the state of a turn being saved right now; a new
+version is never referenced by a pruned checkpoint, so this cannot.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TABLES = ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+
+_TABLES_EXIST_SQL = text("SELECT to_regclass('checkpoints') IS NOT NULL")
+
+# Threads with at least one namespace over the limit, in thread_id order so a
+# run walks the whole table even when some threads have nothing to drop.
+_CANDIDATES_SQL = text(
+    """
+    SELECT thread_id
+    FROM checkpoints
+    WHERE thread_id > :after
+    GROUP BY thread_id, checkpoint_ns
+    HAVING count(*) > :keep_latest
+    ORDER BY thread_id
+    LIMIT :limit
+    """
+)
+
+_PRUNE_SQL = text(
+    """
+    WITH ranked AS (
+        SELECT
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            row_number() OVER (
+                PARTITION BY thread_id, checkpoint_ns
+                ORDER BY checkpoint_id DESC
+            ) AS recency,
+            row_number() OVER (
+                PARTITION BY thread_id, checkpoint_ns, metadata ->> 'turn_id'
+                ORDER BY checkpoint_id DESC
+            ) AS turn_recency
+        FROM checkpoints
+        WHERE thread_id = ANY(CAST(:thread_ids AS text[]))
+    )
+    DELETE FROM checkpoints c
+    USING ranked r
+    WHERE c.thread_id = r.thread_id
+      AND c.checkpoint_ns = r.checkpoint_ns
+      AND c.checkpoint_id = r.checkpoint_id
+      AND r.recency > :keep_latest
+      AND r.turn_recency > 1
+      AND NOT (
+          EXISTS (
+              SELECT 1 FROM checkpoint_writes w
+              WHERE w.thread_id = c.thread_id
+                AND w.checkpoint_ns = c.checkpoint_ns
+                AND w.checkpoint_id = c.checkpoint_id
+                AND w.channel = '__interrupt__'
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM checkpoint_writes w
+              WHERE w.thread_id = c.thread_id
+                AND w.checkpoint_ns = c.checkpoint_ns
+                AND w.checkpoint_id = c.checkpoint_id
+                AND w.channel = '__resume__'
+          )
+      )
+    RETURNING
+        c.thread_id,
+        c.checkpoint_ns,
+        c.checkpoint_id,
+        (c.checkpoint -> 'channel_versions')::text AS channel_versions
+    """
+)
+
+_DELETE_WRITES_SQL = text(
+    """
+    DELETE FROM checkpoint_writes w
+    USING unnest(
+        CAST(:thread_ids AS text[]),
+        CAST(:namespaces AS text[]),
+        CAST(:checkpoint_ids AS text[])
+    ) AS d(thread_id, checkpoint_ns, checkpoint_id)
+    WHERE w.thread_id = d.thread_id
+      AND w.checkpoint_ns = d.checkpoint_ns
+      AND w.checkpoint_id = d.checkpoint_id
+    """
+)
+
+_DELETE_BLOBS_SQL = text(
+    """
+    DELETE FROM checkpoint_blobs b
+    USING unnest(
+        CAST(:thread_ids AS text[]),
+        CAST(:namespaces AS text[]),
+        CAST(:channels AS text[]),
+        CAST(:versions AS text[])
+    ) AS d(thread_id, checkpoint_ns, channel, version)
+    WHERE b.thread_id = d.thread_id
+      AND b.checkpoint_ns = d.checkpoint_ns
+      AND b.channel = d.channel
+      AND b.version = d.version
+      AND NOT EXISTS (
+          SELECT 1 FROM checkpoints c
+          WHERE c.thread_id = b.thread_id
+            AND c.checkpoint_ns = b.checkpoint_ns
+            AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+      )
+    RETURNING coalesce(octet_length(b.blob), 0)
+    """
+)
+
+_TABLE_SIZES_SQL = text(
+    """
+    SELECT t.name, pg_total_relation_size(to_regclass(t.name))
+    FROM unnest(CAST(:tables AS text[])) AS t(name)
+    WHERE to_regclass(t.name) IS NOT NULL
+    """
+)
+
+
+@dataclass(frozen=True)
+class PruneResult:
+    threads: int = 0
+    checkpoints: int = 0
+    writes: int = 0
+    blobs: int = 0
+    blob_bytes: int = 0
+
+    def __add__(self, other: PruneResult) -> PruneResult:
+        return PruneResult(
+            threads=self.threads + other.threads,
+            checkpoints=self.checkpoints + other.checkpoints,
+            writes=self.writes + other.writes,
+            blobs=self.blobs + other.blobs,
+            blob_bytes=self.blob_bytes + other.blob_bytes,
+        )
+
+
+async def checkpoint_tables_exist(session: AsyncSession) -> bool:
+    return bool((await session.execute(_TABLES_EXIST_SQL)).scalar())
+
+
+async def candidate_threads(
+    session: AsyncSession, *, keep_latest: int, after: str, limit: int
+) -> list[str]:
+    """Next ``limit`` thread ids past ``after`` holding more than ``keep_latest``."""
+    rows = await session.execute(
+        _CANDIDATES_SQL,
+        {"after": after, "keep_latest": keep_latest, "limit": limit},
+    )
+    # GROUP BY namespace can repeat a thread; keep the order.
+    return list(dict.fromkeys(row[0] for row in rows))
+
+
+async def prune_checkpoints(
+    session: AsyncSession, thread_ids: list[str], *, keep_latest: int
+) -> PruneResult:
+    """Drop the checkpoints of ``thread_ids`` the retention rules do not keep.
+
+    Does not commit; the caller owns the transaction.
+    """
+    if not thread_ids:
+        return PruneResult()
+    pruned = (
+        await session.execute(
+            _PRUNE_SQL, {"thread_ids": thread_ids, "keep_latest": keep_latest}
+        )
+    ).all()
+    if not pruned:
+        return PruneResult(threads=len(thread_ids))
+
+    writes = await session.execute(
+        _DELETE_WRITES_SQL,
+        {
+            "thread_ids": [row.thread_id for row in pruned],
+            "namespaces": [row.checkpoint_ns for row in pruned],
+            "checkpoint_ids": [row.checkpoint_id for row in pruned],
+        },
+    )
+
+    versions: set[tuple[str, str, str, str]] = set()
+    for row in pruned:
+        for channel, version in json.loads(row.channel_versions or "{}").items():
+            versions.add((row.thread_id, row.checkpoint_ns, channel, str(version)))
+    blob_sizes: list[int] = []
+    if versions:
+        columns = list(zip(*versions, strict=True))
+        blob_sizes = list(
+            (
+                await session.execute(
+                    _DELETE_BLOBS_SQL,
+                    {
+                        "thread_ids": list(columns[0]),
+                        "namespaces": list(columns[1]),
+                        "channels": list(columns[2]),
+                        "versions": list(columns[3]),
+                    },
+                )
+            ).scalars()
+        )
+
+    return PruneResult(
+        threads=len(thread_ids),
+        checkpoints=len(pruned),
+        writes=writes.rowcount or 0,
+        blobs=len(blob_sizes),
+        blob_bytes=sum(blob_sizes),
+    )
+
+
+async def table_sizes(session: AsyncSession) -> dict[str, int]:
+    """``pg_total_relation_size`` of each checkpointer table that exists."""
+    rows = await session.execute(_TABLE_SIZES_SQL, {"tables": list(CHECKPOINT_TABLES)})
+    return {name: int(size) for name, size in rows}
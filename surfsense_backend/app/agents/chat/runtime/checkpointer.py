@@ -10,8 +10,12 @@ preventing 'the connection is closed' errors in long-running deployments.
 """
 
 import logging
+import zlib
+from typing import Any
 
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
@@ -25,6 +29,37 @@ _connection_pool: AsyncConnectionPool | None = None
 _checkpointer_initialized: bool = False
 
 
+class CompressingSerializer(SerializerProtocol):
+    """zlib-compresses serialized channel values of at least ``min_bytes``.
+
+    Compressed payloads are stored with their type tagged ``<type>+zlib`` in the
+    blob/write ``type`` column. Untagged rows pass straight through, so rows
+    written before compression (or with ``min_bytes=0``) keep loading.
+    """
+
+    _SUFFIX = "+zlib"
+
+    def __init__(self, inner: SerializerProtocol, *, min_bytes: int) -> None:
+        self._inner = inner
+        self._min_bytes = min_bytes
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = self._inner.dumps_typed(obj)
+        if self._min_bytes > 0 and len(data) >= self._min_bytes:
+            packed = zlib.compress(data, 1)
+            if len(packed) < len(data):
+                return type_ + self._SUFFIX, packed
+        return type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith(self._SUFFIX):
+            return self._inner.loads_typed(
+                (type_.removesuffix(self._SUFFIX), zlib.decompress(payload))
+            )
+        return self._inner.loads_typed(data)
+
+
 def get_postgres_connection_string() -> str:
     """
     Convert the async DATABASE_URL to a sync postgres connection string for psycopg3.
@@ -82,7 +117,11 @@ async def _create_checkpointer() -> AsyncPostgresSaver:
     )
     await _connection_pool.open(wait=True)
 
-    checkpointer = AsyncPostgresSaver(conn=_connection_pool)
+    # Always wrapped: rows compressed earlier must load even with it off now.
+    serde = CompressingSerializer(
+        JsonPlusSerializer(), min_bytes=config.CHECKPOINT_COMPRESS_MIN_BYTES
+    )
+    checkpointer = AsyncPostgresSaver(conn=_connection_pool, serde=serde)
     logger.info("[Checkpointer] Created AsyncPostgresSaver with connection pool")
     return checkpointer
 
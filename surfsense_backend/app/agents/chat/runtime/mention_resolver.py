@@ -151,8 +151,6 @@ async def resolve_mentions(
     if not doc_id_pool and not folder_id_pool:
         return ResolvedMentionSet()
 
-    index = await build_path_index(session, workspace_id)
-
     doc_rows: dict[int, Document] = {}
     if doc_id_pool:
         result = await session.execute(
@@ -175,6 +173,15 @@ async def resolve_mentions(
         for row in result.scalars().all():
             folder_rows[row.id] = row
 
+    # Occupants only matter for the folders holding the mentioned documents.
+    holders = {row.folder_id for row in doc_rows.values()}
+    index = await build_path_index(
+        session,
+        workspace_id,
+        populate_occupants=bool(holders),
+        folder_ids=holders,
+    )
+
     resolved: list[ResolvedMention] = []
     accepted_doc_ids: list[int] = []
     accepted_folder_ids: list[int] = []
@@ -6,8 +6,10 @@ at this turn so it can retrieve from those sources with tools.
 
 from __future__ import annotations
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import Document
 from app.knowledge_store.paths import build_path_index
 from app.schemas.new_chat import MentionedDocumentInfo
 
@@ -41,12 +43,27 @@ async def resolve_references(
     """Resolve a turn's ``@``-references into one ordered pointer list.
 
     Order is documents, folders, connectors, chats. The path index is built
-    once and shared by the document and folder resolvers.
+    once and shared by the document and folder resolvers; it only derives
+    occupants for the folders holding the referenced documents.
     """
     references: list[Reference] = []
 
     if document_ids or folder_ids:
-        index = await build_path_index(session, workspace_id)
+        holders: set[int | None] = set()
+        if document_ids:
+            result = await session.execute(
+                select(Document.folder_id).where(
+                    Document.workspace_id == workspace_id,
+                    Document.id.in_(document_ids),
+                )
+            )
+            holders = set(result.scalars().all())
+        index = await build_path_index(
+            session,
+            workspace_id,
+            populate_occupants=bool(holders),
+            folder_ids=holders,
+        )
         if document_ids:
             references += await resolve_document_references(
                 session,
@@ -38,6 +38,7 @@ from app.capabilities.core.progress import progress_scope
 from app.capabilities.core.runs import (
     create_pending_run,
     finalize_run,
+    load_run_output_text,
     record_run,
     serialize_output,
 )
@@ -576,7 +577,7 @@ def _register_run_history(router: APIRouter) -> None:
         await check_workspace_access(session, auth, workspace_id)
         parsed_id = _parse_run_uuid(run_id)
         row = await _load_run(session, workspace_id, parsed_id)
-        return _to_detail(row)
+        return _to_detail(row, await load_run_output_text(session, row))
 
     async def stream_run_events(
         workspace_id: int,
@@ -717,11 +718,11 @@ def _to_summary(row: Run) -> RunSummary:
     )
 
 
-def _to_detail(row: Run) -> RunDetail:
+def _to_detail(row: Run, output_text: str | None) -> RunDetail:
     return RunDetail(
         **_to_summary(row).model_dump(),
         thread_id=row.thread_id,
         input=row.input,
-        output_text=row.output_text,
+        output_text=output_text,
         progress=row.progress,
     )
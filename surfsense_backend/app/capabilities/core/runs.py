@@ -2,9 +2,11 @@
 
 Both doors (the agent tool adapter and the REST endpoint) call :func:`record_run`
 so agent and API runs land identically. Output is serialized to JSONL (one item
-per line, ``exclude_none``) so the ``read_run``/``search_run`` tools can page and
-grep by line. Recording is best-effort: a failure here never fails an otherwise
-successful scrape — the caller degrades gracefully on a ``None`` return.
+per line, ``exclude_none``) and stored one row per line (``run_output_lines`` /
+``tool_output_spill_lines``), so the ``read_run``/``search_run`` tools page and
+grep by line without loading the whole payload. Recording is best-effort: a
+failure here never fails an otherwise successful scrape — the caller degrades
+gracefully on a ``None`` return.
 """
 
 from __future__ import annotations
@@ -12,14 +14,17 @@ from __future__ import annotations
 import json
 import logging
 import random
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import text
+from sqlalchemy import func, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
-from app.db import Run, ToolOutputSpill
+from app.db import Run, RunOutputLine, ToolOutputSpill, ToolOutputSpillLine
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -37,6 +42,10 @@ _CLEANUP_SAMPLE_RATE = 0.01
 """ponytail: opportunistic bounded cleanup fired on ~1% of inserts. A dedicated
 cron/scheduler is the upgrade path if row volume ever outpaces this."""
 
+_LINE_INSERT_BATCH = 1_000
+_LINE_STREAM_BATCH = 200
+"""Lines fetched per round trip while grepping, bounding reader memory."""
+
 
 @dataclass(frozen=True)
 class SerializedOutput:
@@ -108,7 +117,6 @@ async def record_run(
             status=status,
             error=error,
             input=input,
-            output_text=serialized.text if serialized else None,
             item_count=serialized.item_count if serialized else 0,
             char_count=serialized.char_count if serialized else 0,
             duration_ms=duration_ms,
@@ -117,6 +125,10 @@ async def record_run(
         )
         session.add(run)
         await session.flush()
+        if serialized is not None:
+            run.line_count = await _store_lines(
+                session, RunOutputLine, "run_id", run.id, serialized.text
+            )
         run_id = str(run.id)
         await _maybe_cleanup(session, "runs", RUNS_RETENTION_DAYS)
         await session.commit()
@@ -197,7 +209,9 @@ async def finalize_run(
         run.status = status
         run.error = error
         if serialized is not None:
-            run.output_text = serialized.text
+            run.line_count = await _store_lines(
+                session, RunOutputLine, "run_id", run.id, serialized.text
+            )
             run.item_count = serialized.item_count
             run.char_count = serialized.char_count
         if duration_ms is not None:
@@ -272,12 +286,14 @@ async def record_spill(
             workspace_id=workspace_id,
             thread_id=thread_id,
             tool_name=tool_name,
-            content=content,
             char_count=len(content),
             **kwargs,
         )
         session.add(spill)
         await session.flush()
+        spill.line_count = await _store_lines(
+            session, ToolOutputSpillLine, "spill_id", spill.id, content
+        )
         spill_id = str(spill.id)
         await _maybe_cleanup(session, "tool_output_spills", SPILLS_RETENTION_DAYS)
         await session.commit()
@@ -291,6 +307,128 @@ async def record_spill(
         return None
 
 
+async def _store_lines(
+    session: AsyncSession, model: type, owner_key: str, owner_id: UUID, body: str
+) -> int:
+    """Insert ``body`` one row per line under ``owner_id``; return the line count."""
+    lines = body.split("\n")
+    for start in range(0, len(lines), _LINE_INSERT_BATCH):
+        await session.execute(
+            insert(model),
+            [
+                {owner_key: owner_id, "line_no": start + offset, "content": line}
+                for offset, line in enumerate(lines[start : start + _LINE_INSERT_BATCH])
+            ],
+        )
+    return len(lines)
+
+
+@dataclass(frozen=True)
+class StoredPayload:
+    """Where a run's or spill's lines live, resolved once per read.
+
+    ``legacy_lines`` is set only for rows written before line storage, whose
+    payload is still a single text blob; those age out with retention.
+    """
+
+    kind: str
+    id: UUID
+    line_count: int
+    legacy_lines: list[str] | None = None
+
+
+_PAYLOAD_SOURCES = {
+    "run": (Run, Run.output_text, RunOutputLine, RunOutputLine.run_id),
+    "spill": (
+        ToolOutputSpill,
+        ToolOutputSpill.content,
+        ToolOutputSpillLine,
+        ToolOutputSpillLine.spill_id,
+    ),
+}
+
+
+async def load_payload(
+    session: AsyncSession, kind: str, ref_id: UUID, workspace_id: int
+) -> StoredPayload | None:
+    """Resolve a run/spill in ``workspace_id``; ``None`` if it is not there."""
+    model, text_column, _line_model, _owner = _PAYLOAD_SOURCES[kind]
+    row = (
+        await session.execute(
+            select(model.line_count, text_column).where(
+                model.id == ref_id, model.workspace_id == workspace_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    line_count, legacy_text = row
+    if line_count is not None:
+        return StoredPayload(kind=kind, id=ref_id, line_count=line_count)
+    legacy_lines = (legacy_text or "").split("\n")
+    return StoredPayload(
+        kind=kind,
+        id=ref_id,
+        line_count=len(legacy_lines),
+        legacy_lines=legacy_lines,
+    )
+
+
+async def read_payload_lines(
+    session: AsyncSession, payload: StoredPayload, start: int, stop: int
+) -> list[str]:
+    """Return lines ``[start, stop)`` — only those rows are fetched."""
+    if payload.legacy_lines is not None:
+        return payload.legacy_lines[start:stop]
+    _model, _text, line_model, owner = _PAYLOAD_SOURCES[payload.kind]
+    result = await session.execute(
+        select(line_model.content)
+        .where(
+            owner == payload.id,
+            line_model.line_no >= start,
+            line_model.line_no < stop,
+        )
+        .order_by(line_model.line_no)
+    )
+    return list(result.scalars().all())
+
+
+async def stream_payload_lines(
+    session: AsyncSession, payload: StoredPayload
+) -> AsyncIterator[tuple[int, str]]:
+    """Yield ``(line_no, line)`` in order, a bounded batch of rows at a time."""
+    if payload.legacy_lines is not None:
+        for line_no, line in enumerate(payload.legacy_lines):
+            yield line_no, line
+        return
+    _model, _text, line_model, owner = _PAYLOAD_SOURCES[payload.kind]
+    result = await session.stream(
+        select(line_model.line_no, line_model.content)
+        .where(owner == payload.id)
+        .order_by(line_model.line_no)
+        .execution_options(yield_per=_LINE_STREAM_BATCH)
+    )
+    try:
+        async for line_no, line in result:
+            yield line_no, line
+    finally:
+        await result.close()
+
+
+async def load_run_output_text(session: AsyncSession, run: Run) -> str | None:
+    """The run's whole output as one JSONL string (the REST detail contract)."""
+    if run.line_count is None:
+        return run.output_text
+    return await session.scalar(
+        select(
+            func.string_agg(
+                RunOutputLine.content,
+                aggregate_order_by(literal("\n"), RunOutputLine.line_no),
+            )
+        ).where(RunOutputLine.run_id == run.id)
+    )
+
+
 async def _maybe_cleanup(
     session: AsyncSession, table: str, retention_days: int
 ) -> None:
@@ -123,16 +123,22 @@ def init_worker(**kwargs):
     initialize_llm_router()
     initialize_image_gen_router()
 
+    from app.tasks.celery_tasks import start_worker_event_loop
+
+    start_worker_event_loop()
+
 
 @worker_process_shutdown.connect
 def shutdown_worker(**kwargs):
-    """Flush queued PostHog events before a Celery worker process exits.
+    """Close the worker's event loop and flush queued PostHog events on exit.
 
     The analytics client init is lazy (fork-safe), so there is nothing to
     start here — only a flush to avoid dropping events captured by tasks.
     """
     from app.observability import analytics as ph_analytics
+    from app.tasks.celery_tasks import stop_worker_event_loop
 
+    stop_worker_event_loop()
     ph_analytics.shutdown()
 
 
@@ -207,6 +213,8 @@ celery_app = Celery(
         "app.tasks.celery_tasks.knowledge_store.index_tasks",
         "app.tasks.celery_tasks.knowledge_store.drift_monitor_task",
         "app.tasks.celery_tasks.auto_reload_task",
+        "app.tasks.celery_tasks.credit_ledger_task",
+        "app.tasks.celery_tasks.checkpoint_retention_task",
         "app.tasks.celery_tasks.gateway_tasks",
         "app.tasks.celery_tasks.model_compatibility_task",
         "app.etl_pipeline.cache.eviction.task",
@@ -312,6 +320,12 @@ celery_app.conf.beat_schedule = {
             "expires": 60,
         },
     },
+    # Apply Redis credit-ledger debits to Postgres (no-op in postgres mode).
+    "settle-credit-ledger": {
+        "task": "settle_credit_ledger",
+        "schedule": crontab(minute="*"),
+        "options": {"expires": 60},
+    },
     "gateway-reconcile-inbox": {
         "task": "gateway.reconcile_inbox",
         "schedule": crontab(minute="*"),
@@ -344,6 +358,12 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(hour="4", minute="30"),
         "options": {"expires": 600},
     },
+    # Drop chat checkpoints past retention and the channel blobs only they used.
+    "prune-chat-checkpoints": {
+        "task": "prune_chat_checkpoints",
+        "schedule": crontab(hour="3", minute="30"),
+        "options": {"expires": 3600},
+    },
     # Prune knowledge-store working copies abandoned by crashed threads.
     "prune-knowledge-store-working-copies": {
         "task": "prune_knowledge_store_working_copies",
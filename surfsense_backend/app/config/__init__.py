@@ -5,13 +5,20 @@ from functools import lru_cache
 from pathlib import Path
 
 import yaml
-from chonkie import AutoEmbeddings, CodeChunker, RecursiveChunker
 from dotenv import load_dotenv
-from rerankers import Reranker
 
 from app.config.embedding_settings import (
     build_embedding_kwargs,
     resolve_embedding_base_url,
+    resolve_embedding_dimension,
+)
+from app.model_runtime.proxies import (
+    LazyChunker,
+    LazyEmbeddings,
+    LazyReranker,
+    check_embedding_dimension,
+    code_chunker,
+    recursive_chunker,
 )
 
 # Get the base directory of the project
@@ -512,6 +519,19 @@ class Config:
     DB_CELERY_IDLE_IN_TX_TIMEOUT_MS = int(
         os.getenv("DB_CELERY_IDLE_IN_TX_TIMEOUT_MS", "3600000")
     )
+    # Each prefork Celery worker process runs all of its async tasks on one
+    # long-lived event loop, so the DB engines and checkpointer pool keep
+    # their connections across tasks instead of reconnecting per task. The
+    # Celery engine then gets a real pool of this size (per worker process).
+    # FALSE restores a fresh loop + NullPool engine per task.
+    CELERY_PERSISTENT_EVENT_LOOP = (
+        os.getenv("CELERY_PERSISTENT_EVENT_LOOP", "TRUE").upper() == "TRUE"
+    )
+    CELERY_DB_POOL_SIZE = int(os.getenv("CELERY_DB_POOL_SIZE", "5"))
+    CELERY_DB_POOL_MAX_OVERFLOW = int(os.getenv("CELERY_DB_POOL_MAX_OVERFLOW", "10"))
+    CELERY_DB_POOL_TIMEOUT_SECONDS = float(
+        os.getenv("CELERY_DB_POOL_TIMEOUT_SECONDS", "30")
+    )
 
     # Celery / Redis
     # Redis (single endpoint for Celery broker, result backend, and app cache).
@@ -547,6 +567,10 @@ class Config:
         "KNOWLEDGE_STORE_ROOT",
         os.path.join(FILE_STORAGE_LOCAL_PATH, "knowledge_store"),
     )
+    # Documents the indexer reads and embeds ahead of the one it is writing.
+    KNOWLEDGE_STORE_INDEX_CONCURRENCY = max(
+        1, int(os.getenv("KNOWLEDGE_STORE_INDEX_CONCURRENCY", "4"))
+    )
 
     # Daytona sandbox (code execution / filesystem sandbox)
     DAYTONA_API_KEY = os.getenv("DAYTONA_API_KEY", "")
@@ -586,6 +610,42 @@ class Config:
         os.getenv("SURFSENSE_AGENT_CACHE_TTL_SECONDS", "1800")
     )
 
+    # Chat SSE delta coalescing: consecutive text/reasoning deltas of one block
+    # are held up to this many ms (or chars) and sent as one frame. 0 disables.
+    STREAM_DELTA_COALESCE_MS = float(
+        os.getenv("SURFSENSE_STREAM_DELTA_COALESCE_MS", "40")
+    )
+    STREAM_DELTA_COALESCE_MAX_CHARS = int(
+        os.getenv("SURFSENSE_STREAM_DELTA_COALESCE_MAX_CHARS", "4096")
+    )
+
+    # LangGraph checkpoint retention: per thread/namespace the newest N
+    # checkpoints survive, plus each turn's last one and any with a pending
+    # interrupt. Runs nightly from Celery beat.
+    CHECKPOINT_RETENTION_ENABLED = (
+        os.getenv("CHECKPOINT_RETENTION_ENABLED", "TRUE").upper() == "TRUE"
+    )
+    CHECKPOINT_RETENTION_KEEP_LATEST = int(
+        os.getenv("CHECKPOINT_RETENTION_KEEP_LATEST", "20")
+    )
+    CHECKPOINT_RETENTION_THREAD_BATCH = int(
+        os.getenv("CHECKPOINT_RETENTION_THREAD_BATCH", "200")
+    )
+    # zlib-compress checkpoint blobs/writes at least this large (bytes). 0 = off;
+    # compressed rows stay readable after turning it off again.
+    CHECKPOINT_COMPRESS_MIN_BYTES = int(os.getenv("CHECKPOINT_COMPRESS_MIN_BYTES", "0"))
+
+    # Resolved workspace access for rbac.check_permission (see app.utils.rbac_cache).
+    # Without Redis, the in-process TTL bounds how long another replica may serve
+    # a revoked grant; with it, every hit is checked against the shared version.
+    RBAC_CACHE_ENABLED = os.getenv("RBAC_CACHE_ENABLED", "TRUE").upper() == "TRUE"
+    RBAC_CACHE_TTL_SECONDS = float(os.getenv("RBAC_CACHE_TTL_SECONDS", "10"))
+    RBAC_CACHE_MAX_ENTRIES = int(os.getenv("RBAC_CACHE_MAX_ENTRIES", "10000"))
+    RBAC_CACHE_REDIS_ENABLED = (
+        os.getenv("RBAC_CACHE_REDIS_ENABLED", "FALSE").upper() == "TRUE"
+    )
+    RBAC_CACHE_REDIS_TTL_SECONDS = int(os.getenv("RBAC_CACHE_REDIS_TTL_SECONDS", "300"))
+
     # Connector discovery cache TTL
     CONNECTOR_DISCOVERY_TTL_SECONDS = float(
         os.getenv("SURFSENSE_CONNECTOR_DISCOVERY_TTL_SECONDS", "30")
@@ -641,6 +701,18 @@ class Config:
         os.getenv("GATEWAY_DISCORD_ENABLED", "FALSE").upper() == "TRUE"
     )
     GATEWAY_DISCORD_REDIRECT_URI = os.getenv("GATEWAY_DISCORD_REDIRECT_URI")
+    # Inbox worker pool: turns of different conversations run concurrently (up
+    # to CONCURRENCY at once); one conversation's messages stay in order. New
+    # rows wake the worker via Postgres NOTIFY, polled every POLL_SECONDS as a
+    # safety net. Disable NOTIFY behind a transaction-pooling PgBouncer, which
+    # cannot hold a LISTEN; the worker then polls every 0.5s.
+    GATEWAY_INBOX_WORKER_CONCURRENCY = int(
+        os.getenv("GATEWAY_INBOX_WORKER_CONCURRENCY", "4")
+    )
+    GATEWAY_INBOX_NOTIFY_ENABLED = (
+        os.getenv("GATEWAY_INBOX_NOTIFY_ENABLED", "TRUE").upper() == "TRUE"
+    )
+    GATEWAY_INBOX_POLL_SECONDS = float(os.getenv("GATEWAY_INBOX_POLL_SECONDS", "5"))
 
     # Stripe checkout (shared secrets for the unified credit wallet)
     STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
@@ -789,6 +861,25 @@ class Config:
         os.getenv("CREDIT_LOW_BALANCE_WARNING_MICROS", "500000")
     )
 
+    # Premium credit reserve/finalize/release backend. "postgres" locks the
+    # User row per call; "redis" runs them as Lua scripts and a beat task
+    # settles finalized debits into Postgres every minute.
+    CREDIT_LEDGER_BACKEND = os.getenv("CREDIT_LEDGER_BACKEND", "postgres").lower()
+    # Re-read the Postgres wallet once the Redis snapshot is this old (seconds).
+    CREDIT_LEDGER_SNAPSHOT_MAX_AGE_SECONDS = int(
+        os.getenv("CREDIT_LEDGER_SNAPSHOT_MAX_AGE_SECONDS", "60")
+    )
+    # Holds neither finalized nor released within this window are dropped.
+    CREDIT_LEDGER_HOLD_TTL_SECONDS = int(
+        os.getenv("CREDIT_LEDGER_HOLD_TTL_SECONDS", "3600")
+    )
+    # Users settled per transaction; a beat run keeps settling batches until
+    # the dirty set is drained or the budget (seconds) is spent.
+    CREDIT_LEDGER_SETTLE_BATCH = int(os.getenv("CREDIT_LEDGER_SETTLE_BATCH", "500"))
+    CREDIT_LEDGER_SETTLE_BUDGET_SECONDS = float(
+        os.getenv("CREDIT_LEDGER_SETTLE_BUDGET_SECONDS", "45")
+    )
+
     # Auto-reload (off-session Stripe top-up) feature flag and guards.
     AUTO_RELOAD_ENABLED = os.getenv("AUTO_RELOAD_ENABLED", "FALSE").upper() == "TRUE"
     # Minimum configurable reload amount (micro-USD). $1.00 to match pack pricing.
@@ -1016,29 +1107,56 @@ class Config:
     # Pass provider-specific settings to embeddings when supported.
     embedding_kwargs = build_embedding_kwargs(embedding_model=EMBEDDING_MODEL)
 
-    embedding_model_instance = AutoEmbeddings.get_embeddings(
-        EMBEDDING_MODEL,
-        **embedding_kwargs,
+    # Vector width of the configured model: EMBEDDING_DIMENSION, else the known
+    # width of a documented model. Schema code reads it from here; only when it
+    # is ``None`` does importing app.db load the model (or ask the runtime).
+    EMBEDDING_DIMENSION = resolve_embedding_dimension(embedding_model=EMBEDDING_MODEL)
+    # Shared model runtime (``python -m app.model_runtime.server``), as
+    # http://host:port or unix:///path.sock. When set, processes call it
+    # instead of each loading their own copy of the embedding/reranker models.
+    MODEL_RUNTIME_URL = os.getenv("MODEL_RUNTIME_URL") or None
+    MODEL_RUNTIME_TIMEOUT_SECONDS = float(
+        os.getenv("MODEL_RUNTIME_TIMEOUT_SECONDS", "120")
     )
-    is_local_embedding_model = "://" not in (EMBEDDING_MODEL or "")
-    chunker_instance = RecursiveChunker(
-        chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
+
+    # Built on first use, not at import: see app/model_runtime/proxies.py.
+    embedding_model_instance = LazyEmbeddings(
+        EMBEDDING_MODEL,
+        embedding_kwargs,
+        dimension=EMBEDDING_DIMENSION,
+        runtime_url=MODEL_RUNTIME_URL,
     )
-    code_chunker_instance = CodeChunker(
-        chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
+    # The runtime batches server-side, so remote calls always use embed_batch.
+    is_local_embedding_model = (
+        "://" not in (EMBEDDING_MODEL or "") and not MODEL_RUNTIME_URL
     )
+    chunker_instance = LazyChunker(recursive_chunker, embedding_model_instance)
+    code_chunker_instance = LazyChunker(code_chunker, embedding_model_instance)
 
     # Reranker's Configuration | Pinecone, Cohere etc. Read more at https://github.com/AnswerDotAI/rerankers?tab=readme-ov-file#usage
     RERANKERS_ENABLED = os.getenv("RERANKERS_ENABLED", "FALSE").upper() == "TRUE"
     if RERANKERS_ENABLED:
         RERANKERS_MODEL_NAME = os.getenv("RERANKERS_MODEL_NAME")
         RERANKERS_MODEL_TYPE = os.getenv("RERANKERS_MODEL_TYPE")
-        reranker_instance = Reranker(
-            model_name=RERANKERS_MODEL_NAME,
-            model_type=RERANKERS_MODEL_TYPE,
+        reranker_instance = LazyReranker(
+            RERANKERS_MODEL_NAME,
+            RERANKERS_MODEL_TYPE,
+            runtime_url=MODEL_RUNTIME_URL,
         )
     else:
         reranker_instance = None
+    # Passages are cut to this many characters before scoring (cross-encoders
+    # truncate at their token window anyway, so the tail only costs time).
+    RERANKERS_MAX_PASSAGE_CHARS = int(os.getenv("RERANKERS_MAX_PASSAGE_CHARS", "2048"))
+    # Cached (query, passage) scores; 0 disables. Keep 0 for listwise rankers
+    # whose scores are relative to the other passages in the call.
+    RERANKERS_SCORE_CACHE_SIZE = int(os.getenv("RERANKERS_SCORE_CACHE_SIZE", "4096"))
+    # Concurrent requests for the same query arriving within this window share
+    # one model call of at most RERANKERS_BATCH_MAX_DOCS passages.
+    RERANKERS_BATCH_WINDOW_MS = float(os.getenv("RERANKERS_BATCH_WINDOW_MS", "5"))
+    RERANKERS_BATCH_MAX_DOCS = int(os.getenv("RERANKERS_BATCH_MAX_DOCS", "128"))
+    # Threads running model calls, off the event loop.
+    RERANKERS_EXECUTOR_WORKERS = int(os.getenv("RERANKERS_EXECUTOR_WORKERS", "1"))
 
     # OAuth JWT
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -1105,6 +1223,14 @@ class Config:
     ETL_CACHE_STORAGE_BACKEND = os.getenv("ETL_CACHE_STORAGE_BACKEND")
     ETL_CACHE_STORAGE_CONTAINER = os.getenv("ETL_CACHE_STORAGE_CONTAINER")
     ETL_CACHE_STORAGE_LOCAL_PATH = os.getenv("ETL_CACHE_STORAGE_LOCAL_PATH")
+    # Picture-description tier: one vision-LLM description (+ OCR) per embedded
+    # image, shared by every PDF that embeds the same bytes. Follows
+    # ETL_CACHE_ENABLED unless set explicitly.
+    ETL_IMAGE_CACHE_ENABLED = (
+        os.getenv("ETL_IMAGE_CACHE_ENABLED", str(ETL_CACHE_ENABLED)).strip().lower()
+        == "true"
+    )
+    ETL_IMAGE_CACHE_MAX_TOTAL_MB = int(os.getenv("ETL_IMAGE_CACHE_MAX_TOTAL_MB", "512"))
 
     # Embedding cache: reuse chunk+embedding output for identical markdown across
     # workspaces. Blobs share the ETL_CACHE_STORAGE_* backend.
@@ -1122,6 +1248,60 @@ class Config:
     EMBEDDING_CACHE_EVICTION_BATCH = int(
         os.getenv("EMBEDDING_CACHE_EVICTION_BATCH", "500")
     )
+    # Per-chunk tier: one vector per (model, chunk text), so edited documents and
+    # boilerplate shared across documents only embed the chunks never seen before.
+    # Follows EMBEDDING_CACHE_ENABLED unless set explicitly.
+    EMBEDDING_VECTOR_CACHE_ENABLED = (
+        os.getenv("EMBEDDING_VECTOR_CACHE_ENABLED", str(EMBEDDING_CACHE_ENABLED))
+        .strip()
+        .lower()
+        == "true"
+    )
+    EMBEDDING_VECTOR_CACHE_MAX_TOTAL_MB = int(
+        os.getenv("EMBEDDING_VECTOR_CACHE_MAX_TOTAL_MB", "2048")
+    )
+
+    # Search-query embedding cache: agents and subagents re-issue the same
+    # queries across turns, and each miss is a model forward pass (or API call).
+    # In-process LRU per worker, optionally shared through Redis.
+    QUERY_EMBEDDING_CACHE_ENABLED = (
+        os.getenv("QUERY_EMBEDDING_CACHE_ENABLED", "true").strip().lower() == "true"
+    )
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.getenv("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", "2048")
+    )
+    QUERY_EMBEDDING_CACHE_REDIS_ENABLED = (
+        os.getenv("QUERY_EMBEDDING_CACHE_REDIS_ENABLED", "false").strip().lower()
+        == "true"
+    )
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS = int(
+        os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", str(24 * 60 * 60))
+    )
+
+    # Filter chunk searches on chunks.workspace_id instead of joining documents,
+    # so the vector and keyword scans (and a hash-partitioned chunks table)
+    # only ever touch one workspace. Enable once
+    # ``scripts/partition_chunks.py backfill`` reports no rows left.
+    CHUNKS_WORKSPACE_FILTER_ENABLED = (
+        os.getenv("CHUNKS_WORKSPACE_FILTER_ENABLED", "false").strip().lower() == "true"
+    )
+    # pgvector >= 0.8 keeps scanning a filtered HNSW index until LIMIT rows
+    # pass the filter, instead of returning whatever survived ef_search
+    # candidates. strict_order | relaxed_order | off; ignored on older pgvector.
+    PGVECTOR_ITERATIVE_SCAN = (
+        os.getenv("PGVECTOR_ITERATIVE_SCAN", "strict_order").strip().lower()
+    )
+    # Quantized vector search: off | halfvec | binary. The HNSW candidate pass
+    # runs on a halfvec (half size) or binary_quantize() (1/32 size) expression
+    # index, then VECTOR_SEARCH_RESCORE_FACTOR x LIMIT candidates are re-ranked
+    # by exact cosine distance on the full-precision embeddings. The matching
+    # index is built by setup_indexes (or scripts/vector_search_report.py).
+    VECTOR_SEARCH_QUANTIZATION = (
+        os.getenv("VECTOR_SEARCH_QUANTIZATION", "off").strip().lower()
+    )
+    VECTOR_SEARCH_RESCORE_FACTOR = max(
+        1, int(os.getenv("VECTOR_SEARCH_RESCORE_FACTOR", "4"))
+    )
 
     # Incremental re-indexing: on document edits, keep chunk rows whose text is
     # unchanged (reusing their embeddings) and embed only new/changed chunks.
@@ -1132,6 +1312,29 @@ class Config:
     INDEXING_CHUNK_INSERT_BATCH_SIZE = int(
         os.getenv("INDEXING_CHUNK_INSERT_BATCH_SIZE", "200")
     )
+    # Coalesce concurrent embedding calls (documents indexed in parallel) into
+    # shared batches: a call waits at most MAX_WAIT_MS for others to join it.
+    EMBEDDING_MICROBATCH_ENABLED = (
+        os.getenv("EMBEDDING_MICROBATCH_ENABLED", "true").strip().lower() == "true"
+    )
+    EMBEDDING_MICROBATCH_MAX_SIZE = int(
+        os.getenv("EMBEDDING_MICROBATCH_MAX_SIZE", "256")
+    )
+    EMBEDDING_MICROBATCH_MAX_WAIT_MS = float(
+        os.getenv("EMBEDDING_MICROBATCH_MAX_WAIT_MS", "10")
+    )
+
+    # Keep MCP tool-call sessions open between calls, per connector, instead of
+    # connecting and re-running ``initialize`` on every call. Idle sessions
+    # close after IDLE_SECONDS; one idle longer than PING_AFTER_SECONDS is
+    # pinged before reuse and reopened if the server has dropped it.
+    MCP_SESSION_POOL_ENABLED = (
+        os.getenv("MCP_SESSION_POOL_ENABLED", "true").strip().lower() == "true"
+    )
+    MCP_SESSION_IDLE_SECONDS = float(os.getenv("MCP_SESSION_IDLE_SECONDS", "300"))
+    MCP_SESSION_PING_AFTER_SECONDS = float(
+        os.getenv("MCP_SESSION_PING_AFTER_SECONDS", "30")
+    )
 
     # Proxy provider selection. Maps to a ProxyProvider implementation registered
     # in app/utils/proxy/registry.py. Add new vendors there and switch via this var.
@@ -1251,16 +1454,10 @@ class Config:
     )
 
     # Validation Checks
-    # Check embedding dimension
-    if (
-        hasattr(embedding_model_instance, "dimension")
-        and embedding_model_instance.dimension > 2000
-    ):
-        raise ValueError(
-            f"Embedding dimension for Model: {EMBEDDING_MODEL} "
-            f"has {embedding_model_instance.dimension} dimensions, which "
-            f"exceeds the maximum of 2000 allowed by PGVector."
-        )
+    # Check embedding dimension. A model whose size is not configured is
+    # checked when it first loads.
+    if EMBEDDING_DIMENSION is not None:
+        check_embedding_dimension(EMBEDDING_MODEL, EMBEDDING_DIMENSION)
 
     @classmethod
     def get_settings(cls):
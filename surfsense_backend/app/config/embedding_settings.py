@@ -3,6 +3,21 @@ from collections.abc import Mapping
 
 EMBEDDING_BASE_URL_ENV = "EMBEDDING_BASE_URL"
 OLLAMA_EMBEDDING_BASE_URL_ENV = "OLLAMA_EMBEDDING_BASE_URL"
+EMBEDDING_DIMENSION_ENV = "EMBEDDING_DIMENSION"
+
+# Output widths of the models the docs suggest, so the schema can size its
+# vector columns without loading one. Any other model needs EMBEDDING_DIMENSION;
+# either way the width is checked against the model when it first loads.
+KNOWN_EMBEDDING_DIMENSIONS: dict[str, int] = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L12-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "openai://text-embedding-ada-002": 1536,
+    "openai://text-embedding-3-small": 1536,
+    "cohere://embed-english-light-v3.0": 384,
+    "cohere://embed-english-v3.0": 1024,
+    "litellm://ollama/nomic-embed-text": 768,
+}
 
 
 def _clean_env_value(value: str | None) -> str | None:
@@ -20,6 +35,19 @@ def resolve_embedding_base_url(environ: Mapping[str, str] | None = None) -> str
     )
 
 
+def resolve_embedding_dimension(
+    environ: Mapping[str, str] | None = None,
+    *,
+    embedding_model: str | None = None,
+) -> int | None:
+    """Return the configured or well-known vector width, without a model load."""
+    environ = os.environ if environ is None else environ
+    configured = _clean_env_value(environ.get(EMBEDDING_DIMENSION_ENV))
+    if configured is not None:
+        return int(configured)
+    return KNOWN_EMBEDDING_DIMENSIONS.get(embedding_model or "")
+
+
 def _supports_embedding_api_base(embedding_model: str | None) -> bool:
     return (embedding_model or "").startswith("litellm://")
 
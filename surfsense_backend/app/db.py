@@ -11,24 +11,38 @@ from fastapi_users.db import SQLAlchemyBaseUserTableUUID, SQLAlchemyUserDatabase
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     ARRAY,
+    DDL,
     JSON,
     TIMESTAMP,
     BigInteger,
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
     Enum as SQLAlchemyEnum,
+    FetchedValue,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
+    inspect as sa_inspect,
+    select,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, backref, declared_attr, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    backref,
+    declared_attr,
+    deferred,
+    relationship,
+)
 
 from app.config import config
 
@@ -1356,6 +1370,32 @@ class Folder(BaseModel, TimestampMixin):
     documents = relationship("Document", back_populates="folder", passive_deletes=True)
 
 
+class FolderPath(Base):
+    """A folder's ``/documents/...`` path: the workspace's persisted path index.
+
+    Written by ``_sync_folder_paths`` in the flush that creates, renames or
+    moves a folder (descendants included), so readers never rebuild the
+    folder tree. The ``C`` collation makes ``path`` byte-ordered: a subtree is
+    one btree range on ``ix_folder_paths_workspace_path``.
+    """
+
+    __tablename__ = "folder_paths"
+
+    folder_id = Column(
+        Integer,
+        ForeignKey("folders.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    workspace_id = Column(
+        Integer,
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    path = Column(Text(collation="C"), nullable=False)
+
+    __table_args__ = (Index("ix_folder_paths_workspace_path", "workspace_id", "path"),)
+
+
 class Document(BaseModel, TimestampMixin):
     __tablename__ = "documents"
 
@@ -1380,7 +1420,14 @@ class Document(BaseModel, TimestampMixin):
     # ``document_metadata['virtual_path']`` until the cut. Index in migration 177.
     path = Column(String, nullable=True)
 
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_model_instance.schema_dimension))
+    # Keyword-search vector, stored so ranking never re-parses ``content``.
+    # Migrated deployments keep it current with a trigger instead (migration
+    # 187); either way it is server-maintained and never written by the ORM.
+    # Deferred so plain ``select(Document)`` loads don't drag it along.
+    search_vector = deferred(
+        Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True))
+    )
 
     # BlockNote live editing state (NULL when never edited)
     # DEPRECATED: Will be removed in a future migration. Use source_markdown instead.
@@ -1490,7 +1537,11 @@ class Chunk(BaseModel, TimestampMixin):
     __tablename__ = "chunks"
 
     content = Column(Text, nullable=False)
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_model_instance.schema_dimension))
+    # See ``Document.search_vector``.
+    search_vector = deferred(
+        Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True))
+    )
     # Explicit document order; ids don't follow it since incremental
     # re-indexing keeps unchanged rows across edits. Deliberately not indexed:
     # ordering reads are document-scoped (covered by ix_chunks_document_id) and
@@ -1512,6 +1563,203 @@ class Chunk(BaseModel, TimestampMixin):
     )
     document = relationship("Document", back_populates="chunks")
 
+    # Denormalized from the document so searches filter chunks directly and a
+    # hash-partitioned layout can prune by it (scripts/partition_chunks.py).
+    # Filled at flush by ``_fill_chunk_workspace_ids``: a partitioned table
+    # routes the row before any trigger runs, so the value must arrive with
+    # the INSERT. The triggers below cover raw SQL and documents that move.
+    workspace_id = deferred(
+        Column(
+            Integer,
+            ForeignKey("workspaces.id", ondelete="CASCADE"),
+            nullable=True,
+            index=True,
+            server_default=FetchedValue(),
+        )
+    )
+
+
+def _fill_chunk_workspace_ids(session: Session, _flush_context, _instances) -> None:
+    """Copy each new chunk's workspace from its document before the INSERT."""
+    pending: dict[int, list[Chunk]] = {}
+    for obj in session.new:
+        if not isinstance(obj, Chunk) or obj.__dict__.get("workspace_id"):
+            continue
+        # Never lazy-load here: under AsyncSession that would raise.
+        document = sa_inspect(obj).attrs.document.loaded_value
+        if isinstance(document, Document) and document.workspace_id is not None:
+            obj.workspace_id = document.workspace_id
+        elif obj.document_id is not None:
+            pending.setdefault(obj.document_id, []).append(obj)
+    if not pending:
+        return
+    rows = session.execute(
+        select(Document.id, Document.workspace_id).where(Document.id.in_(pending))
+    )
+    for document_id, workspace_id in rows:
+        for chunk in pending[document_id]:
+            chunk.workspace_id = workspace_id
+
+
+event.listen(Session, "before_flush", _fill_chunk_workspace_ids)
+
+
+# Deep enough for any tree ``validate_folder_depth`` admits; stops a cycle.
+_MAX_FOLDER_DEPTH = 64
+
+
+def _sync_folder_paths(session: Session, _flush_context) -> None:
+    """Re-derive ``folder_paths`` for folders this flush created, renamed or moved.
+
+    Runs after the rows are written, in the same transaction. A rename or move
+    re-derives the whole subtree below the folder. Deleted folders need
+    nothing: their paths go with them by ``ON DELETE CASCADE``.
+    """
+    changed = {obj.id for obj in session.new if isinstance(obj, Folder)}
+    for obj in session.dirty:
+        if not isinstance(obj, Folder):
+            continue
+        attrs = sa_inspect(obj).attrs
+        if any(
+            attrs[key].history.has_changes() for key in ("name", "parent_id", "parent")
+        ):
+            changed.add(obj.id)
+    if changed:
+        refresh_folder_paths(session.connection(), changed)
+
+
+def refresh_folder_paths(connection, folder_ids) -> None:
+    """Recompute and upsert the paths of ``folder_ids`` and all their descendants."""
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.knowledge_store.paths.naming import safe_folder_segment
+    from app.knowledge_store.paths.store_path import DOCUMENTS_ROOT
+
+    rows = connection.execute(
+        text(
+            """
+            WITH RECURSIVE subtree AS (
+                SELECT id, 0 AS depth FROM folders WHERE id = ANY(:ids)
+                UNION
+                SELECT f.id, s.depth + 1 FROM folders f
+                JOIN subtree s ON f.parent_id = s.id
+                WHERE s.depth < :max_depth
+            )
+            SELECT f.id, f.name, f.parent_id, f.workspace_id
+            FROM folders f WHERE f.id IN (SELECT id FROM subtree)
+            """
+        ),
+        {"ids": list(folder_ids), "max_depth": _MAX_FOLDER_DEPTH},
+    ).all()
+    by_id = {row.id: row for row in rows}
+    # Where each subtree hangs: its parent's already-indexed path.
+    anchors = {
+        row.parent_id
+        for row in rows
+        if row.parent_id is not None and row.parent_id not in by_id
+    }
+    known: dict[int, str] = {}
+    if anchors:
+        known = dict(
+            connection.execute(
+                select(FolderPath.folder_id, FolderPath.path).where(
+                    FolderPath.folder_id.in_(anchors)
+                )
+            ).all()
+        )
+
+    paths: dict[int, str] = {}
+
+    def resolve(folder_id: int, depth: int = 0) -> str:
+        if folder_id in paths:
+            return paths[folder_id]
+        row = by_id[folder_id]
+        parent = row.parent_id
+        if parent is None or depth >= _MAX_FOLDER_DEPTH:
+            base = DOCUMENTS_ROOT
+        elif parent in by_id:
+            base = resolve(parent, depth + 1)
+        else:
+            base = known.get(parent, DOCUMENTS_ROOT)
+        paths[folder_id] = f"{base}/{safe_folder_segment(str(row.name))}"
+        return paths[folder_id]
+
+    for folder_id in by_id:
+        resolve(folder_id)
+    if not paths:
+        return
+    stmt = pg_insert(FolderPath).values(
+        [
+            {
+                "folder_id": folder_id,
+                "workspace_id": by_id[folder_id].workspace_id,
+                "path": path,
+            }
+            for folder_id, path in paths.items()
+        ]
+    )
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[FolderPath.folder_id],
+            set_={
+                "path": stmt.excluded.path,
+                "workspace_id": stmt.excluded.workspace_id,
+            },
+        )
+    )
+
+
+event.listen(Session, "after_flush", _sync_folder_paths)
+
+
+# Kept in step with migration 194, which installs the same triggers on
+# migrated databases; ``create_all`` gets them from this hook. One statement
+# per entry: asyncpg prepares each and refuses multi-statement strings.
+CHUNK_WORKSPACE_TRIGGERS: tuple[str, ...] = (
+    """
+    CREATE OR REPLACE FUNCTION chunks_set_workspace_id() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' OR NEW.workspace_id IS NULL THEN
+            NEW.workspace_id := (
+                SELECT workspace_id FROM documents WHERE id = NEW.document_id
+            );
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION documents_sync_chunk_workspace_id()
+    RETURNS trigger AS $$
+    BEGIN
+        UPDATE chunks SET workspace_id = NEW.workspace_id
+        WHERE document_id = NEW.id
+          AND workspace_id IS DISTINCT FROM NEW.workspace_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS chunks_set_workspace_id ON chunks",
+    """
+    CREATE TRIGGER chunks_set_workspace_id
+        BEFORE INSERT OR UPDATE OF document_id ON chunks
+        FOR EACH ROW EXECUTE FUNCTION chunks_set_workspace_id()
+    """,
+    "DROP TRIGGER IF EXISTS documents_sync_chunk_workspace_id ON documents",
+    """
+    CREATE TRIGGER documents_sync_chunk_workspace_id
+        AFTER UPDATE OF workspace_id ON documents
+        FOR EACH ROW EXECUTE FUNCTION documents_sync_chunk_workspace_id()
+    """,
+)
+
+for _statement in CHUNK_WORKSPACE_TRIGGERS:
+    event.listen(
+        Chunk.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
 
 class VideoPresentationRun(BaseModel, TimestampMixin):
     """Lifecycle record for one video-presentation generation.
@@ -1978,6 +2226,27 @@ class CreditPurchase(Base, TimestampMixin):
     user = relationship("User", back_populates="credit_purchases")
 
 
+class CreditLedgerSettlement(Base, TimestampMixin):
+    """One batch of Redis-ledger debits applied to ``user.credit_micros_balance``.
+
+    The unique ``batch_id`` makes settlement idempotent: a batch re-run after
+    a crash inserts nothing and so debits nothing. Rows are only needed until
+    the batch is cleared in Redis and are pruned after a week.
+    """
+
+    __tablename__ = "credit_ledger_settlements"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    batch_id = Column(String(32), nullable=False, unique=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    amount_micros = Column(BigInteger, nullable=False)
+
+
 class WorkspaceRole(BaseModel, TimestampMixin):
     """
     Custom roles that can be defined per workspace.
@@ -2715,9 +2984,10 @@ class Run(Base, TimestampMixin):
 
     Backs the user-facing Scraper-API logs and the agent's tool-boundary
     truncation: the full output lives here while the model sees only a capped
-    preview plus this row's id. ``output_text`` is stored as JSONL (one item
-    per line, ``exclude_none``) so ``read_run``/``search_run`` can page and grep
-    by line without parsing the whole payload. Retained ~30 days via opportunistic
+    preview plus this row's id. The output is JSONL (one item per line,
+    ``exclude_none``) stored one row per line in ``run_output_lines``, so
+    ``read_run``/``search_run`` page and grep by line without fetching the whole
+    payload. Retained ~30 days via opportunistic
     bounded cleanup on insert.
 
     ``cost_micros`` ships nullable and unpopulated in this pass; the planned
@@ -2758,6 +3028,24 @@ class Run(Base, TimestampMixin):
     # Coarse progress log (list of throttled events) captured during the run;
     # the live fine-grained stream is ephemeral (bus/SSE only).
     progress = Column(JSONB, nullable=True)
+    # Output lines live in ``run_output_lines``; NULL marks a row written
+    # before that, whose output is still the ``output_text`` blob.
+    line_count = Column(Integer, nullable=True)
+
+
+class RunOutputLine(Base):
+    """One line of a run's JSONL output, so readers fetch only the lines they page
+    or grep through instead of the whole (often tens of MB) payload."""
+
+    __tablename__ = "run_output_lines"
+
+    run_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    line_no = Column(Integer, primary_key=True)
+    content = Column(Text, nullable=False)
 
 
 class ToolOutputSpill(Base, TimestampMixin):
@@ -2781,8 +3069,24 @@ class ToolOutputSpill(Base, TimestampMixin):
     )
     thread_id = Column(String(255), nullable=True)
     tool_name = Column(String(255), nullable=True)
-    content = Column(Text, nullable=False)
+    # NULL once the content is stored line by line in ``tool_output_spill_lines``.
+    content = Column(Text, nullable=True)
     char_count = Column(Integer, nullable=False, default=0)
+    line_count = Column(Integer, nullable=True)
+
+
+class ToolOutputSpillLine(Base):
+    """One line of a spill's content (see ``RunOutputLine``)."""
+
+    __tablename__ = "tool_output_spill_lines"
+
+    spill_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tool_output_spills.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    line_no = Column(Integer, primary_key=True)
+    content = Column(Text, nullable=False)
 
 
 class ModelCompatibility(Base):
@@ -2825,9 +3129,13 @@ from app.automations.persistence import (  # noqa: E402, F401
     AutomationRun,
     AutomationTrigger,
 )
-from app.etl_pipeline.cache.persistence.models import CachedParse  # noqa: E402, F401
+from app.etl_pipeline.cache.persistence.models import (  # noqa: E402, F401
+    CachedImageDescription,
+    CachedParse,
+)
 from app.file_storage.persistence import DocumentFile  # noqa: E402, F401
 from app.indexing_pipeline.cache.persistence.models import (  # noqa: E402, F401
+    CachedChunkVector,
     CachedEmbeddingSet,
 )
 from app.notifications.persistence import Notification  # noqa: E402, F401
@@ -2902,9 +3210,9 @@ _INDEX_DEFINITIONS: list[tuple[str, str, str]] = [
         "CREATE INDEX CONCURRENTLY IF NOT EXISTS document_vector_index ON documents USING hnsw (embedding public.vector_cosine_ops)",
     ),
     (
-        "document_search_index",
+        "documents_search_vector_index",
         "documents",
-        "CREATE INDEX CONCURRENTLY IF NOT EXISTS document_search_index ON documents USING gin (to_tsvector('english', content))",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_search_vector_index ON documents USING gin (search_vector)",
     ),
     (
         "chucks_vector_index",
@@ -2912,9 +3220,15 @@ _INDEX_DEFINITIONS: list[tuple[str, str, str]] = [
         "CREATE INDEX CONCURRENTLY IF NOT EXISTS chucks_vector_index ON chunks USING hnsw (embedding public.vector_cosine_ops)",
     ),
     (
-        "chucks_search_index",
+        "chunks_search_vector_index",
+        "chunks",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS chunks_search_vector_index ON chunks USING gin (search_vector)",
+    ),
+    # Trigram index behind the agent filesystem's grep (ILIKE '%text%' / ~*).
+    (
+        "ix_chunks_content_trgm",
         "chunks",
-        "CREATE INDEX CONCURRENTLY IF NOT EXISTS chucks_search_index ON chunks USING gin (to_tsvector('english', content))",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_content_trgm ON chunks USING gin (content gin_trgm_ops)",
     ),
     # pg_trgm index for efficient ILIKE '%term%' searches on titles — critical
     # for the document mention picker (@mentions) to scale.
@@ -2934,9 +3248,55 @@ _INDEX_DEFINITIONS: list[tuple[str, str, str]] = [
         "documents",
         "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_workspace_updated ON documents (workspace_id, updated_at DESC NULLS LAST) INCLUDE (id, title, document_type)",
     ),
+    # Keyset pages of the default document listing (newest first, id tiebreak).
+    (
+        "idx_documents_workspace_created_id",
+        "documents",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_workspace_created_id ON documents (workspace_id, created_at DESC, id DESC)",
+    ),
 ]
 
 
+# HNSW opclass and indexed expression per VECTOR_SEARCH_QUANTIZATION mode. The
+# candidate pass in app/retriever/vector_ranking.py must order by exactly this
+# expression for the planner to use the index.
+_QUANTIZED_VECTOR_OPS: dict[str, tuple[str, str]] = {
+    "halfvec": ("(embedding::halfvec({dim}))", "halfvec_cosine_ops"),
+    "binary": ("(binary_quantize(embedding)::bit({dim}))", "bit_hamming_ops"),
+}
+
+
+def quantized_vector_index(table: str, mode: str) -> tuple[str, str] | None:
+    """``(name, definition)`` of the quantized HNSW index on ``table.embedding``.
+
+    ``None`` when ``mode`` is not a quantization mode (e.g. ``off``).
+    """
+    if mode not in _QUANTIZED_VECTOR_OPS:
+        return None
+    expression, opclass = _QUANTIZED_VECTOR_OPS[mode]
+    dim = config.embedding_model_instance.schema_dimension
+    return (
+        f"{table}_embedding_{mode}_index",
+        f"USING hnsw ({expression.format(dim=dim)} {opclass})",
+    )
+
+
+def _quantized_index_definitions() -> list[tuple[str, str, str]]:
+    definitions = []
+    for table in ("documents", "chunks"):
+        index = quantized_vector_index(table, config.VECTOR_SEARCH_QUANTIZATION)
+        if index is not None:
+            name, definition = index
+            definitions.append(
+                (
+                    name,
+                    table,
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}",
+                )
+            )
+    return definitions
+
+
 async def _drop_invalid_index(conn, name: str) -> None:
     """Drop a leftover *invalid* index so it can be rebuilt.
 
@@ -2958,6 +3318,16 @@ async def _drop_invalid_index(conn, name: str) -> None:
         await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
 
 
+async def _partitioned_tables(conn) -> set[str]:
+    result = await conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'p' AND relnamespace = current_schema()::regnamespace"
+        )
+    )
+    return {row[0] for row in result}
+
+
 async def setup_indexes() -> None:
     """Ensure search/vector indexes exist without ever blocking startup.
 
@@ -2973,7 +3343,15 @@ async def setup_indexes() -> None:
     async with engine.connect() as base_conn:
         conn = await base_conn.execution_options(isolation_level="AUTOCOMMIT")
         await conn.execute(text(f"SET lock_timeout = {lock_timeout_ms}"))
-        for name, table, ddl in _INDEX_DEFINITIONS:
+        partitioned = await _partitioned_tables(conn)
+        for name, table, ddl in [
+            *_INDEX_DEFINITIONS,
+            *_quantized_index_definitions(),
+        ]:
+            if table in partitioned:
+                # Partitioned parents cannot index CONCURRENTLY; their indexes
+                # are built per partition by scripts/partition_chunks.py.
+                continue
             try:
                 await _drop_invalid_index(conn, name)
                 await conn.execute(text(ddl))
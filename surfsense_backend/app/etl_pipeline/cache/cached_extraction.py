@@ -21,39 +21,48 @@ _HASH_CHUNK = 1024 * 1024
 
 
 async def extract_with_cache(request: EtlRequest, *, vision_llm=None) -> EtlResult:
-    """Drop-in for ``EtlPipelineService.extract`` that reuses prior parser output."""
+    """Drop-in for ``EtlPipelineService.extract`` that reuses prior parser output.
+
+    With a vision LLM only the parser half is served from here; picture
+    descriptions are merged in afterwards (through the per-image cache).
+    """
     settings = load_etl_cache_settings()
 
     cacheable = is_parse_cacheable(
         filename=request.filename,
         etl_service=config.ETL_SERVICE,
         cache_enabled=settings.enabled,
-        has_vision_llm=vision_llm is not None,
     )
     if not cacheable:
         return await EtlPipelineService(vision_llm=vision_llm).extract(request)
 
     key = ParseKey.for_document(
-        await asyncio.to_thread(_hash_file, request.file_path),
+        request.source_sha256 or await asyncio.to_thread(_hash_file, request.file_path),
         etl_service=config.ETL_SERVICE,
         mode=request.processing_mode.value,
         version=settings.parser_version,
     )
 
-    cached_result = await _recall(key)
-    if cached_result is not None:
+    result = await _recall(key)
+    if result is not None:
         metrics.record_etl_cache_lookup(
             etl_service=key.etl_service, mode=key.mode, outcome="hit"
         )
         logger.debug("ETL cache hit for %s", key.source_sha256)
-        return cached_result
-
-    metrics.record_etl_cache_lookup(
-        etl_service=key.etl_service, mode=key.mode, outcome="miss"
-    )
-    result = await EtlPipelineService(vision_llm=vision_llm).extract(request)
-    await _remember(key, result)
-    return result
+    else:
+        metrics.record_etl_cache_lookup(
+            etl_service=key.etl_service, mode=key.mode, outcome="miss"
+        )
+        # Parse without the vision LLM so the stored markdown is deterministic.
+        result = await EtlPipelineService().extract(request)
+        await _remember(key, result)
+
+    if vision_llm is None:
+        return result
+    markdown = await EtlPipelineService(
+        vision_llm=vision_llm
+    ).append_picture_descriptions(request, result.markdown_content)
+    return result.model_copy(update={"markdown_content": markdown})
 
 
 async def _recall(key: ParseKey) -> EtlResult | None:
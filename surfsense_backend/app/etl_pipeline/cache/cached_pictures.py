@@ -0,0 +1,88 @@
+"""Entry point: the cross-document picture cache handed to ``describe_pictures``."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from app.config import config
+from app.etl_pipeline.cache.service import ImageDescriptionCacheService
+from app.etl_pipeline.cache.settings import load_etl_cache_settings
+from app.etl_pipeline.parsers.vision_llm import DESCRIPTION_PROMPT_VERSION
+from app.etl_pipeline.picture_describer import CachedPicture
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PictureDescriptionCache:
+    """Best-effort :class:`~app.etl_pipeline.picture_describer.PictureCache`.
+
+    Each call opens its own short session, so no connection is held while the
+    vision LLM runs; any failure degrades to "no hits" / "not stored".
+    """
+
+    def __init__(self, *, vision_model: str, ocr_service: str | None) -> None:
+        self._vision_model = vision_model
+        self._ocr_service = ocr_service
+
+    def _service(self, session) -> ImageDescriptionCacheService:
+        return ImageDescriptionCacheService(
+            session,
+            vision_model=self._vision_model,
+            prompt_version=DESCRIPTION_PROMPT_VERSION,
+            ocr_service=self._ocr_service,
+        )
+
+    async def recall(self, sha256s: list[str]) -> dict[str, CachedPicture]:
+        try:
+            from app.tasks.celery_tasks import get_celery_session_maker
+
+            async with get_celery_session_maker()() as session:
+                hits = await self._service(session).recall_many(sha256s)
+        except Exception:
+            logger.warning(
+                "Picture cache recall failed; describing fresh", exc_info=True
+            )
+            hits = {}
+        metrics.record_etl_image_cache_lookup(
+            hits=len(hits),
+            misses=len(sha256s) - len(hits),
+            vision_model=self._vision_model,
+        )
+        return hits
+
+    async def remember(self, pictures: dict[str, CachedPicture]) -> None:
+        try:
+            from app.tasks.celery_tasks import get_celery_session_maker
+
+            async with get_celery_session_maker()() as session:
+                await self._service(session).remember_many(pictures)
+        except Exception:
+            logger.warning(
+                "Picture cache write failed; descriptions not cached", exc_info=True
+            )
+
+
+def vision_model_name(vision_llm: Any) -> str | None:
+    """The concrete model behind ``vision_llm``, or None when it can't be pinned.
+
+    Router-backed LLMs report ``"auto"`` and may answer from any deployment,
+    so their descriptions are not attributable to one model and stay uncached.
+    """
+    model = getattr(vision_llm, "model", None)
+    if not isinstance(model, str) or not model or model == "auto":
+        return None
+    return model
+
+
+def picture_cache_for(vision_llm: Any) -> PictureDescriptionCache | None:
+    """The picture cache for ``vision_llm``, or None when caching is off."""
+    if vision_llm is None or not load_etl_cache_settings().image_cache_enabled:
+        return None
+    vision_model = vision_model_name(vision_llm)
+    if vision_model is None:
+        return None
+    return PictureDescriptionCache(
+        vision_model=vision_model, ocr_service=config.ETL_SERVICE or None
+    )
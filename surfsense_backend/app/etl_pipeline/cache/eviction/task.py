@@ -1,4 +1,4 @@
-"""Celery task that prunes the parse cache by TTL, then by size budget."""
+"""Celery task that prunes the ETL caches by TTL, then by size budget."""
 
 from __future__ import annotations
 
@@ -8,9 +8,12 @@ from datetime import UTC, datetime, timedelta
 
 from app.celery_app import celery_app
 from app.etl_pipeline.cache.eviction.policy import select_over_budget
-from app.etl_pipeline.cache.persistence import CachedParseRepository
+from app.etl_pipeline.cache.persistence import (
+    CachedImageDescriptionRepository,
+    CachedParseRepository,
+)
 from app.etl_pipeline.cache.schemas import EvictionCandidate
-from app.etl_pipeline.cache.settings import load_etl_cache_settings
+from app.etl_pipeline.cache.settings import EtlCacheSettings, load_etl_cache_settings
 from app.etl_pipeline.cache.storage import MarkdownCacheStore
 from app.observability import metrics
 from app.tasks.celery_tasks import get_celery_session_maker, run_async_celery_task
@@ -26,6 +29,8 @@ def evict_etl_cache_task():
 async def _evict() -> None:
     """Expire stale entries, then shed the coldest overflow only if still over budget."""
     settings = load_etl_cache_settings()
+    if settings.image_cache_enabled:
+        await _evict_images(settings)
     if not settings.enabled:
         return
 
@@ -66,3 +71,37 @@ async def _drop(
     await index.delete_by_ids([candidate.id for candidate in candidates])
     metrics.record_etl_cache_eviction(len(candidates), phase=phase)
     logger.info("Evicted %d cached parses (%s)", len(candidates), phase)
+
+
+async def _evict_images(settings: EtlCacheSettings) -> None:
+    async with get_celery_session_maker()() as session:
+        index = CachedImageDescriptionRepository(session)
+
+        cutoff = datetime.now(UTC) - timedelta(days=settings.ttl_days)
+        expired = await index.select_expired(
+            cutoff=cutoff, limit=settings.eviction_batch
+        )
+        await _drop_images(index, expired, phase="ttl")
+
+        total = await index.total_size_bytes()
+        if total > settings.image_max_total_bytes:
+            coldest = await index.select_coldest(limit=settings.eviction_batch)
+            over_budget = select_over_budget(
+                coldest,
+                current_total_bytes=total,
+                max_total_bytes=settings.image_max_total_bytes,
+            )
+            await _drop_images(index, over_budget, phase="size")
+
+
+async def _drop_images(
+    index: CachedImageDescriptionRepository,
+    candidates: list[EvictionCandidate],
+    *,
+    phase: str,
+) -> None:
+    if not candidates:
+        return
+    await index.delete_by_ids([candidate.id for candidate in candidates])
+    metrics.record_etl_cache_eviction(len(candidates), phase=phase)
+    logger.info("Evicted %d cached picture descriptions (%s)", len(candidates), phase)
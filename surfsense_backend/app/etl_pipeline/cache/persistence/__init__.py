@@ -1,11 +1,13 @@
-"""Database access for cached parse rows."""
+"""Database access for cached parse and image-description rows."""
 
 from __future__ import annotations
 
-from .models import CachedParse
-from .repository import CachedParseRepository
+from .models import CachedImageDescription, CachedParse
+from .repository import CachedImageDescriptionRepository, CachedParseRepository
 
 __all__ = [
+    "CachedImageDescription",
+    "CachedImageDescriptionRepository",
     "CachedParse",
     "CachedParseRepository",
 ]
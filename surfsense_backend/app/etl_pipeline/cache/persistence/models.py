@@ -1,4 +1,8 @@
-"""``etl_cache_parses``: one reusable parser result per (bytes + recipe)."""
+"""ETL-cache index tables.
+
+``etl_cache_parses``: one reusable parser result per (bytes + recipe).
+``etl_cache_image_descriptions``: one reusable picture description per image.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +13,7 @@ from sqlalchemy import (
     Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
 )
 
@@ -47,3 +52,38 @@ class CachedParse(BaseModel, TimestampMixin):
         ),
         Index("ix_etl_cache_parses_last_used_at", "last_used_at"),
     )
+
+
+class CachedImageDescription(BaseModel, TimestampMixin):
+    """Vision-LLM description (and per-image OCR) of one embedded image.
+
+    Logos, slide templates and shared diagrams recur across documents; this
+    lets each be described once per vision model. Descriptions are a few KB
+    of text, so they live in the row itself rather than in the blob store.
+    """
+
+    __tablename__ = "etl_cache_image_descriptions"
+
+    # Key: raw image bytes + the model and prompt that described them.
+    image_sha256 = Column(String(64), nullable=False)
+    vision_model = Column(String(255), nullable=False)
+    prompt_version = Column(Integer, nullable=False)
+
+    description = Column(Text, nullable=False)
+    # ETL service that OCR'd the image; NULL until OCR has succeeded once.
+    ocr_service = Column(String(32), nullable=True)
+    ocr_text = Column(Text, nullable=True)
+
+    # Drives eviction (popularity + recency).
+    times_reused = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "image_sha256",
+            "vision_model",
+            "prompt_version",
+            name="uq_etl_cache_image_descriptions_key",
+        ),
+        Index("ix_etl_cache_image_descriptions_last_used_at", "last_used_at"),
+    )
@@ -1,8 +1,8 @@
-"""CRUD and eviction selectors for ``etl_cache_parses`` (no business rules)."""
+"""CRUD and eviction selectors for the ETL-cache tables (no business rules)."""
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import delete, func, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -10,7 +10,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.etl_pipeline.cache.schemas import EvictionCandidate, ParseKey
 
-from .models import CachedParse
+from .models import CachedImageDescription, CachedParse
+
+# Keeps each statement well under Postgres' 32767 bind-parameter limit.
+_IMAGE_BATCH = 1000
+
+# A hot row is rewritten at most this often; eviction TTLs are in days, so
+# ``last_used_at`` stays accurate enough and ``times_reused`` counts the
+# windows a row was used in rather than every hit.
+_TOUCH_INTERVAL = timedelta(hours=1)
 
 _EVICTION_COLUMNS = (
     CachedParse.id,
@@ -20,6 +28,18 @@ _EVICTION_COLUMNS = (
     CachedParse.times_reused,
 )
 
+# Descriptions live inline, so the image hash stands in for a blob storage key.
+_IMAGE_SIZE_BYTES = func.octet_length(CachedImageDescription.description) + (
+    func.coalesce(func.octet_length(CachedImageDescription.ocr_text), 0)
+)
+_IMAGE_EVICTION_COLUMNS = (
+    CachedImageDescription.id,
+    CachedImageDescription.image_sha256.label("storage_key"),
+    _IMAGE_SIZE_BYTES.label("size_bytes"),
+    CachedImageDescription.last_used_at,
+    CachedImageDescription.times_reused,
+)
+
 
 def _as_eviction_candidate(row) -> EvictionCandidate:
     return EvictionCandidate(
@@ -79,12 +99,16 @@ class CachedParseRepository:
         await self._session.commit()
 
     async def mark_used(self, row_id: int) -> None:
+        now = datetime.now(UTC)
         await self._session.execute(
             update(CachedParse)
-            .where(CachedParse.id == row_id)
+            .where(
+                CachedParse.id == row_id,
+                CachedParse.last_used_at < now - _TOUCH_INTERVAL,
+            )
             .values(
                 times_reused=CachedParse.times_reused + 1,
-                last_used_at=datetime.now(UTC),
+                last_used_at=now,
             )
         )
         await self._session.commit()
@@ -119,3 +143,119 @@ class CachedParseRepository:
             return
         await self._session.execute(delete(CachedParse).where(CachedParse.id.in_(ids)))
         await self._session.commit()
+
+
+class CachedImageDescriptionRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_many(
+        self, *, vision_model: str, prompt_version: int, image_sha256s: list[str]
+    ) -> dict[str, CachedImageDescription]:
+        found: dict[str, CachedImageDescription] = {}
+        for start in range(0, len(image_sha256s), _IMAGE_BATCH):
+            result = await self._session.execute(
+                select(CachedImageDescription).where(
+                    CachedImageDescription.vision_model == vision_model,
+                    CachedImageDescription.prompt_version == prompt_version,
+                    CachedImageDescription.image_sha256.in_(
+                        image_sha256s[start : start + _IMAGE_BATCH]
+                    ),
+                )
+            )
+            found.update((row.image_sha256, row) for row in result.scalars())
+        return found
+
+    async def upsert_many(
+        self, *, vision_model: str, prompt_version: int, rows: list[dict]
+    ) -> None:
+        """Insert ``rows`` (image_sha256, description, ocr_service, ocr_text).
+
+        Concurrent writers describe identical bytes, so an existing description
+        is kept; only OCR fills in, when this write carries a completed run.
+        """
+        if not rows:
+            return
+        now = datetime.now(UTC)
+        values = [
+            {
+                **row,
+                "vision_model": vision_model,
+                "prompt_version": prompt_version,
+                "times_reused": 0,
+                "last_used_at": now,
+                "created_at": now,
+            }
+            for row in rows
+        ]
+        for start in range(0, len(values), _IMAGE_BATCH):
+            stmt = pg_insert(CachedImageDescription).values(
+                values[start : start + _IMAGE_BATCH]
+            )
+            await self._session.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_etl_cache_image_descriptions_key",
+                    set_={
+                        "ocr_service": stmt.excluded.ocr_service,
+                        "ocr_text": stmt.excluded.ocr_text,
+                    },
+                    where=stmt.excluded.ocr_service.is_not(None),
+                )
+            )
+        await self._session.commit()
+
+    async def mark_used(self, row_ids: list[int]) -> None:
+        if not row_ids:
+            return
+        now = datetime.now(UTC)
+        for start in range(0, len(row_ids), _IMAGE_BATCH):
+            await self._session.execute(
+                update(CachedImageDescription)
+                .where(
+                    CachedImageDescription.id.in_(
+                        row_ids[start : start + _IMAGE_BATCH]
+                    ),
+                    CachedImageDescription.last_used_at < now - _TOUCH_INTERVAL,
+                )
+                .values(
+                    times_reused=CachedImageDescription.times_reused + 1,
+                    last_used_at=now,
+                )
+            )
+        await self._session.commit()
+
+    async def total_size_bytes(self) -> int:
+        result = await self._session.execute(
+            select(func.coalesce(func.sum(_IMAGE_SIZE_BYTES), 0))
+        )
+        return int(result.scalar() or 0)
+
+    async def select_expired(
+        self, *, cutoff: datetime, limit: int
+    ) -> list[EvictionCandidate]:
+        result = await self._session.execute(
+            select(*_IMAGE_EVICTION_COLUMNS)
+            .where(CachedImageDescription.last_used_at < cutoff)
+            .order_by(CachedImageDescription.last_used_at.asc())
+            .limit(limit)
+        )
+        return [_as_eviction_candidate(row) for row in result]
+
+    async def select_coldest(self, *, limit: int) -> list[EvictionCandidate]:
+        result = await self._session.execute(
+            select(*_IMAGE_EVICTION_COLUMNS)
+            .order_by(
+                CachedImageDescription.times_reused.asc(),
+                CachedImageDescription.last_used_at.asc(),
+            )
+            .limit(limit)
+        )
+        return [_as_eviction_candidate(row) for row in result]
+
+    async def delete_by_ids(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        await self._session.execute(
+            delete(CachedImageDescription).where(CachedImageDescription.id.in_(ids))
+        )
+        await self._session.commit()
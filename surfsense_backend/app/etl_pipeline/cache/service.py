@@ -1,4 +1,5 @@
-"""Recall and remember parser output, coordinating the index and blob store."""
+"""Recall and remember cached ETL output: parser markdown (index + blob store)
+and picture descriptions (stored inline in Postgres)."""
 
 from __future__ import annotations
 
@@ -6,10 +7,14 @@ import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.etl_pipeline.cache.persistence import CachedParseRepository
+from app.etl_pipeline.cache.persistence import (
+    CachedImageDescriptionRepository,
+    CachedParseRepository,
+)
 from app.etl_pipeline.cache.schemas import ParseKey
 from app.etl_pipeline.cache.storage import MarkdownCacheStore
 from app.etl_pipeline.etl_document import EtlResult
+from app.etl_pipeline.picture_describer import CachedPicture
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +37,11 @@ class EtlCacheService:
             logger.warning("Cache blob missing: %s", row.storage_key, exc_info=True)
             return None
 
-        await self._index.mark_used(row.id)
+        try:
+            await self._index.mark_used(row.id)
+        except Exception:
+            # Recency bookkeeping only; the recalled markdown is still good.
+            logger.warning("ETL cache touch failed", exc_info=True)
         return EtlResult(
             markdown_content=markdown,
             etl_service=row.etl_service,
@@ -51,3 +60,62 @@ class EtlCacheService:
             storage_key=storage_key,
             size_bytes=len(result.markdown_content.encode("utf-8")),
         )
+
+
+class ImageDescriptionCacheService:
+    """Picture descriptions for one vision model and prompt, keyed by image sha256.
+
+    OCR text is only served back when it came from ``ocr_service``; otherwise
+    the entry is a partial hit and the describer re-runs OCR alone.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        vision_model: str,
+        prompt_version: int,
+        ocr_service: str | None,
+    ) -> None:
+        self._index = CachedImageDescriptionRepository(session)
+        self._vision_model = vision_model
+        self._prompt_version = prompt_version
+        self._ocr_service = ocr_service
+
+    async def recall_many(self, image_sha256s: list[str]) -> dict[str, CachedPicture]:
+        rows = await self._index.get_many(
+            vision_model=self._vision_model,
+            prompt_version=self._prompt_version,
+            image_sha256s=image_sha256s,
+        )
+        pictures: dict[str, CachedPicture] = {}
+        for image_sha256, row in rows.items():
+            ocr_done = (
+                self._ocr_service is not None and row.ocr_service == self._ocr_service
+            )
+            pictures[image_sha256] = CachedPicture(
+                description=row.description,
+                ocr_text=row.ocr_text if ocr_done else None,
+                ocr_done=ocr_done,
+            )
+        try:
+            await self._index.mark_used([row.id for row in rows.values()])
+        except Exception:
+            # Recency bookkeeping only; the recalled descriptions are still good.
+            logger.warning("Picture description cache touch failed", exc_info=True)
+        return pictures
+
+    async def remember_many(self, pictures: dict[str, CachedPicture]) -> None:
+        await self._index.upsert_many(
+            vision_model=self._vision_model,
+            prompt_version=self._prompt_version,
+            rows=[
+                {
+                    "image_sha256": image_sha256,
+                    "description": picture.description,
+                    "ocr_service": self._ocr_service if picture.ocr_done else None,
+                    "ocr_text": picture.ocr_text if picture.ocr_done else None,
+                }
+                for image_sha256, picture in pictures.items()
+            ],
+        )
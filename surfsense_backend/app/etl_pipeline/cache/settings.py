@@ -16,6 +16,8 @@ class EtlCacheSettings:
     storage_backend: str | None
     storage_container: str | None
     storage_local_root: str | None
+    image_cache_enabled: bool
+    image_max_total_bytes: int
 
 
 def load_etl_cache_settings() -> EtlCacheSettings:
@@ -30,4 +32,6 @@ def load_etl_cache_settings() -> EtlCacheSettings:
         storage_backend=config.ETL_CACHE_STORAGE_BACKEND or None,
         storage_container=config.ETL_CACHE_STORAGE_CONTAINER or None,
         storage_local_root=config.ETL_CACHE_STORAGE_LOCAL_PATH or None,
+        image_cache_enabled=config.ETL_IMAGE_CACHE_ENABLED,
+        image_max_total_bytes=config.ETL_IMAGE_CACHE_MAX_TOTAL_MB * 1024 * 1024,
     )
@@ -32,6 +32,9 @@ class EtlRequest(BaseModel):
     filename: str
     estimated_pages: int = 0
     processing_mode: ProcessingMode = ProcessingMode.BASIC
+    # sha256 of the file's bytes when the caller already hashed it (upload
+    # spooling does); saves the parse cache a second full read.
+    source_sha256: str | None = None
 
     @field_validator("filename")
     @classmethod
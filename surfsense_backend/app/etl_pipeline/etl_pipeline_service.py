@@ -221,7 +221,7 @@ class EtlPipelineService:
         # do_ocr=True, Azure DI prebuilt-read, etc.) handles text-in-
         # image; this side handles the *visual* description which the
         # parsers all drop today.
-        content = await self._maybe_append_picture_descriptions(request, content)
+        content = await self.append_picture_descriptions(request, content)
 
         return EtlResult(
             markdown_content=content,
@@ -229,12 +229,19 @@ class EtlPipelineService:
             content_type="document",
         )
 
-    async def _maybe_append_picture_descriptions(
+    async def append_picture_descriptions(
         self, request: EtlRequest, markdown: str
     ) -> str:
+        """Merge vision-LLM descriptions of the file's embedded images into
+        ``markdown``; a no-op without a vision LLM.
+
+        Public so the parse cache can reuse deterministic parser output and
+        layer the (separately cached) picture descriptions on top.
+        """
         if self._vision_llm is None:
             return markdown
 
+        from app.etl_pipeline.cache.cached_pictures import picture_cache_for
         from app.etl_pipeline.picture_describer import (
             describe_pictures,
             merge_descriptions_into_markdown,
@@ -285,8 +292,10 @@ class EtlPipelineService:
                     request.filename,
                     self._vision_llm,
                     ocr_runner=_ocr_image,
+                    cache=picture_cache_for(self._vision_llm),
                 )
                 sp.set_attribute("image.described.count", len(result.descriptions))
+                sp.set_attribute("image.cached.count", result.cached)
                 sp.set_attribute("image.failed.count", result.failed)
                 sp.set_attribute("image.skipped.too_small", result.skipped_too_small)
                 sp.set_attribute("image.skipped.too_large", result.skipped_too_large)
@@ -316,9 +325,10 @@ class EtlPipelineService:
         merged = merge_descriptions_into_markdown(markdown, result)
         logging.info(
             "Vision LLM described %d image(s) in %s "
-            "(skipped: %d small / %d large / %d duplicate, %d failed)",
+            "(%d from cache; skipped: %d small / %d large / %d duplicate, %d failed)",
             len(result.descriptions),
             request.filename,
+            result.cached,
             result.skipped_too_small,
             result.skipped_too_large,
             result.skipped_duplicate,
@@ -32,6 +32,10 @@ _DESCRIPTION_PROMPT = (
     "here would be redundant. Stick to the visual interpretation."
 )
 
+# Part of the picture-cache key: bump whenever _DESCRIPTION_PROMPT changes
+# so descriptions written under the old prompt stop being served.
+DESCRIPTION_PROMPT_VERSION = 1
+
 _MAX_IMAGE_BYTES = (
     5 * 1024 * 1024
 )  # 5 MB (Anthropic Claude's limit, the most restrictive)
@@ -111,6 +115,7 @@ async def parse_image_for_description(file_path: str, filename: str, llm) -> str
 
 
 __all__ = [
+    "DESCRIPTION_PROMPT_VERSION",
     "parse_image_for_description",
     "parse_with_vision_llm",
 ]
@@ -15,7 +15,10 @@ text, we:
    limits).
 2. Run the vision LLM on each unique image (visual description) and,
    in parallel when an OCR runner is provided, re-feed the same image
-   through the ETL service for per-image OCR.
+   through the ETL service for per-image OCR. When a
+   :class:`PictureCache` is passed, images described in an earlier
+   document (logos, slide templates, shared diagrams) are served from
+   it and only the unseen ones reach the vision LLM.
 3. **Inject** a horizontal-rule-delimited markdown section -- with
    named "OCR text" and "Visual description" sub-sections -- where the
    image actually appears in the parser's markdown. Two splice modes,
@@ -54,7 +57,7 @@ import tempfile
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 # Type alias for the OCR callback. Takes (file_path, filename), returns
 # the OCR'd markdown text -- or empty string if no text was found, or
@@ -107,6 +110,31 @@ class PictureDescription:
     ocr_text: str | None = None  # OCR text from the ETL service, if any
 
 
+@dataclass(frozen=True)
+class CachedPicture:
+    """What a :class:`PictureCache` holds for one image, keyed by its sha256.
+
+    ``ocr_done`` separates "OCR ran and found no text" (``ocr_text`` is
+    None) from "OCR never ran or failed" -- only the latter re-runs OCR.
+    """
+
+    description: str
+    ocr_text: str | None = None
+    ocr_done: bool = False
+
+
+class PictureCache(Protocol):
+    """Cross-document store of image descriptions, keyed by image sha256.
+
+    Implementations are best-effort: a failing store returns no hits and
+    drops writes rather than raising into the describer.
+    """
+
+    async def recall(self, sha256s: list[str]) -> dict[str, CachedPicture]: ...
+
+    async def remember(self, pictures: dict[str, CachedPicture]) -> None: ...
+
+
 @dataclass
 class PictureExtractionResult:
     """Aggregate result of extracting all pictures from a document."""
@@ -116,6 +144,8 @@ class PictureExtractionResult:
     skipped_too_large: int = 0
     skipped_duplicate: int = 0
     failed: int = 0
+    # Descriptions served whole from the PictureCache (no vision/OCR call).
+    cached: int = 0
 
     @property
     def has_content(self) -> bool:
@@ -192,7 +222,13 @@ async def _describe_one(
     vision_llm: Any,
     semaphore: asyncio.Semaphore,
     ocr_runner: OcrRunner | None,
-) -> PictureDescription | None:
+    known_description: str | None = None,
+) -> tuple[PictureDescription, bool] | None:
+    """Describe (and OCR) one image; returns it plus whether OCR completed.
+
+    ``known_description`` comes from the picture cache when only the OCR
+    half is missing -- the vision LLM is then skipped for this image.
+    """
     from app.etl_pipeline.parsers.vision_llm import parse_image_for_description
 
     suffix = _pick_suffix(name)
@@ -206,9 +242,9 @@ async def _describe_one(
         tmp_path = tmp.name
     try:
         async with semaphore:
-            tasks: list[Awaitable[Any]] = [
-                parse_image_for_description(tmp_path, name, vision_llm),
-            ]
+            tasks: list[Awaitable[Any]] = []
+            if known_description is None:
+                tasks.append(parse_image_for_description(tmp_path, name, vision_llm))
             if ocr_runner is not None:
                 tasks.append(ocr_runner(tmp_path, name))
 
@@ -216,20 +252,24 @@ async def _describe_one(
             # often OCR) doesn't poison the other.
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        description_result = results[0]
-        if isinstance(description_result, BaseException):
-            logger.warning(
-                "Vision LLM failed for image %s on page %d, skipping",
-                name,
-                page_number,
-                exc_info=description_result,
-            )
-            return None
-        description = str(description_result)
+        if known_description is None:
+            description_result = results.pop(0)
+            if isinstance(description_result, BaseException):
+                logger.warning(
+                    "Vision LLM failed for image %s on page %d, skipping",
+                    name,
+                    page_number,
+                    exc_info=description_result,
+                )
+                return None
+            description = str(description_result)
+        else:
+            description = known_description
 
         ocr_text: str | None = None
-        if ocr_runner is not None and len(results) > 1:
-            ocr_result = results[1]
+        ocr_done = False
+        if ocr_runner is not None and results:
+            ocr_result = results[0]
             if isinstance(ocr_result, BaseException):
                 logger.warning(
                     "Per-image OCR failed for image %s on page %d, "
@@ -239,6 +279,7 @@ async def _describe_one(
                     exc_info=ocr_result,
                 )
             else:
+                ocr_done = True
                 stripped = str(ocr_result).strip()
                 # Empty OCR (or whitespace-only) means the OCR engine
                 # found no text in this image. Record that as None so
@@ -248,7 +289,7 @@ async def _describe_one(
         with contextlib.suppress(OSError):
             Path(tmp_path).unlink()
 
-    return PictureDescription(
+    picture = PictureDescription(
         page_number=page_number,
         ordinal_in_page=ordinal,
         name=name,
@@ -256,6 +297,7 @@ async def _describe_one(
         description=description,
         ocr_text=ocr_text,
     )
+    return picture, ocr_done
 
 
 async def describe_pictures(
@@ -264,6 +306,7 @@ async def describe_pictures(
     vision_llm: Any,
     *,
     ocr_runner: OcrRunner | None = None,
+    cache: PictureCache | None = None,
 ) -> PictureExtractionResult:
     """Extract embedded images from a document and describe each via vision LLM.
 
@@ -276,6 +319,11 @@ async def describe_pictures(
     giving per-image OCR attribution alongside the page-level OCR that
     the parser already does.
 
+    When ``cache`` is provided, every unique image is first looked up by
+    sha256: a hit skips the vision LLM (and the OCR runner too, once the
+    cached entry has OCR), and freshly described images are written
+    back for the next document that embeds them.
+
     Currently PDF-only. For non-PDF documents this returns an empty
     result and the caller should leave the parser's markdown untouched.
     """
@@ -307,17 +355,64 @@ async def describe_pictures(
     if not eligible:
         return result
 
+    hits: dict[str, CachedPicture] = {}
+    if cache is not None:
+        hits = await cache.recall([sha for (_, _, _, sha, _) in eligible])
+
     semaphore = asyncio.Semaphore(_VISION_CONCURRENCY)
-    tasks = [
-        _describe_one(p, o, n, sha, d, vision_llm, semaphore, ocr_runner)
-        for (p, o, n, sha, d) in eligible
-    ]
-    descriptions = await asyncio.gather(*tasks)
-    for desc in descriptions:
+    # One slot per eligible image, in document order: cache hits fill
+    # theirs directly, the rest are filled from the gather below.
+    slots: list[PictureDescription | None] = [None] * len(eligible)
+    pending: list[int] = []
+    tasks = []
+    for i, (p, o, n, sha, d) in enumerate(eligible):
+        hit = hits.get(sha)
+        if hit is not None and (ocr_runner is None or hit.ocr_done):
+            slots[i] = PictureDescription(
+                page_number=p,
+                ordinal_in_page=o,
+                name=n,
+                sha256=sha,
+                description=hit.description,
+                ocr_text=hit.ocr_text if ocr_runner is not None else None,
+            )
+            result.cached += 1
+            continue
+        pending.append(i)
+        tasks.append(
+            _describe_one(
+                p,
+                o,
+                n,
+                sha,
+                d,
+                vision_llm,
+                semaphore,
+                ocr_runner,
+                known_description=hit.description if hit is not None else None,
+            )
+        )
+
+    fresh: dict[str, CachedPicture] = {}
+    for i, outcome in zip(pending, await asyncio.gather(*tasks), strict=True):
+        if outcome is None:
+            continue
+        desc, ocr_done = outcome
+        slots[i] = desc
+        fresh[desc.sha256] = CachedPicture(
+            description=desc.description,
+            ocr_text=desc.ocr_text,
+            ocr_done=ocr_done,
+        )
+
+    for desc in slots:
         if desc is None:
             result.failed += 1
         else:
             result.descriptions.append(desc)
+
+    if cache is not None and fresh:
+        await cache.remember(fresh)
     return result
 
 
@@ -665,6 +760,8 @@ def merge_descriptions_into_markdown(
 
 
 __all__ = [
+    "CachedPicture",
+    "PictureCache",
     "PictureDescription",
     "PictureExtractionResult",
     "describe_pictures",
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import base64
 import contextlib
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterable, AsyncIterator
 
 from app.file_storage.backends.base import StorageBackend
 
+# Staged block size for streamed uploads (Azure allows 50,000 blocks per blob).
+_BLOCK_SIZE = 8 * 1024 * 1024
+
 
 class AzureBlobBackend(StorageBackend):
     """Stores objects as blobs in an Azure Blob Storage container."""
@@ -32,6 +36,47 @@ class AzureBlobBackend(StorageBackend):
             blob = service.get_blob_client(self._container, key)
             await blob.upload_blob(data, overwrite=True, content_settings=settings)
 
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: str | None = None,
+    ) -> None:
+        """Stage the stream as uncommitted blocks, then commit them in order.
+
+        At most one block is buffered; until the commit, readers keep seeing
+        the previous blob (or none).
+        """
+        from azure.storage.blob import ContentSettings
+
+        settings = ContentSettings(content_type=content_type) if content_type else None
+        async with self._service() as service:
+            blob = service.get_blob_client(self._container, key)
+            block_ids: list[str] = []
+
+            async def _stage(data: bytes) -> None:
+                # Every id in a blob must have the same length.
+                block_id = base64.b64encode(f"{len(block_ids):08d}".encode()).decode()
+                await blob.stage_block(block_id=block_id, data=data)
+                block_ids.append(block_id)
+
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= _BLOCK_SIZE:
+                    await _stage(bytes(buffer[:_BLOCK_SIZE]))
+                    del buffer[:_BLOCK_SIZE]
+            if not block_ids:
+                # Smaller than one block: a single upload, as ``put`` does.
+                await blob.upload_blob(
+                    bytes(buffer), overwrite=True, content_settings=settings
+                )
+                return
+            if buffer:
+                await _stage(bytes(buffer))
+            await blob.commit_block_list(block_ids, content_settings=settings)
+
     async def open_stream(self, key: str) -> AsyncIterator[bytes]:
         async with self._service() as service:
             blob = service.get_blob_client(self._container, key)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterable, AsyncIterator
 
 
 class StorageBackend(ABC):
@@ -18,6 +18,21 @@ class StorageBackend(ABC):
     ) -> None:
         """Store ``data`` at ``key``, overwriting any existing object."""
 
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: str | None = None,
+    ) -> None:
+        """Store the concatenated ``chunks`` at ``key``, overwriting any object.
+
+        Backends override this to write chunk by chunk; this fallback buffers
+        the whole payload and defers to :meth:`put`.
+        """
+        data = b"".join([chunk async for chunk in chunks])
+        await self.put(key, data, content_type=content_type)
+
     @abstractmethod
     def open_stream(self, key: str) -> AsyncIterator[bytes]:
         """Yield the object's bytes in chunks. Raises if the key is absent."""
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from collections.abc import AsyncIterator
+import os
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
 
 from app.file_storage.backends.base import StorageBackend
@@ -38,6 +40,35 @@ class LocalFileBackend(StorageBackend):
 
         await asyncio.to_thread(_write)
 
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: str | None = None,
+    ) -> None:
+        path = self._path_for(key)
+
+        def _open():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Written beside the target and renamed into place, so readers
+            # never see a half-written object.
+            return tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f".{path.name}.", delete=False
+            )
+
+        handle = await asyncio.to_thread(_open)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, handle.name, path)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(handle.name)
+            raise
+
     async def open_stream(self, key: str) -> AsyncIterator[bytes]:
         path = self._path_for(key)
         handle = await asyncio.to_thread(path.open, "rb")
@@ -6,6 +6,7 @@ Coordinates the storage backend (bytes) with the ``document_files`` table
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 from collections.abc import AsyncIterator, Sequence
@@ -20,9 +21,13 @@ from app.file_storage.factory import get_storage_backend
 from app.file_storage.keys import build_document_file_key
 from app.file_storage.persistence.enums import DocumentFileKind
 from app.file_storage.persistence.models import DocumentFile
+from app.utils.file_io import iter_file_chunks
 
 logger = logging.getLogger(__name__)
 
+# Blob deletes are independent network calls on object-storage backends.
+PURGE_BLOB_CONCURRENCY = 16
+
 
 async def store_document_file(
     session: AsyncSession,
@@ -45,7 +50,88 @@ async def store_document_file(
         filename=filename,
     )
     await backend.put(key, data, content_type=mime_type)
+    return _add_document_file(
+        session,
+        document_id=document_id,
+        workspace_id=workspace_id,
+        kind=kind,
+        backend=backend,
+        key=key,
+        filename=filename,
+        mime_type=mime_type,
+        size_bytes=len(data),
+        checksum_sha256=hashlib.sha256(data).hexdigest(),
+        created_by_id=created_by_id,
+    )
+
 
+async def store_document_file_from_path(
+    session: AsyncSession,
+    *,
+    document_id: int,
+    workspace_id: int,
+    path: str,
+    filename: str,
+    mime_type: str | None = None,
+    kind: DocumentFileKind = DocumentFileKind.ORIGINAL,
+    created_by_id: str | UUID | None = None,
+    backend: StorageBackend | None = None,
+    checksum_sha256: str | None = None,
+) -> DocumentFile:
+    """Stream a local file to storage and add a ``DocumentFile`` row.
+
+    Peak memory is one chunk regardless of file size. Pass
+    ``checksum_sha256`` when it is already known (e.g. from the upload
+    spool); otherwise it is computed during the copy.
+    """
+    backend = backend or get_storage_backend()
+    key = build_document_file_key(
+        workspace_id=workspace_id,
+        document_id=document_id,
+        kind=kind,
+        filename=filename,
+    )
+    digest = hashlib.sha256() if checksum_sha256 is None else None
+    size = 0
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        nonlocal size
+        async for chunk in iter_file_chunks(path):
+            size += len(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            yield chunk
+
+    await backend.put_stream(key, _chunks(), content_type=mime_type)
+    return _add_document_file(
+        session,
+        document_id=document_id,
+        workspace_id=workspace_id,
+        kind=kind,
+        backend=backend,
+        key=key,
+        filename=filename,
+        mime_type=mime_type,
+        size_bytes=size,
+        checksum_sha256=checksum_sha256 or digest.hexdigest(),
+        created_by_id=created_by_id,
+    )
+
+
+def _add_document_file(
+    session: AsyncSession,
+    *,
+    document_id: int,
+    workspace_id: int,
+    kind: DocumentFileKind,
+    backend: StorageBackend,
+    key: str,
+    filename: str,
+    mime_type: str | None,
+    size_bytes: int,
+    checksum_sha256: str,
+    created_by_id: str | UUID | None,
+) -> DocumentFile:
     record = DocumentFile(
         document_id=document_id,
         workspace_id=workspace_id,
@@ -54,8 +140,8 @@ async def store_document_file(
         storage_key=key,
         original_filename=filename,
         mime_type=mime_type,
-        size_bytes=len(data),
-        checksum_sha256=hashlib.sha256(data).hexdigest(),
+        size_bytes=size_bytes,
+        checksum_sha256=checksum_sha256,
         created_by_id=created_by_id,
     )
     session.add(record)
@@ -105,12 +191,14 @@ async def purge_document_blobs(
     *,
     document_ids: Sequence[int],
     backend: StorageBackend | None = None,
+    concurrency: int = PURGE_BLOB_CONCURRENCY,
 ) -> None:
     """Delete stored blobs for the given documents.
 
     Call this before the ``document_files`` rows are removed (they cascade with
     the document). Best-effort: a failed blob delete is logged, not raised, so
-    document deletion is never blocked by an orphaned blob.
+    document deletion is never blocked by an orphaned blob. Up to
+    ``concurrency`` deletes are in flight at once.
     """
     if not document_ids:
         return
@@ -128,20 +216,29 @@ async def purge_document_blobs(
     # Video slide audio lives in object storage keyed from artifact_metadata,
     # not as ArtifactFile rows, so the join above never sees it.
     slide_audio = await _video_slide_audio_blobs(session, document_ids)
-    for backend_name, storage_key in [
-        *document_files.all(),
-        *artifact_files.all(),
-        *slide_audio,
-    ]:
-        if not storage_key:
-            continue
-        try:
-            selected_backend = backend or get_storage_backend(backend_name)
-            await selected_backend.delete(storage_key)
-        except Exception as delete_error:
-            logger.warning(
-                "Failed to delete stored blob %s: %s", storage_key, delete_error
-            )
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _delete(backend_name: str | None, storage_key: str) -> None:
+        async with semaphore:
+            try:
+                selected_backend = backend or get_storage_backend(backend_name)
+                await selected_backend.delete(storage_key)
+            except Exception as delete_error:
+                logger.warning(
+                    "Failed to delete stored blob %s: %s", storage_key, delete_error
+                )
+
+    await asyncio.gather(
+        *(
+            _delete(backend_name, storage_key)
+            for backend_name, storage_key in [
+                *document_files.all(),
+                *artifact_files.all(),
+                *slide_audio,
+            ]
+            if storage_key
+        )
+    )
 
 
 async def _video_slide_audio_blobs(
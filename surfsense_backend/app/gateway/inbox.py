@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import ExternalChatInboundEvent, ExternalChatPlatform
 
+# Postgres channel notified (on commit) for every new inbox row; the FastAPI
+# inbox worker LISTENs on it instead of polling.
+INBOX_NOTIFY_CHANNEL = "gateway_inbox"
+
 
 def telegram_event_dedupe_key(update_id: int | str) -> str:
     return f"update:{update_id}"
@@ -50,4 +55,10 @@ async def persist_inbound_event(
         .returning(ExternalChatInboundEvent.id)
     )
     result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+    inbox_id = result.scalar_one_or_none()
+    if inbox_id is not None:
+        # Transactional: delivered only if, and once, the row is committed.
+        await session.execute(
+            select(func.pg_notify(INBOX_NOTIFY_CHANNEL, str(inbox_id)))
+        )
+    return inbox_id
@@ -7,10 +7,12 @@ FastAPI calls into it after webhook and BYO long-poll intake persist inbox rows.
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import config
@@ -56,10 +58,50 @@ def _is_inactive_whatsapp_account(account: ExternalChatAccount) -> bool:
     )
 
 
+@dataclass(frozen=True)
+class ClaimedInboundEvent:
+    """An inbox row claimed for processing.
+
+    ``ordering_key`` names the conversation (account + peer) the event belongs
+    to; events sharing one must be processed in arrival order.
+    """
+
+    id: int
+    platform: str
+    ordering_key: str
+    claimed_at: float
+
+
+def inbound_ordering_key(
+    account: ExternalChatAccount | None, event: ExternalChatInboundEvent
+) -> str:
+    """Conversation key of ``event``, or a key of its own when it has none."""
+    if account is not None:
+        try:
+            adapter = resolve_platform_bundle(account).adapter
+            parsed = adapter.parse_inbound(event.raw_payload or {})
+        except Exception:
+            # Unparseable here means unparseable in dispatch too, which
+            # records the error; it just can't be ordered against anything.
+            parsed = None
+        if parsed is not None and parsed.external_peer_id is not None:
+            return f"{account.id}:{parsed.external_peer_id}"
+    return f"event:{event.id}"
+
+
 async def claim_next_inbound_event(
     session_maker: SessionMaker = async_session_maker,
-) -> int | None:
-    """Claim the oldest received inbox event for processing."""
+    *,
+    skip_keys: Collection[str] = (),
+    window: int = 1,
+) -> ClaimedInboundEvent | None:
+    """Claim the oldest received inbox event for processing.
+
+    Events of conversations in ``skip_keys`` (ones the caller already holds
+    enough of) are passed over, looking at most ``window`` rows deep: the key
+    is derived from the payload, so it can only be filtered here. The rows
+    passed over are only locked until this claim commits.
+    """
 
     async with session_maker() as session:
         result = await session.execute(
@@ -67,15 +109,57 @@ async def claim_next_inbound_event(
             .where(ExternalChatInboundEvent.status == ExternalChatEventStatus.RECEIVED)
             .order_by(ExternalChatInboundEvent.received_at.asc())
             .with_for_update(skip_locked=True)
-            .limit(1)
+            .limit(max(1, window) if skip_keys else 1)
+        )
+        for event in result.scalars().all():
+            account = await session.get(ExternalChatAccount, event.account_id)
+            ordering_key = inbound_ordering_key(account, event)
+            if ordering_key in skip_keys:
+                continue
+            event.status = ExternalChatEventStatus.PROCESSING
+            event.attempt_count += 1
+            claimed = ClaimedInboundEvent(
+                id=int(event.id),
+                platform=event.platform.value,
+                ordering_key=ordering_key,
+                claimed_at=time.monotonic(),
+            )
+            await session.commit()
+            return claimed
+        await session.rollback()
+        return None
+
+
+async def release_claimed_inbound_events(
+    inbox_ids: list[int],
+    session_maker: SessionMaker = async_session_maker,
+) -> None:
+    """Hand claimed-but-unstarted events back to the queue."""
+    if not inbox_ids:
+        return
+    async with session_maker() as session:
+        await session.execute(
+            update(ExternalChatInboundEvent)
+            .where(
+                ExternalChatInboundEvent.id.in_(inbox_ids),
+                ExternalChatInboundEvent.status == ExternalChatEventStatus.PROCESSING,
+            )
+            .values(status=ExternalChatEventStatus.RECEIVED)
         )
-        event = result.scalars().first()
-        if event is None:
-            return None
-        event.status = ExternalChatEventStatus.PROCESSING
-        event.attempt_count += 1
         await session.commit()
-        return int(event.id)
+
+
+async def count_received_inbound_events(
+    session_maker: SessionMaker = async_session_maker,
+) -> int:
+    """Number of inbox events waiting to be claimed."""
+    async with session_maker() as session:
+        result = await session.execute(
+            select(func.count())
+            .select_from(ExternalChatInboundEvent)
+            .where(ExternalChatInboundEvent.status == ExternalChatEventStatus.RECEIVED)
+        )
+        return int(result.scalar_one())
 
 
 async def process_inbound_event(
@@ -1,41 +1,278 @@
-"""FastAPI lifespan worker for gateway inbox processing."""
+"""FastAPI lifespan worker pool for gateway inbox processing.
+
+A dispatcher claims received inbox rows oldest-first and hands each to the
+lane of its conversation. Lanes run concurrently, at most
+``GATEWAY_INBOX_WORKER_CONCURRENCY`` agent turns at a time, so one slow turn no
+longer holds up every other user's message; within a lane events run strictly
+in arrival order. A conversation holds at most ``_LANE_CLAIM_CAP`` claims
+(one running, one queued): the dispatcher claims past a busy conversation's
+backlog instead of filling every claim slot with it. The dispatcher sleeps until ``persist_inbound_event``'s
+NOTIFY wakes it, polling only as a safety net for missed notifications.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import Counter, deque
 from contextlib import suppress
 
+import asyncpg
+from sqlalchemy.engine import make_url
+
 from app.config import config
-from app.gateway.inbox_processor import claim_next_inbound_event, process_inbound_event
+from app.gateway.inbox import INBOX_NOTIFY_CHANNEL
+from app.gateway.inbox_processor import (
+    ClaimedInboundEvent,
+    claim_next_inbound_event,
+    count_received_inbound_events,
+    process_inbound_event,
+    release_claimed_inbound_events,
+)
+from app.observability.metrics import (
+    record_gateway_inbox_backlog,
+    record_gateway_inbox_claim_to_start,
+    record_gateway_inbox_pending_delta,
+)
 
 logger = logging.getLogger(__name__)
 
 _task: asyncio.Task[None] | None = None
 
+# Poll interval while no LISTEN connection is up (disabled or reconnecting).
+_FALLBACK_POLL_SECONDS = 0.5
+_BACKLOG_SAMPLE_SECONDS = 15.0
+_THREAD_BUSY_BACKOFF_SECONDS = 1.0
+_LISTEN_MAX_BACKOFF_SECONDS = 60.0
+# Claims one conversation may hold in this process: one running, one queued.
+_LANE_CLAIM_CAP = 2
+# Received rows a claim looks through to get past held conversations.
+_CLAIM_WINDOW = 32
 
-async def _process_inbox_forever() -> None:
-    logger.info("Gateway inbox processor started in FastAPI process")
+
+class _InboxWorkerPool:
+    """Per-conversation lanes over a bounded number of concurrent turns."""
+
+    def __init__(self, concurrency: int) -> None:
+        self._running = asyncio.Semaphore(concurrency)
+        # Claimed-but-unfinished events in all lanes; bounds what this process
+        # pulls off the queue ahead of other processes.
+        self._claimable = asyncio.Semaphore(concurrency * 2)
+        self._lanes: dict[str, deque[ClaimedInboundEvent]] = {}
+        # Claimed-but-unfinished events per conversation.
+        self._held: Counter[str] = Counter()
+        self._lane_tasks: set[asyncio.Task[None]] = set()
+        self._wakeup = asyncio.Event()
+        self._next_backlog_sample = 0.0
+        self.listening = False
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def dispatch_forever(self) -> None:
+        while True:
+            await self._claimable.acquire()
+            # Cleared before the claim, so a NOTIFY that lands while the
+            # claim finds nothing still ends the wait below.
+            self._wakeup.clear()
+            try:
+                claimed = await claim_next_inbound_event(
+                    skip_keys=self._full_lanes(), window=_CLAIM_WINDOW
+                )
+            except asyncio.CancelledError:
+                self._claimable.release()
+                raise
+            except Exception:
+                self._claimable.release()
+                logger.exception("Gateway inbox processor failed to claim an event")
+                await asyncio.sleep(1)
+                continue
+
+            await self._sample_backlog()
+            if claimed is None:
+                self._claimable.release()
+                poll = (
+                    config.GATEWAY_INBOX_POLL_SECONDS
+                    if self.listening
+                    else _FALLBACK_POLL_SECONDS
+                )
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=poll)
+                continue
+
+            self._enqueue(claimed)
+
+    def _full_lanes(self) -> set[str]:
+        return {key for key, held in self._held.items() if held >= _LANE_CLAIM_CAP}
+
+    def _unhold(self, key: str) -> None:
+        self._claimable.release()
+        self._held[key] -= 1
+        if self._held[key] <= 0:
+            del self._held[key]
+        # The conversation may have been skipped by a claim that found nothing.
+        self.wake()
+
+    def _enqueue(self, claimed: ClaimedInboundEvent) -> None:
+        record_gateway_inbox_pending_delta(1)
+        self._held[claimed.ordering_key] += 1
+        lane = self._lanes.get(claimed.ordering_key)
+        if lane is not None:
+            lane.append(claimed)
+            return
+        self._lanes[claimed.ordering_key] = deque([claimed])
+        task = asyncio.create_task(
+            self._drain(claimed.ordering_key), name="gateway-inbox-lane"
+        )
+        self._lane_tasks.add(task)
+        task.add_done_callback(self._lane_tasks.discard)
+
+    async def _drain(self, key: str) -> None:
+        lane = self._lanes[key]
+        try:
+            while lane:
+                claimed = lane.popleft()
+                try:
+                    async with self._running:
+                        record_gateway_inbox_pending_delta(-1)
+                        busy = await _process_one(claimed)
+                    if busy:
+                        # Another process holds this conversation: hand back
+                        # what is queued behind the busy event so the retry
+                        # re-claims them all in arrival order. Still held
+                        # meanwhile, so nothing later is claimed ahead of them.
+                        await self._release(lane)
+                finally:
+                    self._unhold(key)
+                if busy:
+                    # Give the holder a moment.
+                    await asyncio.sleep(_THREAD_BUSY_BACKOFF_SECONDS)
+        finally:
+            del self._lanes[key]
+
+    async def _release(self, lane: deque[ClaimedInboundEvent]) -> None:
+        held = list(lane)
+        lane.clear()
+        try:
+            await release_claimed_inbound_events([claimed.id for claimed in held])
+        except Exception:
+            # The stale-processing reconcile returns them to the queue later.
+            logger.warning(
+                "Failed to release claimed gateway inbox events", exc_info=True
+            )
+        finally:
+            for claimed in held:
+                record_gateway_inbox_pending_delta(-1)
+                self._unhold(claimed.ordering_key)
+
+    async def _sample_backlog(self) -> None:
+        now = time.monotonic()
+        if now < self._next_backlog_sample:
+            return
+        self._next_backlog_sample = now + _BACKLOG_SAMPLE_SECONDS
+        try:
+            record_gateway_inbox_backlog(await count_received_inbound_events())
+        except Exception:
+            logger.debug("Failed to sample gateway inbox backlog", exc_info=True)
+
+    async def shutdown(self) -> None:
+        queued = [claimed.id for lane in self._lanes.values() for claimed in lane]
+        for task in self._lane_tasks:
+            task.cancel()
+        await asyncio.gather(*self._lane_tasks, return_exceptions=True)
+        if queued:
+            with suppress(Exception):
+                # Events never started go straight back instead of waiting
+                # out the stale-processing reconcile.
+                await release_claimed_inbound_events(queued)
+
+
+async def _process_one(claimed: ClaimedInboundEvent) -> bool:
+    """Process one claimed event; ``True`` when its thread was busy elsewhere."""
+    record_gateway_inbox_claim_to_start(
+        (time.monotonic() - claimed.claimed_at) * 1000, platform=claimed.platform
+    )
+    try:
+        logger.info("Gateway processing inbox_id=%s", claimed.id)
+        await process_inbound_event(claimed.id)
+        logger.info("Gateway processed inbox_id=%s", claimed.id)
+    except asyncio.CancelledError:
+        raise
+    except RuntimeError as exc:
+        if str(exc) == "gateway_thread_busy":
+            logger.info("Gateway inbox_id busy; will retry from RECEIVED state")
+            return True
+        logger.exception("Gateway inbox processor failed inbox_id=%s", claimed.id)
+    except Exception:
+        logger.exception("Gateway inbox processor failed inbox_id=%s", claimed.id)
+    return False
+
+
+async def _listen_for_inbox_writes(pool: _InboxWorkerPool) -> None:
+    """Wake ``pool`` on every inbox NOTIFY, reconnecting with backoff."""
+    dsn = (
+        make_url(config.DATABASE_URL)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+    delay = 1.0
     while True:
         try:
-            inbox_id = await claim_next_inbound_event()
-            if inbox_id is None:
-                await asyncio.sleep(0.5)
-                continue
-            logger.info("Gateway processing inbox_id=%s", inbox_id)
-            await process_inbound_event(inbox_id)
-            logger.info("Gateway processed inbox_id=%s", inbox_id)
+            connection = await asyncpg.connect(dsn)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(
+                "Gateway inbox LISTEN connection failed (%s); polling, retry in %.0fs",
+                exc,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _LISTEN_MAX_BACKOFF_SECONDS)
+            continue
+
+        delay = 1.0
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _connection, lost=lost: lost.set())
+        try:
+            await connection.add_listener(
+                INBOX_NOTIFY_CHANNEL, lambda *_notification: pool.wake()
+            )
+            pool.listening = True
+            # Rows written while nobody was listening produced no wakeup.
+            pool.wake()
+            await lost.wait()
+            logger.warning("Gateway inbox LISTEN connection lost; reconnecting")
         except asyncio.CancelledError:
             raise
-        except RuntimeError as exc:
-            if str(exc) == "gateway_thread_busy":
-                logger.info("Gateway inbox_id busy; will retry from RECEIVED state")
-            else:
-                logger.exception("Gateway inbox processor failed one iteration")
-            await asyncio.sleep(1)
         except Exception:
-            logger.exception("Gateway inbox processor failed one iteration")
-            await asyncio.sleep(1)
+            logger.warning("Gateway inbox LISTEN failed; reconnecting", exc_info=True)
+        finally:
+            pool.listening = False
+            connection.terminate()
+
+
+async def _process_inbox_forever() -> None:
+    concurrency = max(1, config.GATEWAY_INBOX_WORKER_CONCURRENCY)
+    logger.info(
+        "Gateway inbox processor started in FastAPI process (concurrency=%d)",
+        concurrency,
+    )
+    pool = _InboxWorkerPool(concurrency)
+    listener: asyncio.Task[None] | None = None
+    if config.GATEWAY_INBOX_NOTIFY_ENABLED:
+        listener = asyncio.create_task(
+            _listen_for_inbox_writes(pool), name="gateway-inbox-listener"
+        )
+    try:
+        await pool.dispatch_forever()
+    finally:
+        if listener is not None:
+            listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await listener
+        await pool.shutdown()
 
 
 async def start_gateway_inbox_worker() -> None:
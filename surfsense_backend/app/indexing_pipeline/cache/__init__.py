@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 from app.indexing_pipeline.cache.cached_indexing import build_chunk_embeddings
-from app.indexing_pipeline.cache.service import EmbeddingCacheService
+from app.indexing_pipeline.cache.service import (
+    ChunkVectorCacheService,
+    EmbeddingCacheService,
+)
 
 __all__ = [
+    "ChunkVectorCacheService",
     "EmbeddingCacheService",
     "build_chunk_embeddings",
 ]
@@ -2,7 +2,9 @@
 
 Embeddings are a pure function of the markdown, the embedding model, and the
 chunker -- so identical markdown is chunked and embedded once and reused across
-workspaces, even when it came from different sources.
+workspaces, even when it came from different sources. Below that, every text
+passed to :func:`embed_batch` is looked up by its own hash, so an edited
+document or a templated page only embeds the chunks not seen before.
 """
 
 from __future__ import annotations
@@ -17,7 +19,10 @@ import numpy as np
 from app.config import config
 from app.indexing_pipeline.cache.eligibility import is_embedding_cacheable
 from app.indexing_pipeline.cache.schemas import CachedChunk, EmbeddingKey, EmbeddingSet
-from app.indexing_pipeline.cache.service import EmbeddingCacheService
+from app.indexing_pipeline.cache.service import (
+    ChunkVectorCacheService,
+    EmbeddingCacheService,
+)
 from app.indexing_pipeline.cache.settings import load_embedding_cache_settings
 from app.indexing_pipeline.document_chunker import (
     LineChunk,
@@ -26,6 +31,7 @@ from app.indexing_pipeline.document_chunker import (
     chunk_text_hybrid,
 )
 from app.indexing_pipeline.document_embedder import embed_texts
+from app.indexing_pipeline.embedding_batcher import embed_coalesced
 from app.observability import metrics
 
 logger = logging.getLogger(__name__)
@@ -43,9 +49,14 @@ class EmbeddedChunk:
     embedding: np.ndarray
 
 
+#: The document-level vector and the ordered chunks, as ``build_chunk_embeddings``
+#: returns them.
+ChunkEmbeddings = tuple[np.ndarray, list[EmbeddedChunk]]
+
+
 async def build_chunk_embeddings(
     markdown: str, *, use_code_chunker: bool
-) -> tuple[np.ndarray, list[EmbeddedChunk]]:
+) -> ChunkEmbeddings:
     """Return the document-level vector and the ordered chunks to persist.
 
     Drop-in for the inline chunk+embed step; reuses prior output when the same
@@ -117,8 +128,41 @@ async def chunk_markdown_with_lines(
 
 
 async def embed_batch(texts: list[str]) -> list[np.ndarray]:
-    """Embed texts in one batch off the event loop."""
-    return await asyncio.to_thread(embed_texts, texts)
+    """Embed texts off the event loop, batched with concurrent callers.
+
+    Texts already embedded by the current model (in any document or workspace)
+    are served from the per-chunk vector cache; only the rest reach the model,
+    each distinct text once.
+    """
+    settings = load_embedding_cache_settings()
+    embedding_dim = getattr(config.embedding_model_instance, "dimension", None)
+    cacheable = is_embedding_cacheable(
+        cache_enabled=settings.vector_cache_enabled,
+        embedding_model=config.EMBEDDING_MODEL,
+        embedding_dim=embedding_dim,
+    )
+    if not cacheable or not texts:
+        return await embed_coalesced(texts, embed_texts)
+
+    hashes = [_hash_text(text) for text in texts]
+    vectors = await _recall_vectors(hashes, int(embedding_dim))
+
+    # Dict keeps first-seen order, so the model sees each new text once.
+    misses = dict(zip(hashes, texts, strict=True))
+    for sha in vectors:
+        misses.pop(sha, None)
+    metrics.record_embedding_vector_cache_lookup(
+        hits=len(texts) - sum(1 for sha in hashes if sha in misses),
+        misses=len(misses),
+        embedding_model=config.EMBEDDING_MODEL,
+    )
+
+    if misses:
+        embedded = await embed_coalesced(list(misses.values()), embed_texts)
+        fresh = dict(zip(misses, embedded, strict=True))
+        await _remember_vectors(fresh, int(embedding_dim))
+        vectors.update(fresh)
+    return [vectors[sha] for sha in hashes]
 
 
 async def _compute(
@@ -158,6 +202,41 @@ async def _remember(
         logger.warning("Embedding cache write failed; result not cached", exc_info=True)
 
 
+async def _recall_vectors(
+    hashes: list[str], embedding_dim: int
+) -> dict[str, np.ndarray]:
+    try:
+        from app.tasks.celery_tasks import get_celery_session_maker
+
+        async with get_celery_session_maker()() as session:
+            return await ChunkVectorCacheService(
+                session,
+                embedding_model=config.EMBEDDING_MODEL,
+                embedding_dim=embedding_dim,
+            ).recall_many(sorted(set(hashes)))
+    except Exception:
+        logger.warning(
+            "Chunk vector cache recall failed; embedding fresh", exc_info=True
+        )
+        return {}
+
+
+async def _remember_vectors(vectors: dict[str, np.ndarray], embedding_dim: int) -> None:
+    try:
+        from app.tasks.celery_tasks import get_celery_session_maker
+
+        async with get_celery_session_maker()() as session:
+            await ChunkVectorCacheService(
+                session,
+                embedding_model=config.EMBEDDING_MODEL,
+                embedding_dim=embedding_dim,
+            ).remember_many(vectors)
+    except Exception:
+        logger.warning(
+            "Chunk vector cache write failed; vectors not cached", exc_info=True
+        )
+
+
 def _with_line_spans(markdown: str, pairs: list[ChunkPair]) -> list[EmbeddedChunk]:
     spans = attach_line_spans(markdown, [text for text, _ in pairs])
     return [
@@ -1,4 +1,4 @@
-"""Celery task that prunes the embedding cache by TTL, then by size budget."""
+"""Celery task that prunes the embedding caches by TTL, then by size budget."""
 
 from __future__ import annotations
 
@@ -9,8 +9,14 @@ from datetime import UTC, datetime, timedelta
 from app.celery_app import celery_app
 from app.etl_pipeline.cache.eviction.policy import select_over_budget
 from app.etl_pipeline.cache.schemas import EvictionCandidate
-from app.indexing_pipeline.cache.persistence import CachedEmbeddingSetRepository
-from app.indexing_pipeline.cache.settings import load_embedding_cache_settings
+from app.indexing_pipeline.cache.persistence import (
+    CachedChunkVectorRepository,
+    CachedEmbeddingSetRepository,
+)
+from app.indexing_pipeline.cache.settings import (
+    EmbeddingCacheSettings,
+    load_embedding_cache_settings,
+)
 from app.indexing_pipeline.cache.storage import EmbeddingCacheStore
 from app.observability import metrics
 from app.tasks.celery_tasks import get_celery_session_maker, run_async_celery_task
@@ -26,6 +32,8 @@ def evict_embedding_cache_task():
 async def _evict() -> None:
     """Expire stale entries, then shed the coldest overflow only if still over budget."""
     settings = load_embedding_cache_settings()
+    if settings.vector_cache_enabled:
+        await _evict_vectors(settings)
     if not settings.enabled:
         return
 
@@ -66,3 +74,37 @@ async def _drop(
     await index.delete_by_ids([candidate.id for candidate in candidates])
     metrics.record_embedding_cache_eviction(len(candidates), phase=phase)
     logger.info("Evicted %d cached embedding sets (%s)", len(candidates), phase)
+
+
+async def _evict_vectors(settings: EmbeddingCacheSettings) -> None:
+    async with get_celery_session_maker()() as session:
+        index = CachedChunkVectorRepository(session)
+
+        cutoff = datetime.now(UTC) - timedelta(days=settings.ttl_days)
+        expired = await index.select_expired(
+            cutoff=cutoff, limit=settings.eviction_batch
+        )
+        await _drop_vectors(index, expired, phase="ttl")
+
+        total = await index.total_size_bytes()
+        if total > settings.vector_max_total_bytes:
+            coldest = await index.select_coldest(limit=settings.eviction_batch)
+            over_budget = select_over_budget(
+                coldest,
+                current_total_bytes=total,
+                max_total_bytes=settings.vector_max_total_bytes,
+            )
+            await _drop_vectors(index, over_budget, phase="size")
+
+
+async def _drop_vectors(
+    index: CachedChunkVectorRepository,
+    candidates: list[EvictionCandidate],
+    *,
+    phase: str,
+) -> None:
+    if not candidates:
+        return
+    await index.delete_by_ids([candidate.id for candidate in candidates])
+    metrics.record_embedding_cache_eviction(len(candidates), phase=phase)
+    logger.info("Evicted %d cached chunk vectors (%s)", len(candidates), phase)
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from .models import CachedEmbeddingSet
-from .repository import CachedEmbeddingSetRepository
+from .models import CachedChunkVector, CachedEmbeddingSet
+from .repository import CachedChunkVectorRepository, CachedEmbeddingSetRepository
 
 __all__ = [
+    "CachedChunkVector",
+    "CachedChunkVectorRepository",
     "CachedEmbeddingSet",
     "CachedEmbeddingSetRepository",
 ]
@@ -1,13 +1,20 @@
-"""``embedding_cache_sets``: one reusable chunk+embedding set per markdown."""
+"""Embedding-cache index tables.
+
+``embedding_cache_sets``: one reusable chunk+embedding set per markdown.
+``embedding_cache_vectors``: one reusable vector per chunk text.
+"""
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+
 from sqlalchemy import (
     BigInteger,
     Column,
     DateTime,
     Index,
     Integer,
+    LargeBinary,
     String,
     UniqueConstraint,
 )
@@ -45,3 +52,44 @@ class CachedEmbeddingSet(BaseModel, TimestampMixin):
         ),
         Index("ix_embedding_cache_sets_last_used_at", "last_used_at"),
     )
+
+
+class CachedChunkVector(BaseModel, TimestampMixin):
+    """A single text's vector, shared by every document that contains the text.
+
+    The per-markdown tier misses whenever one paragraph changes; this tier still
+    serves every unchanged chunk, and boilerplate that recurs across documents
+    and workspaces. Vectors are small enough to live in the row itself.
+    """
+
+    __tablename__ = "embedding_cache_vectors"
+
+    # Key: the exact text that was embedded + the model that embedded it.
+    text_sha256 = Column(String(64), nullable=False)
+    embedding_model = Column(String(255), nullable=False)
+    embedding_dim = Column(Integer, nullable=False)
+
+    # Little-endian float32, ``embedding_dim`` values.
+    vector = Column(LargeBinary, nullable=False)
+
+    # Drives eviction (popularity + recency).
+    times_reused = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+    # Overrides the mixin's index=True column so the index below is the only
+    # one declared for it (same name, so the two would otherwise collide).
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "text_sha256",
+            "embedding_model",
+            "embedding_dim",
+            name="uq_embedding_cache_vectors_key",
+        ),
+        Index("ix_embedding_cache_vectors_last_used_at", "last_used_at"),
+        Index("ix_embedding_cache_vectors_created_at", "created_at"),
+    )
@@ -1,8 +1,8 @@
-"""CRUD and eviction selectors for ``embedding_cache_sets`` (no business rules)."""
+"""CRUD and eviction selectors for the embedding-cache tables (no business rules)."""
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import delete, func, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -11,7 +11,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.etl_pipeline.cache.schemas import EvictionCandidate
 from app.indexing_pipeline.cache.schemas import EmbeddingKey
 
-from .models import CachedEmbeddingSet
+from .models import CachedChunkVector, CachedEmbeddingSet
+
+# Keeps each statement well under Postgres' 32767 bind-parameter limit.
+_VECTOR_BATCH = 1000
+
+# A hot row is rewritten at most this often; eviction TTLs are in days, so
+# ``last_used_at`` stays accurate enough and ``times_reused`` counts the
+# windows a row was used in rather than every hit.
+_TOUCH_INTERVAL = timedelta(hours=1)
 
 _EVICTION_COLUMNS = (
     CachedEmbeddingSet.id,
@@ -21,6 +29,15 @@ _EVICTION_COLUMNS = (
     CachedEmbeddingSet.times_reused,
 )
 
+# Vectors live inline, so the text hash stands in for a blob storage key.
+_VECTOR_EVICTION_COLUMNS = (
+    CachedChunkVector.id,
+    CachedChunkVector.text_sha256.label("storage_key"),
+    func.octet_length(CachedChunkVector.vector).label("size_bytes"),
+    CachedChunkVector.last_used_at,
+    CachedChunkVector.times_reused,
+)
+
 
 def _as_eviction_candidate(row) -> EvictionCandidate:
     return EvictionCandidate(
@@ -79,12 +96,16 @@ class CachedEmbeddingSetRepository:
         await self._session.commit()
 
     async def mark_used(self, row_id: int) -> None:
+        now = datetime.now(UTC)
         await self._session.execute(
             update(CachedEmbeddingSet)
-            .where(CachedEmbeddingSet.id == row_id)
+            .where(
+                CachedEmbeddingSet.id == row_id,
+                CachedEmbeddingSet.last_used_at < now - _TOUCH_INTERVAL,
+            )
             .values(
                 times_reused=CachedEmbeddingSet.times_reused + 1,
-                last_used_at=datetime.now(UTC),
+                last_used_at=now,
             )
         )
         await self._session.commit()
@@ -124,3 +145,117 @@ class CachedEmbeddingSetRepository:
             delete(CachedEmbeddingSet).where(CachedEmbeddingSet.id.in_(ids))
         )
         await self._session.commit()
+
+
+class CachedChunkVectorRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_many(
+        self, *, embedding_model: str, embedding_dim: int, text_sha256s: list[str]
+    ) -> dict[str, tuple[int, bytes]]:
+        """Map each cached hash to its ``(row id, vector bytes)``."""
+        found: dict[str, tuple[int, bytes]] = {}
+        for start in range(0, len(text_sha256s), _VECTOR_BATCH):
+            result = await self._session.execute(
+                select(
+                    CachedChunkVector.id,
+                    CachedChunkVector.text_sha256,
+                    CachedChunkVector.vector,
+                ).where(
+                    CachedChunkVector.embedding_model == embedding_model,
+                    CachedChunkVector.embedding_dim == embedding_dim,
+                    CachedChunkVector.text_sha256.in_(
+                        text_sha256s[start : start + _VECTOR_BATCH]
+                    ),
+                )
+            )
+            found.update((row.text_sha256, (row.id, row.vector)) for row in result)
+        return found
+
+    async def insert_many(
+        self,
+        *,
+        embedding_model: str,
+        embedding_dim: int,
+        vectors: dict[str, bytes],
+    ) -> None:
+        # Concurrent writers embed identical text, so a lost race is harmless.
+        if not vectors:
+            return
+        now = datetime.now(UTC)
+        rows = [
+            {
+                "text_sha256": text_sha256,
+                "embedding_model": embedding_model,
+                "embedding_dim": embedding_dim,
+                "vector": vector,
+                "times_reused": 0,
+                "last_used_at": now,
+                "created_at": now,
+            }
+            for text_sha256, vector in vectors.items()
+        ]
+        for start in range(0, len(rows), _VECTOR_BATCH):
+            await self._session.execute(
+                pg_insert(CachedChunkVector)
+                .values(rows[start : start + _VECTOR_BATCH])
+                .on_conflict_do_nothing(constraint="uq_embedding_cache_vectors_key")
+            )
+        await self._session.commit()
+
+    async def mark_used(self, row_ids: list[int]) -> None:
+        if not row_ids:
+            return
+        now = datetime.now(UTC)
+        for start in range(0, len(row_ids), _VECTOR_BATCH):
+            await self._session.execute(
+                update(CachedChunkVector)
+                .where(
+                    CachedChunkVector.id.in_(row_ids[start : start + _VECTOR_BATCH]),
+                    CachedChunkVector.last_used_at < now - _TOUCH_INTERVAL,
+                )
+                .values(
+                    times_reused=CachedChunkVector.times_reused + 1,
+                    last_used_at=now,
+                )
+            )
+        await self._session.commit()
+
+    async def total_size_bytes(self) -> int:
+        result = await self._session.execute(
+            select(
+                func.coalesce(func.sum(func.octet_length(CachedChunkVector.vector)), 0)
+            )
+        )
+        return int(result.scalar() or 0)
+
+    async def select_expired(
+        self, *, cutoff: datetime, limit: int
+    ) -> list[EvictionCandidate]:
+        result = await self._session.execute(
+            select(*_VECTOR_EVICTION_COLUMNS)
+            .where(CachedChunkVector.last_used_at < cutoff)
+            .order_by(CachedChunkVector.last_used_at.asc())
+            .limit(limit)
+        )
+        return [_as_eviction_candidate(row) for row in result]
+
+    async def select_coldest(self, *, limit: int) -> list[EvictionCandidate]:
+        result = await self._session.execute(
+            select(*_VECTOR_EVICTION_COLUMNS)
+            .order_by(
+                CachedChunkVector.times_reused.asc(),
+                CachedChunkVector.last_used_at.asc(),
+            )
+            .limit(limit)
+        )
+        return [_as_eviction_candidate(row) for row in result]
+
+    async def delete_by_ids(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        await self._session.execute(
+            delete(CachedChunkVector).where(CachedChunkVector.id.in_(ids))
+        )
+        await self._session.commit()
@@ -1,12 +1,17 @@
-"""Recall and remember embedding sets, coordinating the index and blob store."""
+"""Recall and remember cached embeddings: whole sets (index + blob store) and
+single chunk vectors (stored inline in Postgres)."""
 
 from __future__ import annotations
 
 import logging
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.indexing_pipeline.cache.persistence import CachedEmbeddingSetRepository
+from app.indexing_pipeline.cache.persistence import (
+    CachedChunkVectorRepository,
+    CachedEmbeddingSetRepository,
+)
 from app.indexing_pipeline.cache.schemas import EmbeddingKey, EmbeddingSet
 from app.indexing_pipeline.cache.storage import EmbeddingCacheStore
 
@@ -36,7 +41,11 @@ class EmbeddingCacheService:
             logger.warning("Cached embedding dimension mismatch: %s", row.storage_key)
             return None
 
-        await self._index.mark_used(row.id)
+        try:
+            await self._index.mark_used(row.id)
+        except Exception:
+            # Recency bookkeeping only; the recalled set is still good.
+            logger.warning("Embedding cache touch failed", exc_info=True)
         return embedding_set
 
     async def remember(self, key: EmbeddingKey, embedding_set: EmbeddingSet) -> None:
@@ -49,3 +58,51 @@ class EmbeddingCacheService:
             size_bytes=size_bytes,
             chunk_count=embedding_set.chunk_count,
         )
+
+
+class ChunkVectorCacheService:
+    """Per-text vectors for one embedding model, keyed by the text's sha256."""
+
+    def __init__(
+        self, session: AsyncSession, *, embedding_model: str, embedding_dim: int
+    ) -> None:
+        self._index = CachedChunkVectorRepository(session)
+        self._embedding_model = embedding_model
+        self._embedding_dim = embedding_dim
+
+    async def recall_many(self, text_sha256s: list[str]) -> dict[str, np.ndarray]:
+        """Return the cached vector for every hash that has one."""
+        rows = await self._index.get_many(
+            embedding_model=self._embedding_model,
+            embedding_dim=self._embedding_dim,
+            text_sha256s=text_sha256s,
+        )
+        vectors: dict[str, np.ndarray] = {}
+        used_ids: list[int] = []
+        for text_sha256, (row_id, raw) in rows.items():
+            vector = np.frombuffer(raw, dtype="<f4")
+            if vector.shape[0] != self._embedding_dim:
+                # Truncated or foreign row; re-embed rather than serve it.
+                logger.warning(
+                    "Cached chunk vector dimension mismatch: %s", text_sha256
+                )
+                continue
+            vectors[text_sha256] = vector.astype(np.float32)
+            used_ids.append(row_id)
+        try:
+            await self._index.mark_used(used_ids)
+        except Exception:
+            # Recency bookkeeping only; the recalled vectors are still good.
+            logger.warning("Chunk vector cache touch failed", exc_info=True)
+        return vectors
+
+    async def remember_many(self, vectors: dict[str, np.ndarray]) -> None:
+        """Store freshly embedded vectors for future reuse."""
+        await self._index.insert_many(
+            embedding_model=self._embedding_model,
+            embedding_dim=self._embedding_dim,
+            vectors={
+                text_sha256: np.asarray(vector, dtype="<f4").tobytes()
+                for text_sha256, vector in vectors.items()
+            },
+        )
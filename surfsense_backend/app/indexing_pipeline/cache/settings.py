@@ -16,6 +16,8 @@ class EmbeddingCacheSettings:
     ttl_days: int
     max_total_bytes: int
     eviction_batch: int
+    vector_cache_enabled: bool
+    vector_max_total_bytes: int
 
 
 def load_embedding_cache_settings() -> EmbeddingCacheSettings:
@@ -27,4 +29,6 @@ def load_embedding_cache_settings() -> EmbeddingCacheSettings:
         ttl_days=config.EMBEDDING_CACHE_TTL_DAYS,
         max_total_bytes=config.EMBEDDING_CACHE_MAX_TOTAL_MB * 1024 * 1024,
         eviction_batch=config.EMBEDDING_CACHE_EVICTION_BATCH,
+        vector_cache_enabled=config.EMBEDDING_VECTOR_CACHE_ENABLED,
+        vector_max_total_bytes=config.EMBEDDING_VECTOR_CACHE_MAX_TOTAL_MB * 1024 * 1024,
     )
@@ -0,0 +1,169 @@
+"""Per-process micro-batcher for embedding calls.
+
+``index_batch_parallel`` and the knowledge-store converge index several
+documents at once, and each document embeds its own ``[markdown, *chunks]``: a
+worker syncing hundreds of short Slack or Notion pages sends hundreds of tiny
+batches to the model or API. Calls that arrive within
+``EMBEDDING_MICROBATCH_MAX_WAIT_MS`` of each other are coalesced into batches of
+up to ``EMBEDDING_MICROBATCH_MAX_SIZE`` texts instead, and every caller gets
+back exactly its own vectors, in order.
+
+Batches are keyed by event loop (Celery runs each task on its own) and by the
+embed function itself, so a caller that swaps the function — tests patching
+``embed_texts`` — is never grouped with one that did not.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import config
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], list[Any]]
+
+
+@dataclass
+class _Request:
+    texts: list[str]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _Pending:
+    requests: list[_Request] = field(default_factory=list)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent ``embed(texts)`` calls into fewer, fuller batches.
+
+    A batch is sent when it reaches ``max_batch_size`` texts or when its oldest
+    caller has waited ``max_wait_ms``, whichever comes first. A request larger
+    than ``max_batch_size`` is split across consecutive calls.
+    """
+
+    def __init__(self, *, max_batch_size: int, max_wait_ms: float) -> None:
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: dict[tuple[asyncio.AbstractEventLoop, EmbedFn], _Pending] = {}
+        self._running: set[asyncio.Task] = set()
+
+    async def embed(self, texts: list[str], embed: EmbedFn) -> list[Any]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        key = (loop, embed)
+        pending = self._pending.setdefault(key, _Pending())
+        future = loop.create_future()
+        pending.requests.append(_Request(list(texts), future, time.perf_counter()))
+        pending.size += len(texts)
+        if pending.size >= self._max_batch_size:
+            self._flush(key)
+        elif pending.timer is None:
+            pending.timer = loop.call_later(self._max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple[asyncio.AbstractEventLoop, EmbedFn]) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        loop, embed = key
+        task = loop.create_task(self._run(embed, pending.requests))
+        # Held so the task is not garbage-collected while it runs.
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, embed: EmbedFn, requests: list[_Request]) -> None:
+        started = time.perf_counter()
+        for request in requests:
+            metrics.record_embedding_batch_wait((started - request.enqueued_at) * 1000)
+        try:
+            texts = [text for request in requests for text in request.texts]
+            try:
+                vectors = await self._call(embed, texts)
+            except Exception:
+                if len(requests) == 1:
+                    raise
+                # One caller's bad input must not fail the callers grouped with
+                # it: re-run each on its own so every one gets its own outcome.
+                logger.debug(
+                    "Coalesced embedding batch failed; retrying %d callers alone",
+                    len(requests),
+                    exc_info=True,
+                )
+                for request in requests:
+                    await self._run_alone(embed, request)
+                return
+            offset = 0
+            for request in requests:
+                end = offset + len(request.texts)
+                _resolve(request, vectors[offset:end])
+                offset = end
+        except Exception as exc:
+            for request in requests:
+                _fail(request, exc)
+        finally:
+            # Cancelled mid-call (loop shutdown): nobody may wait forever.
+            for request in requests:
+                if not request.future.done():
+                    request.future.cancel()
+
+    async def _run_alone(self, embed: EmbedFn, request: _Request) -> None:
+        try:
+            vectors = await self._call(embed, request.texts)
+        except Exception as exc:
+            _fail(request, exc)
+        else:
+            _resolve(request, vectors)
+
+    async def _call(self, embed: EmbedFn, texts: list[str]) -> list[Any]:
+        vectors: list[Any] = []
+        for start in range(0, len(texts), self._max_batch_size):
+            batch = texts[start : start + self._max_batch_size]
+            metrics.record_embedding_batch_size(
+                len(batch), embedding_model=config.EMBEDDING_MODEL
+            )
+            vectors.extend(await asyncio.to_thread(embed, batch))
+        return vectors
+
+
+def _resolve(request: _Request, vectors: list[Any]) -> None:
+    if not request.future.done():
+        request.future.set_result(vectors)
+
+
+def _fail(request: _Request, exc: BaseException) -> None:
+    if not request.future.done():
+        request.future.set_exception(exc)
+
+
+_batcher = EmbeddingBatcher(
+    max_batch_size=config.EMBEDDING_MICROBATCH_MAX_SIZE,
+    max_wait_ms=config.EMBEDDING_MICROBATCH_MAX_WAIT_MS,
+)
+
+
+async def embed_coalesced(texts: list[str], embed: EmbedFn) -> list[Any]:
+    """``embed(texts)`` off the event loop, sharing a batch with concurrent callers.
+
+    With ``EMBEDDING_MICROBATCH_ENABLED`` off this is one ``embed`` call on a
+    worker thread, exactly as before the batcher existed.
+    """
+    if not config.EMBEDDING_MICROBATCH_ENABLED:
+        return await asyncio.to_thread(embed, texts)
+    return await _batcher.embed(texts, embed)
+
+
+__all__ = ["EmbeddingBatcher", "embed_coalesced"]
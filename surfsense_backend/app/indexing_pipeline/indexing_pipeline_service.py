@@ -21,6 +21,7 @@ from app.db import (
 )
 from app.indexing_pipeline.cache import build_chunk_embeddings
 from app.indexing_pipeline.cache.cached_indexing import (
+    ChunkEmbeddings,
     chunk_markdown_with_lines,
     embed_batch,
 )
@@ -398,10 +399,19 @@ class IndexingPipelineService:
         return await self.index(document, connector_doc)
 
     async def index(
-        self, document: Document, connector_doc: ConnectorDocument
+        self,
+        document: Document,
+        connector_doc: ConnectorDocument,
+        *,
+        precomputed: ChunkEmbeddings | None = None,
     ) -> Document:
         """
         Run deterministic content storage, embedding, and chunking for a document.
+
+        ``precomputed`` is ``build_chunk_embeddings`` output for exactly
+        ``connector_doc.source_markdown``, computed ahead by a caller that
+        overlaps embedding with other documents' writes; it replaces the
+        chunk+embed step instead of repeating it.
         """
         ctx = PipelineLogContext(
             connector_id=connector_doc.connector_id,
@@ -432,7 +442,7 @@ class IndexingPipelineService:
             existing = await self._load_existing_chunks(document.id)
             if existing and self._reconcile_enabled():
                 chunk_count = await self._reindex_incrementally(
-                    document, content, connector_doc, existing
+                    document, content, connector_doc, existing, precomputed
                 )
                 perf.info(
                     "[indexing] chunk+embed doc=%d chunks=%d in %.3fs",
@@ -448,7 +458,7 @@ class IndexingPipelineService:
                 from app.config import config
 
                 chunks = await self._reindex_from_scratch(
-                    document, content, connector_doc
+                    document, content, connector_doc, precomputed
                 )
                 chunk_count = len(chunks)
                 perf.info(
@@ -554,15 +564,21 @@ class IndexingPipelineService:
         ]
 
     async def _reindex_from_scratch(
-        self, document: Document, content: str, connector_doc: ConnectorDocument
+        self,
+        document: Document,
+        content: str,
+        connector_doc: ConnectorDocument,
+        precomputed: ChunkEmbeddings | None = None,
     ) -> list[Chunk]:
         await self.session.execute(
             delete(Chunk).where(Chunk.document_id == document.id)
         )
 
-        summary_embedding, embedded_chunks = await build_chunk_embeddings(
-            content,
-            use_code_chunker=connector_doc.should_use_code_chunker,
+        summary_embedding, embedded_chunks = precomputed or (
+            await build_chunk_embeddings(
+                content,
+                use_code_chunker=connector_doc.should_use_code_chunker,
+            )
         )
 
         document.embedding = summary_embedding
@@ -583,6 +599,7 @@ class IndexingPipelineService:
         content: str,
         connector_doc: ConnectorDocument,
         existing: list[ExistingChunk],
+        precomputed: ChunkEmbeddings | None = None,
     ) -> int:
         """Edit path: keep rows whose text survived, embed only new texts.
 
@@ -594,9 +611,17 @@ class IndexingPipelineService:
         )
         plan = reconcile(existing, new_chunks)
 
-        # One batch: the document-level summary vector plus the missing chunks.
-        embeddings = await embed_batch([content, *[c.text for c in plan.to_embed]])
-        summary_embedding, *new_embeddings = embeddings
+        if precomputed is None:
+            # One batch: the document-level summary vector plus the missing chunks.
+            embeddings = await embed_batch([content, *[c.text for c in plan.to_embed]])
+            summary_embedding, *new_embeddings = embeddings
+        else:
+            summary_embedding, embedded_chunks = precomputed
+            by_text = {chunk.text: chunk.embedding for chunk in embedded_chunks}
+            missing = [c.text for c in plan.to_embed if c.text not in by_text]
+            if missing:
+                by_text.update(zip(missing, await embed_batch(missing), strict=True))
+            new_embeddings = [by_text[c.text] for c in plan.to_embed]
 
         if plan.reused:
             await self.session.execute(
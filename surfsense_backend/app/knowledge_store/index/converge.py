@@ -10,16 +10,25 @@ Neither wipes. Document rows are upserted by path and keep their ids, because
 ``documents``/``folders`` replicate to the browser and an id that changed under
 a reader would make every note vanish and reappear. Chunk rows are the
 disposable layer, replaced per document by the existing indexing pipeline.
+
+Rows are written one at a time, in tree order, on the run's session. What
+overlaps is the slow part around them: while one document is written, the next
+few are already being read from git and, when they have no row yet, chunked and
+embedded (``KNOWLEDGE_STORE_INDEX_CONCURRENCY`` at a time).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import Document, DocumentStatus, Workspace
+from app.indexing_pipeline.cache import build_chunk_embeddings
+from app.indexing_pipeline.cache.cached_indexing import ChunkEmbeddings
 from app.indexing_pipeline.connector_document import ConnectorDocument
 from app.indexing_pipeline.indexing_pipeline_service import IndexingPipelineService
 from app.knowledge_store import KnowledgeStore
@@ -36,6 +45,7 @@ from app.knowledge_store.index.rows import (
 )
 from app.knowledge_store.locks import workspace_index_lock
 from app.knowledge_store.paths import PATH_MARKER, to_virtual_path
+from app.knowledge_store.settings import load_knowledge_store_settings
 from app.utils.document_converters import generate_content_hash
 
 logger = logging.getLogger(__name__)
@@ -74,6 +84,17 @@ class _Plan:
     tree: set[str] | None = field(default=None)
 
 
+@dataclass(frozen=True)
+class _Prepared:
+    """One upsert path after the stages that run ahead of its row write."""
+
+    store_path: str
+    #: Indexable text, or ``None`` when the blob is skipped.
+    content: str | None
+    #: Chunk+embed output computed ahead, or ``None`` to let the pipeline do it.
+    embeddings: ChunkEmbeddings | None = None
+
+
 async def index_changes(session: AsyncSession, workspace_id: int) -> IndexOutcome:
     """Fold the paths that moved since the last run into the index.
 
@@ -184,27 +205,18 @@ async def _converge(
             )
             outcome.deleted += 1 if removed is not None else 0
 
-    for store_path in plan.upserts:
-        if not _is_document_store_path(store_path):
-            outcome.skipped += 1
-            continue
-        virtual_path = to_virtual_path(store_path)
-        content = await read_indexable(store, head, store_path)
-        if content is None:
-            outcome.skipped += 1
-            continue
-        ready = await _index_one(
-            session,
-            workspace_id=workspace.id,
-            virtual_path=virtual_path,
-            content=content,
-            author_id=author_id,
-            owned=owned,
-        )
-        if ready:
-            outcome.indexed += 1
-        else:
-            outcome.failed += 1
+    documents = [path for path in plan.upserts if _is_document_store_path(path)]
+    outcome.skipped += len(plan.upserts) - len(documents)
+    await _upsert_all(
+        session,
+        store,
+        head,
+        documents,
+        workspace_id=workspace.id,
+        author_id=author_id,
+        owned=owned,
+        outcome=outcome,
+    )
 
     for store_path in plan.removals:
         if _is_document_store_path(store_path):
@@ -241,6 +253,91 @@ async def _converge(
     return outcome
 
 
+async def _upsert_all(
+    session: AsyncSession,
+    store: KnowledgeStore,
+    head: str,
+    store_paths: list[str],
+    *,
+    workspace_id: int,
+    author_id: str,
+    owned: dict[str, Document],
+    outcome: IndexOutcome,
+) -> None:
+    """Write every path's row in order while the paths after it are prepared.
+
+    At most twice the concurrency is prepared ahead, so a 20k-document rebuild
+    holds a few documents' text and vectors in memory, not the tree's.
+    """
+    concurrency = load_knowledge_store_settings().index_concurrency
+    gate = asyncio.Semaphore(concurrency)
+    remaining = iter(store_paths)
+    ahead: deque[asyncio.Task[_Prepared]] = deque()
+
+    def top_up() -> None:
+        while len(ahead) < 2 * concurrency:
+            store_path = next(remaining, None)
+            if store_path is None:
+                return
+            # Only a path with no row yet is certain to need every chunk
+            # embedded; an existing row re-embeds just its edited chunks inline.
+            embed = to_virtual_path(store_path) not in owned
+            ahead.append(
+                asyncio.create_task(
+                    _prepare(store, head, store_path, gate=gate, embed=embed)
+                )
+            )
+
+    top_up()
+    try:
+        while ahead:
+            prepared = await ahead.popleft()
+            top_up()
+            if prepared.content is None:
+                outcome.skipped += 1
+                continue
+            ready = await _index_one(
+                session,
+                workspace_id=workspace_id,
+                virtual_path=to_virtual_path(prepared.store_path),
+                content=prepared.content,
+                author_id=author_id,
+                owned=owned,
+                precomputed=prepared.embeddings,
+            )
+            if ready:
+                outcome.indexed += 1
+            else:
+                outcome.failed += 1
+    finally:
+        for task in ahead:
+            task.cancel()
+        await asyncio.gather(*ahead, return_exceptions=True)
+
+
+async def _prepare(
+    store: KnowledgeStore,
+    head: str,
+    store_path: str,
+    *,
+    gate: asyncio.Semaphore,
+    embed: bool,
+) -> _Prepared:
+    """Read one blob and, when ``embed``, chunk and embed it ahead of its write."""
+    async with gate:
+        content = await read_indexable(store, head, store_path)
+        if content is None or not embed:
+            return _Prepared(store_path, content)
+        try:
+            embeddings = await build_chunk_embeddings(content, use_code_chunker=False)
+        except Exception:
+            # The pipeline repeats the step inline, where a failure is classified
+            # and recorded on the row like any other.
+            logger.debug("Embedding ahead failed for %s", store_path, exc_info=True)
+            embeddings = None
+        return _Prepared(store_path, content, embeddings)
+
+
 async def _index_one(
     session: AsyncSession,
     *,
@@ -249,6 +346,7 @@ async def _index_one(
     content: str,
     author_id: str,
     owned: dict[str, Document],
+    precomputed: ChunkEmbeddings | None = None,
 ) -> bool:
     """Upsert the row for one path, then hand it to the indexing pipeline."""
     # index_tree replays every path in the tree, so the hourly drift sweep would
@@ -290,7 +388,9 @@ async def _index_one(
         metadata=document.document_metadata,
         folder_id=document.folder_id,
     )
-    indexed = await IndexingPipelineService(session).index(document, connector_doc)
+    indexed = await IndexingPipelineService(session).index(
+        document, connector_doc, precomputed=precomputed
+    )
     if not DocumentStatus.is_state(indexed.status, DocumentStatus.READY):
         logger.warning(
             "Indexing failed for %s: %s",
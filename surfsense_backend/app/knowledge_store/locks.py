@@ -6,11 +6,16 @@ outlives its TTL fails just as loudly — exclusivity was lost, never silently.
 
 Indexing takes a *separate* lock. It embeds, so it runs for far longer than a
 commit — sharing the write lock would stall agent writes behind embedding calls,
-and sizing one TTL for both would either wedge writes or expire mid-rebuild.
+and sizing one TTL for both would either wedge writes or expire mid-rebuild. Its
+holder renews a short TTL on a heartbeat instead of guessing a ceiling, so a
+rebuild can run as long as it needs while a crashed indexer still frees the
+workspace within one TTL.
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager, suppress
 
 import redis.asyncio as redis
@@ -19,6 +24,8 @@ from redis.exceptions import LockError, LockNotOwnedError
 from app.config import config
 from app.knowledge_store.exceptions import KnowledgeStoreLockError
 
+logger = logging.getLogger(__name__)
+
 __all__ = [
     "KnowledgeStoreLockError",
     "workspace_index_lock",
@@ -30,8 +37,11 @@ LOCK_TTL_SECONDS = 30.0
 # How long a contender waits before giving up.
 LOCK_WAIT_SECONDS = 10.0
 
-# Indexing a whole workspace embeds every document, so its ceiling is minutes.
-INDEX_LOCK_TTL_SECONDS = 1800.0
+# Indexing a whole workspace embeds every document and can run for as long as
+# it needs: the TTL only bounds how long a crashed indexer wedges the workspace,
+# and the holder renews it every heartbeat.
+INDEX_LOCK_TTL_SECONDS = 300.0
+INDEX_LOCK_HEARTBEAT_SECONDS = 60.0
 # A contender gives up quickly: the holder converges to the current revision
 # anyway, and the drift sweep re-drives anything it missed.
 INDEX_LOCK_WAIT_SECONDS = 5.0
@@ -43,7 +53,12 @@ def _lock_key(workspace_id: int | str, purpose: str) -> str:
 
 @asynccontextmanager
 async def _workspace_lock(
-    workspace_id: int | str, *, purpose: str, ttl: float, wait: float
+    workspace_id: int | str,
+    *,
+    purpose: str,
+    ttl: float,
+    wait: float,
+    heartbeat: float | None = None,
 ):
     # The client lives and dies with the block rather than being cached: celery
     # runs every task on a fresh event loop, and a pooled connection bound to a
@@ -64,13 +79,20 @@ async def _workspace_lock(
                 f"Could not acquire {purpose} for workspace {workspace_id} "
                 f"within {wait}s"
             )
+        renewer = (
+            asyncio.create_task(_renew(lock, ttl=ttl, every=heartbeat))
+            if heartbeat
+            else None
+        )
         try:
             yield
         except BaseException:
             # The block itself failed; a lost hold must not mask that error.
+            await _stop(renewer)
             with suppress(LockError):
                 await lock.release()
             raise
+        await _stop(renewer)
         try:
             await lock.release()
         except LockNotOwnedError:
@@ -85,6 +107,29 @@ async def _workspace_lock(
             await client.aclose()
 
 
+async def _renew(lock, *, ttl: float, every: float) -> None:
+    """Reset the hold to a full ``ttl`` every ``every`` seconds until cancelled.
+
+    Stops at the first failure: a hold that was lost is reported when the block
+    releases, and a Redis blip that outlasts the TTL is exactly that case.
+    """
+    while True:
+        await asyncio.sleep(every)
+        try:
+            await lock.extend(ttl, replace_ttl=True)
+        except Exception:
+            logger.warning("Could not renew %s", lock.name, exc_info=True)
+            return
+
+
+async def _stop(renewer: asyncio.Task | None) -> None:
+    if renewer is None:
+        return
+    renewer.cancel()
+    with suppress(asyncio.CancelledError):
+        await renewer
+
+
 @asynccontextmanager
 async def workspace_write_lock(workspace_id: int | str):
     """Hold ``workspace_id``'s single-writer lock for the block."""
@@ -101,13 +146,14 @@ async def workspace_write_lock(workspace_id: int | str):
 async def workspace_index_lock(workspace_id: int | str):
     """Hold ``workspace_id``'s single-indexer lock for the block.
 
-    ``ponytail:`` ceiling — a rebuild that outruns the TTL can be joined by a
-    second builder; upgrade path is a ``lock.extend()`` heartbeat while indexing.
+    Renewed every ``INDEX_LOCK_HEARTBEAT_SECONDS`` while the block runs, so a
+    long rebuild keeps its exclusivity however many TTLs it spans.
     """
     async with _workspace_lock(
         workspace_id,
         purpose="index_lock",
         ttl=INDEX_LOCK_TTL_SECONDS,
         wait=INDEX_LOCK_WAIT_SECONDS,
+        heartbeat=INDEX_LOCK_HEARTBEAT_SECONDS,
     ):
         yield
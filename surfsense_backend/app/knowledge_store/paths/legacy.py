@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
@@ -11,7 +11,6 @@ from app.knowledge_store.paths.naming import (
     _INVALID_FILENAME_CHARS,
     _MAX_SEGMENT_LEN,
     _WHITESPACE_RUN,
-    safe_folder_segment,
 )
 from app.knowledge_store.paths.store_path import (
     DOCUMENTS_ROOT,
@@ -77,42 +76,41 @@ class PathIndex:
     occupants: dict[str, int] = field(default_factory=dict)
 
 
-async def _build_folder_paths(
+async def _load_folder_paths(
     session: AsyncSession,
     workspace_id: int,
+    under: str | None,
 ) -> dict[int, str]:
-    from sqlalchemy import select
+    """Folder paths from the persisted index, optionally one subtree of it.
 
-    from app.db import Folder
+    The subtree at ``under`` comes with the folder holding ``under`` itself,
+    so a path that names a single document still finds its folder.
+    """
+    from sqlalchemy import and_, or_, select
 
-    result = await session.execute(
-        select(Folder.id, Folder.name, Folder.parent_id).where(
-            Folder.workspace_id == workspace_id
-        )
+    from app.db import FolderPath
+
+    query = select(FolderPath.folder_id, FolderPath.path).where(
+        FolderPath.workspace_id == workspace_id
     )
-    rows = result.all()
-    by_id = {row.id: {"name": row.name, "parent_id": row.parent_id} for row in rows}
-    cache: dict[int, str] = {}
-
-    def resolve(folder_id: int) -> str:
-        if folder_id in cache:
-            return cache[folder_id]
-        parts: list[str] = []
-        cursor: int | None = folder_id
-        visited: set[int] = set()
-        while cursor is not None and cursor in by_id and cursor not in visited:
-            visited.add(cursor)
-            entry = by_id[cursor]
-            parts.append(safe_folder_segment(str(entry["name"])))
-            cursor = entry["parent_id"]
-        parts.reverse()
-        path = f"{DOCUMENTS_ROOT}/" + "/".join(parts) if parts else DOCUMENTS_ROOT
-        cache[folder_id] = path
-        return path
-
-    for folder_id in by_id:
-        resolve(folder_id)
-    return cache
+    prefix = (under or DOCUMENTS_ROOT).rstrip("/")
+    if prefix and prefix != DOCUMENTS_ROOT:
+        # Byte order (``C`` collation): "<prefix>/" <= p < "<prefix>0" is
+        # exactly the paths under ``prefix``, as one index range.
+        query = query.where(
+            or_(
+                FolderPath.path.in_([prefix, prefix.rsplit("/", 1)[0]]),
+                and_(FolderPath.path >= f"{prefix}/", FolderPath.path < f"{prefix}0"),
+            )
+        )
+    result = await session.execute(query)
+    return {row.folder_id: row.path for row in result.all()}
+
+
+def _reaches_root(under: str | None) -> bool:
+    """Whether the subtree at ``under`` (with its holder) includes root documents."""
+    prefix = (under or DOCUMENTS_ROOT).rstrip("/")
+    return prefix in ("", DOCUMENTS_ROOT) or prefix.rsplit("/", 1)[0] == DOCUMENTS_ROOT
 
 
 async def build_path_index(
@@ -120,27 +118,45 @@ async def build_path_index(
     workspace_id: int,
     *,
     populate_occupants: bool = True,
+    under: str | None = None,
+    folder_ids: Iterable[int | None] | None = None,
 ) -> PathIndex:
-    """Build a :class:`PathIndex` for a workspace."""
-    from sqlalchemy import select
+    """Build a :class:`PathIndex` for a workspace, or the part of it a caller needs.
+
+    Folder paths are read from the persisted ``folder_paths`` index; ``under``
+    narrows them to one subtree. Occupants are derived from the documents of
+    ``folder_ids`` (``None`` for the root) when given, else of every folder in
+    the map, in id order: collisions only happen between documents sharing a
+    folder, so a folder's occupants never depend on any other folder's.
+    """
+    from sqlalchemy import or_, select
 
     from app.db import Document
 
-    folder_paths = await _build_folder_paths(session, workspace_id)
+    folder_paths = await _load_folder_paths(session, workspace_id, under)
     occupants: dict[str, int] = {}
-    if populate_occupants:
-        rows = await session.execute(
-            select(Document.id, Document.title, Document.folder_id).where(
-                Document.workspace_id == workspace_id,
-            )
-        )
-        for row in rows.all():
-            base = folder_paths.get(row.folder_id, DOCUMENTS_ROOT)
-            filename = safe_filename(str(row.title or "untitled"))
-            path = f"{base}/{filename}"
-            if path in occupants and occupants[path] != row.id:
-                path = f"{base}/{_suffix_with_doc_id(filename, row.id)}"
-            occupants[path] = row.id
+    if not populate_occupants:
+        return PathIndex(folder_paths=folder_paths, occupants=occupants)
+
+    query = select(Document.id, Document.title, Document.folder_id).where(
+        Document.workspace_id == workspace_id
+    )
+    if folder_ids is not None or under is not None:
+        scope = set(folder_paths) if folder_ids is None else set(folder_ids)
+        if folder_ids is None and _reaches_root(under):
+            scope.add(None)
+        clauses = [Document.folder_id.in_([fid for fid in scope if fid is not None])]
+        if None in scope:
+            clauses.append(Document.folder_id.is_(None))
+        query = query.where(or_(*clauses))
+    rows = await session.execute(query.order_by(Document.id))
+    for row in rows.all():
+        base = folder_paths.get(row.folder_id, DOCUMENTS_ROOT)
+        filename = safe_filename(str(row.title or "untitled"))
+        path = f"{base}/{filename}"
+        if path in occupants and occupants[path] != row.id:
+            path = f"{base}/{_suffix_with_doc_id(filename, row.id)}"
+        occupants[path] = row.id
     return PathIndex(folder_paths=folder_paths, occupants=occupants)
 
 
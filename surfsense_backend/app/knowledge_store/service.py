@@ -464,7 +464,11 @@ class KnowledgeStore:
         from app.observability import metrics
 
         try:
-            index = await build_path_index(session, self._workspace_id)
+            index = await build_path_index(
+                session,
+                self._workspace_id,
+                folder_ids={document.folder_id for document in documents},
+            )
             removes = [
                 path
                 for path in (_store_path_of(document, index) for document in documents)
@@ -1013,12 +1017,13 @@ async def folder_virtual_path(session: AsyncSession, folder: Folder) -> str | No
     itself. Capture it before a rename mutates the row: git still holds the old
     path, and the move needs both ends.
     """
-    from app.knowledge_store.paths import build_path_index
+    from sqlalchemy import select
+
+    from app.db import FolderPath
 
-    index = await build_path_index(
-        session, folder.workspace_id, populate_occupants=False
+    return await session.scalar(
+        select(FolderPath.path).where(FolderPath.folder_id == folder.id)
     )
-    return index.folder_paths.get(folder.id)
 
 
 async def record_created_folder(
@@ -18,6 +18,7 @@ class KnowledgeStoreSettings:
 
     enabled: bool
     root: str
+    index_concurrency: int
 
 
 def load_knowledge_store_settings() -> KnowledgeStoreSettings:
@@ -27,6 +28,7 @@ def load_knowledge_store_settings() -> KnowledgeStoreSettings:
     return KnowledgeStoreSettings(
         enabled=config.KNOWLEDGE_STORE_ENABLED,
         root=config.KNOWLEDGE_STORE_ROOT,
+        index_concurrency=config.KNOWLEDGE_STORE_INDEX_CONCURRENCY,
     )
 
 
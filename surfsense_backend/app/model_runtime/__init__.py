@@ -0,0 +1 @@
+"""Embedding and reranker models, loaded on first use or served by a shared runtime."""
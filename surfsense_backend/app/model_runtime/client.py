@@ -0,0 +1,161 @@
+"""Clients for the shared model runtime (:mod:`app.model_runtime.server`).
+
+They present the same surface as the in-process Chonkie embeddings and
+``rerankers`` model, so callers cannot tell where the model lives. Calls are
+synchronous like the models they replace: the embedding path already runs in
+worker threads (``asyncio.to_thread``).
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import httpx
+import numpy as np
+
+_DEFAULT_TIMEOUT_SECONDS = 120.0
+
+
+class ModelRuntimeClient:
+    """Thin HTTP client; ``unix:///path.sock`` URLs go over a Unix socket."""
+
+    def __init__(self, url: str, *, timeout: float = _DEFAULT_TIMEOUT_SECONDS):
+        if url.startswith("unix://"):
+            transport = httpx.HTTPTransport(uds=url.removeprefix("unix://"))
+            base_url = "http://model-runtime"
+        else:
+            transport = httpx.HTTPTransport(retries=1)
+            base_url = url.rstrip("/")
+        self._http = httpx.Client(
+            base_url=base_url, transport=transport, timeout=timeout
+        )
+
+    def get(self, path: str) -> dict[str, Any]:
+        response = self._http.get(path)
+        response.raise_for_status()
+        return response.json()
+
+    def post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        response = self._http.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+def _runtime_timeout() -> float:
+    # Imported late: the proxies that build these clients are created while
+    # ``app.config`` itself is still importing.
+    from app.config import config
+
+    return float(getattr(config, "MODEL_RUNTIME_TIMEOUT_SECONDS", 0) or 0) or (
+        _DEFAULT_TIMEOUT_SECONDS
+    )
+
+
+def decode_vectors(payload: dict[str, Any]) -> list[np.ndarray]:
+    dimension = payload["dimension"]
+    flat = np.frombuffer(base64.b64decode(payload["vectors"]), dtype=np.float32)
+    return list(flat.reshape(-1, dimension)) if dimension else []
+
+
+def encode_vectors(vectors: list[Any], dimension: int) -> dict[str, Any]:
+    flat = np.asarray(vectors, dtype=np.float32).reshape(-1, dimension)
+    return {
+        "dimension": dimension,
+        "vectors": base64.b64encode(flat.tobytes()).decode("ascii"),
+    }
+
+
+class _RemoteTokenizer:
+    def __init__(self, client: ModelRuntimeClient) -> None:
+        self._client = client
+
+    def encode(self, text: str) -> list[int]:
+        return self._client.post("/tokenize", {"text": text})["tokens"]
+
+    def decode(self, tokens: list[int]) -> str:
+        return self._client.post("/detokenize", {"tokens": list(tokens)})["text"]
+
+
+class RemoteEmbeddings:
+    """Embeddings served by the model runtime."""
+
+    def __init__(self, url: str, *, client: ModelRuntimeClient | None = None):
+        self._client = client or ModelRuntimeClient(url, timeout=_runtime_timeout())
+
+    @cached_property
+    def _info(self) -> dict[str, Any]:
+        return self._client.get("/info")
+
+    @property
+    def model_name(self) -> str:
+        return self._info["model"]
+
+    @property
+    def dimension(self) -> int:
+        return self._info["dimension"]
+
+    @property
+    def max_seq_length(self) -> int:
+        return self._reported("max_seq_length")
+
+    @property
+    def _max_tokens(self) -> int:
+        return self._reported("max_tokens")
+
+    def _reported(self, key: str) -> int:
+        # Missing like on the local model, so ``getattr`` fallbacks still apply.
+        value = self._info.get(key)
+        if value is None:
+            raise AttributeError(key)
+        return value
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        if not texts:
+            return []
+        return decode_vectors(self._client.post("/embed", {"texts": texts}))
+
+    def get_tokenizer(self) -> _RemoteTokenizer:
+        return _RemoteTokenizer(self._client)
+
+
+@dataclass(frozen=True)
+class RemoteRankedResult:
+    document: Any
+    score: float
+    rank: int
+
+
+@dataclass(frozen=True)
+class RemoteRankedResults:
+    results: list[RemoteRankedResult]
+
+
+class RemoteReranker:
+    """Reranker served by the model runtime.
+
+    Only texts cross the wire; the runtime answers with indices, which are
+    mapped back onto the caller's own document objects (ids, metadata).
+    """
+
+    def __init__(self, url: str, *, client: ModelRuntimeClient | None = None):
+        self._client = client or ModelRuntimeClient(url, timeout=_runtime_timeout())
+
+    def rank(self, query: str, docs: list[Any]) -> RemoteRankedResults:
+        texts = [getattr(doc, "text", doc) for doc in docs]
+        payload = self._client.post("/rank", {"query": query, "docs": texts})
+        return RemoteRankedResults(
+            results=[
+                RemoteRankedResult(
+                    document=docs[item["index"]],
+                    score=item["score"],
+                    rank=item["rank"],
+                )
+                for item in payload["results"]
+            ]
+        )
@@ -0,0 +1,191 @@
+"""Lazy stand-ins for the embedding model, chunkers and reranker.
+
+``app.config`` used to build all of them at import, so every uvicorn worker,
+Celery worker, beat process, script and migration loaded the full model into
+its own memory before doing anything. Each proxy here builds its target on
+first use instead — in-process, or as a client of the shared model runtime
+(:mod:`app.model_runtime.server`) when ``MODEL_RUNTIME_URL`` is set — and
+answers ``dimension`` from ``EMBEDDING_DIMENSION`` without loading anything.
+``schema_dimension`` only loads (with a warning) when that width is unknown:
+the schema is imported by every process.
+
+This module must not import ``app.config``: the config builds these proxies.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# pgvector's limit for indexed ``vector`` columns.
+MAX_EMBEDDING_DIMENSION = 2000
+
+
+def check_embedding_dimension(model_name: str | None, dimension: int) -> None:
+    if dimension > MAX_EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"Embedding dimension for Model: {model_name} "
+            f"has {dimension} dimensions, which "
+            f"exceeds the maximum of {MAX_EMBEDDING_DIMENSION} allowed by PGVector."
+        )
+
+
+def load_local_embeddings(model_name: str | None, model_kwargs: dict[str, Any]):
+    from chonkie import AutoEmbeddings
+
+    return AutoEmbeddings.get_embeddings(model_name, **model_kwargs)
+
+
+def load_local_reranker(model_name: str | None, model_type: str | None):
+    from rerankers import Reranker
+
+    return Reranker(model_name=model_name, model_type=model_type)
+
+
+class _LazyProxy:
+    """Builds its target once, on first use, and forwards everything to it."""
+
+    def __init__(self) -> None:
+        self._target: Any = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        raise NotImplementedError
+
+    def _get(self) -> Any:
+        target = self._target
+        if target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._load()
+                target = self._target
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def __getattr__(self, name: str) -> Any:
+        # Dunder lookups (copy, pickle, introspection) must not load a model.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._get(), name)
+
+
+class LazyEmbeddings(_LazyProxy):
+    """Chonkie embeddings (``embed``/``embed_batch``/``get_tokenizer``), lazily."""
+
+    def __init__(
+        self,
+        model_name: str | None,
+        model_kwargs: dict[str, Any],
+        *,
+        dimension: int | None = None,
+        runtime_url: str | None = None,
+    ) -> None:
+        super().__init__()
+        self._model_name = model_name
+        self._model_kwargs = dict(model_kwargs)
+        self._dimension = dimension
+        self._runtime_url = runtime_url
+
+    def _load(self) -> Any:
+        if self._runtime_url:
+            from app.model_runtime.client import RemoteEmbeddings
+
+            model = RemoteEmbeddings(self._runtime_url)
+        else:
+            model = load_local_embeddings(self._model_name, self._model_kwargs)
+        actual = getattr(model, "dimension", None)
+        if actual is not None:
+            if self._dimension is not None and actual != self._dimension:
+                raise ValueError(
+                    f"EMBEDDING_DIMENSION is {self._dimension} but "
+                    f"{self._model_name} produces {actual}-dimensional vectors."
+                )
+            check_embedding_dimension(self._model_name, actual)
+        return model
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is not None:
+            return self._dimension
+        return self._get().dimension
+
+    @property
+    def schema_dimension(self) -> int:
+        """The width for sizing vector columns, loading only if it is unknown."""
+        if self._dimension is None:
+            logger.warning(
+                "EMBEDDING_DIMENSION is not set and the vector width of %r is "
+                "not known; loading the model to read it. Set "
+                "EMBEDDING_DIMENSION so importing the schema does not.",
+                self._model_name,
+            )
+        return self.dimension
+
+    def embed(self, text: str) -> Any:
+        return self._get().embed(text)
+
+    def embed_batch(self, texts: list[str]) -> list[Any]:
+        return self._get().embed_batch(texts)
+
+    def get_tokenizer(self) -> Any:
+        return self._get().get_tokenizer()
+
+
+class LazyChunker(_LazyProxy):
+    """A Chonkie chunker sized to the embedding model's context, built lazily."""
+
+    def __init__(self, factory: Callable[[int], Any], embeddings: Any) -> None:
+        super().__init__()
+        self._factory = factory
+        self._embeddings = embeddings
+
+    def _load(self) -> Any:
+        return self._factory(getattr(self._embeddings, "max_seq_length", 512))
+
+    def chunk(self, text: str) -> Any:
+        return self._get().chunk(text)
+
+
+def recursive_chunker(chunk_size: int) -> Any:
+    from chonkie import RecursiveChunker
+
+    return RecursiveChunker(chunk_size=chunk_size)
+
+
+def code_chunker(chunk_size: int) -> Any:
+    from chonkie import CodeChunker
+
+    return CodeChunker(chunk_size=chunk_size)
+
+
+class LazyReranker(_LazyProxy):
+    """A ``rerankers`` model (``rank(query, docs)``), lazily."""
+
+    def __init__(
+        self,
+        model_name: str | None,
+        model_type: str | None,
+        *,
+        runtime_url: str | None = None,
+    ) -> None:
+        super().__init__()
+        self._model_name = model_name
+        self._model_type = model_type
+        self._runtime_url = runtime_url
+
+    def _load(self) -> Any:
+        if self._runtime_url:
+            from app.model_runtime.client import RemoteReranker
+
+            return RemoteReranker(self._runtime_url)
+        return load_local_reranker(self._model_name, self._model_type)
+
+    def rank(self, query: str, docs: list[Any]) -> Any:
+        return self._get().rank(query=query, docs=docs)
@@ -0,0 +1,159 @@
+"""Shared model runtime: one process that holds the embedding and reranker models.
+
+Point every backend, Celery worker and beat process at it with
+``MODEL_RUNTIME_URL`` and the models are loaded once per host instead of once
+per process::
+
+    python -m app.model_runtime.server --port 8100
+    python -m app.model_runtime.server --uds /run/surfsense/models.sock
+
+It reads the same ``EMBEDDING_MODEL``/``RERANKERS_*`` settings as the backend
+and loads both models eagerly, so it is ready before the first request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import threading
+from typing import Any
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from app.config import config
+from app.model_runtime.client import encode_vectors
+from app.model_runtime.proxies import (
+    check_embedding_dimension,
+    load_local_embeddings,
+    load_local_reranker,
+)
+
+
+class EmbedRequest(BaseModel):
+    texts: list[str]
+
+
+class TokenizeRequest(BaseModel):
+    text: str
+
+
+class DetokenizeRequest(BaseModel):
+    tokens: list[int]
+
+
+class RankRequest(BaseModel):
+    query: str
+    docs: list[str]
+
+
+class _Models:
+    def __init__(self) -> None:
+        self.embeddings = load_local_embeddings(
+            config.EMBEDDING_MODEL, config.embedding_kwargs
+        )
+        self.dimension = self.embeddings.dimension
+        check_embedding_dimension(config.EMBEDDING_MODEL, self.dimension)
+        self.is_local = "://" not in (config.EMBEDDING_MODEL or "")
+        self.reranker = (
+            load_local_reranker(
+                config.RERANKERS_MODEL_NAME, config.RERANKERS_MODEL_TYPE
+            )
+            if config.RERANKERS_ENABLED
+            else None
+        )
+        # Fast tokenizers are not thread-safe (see document_converters).
+        self.embedding_lock = threading.Lock()
+        self.reranker_lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> list[Any]:
+        with self.embedding_lock:
+            if self.is_local:
+                # SentenceTransformers pads a batch to its longest text;
+                # one at a time is faster for mixed-length chunks.
+                return [self.embeddings.embed(text) for text in texts]
+            return self.embeddings.embed_batch(texts)
+
+    def tokenize(self, text: str) -> list[int]:
+        with self.embedding_lock:
+            return list(self.embeddings.get_tokenizer().encode(text))
+
+    def detokenize(self, tokens: list[int]) -> str:
+        with self.embedding_lock:
+            return self.embeddings.get_tokenizer().decode(tokens)
+
+    def rank(self, query: str, texts: list[str]) -> list[dict[str, Any]]:
+        from rerankers import Document as RerankerDocument
+
+        docs = [
+            RerankerDocument(text=text, doc_id=index)
+            for index, text in enumerate(texts)
+        ]
+        with self.reranker_lock:
+            ranked = self.reranker.rank(query=query, docs=docs)
+        return [
+            {
+                "index": result.document.doc_id,
+                "score": float(result.score),
+                "rank": result.rank,
+            }
+            for result in ranked.results
+        ]
+
+
+def create_app() -> FastAPI:
+    models = _Models()
+    app = FastAPI(title="SurfSense model runtime")
+
+    @app.get("/info")
+    async def info() -> dict[str, Any]:
+        return {
+            "model": config.EMBEDDING_MODEL,
+            "dimension": models.dimension,
+            # Only what the model reports: clients fall back exactly as they
+            # would in-process (512 for chunking, 8192 for truncation).
+            "max_seq_length": getattr(models.embeddings, "max_seq_length", None),
+            "max_tokens": getattr(models.embeddings, "_max_tokens", None),
+            "reranker": models.reranker is not None,
+        }
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.post("/embed")
+    async def embed(request: EmbedRequest) -> dict[str, Any]:
+        vectors = await asyncio.to_thread(models.embed, request.texts)
+        return encode_vectors(vectors, models.dimension)
+
+    @app.post("/tokenize")
+    async def tokenize(request: TokenizeRequest) -> dict[str, Any]:
+        return {"tokens": await asyncio.to_thread(models.tokenize, request.text)}
+
+    @app.post("/detokenize")
+    async def detokenize(request: DetokenizeRequest) -> dict[str, Any]:
+        return {"text": await asyncio.to_thread(models.detokenize, request.tokens)}
+
+    @app.post("/rank")
+    async def rank(request: RankRequest) -> dict[str, Any]:
+        if models.reranker is None:
+            raise HTTPException(status_code=404, detail="Reranker is not enabled")
+        results = await asyncio.to_thread(models.rank, request.query, request.docs)
+        return {"results": results}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--uds", help="Serve on this Unix socket instead of TCP")
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port, uds=args.uds)
+
+
+if __name__ == "__main__":
+    main()
@@ -301,6 +301,14 @@ def _etl_cache_lookups():
     )
 
 
+@lru_cache(maxsize=1)
+def _etl_image_cache_lookups():
+    return _get_meter().create_counter(
+        "surfsense.etl.image_cache.lookups",
+        description="Count of picture-description cache lookups by outcome (hit/miss).",
+    )
+
+
 @lru_cache(maxsize=1)
 def _etl_cache_evictions():
     return _get_meter().create_counter(
@@ -325,6 +333,63 @@ def _embedding_cache_evictions():
     )
 
 
+@lru_cache(maxsize=1)
+def _embedding_vector_cache_lookups():
+    return _get_meter().create_counter(
+        "surfsense.embedding.vector_cache.lookups",
+        description="Count of per-chunk embedding vector cache lookups by outcome (hit/miss).",
+    )
+
+
+@lru_cache(maxsize=1)
+def _embedding_batch_size():
+    return _get_meter().create_histogram(
+        "surfsense.embedding.batch.size",
+        unit="{text}",
+        description="Texts per embedding model call after micro-batching.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _embedding_batch_wait():
+    return _get_meter().create_histogram(
+        "surfsense.embedding.batch.wait",
+        unit="ms",
+        description="Time an embedding request waited to join a batch.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _query_embedding_cache_lookups():
+    return _get_meter().create_counter(
+        "surfsense.query_embedding.cache.lookups",
+        description=(
+            "Count of search-query embedding cache lookups by tier and outcome "
+            "(hit/miss/shared)."
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def _query_embedding_duration():
+    return _get_meter().create_histogram(
+        "surfsense.query_embedding.duration",
+        unit="ms",
+        description="Duration of search-query embeddings computed on a cache miss.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _mcp_session_acquires():
+    return _get_meter().create_counter(
+        "surfsense.mcp.session.acquires",
+        description=(
+            "MCP tool-call session acquisitions by transport and outcome "
+            "(reused/opened/reconnected)."
+        ),
+    )
+
+
 @lru_cache(maxsize=1)
 def _chunk_reconcile_chunks():
     return _get_meter().create_counter(
@@ -361,6 +426,140 @@ def _celery_queue_latency():
     )
 
 
+@lru_cache(maxsize=1)
+def _db_pool_checkouts():
+    return _get_meter().create_counter(
+        "surfsense.db.pool.checkouts",
+        description="Count of DB pool checkouts by whether a pooled connection was reused.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _db_pool_checkout_wait():
+    return _get_meter().create_histogram(
+        "surfsense.db.pool.checkout.wait",
+        unit="ms",
+        description="Time spent waiting to check a connection out of a DB pool.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _credit_ledger_fallbacks():
+    return _get_meter().create_counter(
+        "surfsense.credit_ledger.fallbacks",
+        description="Count of credit-ledger operations served by Postgres instead of Redis.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _credit_ledger_settled_users():
+    return _get_meter().create_counter(
+        "surfsense.credit_ledger.settled.users",
+        description="Count of per-user ledger batches applied to Postgres.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _credit_ledger_settled_micros():
+    return _get_meter().create_counter(
+        "surfsense.credit_ledger.settled.micros",
+        description="Micro-USD of ledger debits applied to Postgres.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _checkpoint_pruned_rows():
+    return _get_meter().create_counter(
+        "surfsense.checkpoint.pruned.rows",
+        description="Count of checkpointer rows deleted by retention, per table.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _checkpoint_pruned_bytes():
+    return _get_meter().create_counter(
+        "surfsense.checkpoint.pruned.bytes",
+        unit="By",
+        description="Bytes of checkpoint channel blobs deleted by retention.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _checkpoint_table_size():
+    return _get_meter().create_histogram(
+        "surfsense.checkpoint.table.size",
+        unit="By",
+        description="Sampled total size of each checkpointer table after retention.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rbac_cache_lookups():
+    return _get_meter().create_counter(
+        "surfsense.rbac.cache.lookups",
+        description="Count of workspace permission cache lookups by tier and outcome.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rbac_check_duration():
+    return _get_meter().create_histogram(
+        "surfsense.rbac.check.duration",
+        unit="ms",
+        description="Time spent authorizing a workspace request.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_duration():
+    return _get_meter().create_histogram(
+        "surfsense.rerank.duration",
+        unit="ms",
+        description="Time spent reranking retrieved documents for one request.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_cache_lookups():
+    return _get_meter().create_counter(
+        "surfsense.rerank.cache.lookups",
+        description="Count of reranker passage-score cache lookups by outcome.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_batch_requests():
+    return _get_meter().create_histogram(
+        "surfsense.rerank.batch.requests",
+        description="Number of rerank requests merged into one model call.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_batch_docs():
+    return _get_meter().create_histogram(
+        "surfsense.rerank.batch.docs",
+        description="Number of passages scored in one reranker model call.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_queue_depth():
+    return _get_meter().create_up_down_counter(
+        "surfsense.rerank.queue.depth",
+        description="Current change in reranker batches queued or running.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _rerank_queue_wait():
+    return _get_meter().create_histogram(
+        "surfsense.rerank.queue.wait",
+        unit="ms",
+        description="Time a reranker batch waited for a free worker thread.",
+    )
+
+
 @lru_cache(maxsize=1)
 def _gateway_redis_fallback():
     return _get_meter().create_counter(
@@ -466,6 +665,34 @@ def _gateway_inbox_enqueued():
     )
 
 
+@lru_cache(maxsize=1)
+def _gateway_inbox_backlog():
+    return _get_meter().create_histogram(
+        "surfsense.gateway.inbox.backlog",
+        description="Sampled count of gateway inbox rows waiting to be claimed.",
+    )
+
+
+@lru_cache(maxsize=1)
+def _gateway_inbox_pending():
+    return _get_meter().create_up_down_counter(
+        "surfsense.gateway.inbox.pending",
+        description=(
+            "Current change in claimed gateway inbox events waiting for a worker "
+            "or an earlier event of the same conversation."
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def _gateway_inbox_claim_to_start():
+    return _get_meter().create_histogram(
+        "surfsense.gateway.inbox.claim_to_start",
+        unit="ms",
+        description="Delay between claiming a gateway inbox event and starting it.",
+    )
+
+
 @lru_cache(maxsize=1)
 def _gateway_inbox_sweep_replayed():
     return _get_meter().create_counter(
@@ -748,6 +975,17 @@ def record_etl_cache_lookup(
     )
 
 
+def record_etl_image_cache_lookup(
+    *, hits: int, misses: int, vision_model: str | None
+) -> None:
+    """Record one document's picture-description cache outcome, counted per image."""
+    attributes = {"vision.model": vision_model or "unknown"}
+    if hits > 0:
+        _add(_etl_image_cache_lookups(), hits, {**attributes, "outcome": "hit"})
+    if misses > 0:
+        _add(_etl_image_cache_lookups(), misses, {**attributes, "outcome": "miss"})
+
+
 def record_etl_cache_eviction(count: int, *, phase: str) -> None:
     """Record evicted entries. ``phase`` is ``ttl`` or ``size``."""
     if count <= 0:
@@ -777,6 +1015,63 @@ def record_embedding_cache_eviction(count: int, *, phase: str) -> None:
     _add(_embedding_cache_evictions(), count, {"phase": phase})
 
 
+def record_embedding_vector_cache_lookup(
+    *, hits: int, misses: int, embedding_model: str | None
+) -> None:
+    """Record one batch's per-chunk vector cache outcome, counted per text."""
+    attributes = {"embedding.model": embedding_model or "unknown"}
+    if hits > 0:
+        _add(_embedding_vector_cache_lookups(), hits, {**attributes, "outcome": "hit"})
+    if misses > 0:
+        _add(
+            _embedding_vector_cache_lookups(),
+            misses,
+            {**attributes, "outcome": "miss"},
+        )
+
+
+def record_embedding_batch_size(size: int, *, embedding_model: str | None) -> None:
+    """Record how many texts one (micro-batched) embedding call carried."""
+    _record(
+        _embedding_batch_size(),
+        size,
+        {"embedding.model": embedding_model or "unknown"},
+    )
+
+
+def record_embedding_batch_wait(wait_ms: float) -> None:
+    """Record how long one embedding request queued before its batch was sent."""
+    _record(_embedding_batch_wait(), wait_ms, {})
+
+
+def record_query_embedding_cache_lookup(*, tier: str, outcome: str) -> None:
+    """Record a query-embedding lookup.
+
+    ``tier`` is ``memory`` or ``redis``; ``outcome`` is ``hit``, ``miss`` or
+    ``shared`` (joined an identical in-flight embedding).
+    """
+    _add(_query_embedding_cache_lookups(), 1, {"tier": tier, "outcome": outcome})
+
+
+def record_query_embedding_duration(
+    duration_ms: float, *, embedding_model: str | None
+) -> None:
+    _record(
+        _query_embedding_duration(),
+        duration_ms,
+        {"embedding.model": embedding_model or "unknown"},
+    )
+
+
+def record_mcp_session_acquire(*, transport: str, outcome: str) -> None:
+    """Record how an MCP tool call got its session.
+
+    ``outcome`` is ``reused`` (pooled and healthy), ``opened`` (no pooled
+    session) or ``reconnected`` (the pooled one was dead or failed the call).
+    """
+    _add(_mcp_session_acquires(), 1, {"transport": transport, "outcome": outcome})
+
+
 def record_chunk_reconcile(*, reused: int, embedded: int, deleted: int) -> None:
     """Record an incremental re-index: how many chunks were kept vs recomputed."""
     for outcome, count in (
@@ -816,6 +1111,83 @@ def record_celery_queue_latency(
     )
 
 
+def record_db_pool_checkout(wait_ms: float, *, pool: str, reused: bool) -> None:
+    attrs = {"db.pool": pool}
+    _record(_db_pool_checkout_wait(), wait_ms, attrs)
+    _add(
+        _db_pool_checkouts(),
+        1,
+        {**attrs, "outcome": "reused" if reused else "opened"},
+    )
+
+
+def record_credit_ledger_fallback(*, operation: str) -> None:
+    _add(_credit_ledger_fallbacks(), 1, {"operation": operation})
+
+
+def record_credit_ledger_settlement(*, users: int, micros: int) -> None:
+    if users <= 0:
+        return
+    _add(_credit_ledger_settled_users(), users, {})
+    _add(_credit_ledger_settled_micros(), micros, {})
+
+
+def record_checkpoint_prune(
+    *, checkpoints: int, writes: int, blobs: int, blob_bytes: int
+) -> None:
+    counter = _checkpoint_pruned_rows()
+    for table, rows in (
+        ("checkpoints", checkpoints),
+        ("checkpoint_writes", writes),
+        ("checkpoint_blobs", blobs),
+    ):
+        if rows > 0:
+            _add(counter, rows, {"table": table})
+    if blob_bytes > 0:
+        _add(_checkpoint_pruned_bytes(), blob_bytes, {})
+
+
+def record_checkpoint_table_size(*, table: str, size_bytes: int) -> None:
+    _record(_checkpoint_table_size(), size_bytes, {"table": table})
+
+
+def record_rbac_cache_lookup(*, tier: str, outcome: str) -> None:
+    """``tier`` is ``memory`` or ``redis``; ``outcome`` is ``hit`` or ``miss``."""
+    _add(_rbac_cache_lookups(), 1, {"tier": tier, "outcome": outcome})
+
+
+def record_rbac_check_duration(duration_ms: float, *, check: str, outcome: str) -> None:
+    """``outcome`` is ``allowed`` or ``denied``."""
+    _record(_rbac_check_duration(), duration_ms, {"check": check, "outcome": outcome})
+
+
+def record_rerank_duration(duration_ms: float, *, outcome: str) -> None:
+    """Record one reranking request, cache hits and batching included."""
+    _record(_rerank_duration(), duration_ms, {"outcome": outcome})
+
+
+def record_rerank_cache_lookup(*, hits: int, misses: int) -> None:
+    """Count passage-score cache hits and misses for one rerank request."""
+    if hits:
+        _add(_rerank_cache_lookups(), hits, {"outcome": "hit"})
+    if misses:
+        _add(_rerank_cache_lookups(), misses, {"outcome": "miss"})
+
+
+def record_rerank_batch(*, requests: int, docs: int) -> None:
+    """Record the size of one reranker model call."""
+    _record(_rerank_batch_requests(), requests, {})
+    _record(_rerank_batch_docs(), docs, {})
+
+
+def record_rerank_queue_depth_delta(delta: int) -> None:
+    _add(_rerank_queue_depth(), delta, {})
+
+
+def record_rerank_queue_wait(duration_ms: float) -> None:
+    _record(_rerank_queue_wait(), duration_ms, {})
+
+
 def record_gateway_redis_fallback() -> None:
     _add(_gateway_redis_fallback(), 1, {})
 
@@ -876,6 +1248,18 @@ def record_gateway_inbox_enqueued(*, intake: str, outcome: str) -> None:
     _add(_gateway_inbox_enqueued(), 1, {"intake": intake, "outcome": outcome})
 
 
+def record_gateway_inbox_backlog(depth: int) -> None:
+    _record(_gateway_inbox_backlog(), depth, {})
+
+
+def record_gateway_inbox_pending_delta(delta: int) -> None:
+    _add(_gateway_inbox_pending(), delta, {})
+
+
+def record_gateway_inbox_claim_to_start(duration_ms: float, *, platform: str) -> None:
+    _record(_gateway_inbox_claim_to_start(), duration_ms, {"platform": platform})
+
+
 def record_gateway_inbox_sweep_replayed() -> None:
     _add(_gateway_inbox_sweep_replayed(), 1, {})
 
@@ -1009,27 +1393,46 @@ __all__ = [
     "record_celery_queue_latency",
     "record_chat_request_duration",
     "record_chat_request_outcome",
+    "record_checkpoint_prune",
+    "record_checkpoint_table_size",
     "record_chunk_reconcile",
     "record_compaction_run",
     "record_connector_sync_duration",
     "record_connector_sync_outcome",
+    "record_credit_ledger_fallback",
+    "record_credit_ledger_settlement",
+    "record_db_pool_checkout",
+    "record_embedding_batch_size",
+    "record_embedding_batch_wait",
     "record_embedding_cache_eviction",
     "record_embedding_cache_lookup",
+    "record_embedding_vector_cache_lookup",
     "record_etl_cache_eviction",
     "record_etl_cache_lookup",
     "record_etl_extract_duration",
     "record_etl_extract_outcome",
+    "record_etl_image_cache_lookup",
     "record_indexing_document_duration",
     "record_indexing_document_outcome",
     "record_interrupt",
     "record_kb_search_duration",
     "record_knowledge_store_drift_check",
     "record_knowledge_store_record_outcome",
+    "record_mcp_session_acquire",
     "record_model_call_duration",
     "record_model_token_usage",
     "record_perf_elapsed",
     "record_permission_ask",
+    "record_query_embedding_cache_lookup",
+    "record_query_embedding_duration",
     "record_rate_limit_rejection",
+    "record_rbac_cache_lookup",
+    "record_rbac_check_duration",
+    "record_rerank_batch",
+    "record_rerank_cache_lookup",
+    "record_rerank_duration",
+    "record_rerank_queue_depth_delta",
+    "record_rerank_queue_wait",
     "record_subagent_invoke_duration",
     "record_subagent_invoke_outcome",
     "record_tool_call_duration",
@@ -1,4 +1,3 @@
-import asyncio
 import contextlib
 import functools
 import time
@@ -46,6 +45,47 @@ def _instrument_search(mode: str):
     return _decorator
 
 
+def resolve_document_types(document_type) -> list:
+    """``DocumentType`` members for a type name or list; unknown names dropped."""
+    from app.db import DocumentType
+
+    type_list = document_type if isinstance(document_type, list) else [document_type]
+    doc_type_enums = []
+    for dt in type_list:
+        if isinstance(dt, str):
+            with contextlib.suppress(KeyError):
+                doc_type_enums.append(DocumentType[dt])
+        else:
+            doc_type_enums.append(dt)
+    return doc_type_enums
+
+
+def _date_conditions(document, start_date, end_date) -> list:
+    """``updated_at`` bounds on ``document`` for whichever dates are set."""
+    conditions = []
+    if start_date is not None:
+        conditions.append(document.updated_at >= start_date)
+    if end_date is not None:
+        conditions.append(document.updated_at <= end_date)
+    return conditions
+
+
+def _serialize_hit(row) -> dict:
+    return {
+        "chunk_id": row.id,
+        "content": row.content,
+        "score": float(row.score),  # Ensure score is a Python float
+        "document": {
+            "id": row.document_id,
+            "title": row.title,
+            "document_type": row.document_type.value
+            if row.document_type is not None
+            else None,
+            "metadata": row.document_metadata,
+        },
+    }
+
+
 class ChucksHybridSearchRetriever:
     def __init__(self, db_session):
         """
@@ -81,40 +121,43 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Chunk, Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan, scope_chunks
+        from app.retriever.vector_ranking import nearest
 
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
         # Get embedding for the query
-        embedding_model = config.embedding_model_instance
         t_embed = time.perf_counter()
-        query_embedding = await asyncio.to_thread(embedding_model.embed, query_text)
+        query_embedding = await embed_query(query_text)
         perf.debug(
             "[chunk_search] vector_search embedding in %.3fs",
             time.perf_counter() - t_embed,
         )
 
-        # Build the query filtered by workspace
+        # Nearest chunks in the workspace (and time range, if provided)
+        nearest_ids = nearest(
+            scope_chunks(
+                select(Chunk.id),
+                workspace_id,
+                *_date_conditions(Document, start_date, end_date),
+            ),
+            Chunk.embedding,
+            query_embedding,
+            top_k,
+        ).subquery()
         query = (
             select(Chunk)
             .options(joinedload(Chunk.document).joinedload(Document.workspace))
-            .join(Document, Chunk.document_id == Document.id)
-            .where(Document.workspace_id == workspace_id)
+            .join(nearest_ids, Chunk.id == nearest_ids.c.id)
+            .order_by(nearest_ids.c.rank)
         )
 
-        # Add time-based filtering if provided
-        if start_date is not None:
-            query = query.where(Document.updated_at >= start_date)
-        if end_date is not None:
-            query = query.where(Document.updated_at <= end_date)
-
-        # Add vector similarity ordering
-        query = query.order_by(Chunk.embedding.op("<=>")(query_embedding)).limit(top_k)
-
         # Execute the query
         t_db = time.perf_counter()
+        await enable_iterative_scan(self.db_session)
         result = await self.db_session.execute(query)
         chunks = result.scalars().all()
         perf.info(
@@ -153,31 +196,25 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy.orm import joinedload
 
         from app.db import Chunk, Document
+        from app.retriever.scoping import scope_chunks
 
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector (GIN-indexed) and tsquery for PostgreSQL full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
-        # Build the query filtered by workspace
-        query = (
+        # Build the query filtered by workspace (and time, if provided)
+        query = scope_chunks(
             select(Chunk)
             .options(joinedload(Chunk.document).joinedload(Document.workspace))
-            .join(Document, Chunk.document_id == Document.id)
-            .where(Document.workspace_id == workspace_id)
-            .where(
-                tsvector.op("@@")(tsquery)
-            )  # Only include results that match the query
+            # Only include results that match the query
+            .where(tsvector.op("@@")(tsquery)),
+            workspace_id,
+            *_date_conditions(Document, start_date, end_date),
         )
 
-        # Add time-based filtering if provided
-        if start_date is not None:
-            query = query.where(Document.updated_at >= start_date)
-        if end_date is not None:
-            query = query.where(Document.updated_at <= end_date)
-
         # Add text search ranking
         query = query.order_by(func.ts_rank_cd(tsvector, tsquery).desc()).limit(top_k)
 
@@ -226,19 +263,19 @@ class ChucksHybridSearchRetriever:
               - chunks: list[{chunk_id, content}] for citation-aware prompting
               - document: {id, title, document_type, metadata}
         """
-        from sqlalchemy import func, or_, select, text
-        from sqlalchemy.orm import joinedload
+        from sqlalchemy import func, select, text
 
-        from app.config import config
-        from app.db import Chunk, Document, DocumentType
+        from app.db import Chunk, Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan, scope_chunks
+        from app.retriever.vector_ranking import nearest
 
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
         if query_embedding is None:
-            embedding_model = config.embedding_model_instance
             t_embed = time.perf_counter()
-            query_embedding = await asyncio.to_thread(embedding_model.embed, query_text)
+            query_embedding = await embed_query(query_text)
             perf.debug(
                 "[chunk_search] hybrid_search embedding in %.3fs",
                 time.perf_counter() - t_embed,
@@ -248,71 +285,42 @@ class ChucksHybridSearchRetriever:
         k = 60
         n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector (GIN-indexed) and tsquery for PostgreSQL full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
-        # Base conditions for chunk filtering - workspace is required.
-        # Exclude documents in "deleting" state (background deletion in progress).
-        base_conditions = [
-            Document.workspace_id == workspace_id,
-            func.coalesce(Document.status["state"].astext, "ready") != "deleting",
-        ]
+        # Document filters beyond the workspace (which scope_chunks applies,
+        # along with excluding documents mid-deletion).
+        document_conditions = _date_conditions(Document, start_date, end_date)
 
         # Add document type filter if provided (single string or list of strings)
         if document_type is not None:
-            type_list = (
-                document_type if isinstance(document_type, list) else [document_type]
-            )
-            doc_type_enums = []
-            for dt in type_list:
-                if isinstance(dt, str):
-                    with contextlib.suppress(KeyError):
-                        doc_type_enums.append(DocumentType[dt])
-                else:
-                    doc_type_enums.append(dt)
+            doc_type_enums = resolve_document_types(document_type)
             if not doc_type_enums:
                 return []
             if len(doc_type_enums) == 1:
-                base_conditions.append(Document.document_type == doc_type_enums[0])
+                document_conditions.append(Document.document_type == doc_type_enums[0])
             else:
-                base_conditions.append(Document.document_type.in_(doc_type_enums))
-
-        # Add time-based filtering if provided
-        if start_date is not None:
-            base_conditions.append(Document.updated_at >= start_date)
-        if end_date is not None:
-            base_conditions.append(Document.updated_at <= end_date)
+                document_conditions.append(Document.document_type.in_(doc_type_enums))
 
         # CTE for semantic search filtered by workspace
-        semantic_search_cte = (
-            select(
-                Chunk.id,
-                func.rank()
-                .over(order_by=Chunk.embedding.op("<=>")(query_embedding))
-                .label("rank"),
-            )
-            .join(Document, Chunk.document_id == Document.id)
-            .where(*base_conditions)
-        )
-
-        semantic_search_cte = (
-            semantic_search_cte.order_by(Chunk.embedding.op("<=>")(query_embedding))
-            .limit(n_results)
-            .cte("semantic_search")
-        )
+        semantic_search_cte = nearest(
+            scope_chunks(select(Chunk.id), workspace_id, *document_conditions),
+            Chunk.embedding,
+            query_embedding,
+            n_results,
+        ).cte("semantic_search")
 
         # CTE for keyword search filtered by workspace
-        keyword_search_cte = (
+        keyword_search_cte = scope_chunks(
             select(
                 Chunk.id,
                 func.rank()
                 .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
                 .label("rank"),
-            )
-            .join(Document, Chunk.document_id == Document.id)
-            .where(*base_conditions)
-            .where(tsvector.op("@@")(tsquery))
+            ).where(tsvector.op("@@")(tsquery)),
+            workspace_id,
+            *document_conditions,
         )
 
         keyword_search_cte = (
@@ -321,10 +329,17 @@ class ChucksHybridSearchRetriever:
             .cte("keyword_search")
         )
 
-        # Final combined query using a FULL OUTER JOIN with RRF scoring
+        # Final combined query using a FULL OUTER JOIN with RRF scoring.
+        # Projects only the columns grouping needs: no ORM hydration, and none
+        # of the document's content, source_markdown or embedding.
         final_query = (
             select(
-                Chunk,
+                Chunk.id,
+                Chunk.content,
+                Document.id.label("document_id"),
+                Document.title,
+                Document.document_type,
+                Document.document_metadata,
                 (
                     func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
                     + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
@@ -342,13 +357,14 @@ class ChucksHybridSearchRetriever:
                 Chunk.id
                 == func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id),
             )
-            .options(joinedload(Chunk.document))
+            .join(Document, Chunk.document_id == Document.id)
             .order_by(text("score DESC"))
             .limit(top_k)
         )
 
         # Execute the RRF query
         t_rrf = time.perf_counter()
+        await enable_iterative_scan(self.db_session)
         result = await self.db_session.execute(final_query)
         chunks_with_scores = result.all()
         perf.info(
@@ -364,54 +380,218 @@ class ChucksHybridSearchRetriever:
             return []
 
         # Convert to serializable dictionaries
-        serialized_chunk_results: list[dict] = []
-        for chunk, score in chunks_with_scores:
-            serialized_chunk_results.append(
-                {
-                    "chunk_id": chunk.id,
-                    "content": chunk.content,
-                    "score": float(score),  # Ensure score is a Python float
-                    "document": {
-                        "id": chunk.document.id,
-                        "title": chunk.document.title,
-                        "document_type": chunk.document.document_type.value
-                        if hasattr(chunk.document, "document_type")
-                        else None,
-                        "metadata": chunk.document.document_metadata,
-                    },
-                }
+        serialized_chunk_results = [_serialize_hit(row) for row in chunks_with_scores]
+
+        final_docs = (
+            await self._group_by_document({None: serialized_chunk_results}, top_k)
+        )[None]
+
+        perf.info(
+            "[chunk_search] hybrid_search TOTAL in %.3fs docs=%d space=%d type=%s",
+            time.perf_counter() - t0,
+            len(final_docs),
+            workspace_id,
+            document_type,
+        )
+        return final_docs
+
+    @_instrument_search("hybrid_by_source")
+    async def hybrid_search_by_source(
+        self,
+        query_text: str,
+        top_k: int,
+        workspace_id: int,
+        sources: dict[str, str | list[str]],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list | None = None,
+    ) -> dict[str, list]:
+        """
+        :meth:`hybrid_search` for several sources in one statement.
+
+        Each source gets its own semantic and keyword top-k (a source with few
+        matches is not crowded out by a large one), but all of them run as
+        branches of a single query, followed by a single chunk fetch — two
+        round trips however many sources are searched.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per source
+            workspace_id: The workspace ID to search within
+            sources: Source key -> document type(s) it covers
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Pre-computed embedding vector. If None, will be computed here.
+
+        Returns:
+            Source key -> the list :meth:`hybrid_search` would return for it.
+            Every requested key is present.
+        """
+        from sqlalchemy import func, literal, select, union_all
+
+        from app.db import Chunk, Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan, scope_chunks
+        from app.retriever.vector_ranking import nearest
+
+        perf = get_perf_logger()
+        t0 = time.perf_counter()
+
+        results: dict[str, list] = {key: [] for key in sources}
+        source_types = {
+            key: enums
+            for key, types in sources.items()
+            if (enums := resolve_document_types(types))
+        }
+        if not source_types:
+            return results
+
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
+
+        tsvector = Chunk.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
+        text_rank = func.ts_rank_cd(tsvector, tsquery).desc()
+
+        date_conditions = _date_conditions(Document, start_date, end_date)
+
+        def _by_distance(stmt):
+            return nearest(stmt, Chunk.embedding, query_embedding, n_results)
+
+        def _by_text_rank(stmt):
+            return (
+                stmt.add_columns(func.rank().over(order_by=text_rank).label("rank"))
+                .order_by(text_rank)
+                .limit(n_results)
             )
 
+        def _leg(ranked, *conditions):
+            # One LIMITed branch per source keeps each on the HNSW/GIN index.
+            branches = []
+            for key, enums in source_types.items():
+                branch = ranked(
+                    scope_chunks(
+                        select(literal(key).label("source"), Chunk.id).where(
+                            *conditions
+                        ),
+                        workspace_id,
+                        *date_conditions,
+                        Document.document_type.in_(enums),
+                    )
+                ).subquery()
+                branches.append(select(*branch.c))
+            return union_all(*branches)
+
+        semantic_search_cte = _leg(_by_distance).cte("semantic_search")
+        keyword_search_cte = _leg(_by_text_rank, tsvector.op("@@")(tsquery)).cte(
+            "keyword_search"
+        )
+
+        score = (
+            func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
+            + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        ).label("score")
+        final_query = (
+            select(
+                func.coalesce(
+                    semantic_search_cte.c.source, keyword_search_cte.c.source
+                ).label("source"),
+                Chunk.id,
+                Chunk.content,
+                Document.id.label("document_id"),
+                Document.title,
+                Document.document_type,
+                Document.document_metadata,
+                score,
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    (semantic_search_cte.c.source == keyword_search_cte.c.source)
+                    & (semantic_search_cte.c.id == keyword_search_cte.c.id),
+                    full=True,
+                )
+            )
+            .join(
+                Chunk,
+                Chunk.id
+                == func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id),
+            )
+            .join(Document, Chunk.document_id == Document.id)
+            .order_by(score.desc())
+        )
+
+        t_rrf = time.perf_counter()
+        await enable_iterative_scan(self.db_session)
+        rows = (await self.db_session.execute(final_query)).all()
+        perf.info(
+            "[chunk_search] hybrid_search_by_source RRF query in %.3fs results=%d "
+            "space=%d sources=%d",
+            time.perf_counter() - t_rrf,
+            len(rows),
+            workspace_id,
+            len(source_types),
+        )
+
+        # Each source keeps its top_k fused chunks, as hybrid_search's LIMIT
+        # does; grouping and the matched-chunk set only ever see those.
+        hits: dict[str, list[dict]] = {key: [] for key in source_types}
+        for row in rows:
+            if len(hits[row.source]) < top_k:
+                hits[row.source].append(_serialize_hit(row))
+        results.update(await self._group_by_document(hits, top_k))
+
+        perf.info(
+            "[chunk_search] hybrid_search_by_source TOTAL in %.3fs docs=%d "
+            "space=%d sources=%d",
+            time.perf_counter() - t0,
+            sum(len(docs) for docs in results.values()),
+            workspace_id,
+            len(source_types),
+        )
+        return results
+
+    async def _group_by_document(
+        self, ranked_hits: dict, top_k: int
+    ) -> dict[object, list[dict]]:
+        """Group score-ordered chunk hits into documents, per key.
+
+        Keeps each key's ``top_k`` best documents and fetches their chunks for
+        every key in one query.
+        """
+        from sqlalchemy import func, or_, select
+
+        from app.db import Chunk
+
         # Group by document, preserving ranking order by best chunk rank
+        doc_ids_by_key: dict[object, list[int]] = {}
         doc_scores: dict[int, float] = {}
-        doc_order: list[int] = []
-        for item in serialized_chunk_results:
-            doc_id = item.get("document", {}).get("id")
-            if doc_id is None:
-                continue
-            if doc_id not in doc_scores:
-                doc_scores[doc_id] = item.get("score", 0.0)
-                doc_order.append(doc_id)
-            else:
-                # Use the best score as doc score
-                doc_scores[doc_id] = max(doc_scores[doc_id], item.get("score", 0.0))
+        doc_meta_cache: dict[int, dict] = {}
+        matched_chunk_ids: set[int] = set()
+        for key, hits in ranked_hits.items():
+            doc_order: list[int] = []
+            for item in hits:
+                doc_id = item.get("document", {}).get("id")
+                if doc_id is None:
+                    continue
+                matched_chunk_ids.add(item["chunk_id"])
+                if doc_id not in doc_scores:
+                    doc_scores[doc_id] = item.get("score", 0.0)
+                    doc_meta_cache[doc_id] = item["document"]
+                    doc_order.append(doc_id)
+                else:
+                    # Use the best score as doc score
+                    doc_scores[doc_id] = max(doc_scores[doc_id], item.get("score", 0.0))
+            # Keep only top_k documents by initial rank order.
+            doc_ids_by_key[key] = doc_order[:top_k]
 
-        # Keep only top_k documents by initial rank order.
-        doc_ids = doc_order[:top_k]
+        doc_ids = [did for ids in doc_ids_by_key.values() for did in ids]
         if not doc_ids:
-            return []
-
-        # Collect document metadata from the small RRF result set (already
-        # loaded via joinedload) so the bulk chunk fetch can skip the expensive
-        # Document JOIN entirely.
-        matched_chunk_ids: set[int] = {
-            item["chunk_id"] for item in serialized_chunk_results
-        }
-        doc_meta_cache: dict[int, dict] = {}
-        for item in serialized_chunk_results:
-            did = item["document"]["id"]
-            if did not in doc_meta_cache:
-                doc_meta_cache[did] = item["document"]
+            return {key: [] for key in ranked_hits}
 
         # SQL-level per-document chunk limit using ROW_NUMBER().
         # Avoids loading hundreds of chunks per large document only to
@@ -450,7 +630,7 @@ class ChucksHybridSearchRetriever:
         t_fetch = time.perf_counter()
         chunks_result = await self.db_session.execute(chunk_query)
         fetched_chunks = chunks_result.all()
-        perf.debug(
+        get_perf_logger().debug(
             "[chunk_search] chunk fetch in %.3fs rows=%d",
             time.perf_counter() - t_fetch,
             len(fetched_chunks),
@@ -481,19 +661,11 @@ class ChucksHybridSearchRetriever:
                 doc_entry["matched_chunk_ids"].append(row.id)
 
         # Fill concatenated content (useful for reranking)
-        final_docs: list[dict] = []
-        for doc_id in doc_ids:
-            entry = doc_map[doc_id]
+        for entry in doc_map.values():
             entry["content"] = "\n\n".join(
                 c["content"] for c in entry.get("chunks", []) if c.get("content")
             )
-            final_docs.append(entry)
-
-        perf.info(
-            "[chunk_search] hybrid_search TOTAL in %.3fs docs=%d space=%d type=%s",
-            time.perf_counter() - t0,
-            len(final_docs),
-            workspace_id,
-            document_type,
-        )
-        return final_docs
+        return {
+            key: [doc_map[doc_id] for doc_id in ids]
+            for key, ids in doc_ids_by_key.items()
+        }
@@ -1,10 +1,9 @@
-import asyncio
-import contextlib
 import functools
 import time
 from datetime import datetime
 
 from app.observability import metrics as ot_metrics, otel as ot
+from app.retriever.chunks_hybrid_search import resolve_document_types
 from app.utils.perf import get_perf_logger
 
 _MAX_FETCH_CHUNKS_PER_DOC = 20
@@ -81,35 +80,35 @@ class DocumentHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan
+        from app.retriever.vector_ranking import nearest
 
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
         # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = await asyncio.to_thread(embedding_model.embed, query_text)
+        query_embedding = await embed_query(query_text)
 
-        # Build the query filtered by workspace
+        # Nearest documents in the workspace (and time range, if provided)
+        candidates = select(Document.id).where(Document.workspace_id == workspace_id)
+        if start_date is not None:
+            candidates = candidates.where(Document.updated_at >= start_date)
+        if end_date is not None:
+            candidates = candidates.where(Document.updated_at <= end_date)
+        nearest_ids = nearest(
+            candidates, Document.embedding, query_embedding, top_k
+        ).subquery()
         query = (
             select(Document)
             .options(joinedload(Document.workspace))
-            .where(Document.workspace_id == workspace_id)
-        )
-
-        # Add time-based filtering if provided
-        if start_date is not None:
-            query = query.where(Document.updated_at >= start_date)
-        if end_date is not None:
-            query = query.where(Document.updated_at <= end_date)
-
-        # Add vector similarity ordering
-        query = query.order_by(Document.embedding.op("<=>")(query_embedding)).limit(
-            top_k
+            .join(nearest_ids, Document.id == nearest_ids.c.id)
+            .order_by(nearest_ids.c.rank)
         )
 
         # Execute the query
+        await enable_iterative_scan(self.db_session)
         result = await self.db_session.execute(query)
         documents = result.scalars().all()
         perf.info(
@@ -151,8 +150,8 @@ class DocumentHybridSearchRetriever:
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector (GIN-indexed) and tsquery for PostgreSQL full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the query filtered by workspace
@@ -215,22 +214,23 @@ class DocumentHybridSearchRetriever:
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
-        from app.db import Chunk, Document, DocumentType
+        from app.db import Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan
+        from app.retriever.vector_ranking import nearest
 
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
         if query_embedding is None:
-            embedding_model = config.embedding_model_instance
-            query_embedding = await asyncio.to_thread(embedding_model.embed, query_text)
+            query_embedding = await embed_query(query_text)
 
         # RRF constants
         k = 60
         n_results = top_k * 2  # Fetch extra documents for better fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector (GIN-indexed) and tsquery for PostgreSQL full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Base conditions for document filtering - workspace is required.
@@ -242,16 +242,7 @@ class DocumentHybridSearchRetriever:
 
         # Add document type filter if provided (single string or list of strings)
         if document_type is not None:
-            type_list = (
-                document_type if isinstance(document_type, list) else [document_type]
-            )
-            doc_type_enums = []
-            for dt in type_list:
-                if isinstance(dt, str):
-                    with contextlib.suppress(KeyError):
-                        doc_type_enums.append(DocumentType[dt])
-                else:
-                    doc_type_enums.append(dt)
+            doc_type_enums = resolve_document_types(document_type)
             if not doc_type_enums:
                 return []
             if len(doc_type_enums) == 1:
@@ -266,18 +257,12 @@ class DocumentHybridSearchRetriever:
             base_conditions.append(Document.updated_at <= end_date)
 
         # CTE for semantic search filtered by workspace
-        semantic_search_cte = select(
-            Document.id,
-            func.rank()
-            .over(order_by=Document.embedding.op("<=>")(query_embedding))
-            .label("rank"),
-        ).where(*base_conditions)
-
-        semantic_search_cte = (
-            semantic_search_cte.order_by(Document.embedding.op("<=>")(query_embedding))
-            .limit(n_results)
-            .cte("semantic_search")
-        )
+        semantic_search_cte = nearest(
+            select(Document.id).where(*base_conditions),
+            Document.embedding,
+            query_embedding,
+            n_results,
+        ).cte("semantic_search")
 
         # CTE for keyword search filtered by workspace
         keyword_search_cte = (
@@ -324,6 +309,7 @@ class DocumentHybridSearchRetriever:
         )
 
         # Execute the query
+        await enable_iterative_scan(self.db_session)
         result = await self.db_session.execute(final_query)
         documents_with_scores = result.all()
 
@@ -331,25 +317,199 @@ class DocumentHybridSearchRetriever:
         if not documents_with_scores:
             return []
 
+        final_docs = (await self._attach_chunks({None: documents_with_scores}))[None]
+
+        perf.info(
+            "[doc_search] hybrid_search TOTAL in %.3fs docs=%d space=%d type=%s",
+            time.perf_counter() - t0,
+            len(final_docs),
+            workspace_id,
+            document_type,
+        )
+        return final_docs
+
+    @_instrument_search("hybrid_by_source")
+    async def hybrid_search_by_source(
+        self,
+        query_text: str,
+        top_k: int,
+        workspace_id: int,
+        sources: dict[str, str | list[str]],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list | None = None,
+    ) -> dict[str, list]:
+        """
+        :meth:`hybrid_search` for several sources in one statement.
+
+        Each source gets its own semantic and keyword top-k, run as branches of
+        a single query and followed by a single chunk fetch.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per source
+            workspace_id: The workspace ID to search within
+            sources: Source key -> document type(s) it covers
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Pre-computed embedding vector. If None, will be computed here.
+
+        Returns:
+            Source key -> the list :meth:`hybrid_search` would return for it.
+            Every requested key is present.
+        """
+        from sqlalchemy import func, literal, select, union_all
+
+        from app.db import Document
+        from app.retriever.query_embedding import embed_query
+        from app.retriever.scoping import enable_iterative_scan
+        from app.retriever.vector_ranking import nearest
+
+        perf = get_perf_logger()
+        t0 = time.perf_counter()
+
+        results: dict[str, list] = {key: [] for key in sources}
+        source_types = {
+            key: enums
+            for key, types in sources.items()
+            if (enums := resolve_document_types(types))
+        }
+        if not source_types:
+            return results
+
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 2  # Fetch extra documents for better fusion
+
+        tsvector = Document.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
+        text_rank = func.ts_rank_cd(tsvector, tsquery).desc()
+
+        base_conditions = [
+            Document.workspace_id == workspace_id,
+            func.coalesce(Document.status["state"].astext, "ready") != "deleting",
+        ]
+        if start_date is not None:
+            base_conditions.append(Document.updated_at >= start_date)
+        if end_date is not None:
+            base_conditions.append(Document.updated_at <= end_date)
+
+        def _by_distance(stmt):
+            return nearest(stmt, Document.embedding, query_embedding, n_results)
+
+        def _by_text_rank(stmt):
+            return (
+                stmt.add_columns(func.rank().over(order_by=text_rank).label("rank"))
+                .order_by(text_rank)
+                .limit(n_results)
+            )
+
+        def _leg(ranked, *conditions):
+            # One LIMITed branch per source keeps each on the HNSW/GIN index.
+            branches = []
+            for key, enums in source_types.items():
+                branch = ranked(
+                    select(literal(key).label("source"), Document.id)
+                    .where(*base_conditions, *conditions)
+                    .where(Document.document_type.in_(enums))
+                ).subquery()
+                branches.append(select(*branch.c))
+            return union_all(*branches)
+
+        semantic_search_cte = _leg(_by_distance).cte("semantic_search")
+        keyword_search_cte = _leg(_by_text_rank, tsvector.op("@@")(tsquery)).cte(
+            "keyword_search"
+        )
+
+        # Projects only what the results carry: not the document's content,
+        # source_markdown or embedding.
+        score = (
+            func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
+            + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        ).label("score")
+        final_query = (
+            select(
+                func.coalesce(
+                    semantic_search_cte.c.source, keyword_search_cte.c.source
+                ).label("source"),
+                Document.id,
+                Document.title,
+                Document.document_type,
+                Document.document_metadata,
+                score,
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    (semantic_search_cte.c.source == keyword_search_cte.c.source)
+                    & (semantic_search_cte.c.id == keyword_search_cte.c.id),
+                    full=True,
+                )
+            )
+            .join(
+                Document,
+                Document.id
+                == func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id),
+            )
+            .order_by(score.desc())
+        )
+
+        await enable_iterative_scan(self.db_session)
+        rows = (await self.db_session.execute(final_query)).all()
+
+        ranked: dict[str, list] = {key: [] for key in source_types}
+        for row in rows:
+            if len(ranked[row.source]) < top_k:
+                ranked[row.source].append((row, row.score))
+        results.update(await self._attach_chunks(ranked))
+
+        perf.info(
+            "[doc_search] hybrid_search_by_source TOTAL in %.3fs docs=%d "
+            "space=%d sources=%d",
+            time.perf_counter() - t0,
+            sum(len(docs) for docs in results.values()),
+            workspace_id,
+            len(source_types),
+        )
+        return results
+
+    async def _attach_chunks(self, ranked: dict) -> dict[object, list[dict]]:
+        """Doc-grouped results for score-ordered ``(document, score)`` pairs.
+
+        ``ranked`` maps a key to its pairs; the chunks of every key's
+        documents are fetched in one query.
+        """
+        from sqlalchemy import func, select
+
+        from app.db import Chunk
+
         # Collect document IDs and pre-cache metadata from the small RRF
         # result set so the bulk chunk fetch can skip joinedload entirely.
-        doc_ids: list[int] = [doc.id for doc, _score in documents_with_scores]
         doc_meta_cache: dict[int, dict] = {}
         doc_score_cache: dict[int, float] = {}
         doc_source_cache: dict[int, str | None] = {}
-        for doc, score in documents_with_scores:
-            doc_meta_cache[doc.id] = {
-                "id": doc.id,
-                "title": doc.title,
-                "document_type": doc.document_type.value
-                if getattr(doc, "document_type", None)
-                else None,
-                "metadata": doc.document_metadata or {},
-            }
-            doc_score_cache[doc.id] = float(score)
-            doc_source_cache[doc.id] = (
-                doc.document_type.value if getattr(doc, "document_type", None) else None
-            )
+        for pairs in ranked.values():
+            for doc, score in pairs:
+                doc_meta_cache[doc.id] = {
+                    "id": doc.id,
+                    "title": doc.title,
+                    "document_type": doc.document_type.value
+                    if getattr(doc, "document_type", None)
+                    else None,
+                    "metadata": doc.document_metadata or {},
+                }
+                doc_score_cache[doc.id] = float(score)
+                doc_source_cache[doc.id] = (
+                    doc.document_type.value
+                    if getattr(doc, "document_type", None)
+                    else None
+                )
+        doc_ids: list[int] = list(doc_meta_cache)
+        if not doc_ids:
+            return {key: [] for key in ranked}
 
         # SQL-level per-document chunk limit using ROW_NUMBER().
         # Avoids loading hundreds of chunks per large document only to
@@ -379,7 +539,7 @@ class DocumentHybridSearchRetriever:
         t_fetch = time.perf_counter()
         chunks_result = await self.db_session.execute(chunks_query)
         fetched_chunks = chunks_result.all()
-        perf.debug(
+        get_perf_logger().debug(
             "[doc_search] chunk fetch in %.3fs rows=%d",
             time.perf_counter() - t_fetch,
             len(fetched_chunks),
@@ -408,19 +568,11 @@ class DocumentHybridSearchRetriever:
             )
 
         # Fill concatenated content (useful for reranking)
-        final_docs: list[dict] = []
-        for doc_id in doc_ids:
-            entry = doc_map[doc_id]
+        for entry in doc_map.values():
             entry["content"] = "\n\n".join(
                 c["content"] for c in entry.get("chunks", []) if c.get("content")
             )
-            final_docs.append(entry)
-
-        perf.info(
-            "[doc_search] hybrid_search TOTAL in %.3fs docs=%d space=%d type=%s",
-            time.perf_counter() - t0,
-            len(final_docs),
-            workspace_id,
-            document_type,
-        )
-        return final_docs
+        return {
+            key: [doc_map[doc.id] for doc, _score in pairs]
+            for key, pairs in ranked.items()
+        }
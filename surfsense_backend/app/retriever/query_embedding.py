@@ -0,0 +1,210 @@
+"""Process-wide cache for search-query embeddings.
+
+Every search surface — the chunk/document retrievers, ``ConnectorService``,
+the chat agent's hybrid search and the REST semantic search — embeds its query
+before touching Postgres. Agents re-issue the same queries across subagents
+and turns, and with a local model each miss is a forward pass on the shared
+thread pool, so all of them go through :func:`embed_query`.
+
+Entries are keyed by (embedding model, normalized query text). Lookups try an
+in-process LRU first, then Redis when ``QUERY_EMBEDDING_CACHE_REDIS_ENABLED``
+is set; identical concurrent misses share one computation. Redis is a
+best-effort tier: any error degrades to computing locally.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from app.config import config
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "qembed:v1:"
+_WHITESPACE = re.compile(r"\s+")
+
+_redis_client: aioredis.Redis | None = None
+
+
+def normalize_query(query: str) -> str:
+    """Fold Unicode compatibility forms and collapse whitespace.
+
+    Case is kept: cased embedding models give "US" and "us" different vectors.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+def _model_key(model: Any) -> str:
+    dimension = getattr(model, "dimension", None)
+    return f"{config.EMBEDDING_MODEL or type(model).__name__}:{dimension}"
+
+
+def _redis() -> aioredis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(config.REDIS_APP_URL)
+    return _redis_client
+
+
+def _redis_key(model_key: str, text: str) -> str:
+    digest = hashlib.sha256(f"{model_key}\0{text}".encode()).hexdigest()
+    return f"{_REDIS_KEY_PREFIX}{digest}"
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query embeddings with in-flight de-duplication.
+
+    The cache remembers which model instance filled it and starts over when
+    ``config.embedding_model_instance`` is swapped, so a vector is never served
+    for a different model than the one that would compute it now.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    def _bind_model(self, model: Any) -> None:
+        with self._lock:
+            if self._model is not model:
+                self._entries.clear()
+                self._model = model
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: str, vector: Any) -> None:
+        if self._max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def embed(self, query: str) -> Any:
+        model = config.embedding_model_instance
+        self._bind_model(model)
+        text = normalize_query(query)
+        model_key = _model_key(model)
+        key = f"{model_key}\0{text}"
+
+        vector = self.get(key)
+        if vector is not None:
+            metrics.record_query_embedding_cache_lookup(tier="memory", outcome="hit")
+            return vector
+
+        # Tasks belong to one event loop; Celery tasks each run their own.
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is loop:
+            metrics.record_query_embedding_cache_lookup(tier="memory", outcome="shared")
+        else:
+            metrics.record_query_embedding_cache_lookup(tier="memory", outcome="miss")
+            task = loop.create_task(self._fill(model, model_key, key, text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        # Shielded: a caller that goes away must not cancel the computation
+        # other callers (and the cache) are waiting on.
+        return await asyncio.shield(task)
+
+    def _settle(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieved here so an error nobody awaited isn't logged as lost.
+            task.exception()
+
+    async def _fill(self, model: Any, model_key: str, key: str, text: str) -> Any:
+        vector = await self._load(model, model_key, text)
+        if self._model is model:
+            self.put(key, vector)
+        return vector
+
+    async def _load(self, model: Any, model_key: str, text: str) -> np.ndarray:
+        """Fetch from Redis when enabled, else compute (and publish) the vector.
+
+        Either way the result is a writable float32 array.
+        """
+        use_redis = config.QUERY_EMBEDDING_CACHE_REDIS_ENABLED
+        redis_key = _redis_key(model_key, text) if use_redis else ""
+        if use_redis:
+            try:
+                raw = await _redis().get(redis_key)
+            except Exception as exc:  # best-effort tier; never fail the search
+                logger.debug("query-embedding Redis read failed: %s", exc)
+                raw = None
+            if raw is not None:
+                metrics.record_query_embedding_cache_lookup(tier="redis", outcome="hit")
+                # Copied: a buffer-backed array is read-only, a computed one isn't.
+                return np.frombuffer(raw, dtype=np.float32).copy()
+            metrics.record_query_embedding_cache_lookup(tier="redis", outcome="miss")
+
+        started = time.perf_counter()
+        vector = np.asarray(
+            await asyncio.to_thread(model.embed, text), dtype=np.float32
+        )
+        metrics.record_query_embedding_duration(
+            (time.perf_counter() - started) * 1000,
+            embedding_model=config.EMBEDDING_MODEL,
+        )
+
+        if use_redis:
+            try:
+                await _redis().set(
+                    redis_key,
+                    vector.tobytes(),
+                    ex=config.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+                )
+            except Exception as exc:  # best-effort tier; never fail the search
+                logger.debug("query-embedding Redis write failed: %s", exc)
+        return vector
+
+
+_cache = QueryEmbeddingCache(config.QUERY_EMBEDDING_CACHE_MAX_ENTRIES)
+
+
+async def embed_query(query: str) -> Any:
+    """Embedding of ``query`` under the configured model, computed off the loop.
+
+    Served from the shared cache unless ``QUERY_EMBEDDING_CACHE_ENABLED`` is
+    off, in which case this is just ``embed`` on a worker thread.
+    """
+    if not config.QUERY_EMBEDDING_CACHE_ENABLED:
+        return await asyncio.to_thread(config.embedding_model_instance.embed, query)
+    return await _cache.embed(query)
+
+
+def clear_query_embedding_cache() -> None:
+    """Drop this process's in-memory entries (Redis entries expire by TTL)."""
+    _cache.clear()
+
+
+__all__ = [
+    "QueryEmbeddingCache",
+    "clear_query_embedding_cache",
+    "embed_query",
+    "normalize_query",
+]
@@ -0,0 +1,104 @@
+"""Workspace scoping shared by the search retrievers.
+
+Chunk searches filter by workspace. Joining ``documents`` for that makes the
+HNSW scan walk every tenant's vectors and discard the foreign ones, so once
+``chunks.workspace_id`` is backfilled (``CHUNKS_WORKSPACE_FILTER_ENABLED``)
+the filter runs on the chunk itself: on a hash-partitioned table it prunes to
+one partition and its own HNSW/GIN indexes.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import Chunk, Document
+
+logger = logging.getLogger(__name__)
+
+_ITERATIVE_SCAN_MODES = frozenset({"strict_order", "relaxed_order"})
+_ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+# Whether the installed pgvector knows ``hnsw.iterative_scan``; probed once.
+_iterative_scan_supported: bool | None = None
+
+
+def _not_deleting():
+    return func.coalesce(Document.status["state"].astext, "ready") != "deleting"
+
+
+def scope_chunks(stmt: Select, workspace_id: int, *document_conditions) -> Select:
+    """Restrict a select over ``chunks`` to one workspace's searchable documents.
+
+    ``document_conditions`` are extra filters on ``Document`` (type, dates,
+    ids). Without the workspace column they apply through the usual join;
+    with it they become a semi-join on ``document_id``, so the chunk scan
+    itself stays on its vector or keyword index. Documents being deleted are
+    always excluded.
+    """
+    if not config.CHUNKS_WORKSPACE_FILTER_ENABLED:
+        return stmt.join(Document, Chunk.document_id == Document.id).where(
+            Document.workspace_id == workspace_id,
+            _not_deleting(),
+            *document_conditions,
+        )
+
+    stmt = stmt.where(Chunk.workspace_id == workspace_id)
+    if document_conditions:
+        visible = select(Document.id).where(
+            Document.workspace_id == workspace_id,
+            _not_deleting(),
+            *document_conditions,
+        )
+        return stmt.where(Chunk.document_id.in_(visible))
+    # Only a handful of documents are ever mid-deletion: exclude just those.
+    deleting = select(Document.id).where(
+        Document.workspace_id == workspace_id,
+        Document.status["state"].astext == "deleting",
+    )
+    return stmt.where(Chunk.document_id.not_in(deleting))
+
+
+async def enable_iterative_scan(session: AsyncSession) -> None:
+    """Let filtered HNSW scans continue until ``LIMIT`` rows pass the filter.
+
+    ``SET LOCAL``, so it ends with the caller's transaction. Skipped before
+    pgvector 0.8, which rejects the setting.
+    """
+    mode = config.PGVECTOR_ITERATIVE_SCAN
+    if mode not in _ITERATIVE_SCAN_MODES:
+        return
+    if not await _supports_iterative_scan(session):
+        return
+    await session.execute(text(f"SET LOCAL hnsw.iterative_scan = {mode}"))
+
+
+async def _supports_iterative_scan(session: AsyncSession) -> bool:
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        version = await session.scalar(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        _iterative_scan_supported = _version(version) >= _ITERATIVE_SCAN_MIN_VERSION
+        if not _iterative_scan_supported:
+            logger.info(
+                "pgvector %s predates iterative index scans; filtered HNSW "
+                "searches may return fewer than LIMIT rows",
+                version,
+            )
+    return _iterative_scan_supported
+
+
+def _version(raw: str | None) -> tuple[int, ...]:
+    parts: list[int] = []
+    for part in (raw or "").split("."):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
+
+
+__all__ = ["enable_iterative_scan", "scope_chunks"]
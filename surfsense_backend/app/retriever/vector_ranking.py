@@ -0,0 +1,86 @@
+"""Nearest-neighbour legs shared by the search retrievers.
+
+With ``VECTOR_SEARCH_QUANTIZATION`` set, the HNSW scan walks a quantized
+expression index instead of the full-precision one (``halfvec`` is half its
+size, ``binary`` a 32nd), so far more of it stays in memory. Only
+``VECTOR_SEARCH_RESCORE_FACTOR`` times the wanted rows come out of that pass;
+they are re-ranked by exact cosine distance on the stored embeddings, so ranks
+and RRF scores mean the same as in an unquantized search.
+"""
+
+from __future__ import annotations
+
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import Select, cast, func, literal, select
+
+from app.config import config
+
+QUANTIZATION_MODES = ("off", "halfvec", "binary")
+
+
+def exact_distance(embedding, query_embedding):
+    """Cosine distance to the query on the full-precision ``embedding``."""
+    return embedding.op("<=>")(query_embedding)
+
+
+def candidate_distance(embedding, query_embedding, mode: str):
+    """The distance the quantized HNSW index for ``mode`` can order by.
+
+    Mirrors ``app.db.quantized_vector_index``; the expressions must match for
+    the planner to pick the index.
+    """
+    dim = embedding.type.dim
+    query = literal(query_embedding, Vector(dim))
+    if mode == "halfvec":
+        return cast(embedding, HALFVEC(dim)).op("<=>")(cast(query, HALFVEC(dim)))
+    if mode == "binary":
+        return cast(func.binary_quantize(embedding), BIT(dim)).op("<~>")(
+            cast(func.binary_quantize(cast(query, Vector(dim))), BIT(dim))
+        )
+    raise ValueError(f"Unknown vector search quantization: {mode!r}")
+
+
+def nearest(
+    stmt: Select,
+    embedding,
+    query_embedding: list[float],
+    limit: int,
+    *,
+    quantization: str | None = None,
+) -> Select:
+    """``stmt``'s columns plus a ``rank`` for its ``limit`` rows nearest the query.
+
+    ``stmt`` is a filtered select over the table owning ``embedding``, without
+    ordering. ``quantization`` defaults to ``VECTOR_SEARCH_QUANTIZATION``.
+    """
+    mode = quantization or config.VECTOR_SEARCH_QUANTIZATION
+    distance = exact_distance(embedding, query_embedding)
+    if mode not in QUANTIZATION_MODES or mode == "off":
+        return (
+            stmt.add_columns(func.rank().over(order_by=distance).label("rank"))
+            .order_by(distance)
+            .limit(limit)
+        )
+
+    candidates = (
+        stmt.add_columns(distance.label("distance"))
+        .order_by(candidate_distance(embedding, query_embedding, mode))
+        .limit(limit * config.VECTOR_SEARCH_RESCORE_FACTOR)
+        .subquery("candidates")
+    )
+    return (
+        select(
+            *(column for column in candidates.c if column.key != "distance"),
+            func.rank().over(order_by=candidates.c.distance).label("rank"),
+        )
+        .order_by(candidates.c.distance)
+        .limit(limit)
+    )
+
+
+__all__ = [
+    "QUANTIZATION_MODES",
+    "candidate_distance",
+    "exact_distance",
+    "nearest",
+]
@@ -1,8 +1,11 @@
 # Force asyncio to use standard event loop before unstructured imports
 import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Literal
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, UploadFile
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel as PydanticBaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -19,6 +22,7 @@ from app.db import (
     Workspace,
     WorkspaceMembership,
     get_async_session,
+    shielded_async_session,
 )
 from app.knowledge_store.paths import virtual_path_to_doc
 from app.knowledge_store.service import record_deleted_documents
@@ -40,6 +44,13 @@ from app.services.export_service import resolve_document_markdown
 from app.services.okf import document_to_concept
 from app.services.task_dispatcher import TaskDispatcher, get_task_dispatcher
 from app.users import get_auth_context
+from app.utils.file_io import FileTooLargeError, spool_to_temp
+from app.utils.pagination import (
+    after_cursor,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+)
 from app.utils.rbac import check_permission
 
 try:
@@ -165,13 +176,11 @@ async def create_documents_file_upload(
     Requires DOCUMENTS_CREATE permission.
     """
     import os
-    import tempfile
     from datetime import datetime
-    from pathlib import Path
 
     from app.db import DocumentStatus
     from app.etl_pipeline.etl_document import ProcessingMode
-    from app.file_storage.service import store_document_file
+    from app.file_storage.service import store_document_file_from_path
     from app.tasks.document_processors.base import (
         check_document_by_unique_identifier,
         get_current_timestamp,
@@ -201,41 +210,51 @@ async def create_documents_file_upload(
                     f"exceeds the {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB per-file limit.",
                 )
 
-        # ===== Read all files concurrently to avoid blocking the event loop =====
-        async def _read_and_save(file: UploadFile) -> tuple[str, str, int, str | None]:
-            """Read upload content and write to temp file off the event loop."""
-            content = await file.read()
-            file_size = len(content)
+        # ===== Spool all files to disk concurrently, one chunk at a time =====
+        async def _read_and_save(
+            file: UploadFile,
+        ) -> tuple[str, str, int, str | None, str]:
+            """Copy the upload to a temp file, hashing it on the way."""
             filename = file.filename or "unknown"
-            content_type = file.content_type
-
-            if file_size > MAX_FILE_SIZE_BYTES:
+            try:
+                spooled = await spool_to_temp(
+                    file.read,
+                    suffix=os.path.splitext(filename)[1],
+                    max_bytes=MAX_FILE_SIZE_BYTES,
+                )
+            except FileTooLargeError as e:
                 raise HTTPException(
                     status_code=413,
-                    detail=f"File '{filename}' ({file_size / (1024 * 1024):.1f} MB) "
+                    detail=f"File '{filename}' ({e.size / (1024 * 1024):.1f} MB) "
                     f"exceeds the {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB per-file limit.",
-                )
-
-            def _write_temp() -> str:
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=os.path.splitext(filename)[1]
-                ) as tmp:
-                    tmp.write(content)
-                    return tmp.name
-
-            temp_path = await asyncio.to_thread(_write_temp)
-            return temp_path, filename, file_size, content_type
+                ) from e
+            return (
+                spooled.path,
+                filename,
+                spooled.size,
+                file.content_type,
+                spooled.sha256,
+            )
 
-        saved_files = await asyncio.gather(*(_read_and_save(f) for f in files))
+        saved_files = await asyncio.gather(
+            *(_read_and_save(f) for f in files), return_exceptions=True
+        )
+        failures = [r for r in saved_files if isinstance(r, BaseException)]
+        if failures:
+            for r in saved_files:
+                if not isinstance(r, BaseException):
+                    with contextlib.suppress(OSError):
+                        os.unlink(r[0])
+            raise failures[0]
 
         # ===== PHASE 1: Create pending documents for all files =====
         created_documents: list[Document] = []
-        # (document, temp_path, filename, content_type)
-        files_to_process: list[tuple[Document, str, str, str | None]] = []
+        # (document, temp_path, filename, content_type, sha256)
+        files_to_process: list[tuple[Document, str, str, str | None, str]] = []
         skipped_duplicates = 0
         duplicate_document_ids: list[int] = []
 
-        for temp_path, filename, file_size, content_type in saved_files:
+        for temp_path, filename, file_size, content_type, sha256 in saved_files:
             try:
                 unique_identifier_hash = generate_unique_identifier_hash(
                     DocumentType.FILE, filename, workspace_id
@@ -261,7 +280,7 @@ async def create_documents_file_upload(
                     existing.updated_at = get_current_timestamp()
                     created_documents.append(existing)
                     files_to_process.append(
-                        (existing, temp_path, filename, content_type)
+                        (existing, temp_path, filename, content_type, sha256)
                     )
                     continue
 
@@ -284,7 +303,9 @@ async def create_documents_file_upload(
                 )
                 session.add(document)
                 created_documents.append(document)
-                files_to_process.append((document, temp_path, filename, content_type))
+                files_to_process.append(
+                    (document, temp_path, filename, content_type, sha256)
+                )
 
             except HTTPException:
                 raise
@@ -302,19 +323,17 @@ async def create_documents_file_upload(
 
         # ===== PHASE 1.5: Persist the original uploads to durable storage =====
         # Best-effort: a storage failure must not block parsing or the response.
-        for document, temp_path, filename, content_type in files_to_process:
+        for document, temp_path, filename, content_type, sha256 in files_to_process:
             try:
-                original_bytes = await asyncio.to_thread(
-                    lambda p=temp_path: Path(p).read_bytes()
-                )
-                await store_document_file(
+                await store_document_file_from_path(
                     session,
                     document_id=document.id,
                     workspace_id=workspace_id,
-                    data=original_bytes,
+                    path=temp_path,
                     filename=filename,
                     mime_type=content_type,
                     created_by_id=str(user.id),
+                    checksum_sha256=sha256,
                 )
             except Exception as storage_error:
                 logger.warning(
@@ -325,7 +344,7 @@ async def create_documents_file_upload(
         await session.commit()
 
         # ===== PHASE 2: Dispatch tasks for each file =====
-        for document, temp_path, filename, _content_type in files_to_process:
+        for document, temp_path, filename, _content_type, sha256 in files_to_process:
             await dispatcher.dispatch_file_processing(
                 document_id=document.id,
                 temp_path=temp_path,
@@ -334,6 +353,7 @@ async def create_documents_file_upload(
                 user_id=str(user.id),
                 use_vision_llm=use_vision_llm,
                 processing_mode=validated_mode.value,
+                source_sha256=sha256,
             )
 
         return {
@@ -353,6 +373,157 @@ async def create_documents_file_upload(
         ) from e
 
 
+_DOCUMENT_SORT_COLUMNS = {
+    "created_at": Document.created_at,
+    "title": Document.title,
+    "document_type": Document.document_type,
+}
+
+# Rows fetched per query when a listing is streamed as NDJSON.
+_NDJSON_BATCH_SIZE = 500
+
+
+def _to_document_read(doc: Document) -> DocumentRead:
+    created_by_name = None
+    created_by_email = None
+    if doc.created_by:
+        created_by_name = doc.created_by.display_name
+        created_by_email = doc.created_by.email
+
+    # Parse status from JSONB
+    status_data = None
+    if hasattr(doc, "status") and doc.status:
+        status_data = DocumentStatusSchema(
+            state=doc.status.get("state", "ready"),
+            reason=doc.status.get("reason"),
+        )
+
+    raw_content = doc.content or ""
+    return DocumentRead(
+        id=doc.id,
+        title=doc.title,
+        document_type=doc.document_type,
+        document_metadata=doc.document_metadata,
+        content="",
+        content_preview=raw_content[:300],
+        content_hash=doc.content_hash,
+        unique_identifier_hash=doc.unique_identifier_hash,
+        created_at=doc.created_at,
+        updated_at=doc.updated_at,
+        workspace_id=doc.workspace_id,
+        folder_id=doc.folder_id,
+        created_by_id=doc.created_by_id,
+        created_by_name=created_by_name,
+        created_by_email=created_by_email,
+        status=status_data,
+    )
+
+
+async def _stream_documents_ndjson(
+    query, sort_cols: tuple, descending: bool
+) -> AsyncIterator[bytes]:
+    """Yield every row of ``query`` as NDJSON, one keyset batch per session.
+
+    Only one batch is held at a time and no connection stays checked out
+    while the client reads, however large the listing.
+    """
+    after = None
+    while True:
+        batch_query = query
+        if after is not None:
+            batch_query = query.where(
+                after_cursor(sort_cols, after, descending=descending)
+            )
+        async with shielded_async_session() as session:
+            result = await session.execute(batch_query.limit(_NDJSON_BATCH_SIZE))
+            db_documents = result.scalars().all()
+        for doc in db_documents:
+            yield _to_document_read(doc).model_dump_json().encode() + b"\n"
+        if len(db_documents) < _NDJSON_BATCH_SIZE:
+            return
+        after = [getattr(db_documents[-1], col.key) for col in sort_cols]
+
+
+async def _list_documents(
+    session: AsyncSession,
+    query,
+    rows_query,
+    *,
+    sort_col,
+    descending: bool,
+    skip: int | None,
+    page: int | None,
+    page_size: int,
+    cursor: str | None,
+    count: str,
+    output_format: str,
+):
+    """Order, paginate and count a document listing for the list endpoints.
+
+    ``query`` selects the documents, ``rows_query`` the same rows' ids (for
+    counting). Pages are keyset-paginated on ``(sort_col, id)`` when a
+    ``cursor`` is given and offset-paginated otherwise.
+    """
+    sort_cols = (sort_col, Document.id)
+    query = query.order_by(
+        *(col.desc() if descending else col.asc() for col in sort_cols)
+    )
+    if output_format == "ndjson":
+        return StreamingResponse(
+            _stream_documents_ndjson(query, sort_cols, descending),
+            media_type="application/x-ndjson",
+        )
+
+    total, total_is_estimate = await count_rows(
+        session, rows_query, estimate=count == "estimate"
+    )
+
+    sort_key = f"{sort_col.key}:{'desc' if descending else 'asc'}"
+    offset = 0
+    if cursor is not None:
+        try:
+            query = query.where(
+                after_cursor(
+                    sort_cols, decode_cursor(cursor, sort_key), descending=descending
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}") from e
+    elif skip is not None:
+        offset = skip
+    elif page is not None:
+        offset = page * page_size
+
+    # Get paginated results; one extra row tells whether another page exists.
+    if page_size == -1:
+        result = await session.execute(query.offset(offset))
+        db_documents = result.scalars().all()
+        has_more = False
+    else:
+        result = await session.execute(query.offset(offset).limit(page_size + 1))
+        db_documents = result.scalars().all()
+        has_more = len(db_documents) > page_size
+        db_documents = db_documents[:page_size]
+
+    next_cursor = None
+    if has_more and db_documents:
+        last = db_documents[-1]
+        next_cursor = encode_cursor(sort_key, [getattr(last, sort_col.key), last.id])
+
+    actual_page = (
+        page if page is not None else (offset // page_size if page_size > 0 else 0)
+    )
+    return PaginatedResponse(
+        items=[_to_document_read(doc) for doc in db_documents],
+        total=total,
+        page=actual_page,
+        page_size=page_size,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+    )
+
+
 @router.get("/documents", response_model=PaginatedResponse[DocumentRead])
 async def read_documents(
     skip: int | None = None,
@@ -363,6 +534,9 @@ async def read_documents(
     folder_id: int | str | None = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
+    cursor: str | None = None,
+    count: Literal["exact", "estimate"] = "exact",
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
     session: AsyncSession = Depends(get_async_session),
     auth: AuthContext = Depends(get_auth_context),
 ):
@@ -377,6 +551,9 @@ async def read_documents(
         page_size: Number of items per page (default: 50). Use -1 to return all remaining items after the offset.
         workspace_id: If provided, restrict results to a specific workspace.
         document_types: Comma-separated list of document types to filter by (e.g., "EXTENSION,FILE,SLACK_CONNECTOR").
+        cursor: 'next_cursor' from the previous page. Continues right after that page's last document, at constant cost however deep; 'skip' and 'page' are ignored.
+        count: "exact" counts every matching row; "estimate" uses the query planner's estimate for large results ('total_is_estimate' says which was returned).
+        format: "ndjson" streams every matching document as newline-delimited JSON instead of returning one page.
         session: Database session (injected).
         user: Current authenticated user (injected).
 
@@ -388,8 +565,6 @@ async def read_documents(
         - Results are scoped to documents in workspaces the user has membership in.
     """
     try:
-        from sqlalchemy import func
-
         # If specific workspace_id, check permission
         if workspace_id is not None:
             await check_permission(
@@ -404,10 +579,8 @@ async def read_documents(
                 .options(selectinload(Document.created_by))
                 .filter(Document.workspace_id == workspace_id)
             )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .filter(Document.workspace_id == workspace_id)
+            rows_query = select(Document.id).filter(
+                Document.workspace_id == workspace_id
             )
         else:
             # Get documents from all workspaces user has membership in
@@ -418,9 +591,8 @@ async def read_documents(
                 .join(WorkspaceMembership)
                 .filter(WorkspaceMembership.user_id == user.id)
             )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
+            rows_query = (
+                select(Document.id)
                 .join(Workspace)
                 .join(WorkspaceMembership)
                 .filter(WorkspaceMembership.user_id == user.id)
@@ -431,101 +603,31 @@ async def read_documents(
             type_list = [t.strip() for t in document_types.split(",") if t.strip()]
             if type_list:
                 query = query.filter(Document.document_type.in_(type_list))
-                count_query = count_query.filter(Document.document_type.in_(type_list))
+                rows_query = rows_query.filter(Document.document_type.in_(type_list))
 
         # Filter by folder_id: "root" or "null" => root level (folder_id IS NULL),
         # integer => specific folder, omitted => all documents
         if folder_id is not None:
             if str(folder_id).lower() in ("root", "null"):
                 query = query.filter(Document.folder_id.is_(None))
-                count_query = count_query.filter(Document.folder_id.is_(None))
+                rows_query = rows_query.filter(Document.folder_id.is_(None))
             else:
                 fid = int(folder_id)
                 query = query.filter(Document.folder_id == fid)
-                count_query = count_query.filter(Document.folder_id == fid)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        from sqlalchemy import asc as sa_asc, desc as sa_desc
-
-        sort_column_map = {
-            "created_at": Document.created_at,
-            "title": Document.title,
-            "document_type": Document.document_type,
-        }
-        sort_col = sort_column_map.get(sort_by, Document.created_at)
-        query = query.order_by(
-            sa_desc(sort_col) if sort_order == "desc" else sa_asc(sort_col)
-        )
-
-        # Calculate offset
-        offset = 0
-        if skip is not None:
-            offset = skip
-        elif page is not None:
-            offset = page * page_size
-
-        # Get paginated results
-        if page_size == -1:
-            result = await session.execute(query.offset(offset))
-        else:
-            result = await session.execute(query.offset(offset).limit(page_size))
+                rows_query = rows_query.filter(Document.folder_id == fid)
 
-        db_documents = result.scalars().all()
-
-        # Convert database objects to API-friendly format
-        api_documents = []
-        for doc in db_documents:
-            created_by_name = None
-            created_by_email = None
-            if doc.created_by:
-                created_by_name = doc.created_by.display_name
-                created_by_email = doc.created_by.email
-
-            # Parse status from JSONB
-            status_data = None
-            if hasattr(doc, "status") and doc.status:
-                status_data = DocumentStatusSchema(
-                    state=doc.status.get("state", "ready"),
-                    reason=doc.status.get("reason"),
-                )
-
-            raw_content = doc.content or ""
-            api_documents.append(
-                DocumentRead(
-                    id=doc.id,
-                    title=doc.title,
-                    document_type=doc.document_type,
-                    document_metadata=doc.document_metadata,
-                    content="",
-                    content_preview=raw_content[:300],
-                    content_hash=doc.content_hash,
-                    unique_identifier_hash=doc.unique_identifier_hash,
-                    created_at=doc.created_at,
-                    updated_at=doc.updated_at,
-                    workspace_id=doc.workspace_id,
-                    folder_id=doc.folder_id,
-                    created_by_id=doc.created_by_id,
-                    created_by_name=created_by_name,
-                    created_by_email=created_by_email,
-                    status=status_data,
-                )
-            )
-
-        # Calculate pagination info
-        actual_page = (
-            page if page is not None else (offset // page_size if page_size > 0 else 0)
-        )
-        has_more = (offset + len(api_documents)) < total if page_size > 0 else False
-
-        return PaginatedResponse(
-            items=api_documents,
-            total=total,
-            page=actual_page,
+        return await _list_documents(
+            session,
+            query,
+            rows_query,
+            sort_col=_DOCUMENT_SORT_COLUMNS.get(sort_by, Document.created_at),
+            descending=sort_order == "desc",
+            skip=skip,
+            page=page,
             page_size=page_size,
-            has_more=has_more,
+            cursor=cursor,
+            count=count,
+            output_format=output_format,
         )
     except HTTPException:
         raise
@@ -543,6 +645,9 @@ async def search_documents(
     page_size: int = 50,
     workspace_id: int | None = None,
     document_types: str | None = None,
+    cursor: str | None = None,
+    count: Literal["exact", "estimate"] = "exact",
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
     session: AsyncSession = Depends(get_async_session),
     auth: AuthContext = Depends(get_auth_context),
 ):
@@ -558,6 +663,9 @@ async def search_documents(
         page_size: Number of items per page. Use -1 to return all remaining items after the offset. Default: 50.
         workspace_id: Filter results to a specific workspace. Default: None.
         document_types: Comma-separated list of document types to filter by (e.g., "EXTENSION,FILE,SLACK_CONNECTOR").
+        cursor: 'next_cursor' from the previous page; 'skip' and 'page' are ignored. Default: None.
+        count: "exact" or "estimate" (query planner estimate for large results). Default: "exact".
+        format: "ndjson" streams every match as newline-delimited JSON. Default: "json".
         session: Database session (injected).
         user: Current authenticated user (injected).
 
@@ -566,11 +674,10 @@ async def search_documents(
 
     Notes:
         - Title matching uses ILIKE (case-insensitive).
+        - Results are ordered newest first.
         - If both 'skip' and 'page' are provided, 'skip' is used.
     """
     try:
-        from sqlalchemy import func
-
         # If specific workspace_id, check permission
         if workspace_id is not None:
             await check_permission(
@@ -585,10 +692,8 @@ async def search_documents(
                 .options(selectinload(Document.created_by))
                 .filter(Document.workspace_id == workspace_id)
             )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .filter(Document.workspace_id == workspace_id)
+            rows_query = select(Document.id).filter(
+                Document.workspace_id == workspace_id
             )
         else:
             # Get documents from all workspaces user has membership in
@@ -599,9 +704,8 @@ async def search_documents(
                 .join(WorkspaceMembership)
                 .filter(WorkspaceMembership.user_id == user.id)
             )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
+            rows_query = (
+                select(Document.id)
                 .join(Workspace)
                 .join(WorkspaceMembership)
                 .filter(WorkspaceMembership.user_id == user.id)
@@ -609,84 +713,27 @@ async def search_documents(
 
         # Only search by title (case-insensitive)
         query = query.filter(Document.title.ilike(f"%{title}%"))
-        count_query = count_query.filter(Document.title.ilike(f"%{title}%"))
+        rows_query = rows_query.filter(Document.title.ilike(f"%{title}%"))
 
         # Filter by document_types if provided
         if document_types is not None and document_types.strip():
             type_list = [t.strip() for t in document_types.split(",") if t.strip()]
             if type_list:
                 query = query.filter(Document.document_type.in_(type_list))
-                count_query = count_query.filter(Document.document_type.in_(type_list))
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
+                rows_query = rows_query.filter(Document.document_type.in_(type_list))
 
-        # Calculate offset
-        offset = 0
-        if skip is not None:
-            offset = skip
-        elif page is not None:
-            offset = page * page_size
-
-        # Get paginated results
-        if page_size == -1:
-            result = await session.execute(query.offset(offset))
-        else:
-            result = await session.execute(query.offset(offset).limit(page_size))
-
-        db_documents = result.scalars().all()
-
-        # Convert database objects to API-friendly format
-        api_documents = []
-        for doc in db_documents:
-            created_by_name = None
-            created_by_email = None
-            if doc.created_by:
-                created_by_name = doc.created_by.display_name
-                created_by_email = doc.created_by.email
-
-            # Parse status from JSONB
-            status_data = None
-            if hasattr(doc, "status") and doc.status:
-                status_data = DocumentStatusSchema(
-                    state=doc.status.get("state", "ready"),
-                    reason=doc.status.get("reason"),
-                )
-
-            raw_content = doc.content or ""
-            api_documents.append(
-                DocumentRead(
-                    id=doc.id,
-                    title=doc.title,
-                    document_type=doc.document_type,
-                    document_metadata=doc.document_metadata,
-                    content="",
-                    content_preview=raw_content[:300],
-                    content_hash=doc.content_hash,
-                    unique_identifier_hash=doc.unique_identifier_hash,
-                    created_at=doc.created_at,
-                    updated_at=doc.updated_at,
-                    workspace_id=doc.workspace_id,
-                    folder_id=doc.folder_id,
-                    created_by_id=doc.created_by_id,
-                    created_by_name=created_by_name,
-                    created_by_email=created_by_email,
-                    status=status_data,
-                )
-            )
-
-        # Calculate pagination info
-        actual_page = (
-            page if page is not None else (offset // page_size if page_size > 0 else 0)
-        )
-        has_more = (offset + len(api_documents)) < total if page_size > 0 else False
-
-        return PaginatedResponse(
-            items=api_documents,
-            total=total,
-            page=actual_page,
+        return await _list_documents(
+            session,
+            query,
+            rows_query,
+            sort_col=Document.created_at,
+            descending=True,
+            skip=skip,
+            page=page,
             page_size=page_size,
-            has_more=has_more,
+            cursor=cursor,
+            count=count,
+            output_format=output_format,
         )
     except HTTPException:
         raise
@@ -792,6 +839,69 @@ async def search_documents_semantic(
     )
 
 
+class ConnectorSearchRequest(PydanticBaseModel):
+    """Request body for a per-connector search across several sources at once."""
+
+    workspace_id: int
+    query: str = Field(min_length=1)
+    document_types: list[str] = Field(
+        min_length=1,
+        description="DocumentType names of the connectors to search.",
+    )
+    top_k: int = Field(default=5, ge=1, le=20)
+
+
+class ConnectorSearchResponse(PydanticBaseModel):
+    # Document type -> that connector's sources_info ({id, name, type, sources}).
+    results: dict[str, dict]
+
+
+@router.post("/documents/search-connectors", response_model=ConnectorSearchResponse)
+async def search_documents_by_connector(
+    request: ConnectorSearchRequest,
+    session: AsyncSession = Depends(get_async_session),
+    auth: AuthContext = Depends(get_auth_context),
+):
+    """Search several connectors, returning each one's citable sources.
+
+    One batched retrieval serves every requested connector, so latency stays
+    flat as sources are added. Requires DOCUMENTS_READ permission for the
+    workspace.
+    """
+    # Local import: the retriever pulls in the embedding model (see above).
+    from app.services.connector_service import ConnectorService
+
+    await check_permission(
+        session,
+        auth,
+        request.workspace_id,
+        Permission.DOCUMENTS_READ.value,
+        "You don't have permission to read documents in this workspace",
+    )
+
+    service = ConnectorService(session, workspace_id=request.workspace_id)
+    try:
+        results = await service.search_connectors(
+            user_query=request.query,
+            workspace_id=request.workspace_id,
+            document_types=request.document_types,
+            top_k=request.top_k,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Connector search failed: {e!s}"
+        ) from e
+
+    return ConnectorSearchResponse(
+        results={
+            document_type: sources_info
+            for document_type, (sources_info, _documents) in results.items()
+        }
+    )
+
+
 @router.get("/documents/search/titles", response_model=DocumentTitleSearchResponse)
 async def search_document_titles(
     workspace_id: int,
@@ -1223,16 +1333,19 @@ async def get_document_chunks_paginated(
     start_offset: int | None = Query(
         None, ge=0, description="Direct offset; overrides page * page_size"
     ),
+    cursor: str | None = Query(
+        None,
+        description="next_cursor from the previous page; overrides page and start_offset",
+    ),
+    count: Literal["exact", "estimate"] = "exact",
     session: AsyncSession = Depends(get_async_session),
     auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Paginated chunk loading for a document.
-    Supports both page-based and offset-based access.
+    Supports page-based, offset-based and cursor (keyset) access.
     """
     try:
-        from sqlalchemy import func
-
         doc_result = await session.execute(
             select(Document).filter(Document.id == document_id)
         )
@@ -1249,29 +1362,48 @@ async def get_document_chunks_paginated(
             "You don't have permission to read documents in this workspace",
         )
 
-        total_result = await session.execute(
-            select(func.count())
-            .select_from(Chunk)
-            .filter(Chunk.document_id == document_id)
+        total, total_is_estimate = await count_rows(
+            session,
+            select(Chunk.id).filter(Chunk.document_id == document_id),
+            estimate=count == "estimate",
         )
-        total = total_result.scalar() or 0
 
-        offset = start_offset if start_offset is not None else page * page_size
-        chunks_result = await session.execute(
-            select(Chunk)
-            .filter(Chunk.document_id == document_id)
-            .order_by(Chunk.position, Chunk.id)
-            .offset(offset)
-            .limit(page_size)
+        sort_cols = (Chunk.position, Chunk.id)
+        query = (
+            select(Chunk).filter(Chunk.document_id == document_id).order_by(*sort_cols)
         )
+        offset = start_offset if start_offset is not None else page * page_size
+        if cursor is not None:
+            offset = 0
+            try:
+                query = query.where(
+                    after_cursor(
+                        sort_cols,
+                        decode_cursor(cursor, "position:asc"),
+                        descending=False,
+                    )
+                )
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid cursor: {e}"
+                ) from e
+        chunks_result = await session.execute(query.offset(offset).limit(page_size + 1))
         chunks = chunks_result.scalars().all()
+        has_more = len(chunks) > page_size
+        chunks = chunks[:page_size]
 
         return PaginatedResponse(
             items=chunks,
             total=total,
             page=offset // page_size if page_size else page,
             page_size=page_size,
-            has_more=(offset + len(chunks)) < total,
+            has_more=has_more,
+            next_cursor=(
+                encode_cursor("position:asc", [chunks[-1].position, chunks[-1].id])
+                if has_more
+                else None
+            ),
+            total_is_estimate=total_is_estimate,
         )
     except HTTPException:
         raise
@@ -1685,7 +1817,6 @@ async def folder_upload(
     Works for all deployment modes (no is_self_hosted guard).
     """
     import json
-    import tempfile
 
     from app.etl_pipeline.etl_document import ProcessingMode
 
@@ -1775,27 +1906,38 @@ async def folder_upload(
         await session.commit()
 
     async def _read_and_save(file: UploadFile, idx: int) -> dict:
-        content = await file.read()
         raw_name = file.filename or rel_paths[idx]
         filename = raw_name.split("/")[-1]
-
-        def _write_temp() -> str:
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=os.path.splitext(filename)[1]
-            ) as tmp:
-                tmp.write(content)
-                return tmp.name
-
-        temp_path = await asyncio.to_thread(_write_temp)
+        try:
+            spooled = await spool_to_temp(
+                file.read,
+                suffix=os.path.splitext(filename)[1],
+                max_bytes=MAX_FILE_SIZE_BYTES,
+            )
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File '{filename}' ({e.size / (1024 * 1024):.1f} MB) "
+                f"exceeds the {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB per-file limit.",
+            ) from e
         return {
-            "temp_path": temp_path,
+            "temp_path": spooled.path,
             "relative_path": rel_paths[idx],
             "filename": filename,
+            "sha256": spooled.sha256,
         }
 
-    file_mappings = await asyncio.gather(
-        *(_read_and_save(f, i) for i, f in enumerate(files))
+    saved = await asyncio.gather(
+        *(_read_and_save(f, i) for i, f in enumerate(files)), return_exceptions=True
     )
+    failures = [r for r in saved if isinstance(r, BaseException)]
+    if failures:
+        for r in saved:
+            if not isinstance(r, BaseException):
+                with contextlib.suppress(OSError):
+                    os.unlink(r["temp_path"])
+        raise failures[0]
+    file_mappings = list(saved)
 
     from app.tasks.celery_tasks.document_tasks import (
         index_uploaded_folder_files_task,
@@ -1807,7 +1949,7 @@ async def folder_upload(
         folder_name=folder_name,
         root_folder_id=root_folder_id,
         use_vision_llm=use_vision_llm,
-        file_mappings=list(file_mappings),
+        file_mappings=file_mappings,
         processing_mode=validated_mode.value,
     )
 
@@ -1169,7 +1169,7 @@ async def get_my_access(
             workspace_id=workspace_id,
             workspace_name=workspace.name if workspace else "",
             is_owner=membership.is_owner,
-            role_name=membership.role.name if membership.role else None,
+            role_name=membership.role_name,
             permissions=permissions,
         )
 
@@ -79,6 +79,10 @@ class PaginatedResponse[T](BaseModel):
     page: int
     page_size: int
     has_more: bool
+    # Pass back as ``cursor`` to fetch the page after this one (keyset).
+    next_cursor: str | None = None
+    # True when ``total`` is the query planner's estimate, not a count.
+    total_is_estimate: bool = False
 
 
 class DocumentTitleRead(BaseModel):
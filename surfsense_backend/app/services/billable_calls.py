@@ -351,6 +351,7 @@ async def billable_call(
                         db_session=quota_session,
                         user_id=user_id,
                         reserved_micros=reserve_micros,
+                        request_id=request_id,
                     )
             except Exception:
                 logger.exception(
@@ -406,6 +407,7 @@ async def billable_call(
                         db_session=quota_session,
                         user_id=user_id,
                         reserved_micros=reserve_micros,
+                        request_id=request_id,
                     )
             except Exception:
                 logger.exception(
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from collections.abc import Callable
 from datetime import datetime
 from threading import Lock
 from typing import Any
@@ -19,9 +20,84 @@ from app.db import (
 )
 from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
 from app.retriever.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.retriever.query_embedding import embed_query
 from app.utils.perf import get_perf_logger
 
 
+def _rrf_fuse(
+    chunk_results: list[dict[str, Any]],
+    doc_results: list[dict[str, Any]],
+    top_k: int,
+) -> list[dict[str, Any]]:
+    """Fuse chunk-level and document-level hits by document, with RRF."""
+    # RRF constant
+    k = 60
+
+    if not chunk_results and not doc_results:
+        return []
+
+    # Helper to extract document_id from our doc-grouped result
+    def _doc_id(item: dict[str, Any]) -> int | None:
+        doc = item.get("document", {})
+        did = doc.get("id")
+        return int(did) if did is not None else None
+
+    # Build rank maps for RRF calculation (document-level)
+    chunk_ranks: dict[int, int] = {}
+    for rank, result in enumerate(chunk_results, start=1):
+        did = _doc_id(result)
+        if did is not None and did not in chunk_ranks:
+            chunk_ranks[did] = rank
+
+    doc_ranks: dict[int, int] = {}
+    for rank, result in enumerate(doc_results, start=1):
+        did = _doc_id(result)
+        if did is not None and did not in doc_ranks:
+            doc_ranks[did] = rank
+
+    all_doc_ids = set(chunk_ranks.keys()) | set(doc_ranks.keys())
+
+    # Calculate RRF scores for each document
+    rrf_scores: dict[int, float] = {}
+    for did in all_doc_ids:
+        chunk_rank = chunk_ranks.get(did)
+        doc_rank = doc_ranks.get(did)
+        score = 0.0
+        if chunk_rank is not None:
+            score += 1.0 / (k + chunk_rank)
+        if doc_rank is not None:
+            score += 1.0 / (k + doc_rank)
+        rrf_scores[did] = score
+
+    # Prefer chunk_results data, fallback to doc_results data
+    doc_data: dict[int, dict[str, Any]] = {}
+    for result in chunk_results:
+        did = _doc_id(result)
+        if did is not None and did not in doc_data:
+            doc_data[did] = result
+    for result in doc_results:
+        did = _doc_id(result)
+        if did is not None and did not in doc_data:
+            doc_data[did] = result
+
+    sorted_doc_ids = sorted(all_doc_ids, key=lambda did: rrf_scores[did], reverse=True)[
+        :top_k
+    ]
+
+    combined_results: list[dict[str, Any]] = []
+    for did in sorted_doc_ids:
+        if did in doc_data:
+            result = doc_data[did].copy()
+            result["document_id"] = did
+            result["score"] = rrf_scores[did]
+            # Preserve chunks list if present
+            if "chunks" in doc_data[did]:
+                result["chunks"] = doc_data[did]["chunks"]
+            combined_results.append(result)
+
+    return combined_results
+
+
 class ConnectorService:
     def __init__(self, session: AsyncSession, workspace_id: int | None = None):
         self.session = session
@@ -90,7 +166,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_files(files_docs)
 
+    def _format_files(self, files_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_files`` returns them."""
         # Early return if no results
         if not files_docs:
             return {
@@ -160,8 +239,6 @@ class ConnectorService:
         Returns:
             List of combined and deduplicated document results
         """
-        from app.config import config
-
         perf = get_perf_logger()
         t0 = time.perf_counter()
 
@@ -175,18 +252,13 @@ class ConnectorService:
         else:
             resolved_type = document_type
 
-        # RRF constant
-        k = 60
-
         # Get more results from each retriever for better fusion
         retriever_top_k = top_k * 2
 
         # Reuse caller-provided embedding or compute once for both retrievers.
         if query_embedding is None:
             t_embed = time.perf_counter()
-            query_embedding = await asyncio.to_thread(
-                config.embedding_model_instance.embed, query_text
-            )
+            query_embedding = await embed_query(query_text)
             perf.info(
                 "[connector_svc] _combined_rrf embedding in %.3fs type=%s",
                 time.perf_counter() - t_embed,
@@ -228,67 +300,7 @@ class ConnectorService:
             document_type,
         )
 
-        if not chunk_results and not doc_results:
-            return []
-
-        # Helper to extract document_id from our doc-grouped result
-        def _doc_id(item: dict[str, Any]) -> int | None:
-            doc = item.get("document", {})
-            did = doc.get("id")
-            return int(did) if did is not None else None
-
-        # Build rank maps for RRF calculation (document-level)
-        chunk_ranks: dict[int, int] = {}
-        for rank, result in enumerate(chunk_results, start=1):
-            did = _doc_id(result)
-            if did is not None and did not in chunk_ranks:
-                chunk_ranks[did] = rank
-
-        doc_ranks: dict[int, int] = {}
-        for rank, result in enumerate(doc_results, start=1):
-            did = _doc_id(result)
-            if did is not None and did not in doc_ranks:
-                doc_ranks[did] = rank
-
-        all_doc_ids = set(chunk_ranks.keys()) | set(doc_ranks.keys())
-
-        # Calculate RRF scores for each document
-        rrf_scores: dict[int, float] = {}
-        for did in all_doc_ids:
-            chunk_rank = chunk_ranks.get(did)
-            doc_rank = doc_ranks.get(did)
-            score = 0.0
-            if chunk_rank is not None:
-                score += 1.0 / (k + chunk_rank)
-            if doc_rank is not None:
-                score += 1.0 / (k + doc_rank)
-            rrf_scores[did] = score
-
-        # Prefer chunk_results data, fallback to doc_results data
-        doc_data: dict[int, dict[str, Any]] = {}
-        for result in chunk_results:
-            did = _doc_id(result)
-            if did is not None and did not in doc_data:
-                doc_data[did] = result
-        for result in doc_results:
-            did = _doc_id(result)
-            if did is not None and did not in doc_data:
-                doc_data[did] = result
-
-        sorted_doc_ids = sorted(
-            all_doc_ids, key=lambda did: rrf_scores[did], reverse=True
-        )[:top_k]
-
-        combined_results: list[dict[str, Any]] = []
-        for did in sorted_doc_ids:
-            if did in doc_data:
-                result = doc_data[did].copy()
-                result["document_id"] = did
-                result["score"] = rrf_scores[did]
-                # Preserve chunks list if present
-                if "chunks" in doc_data[did]:
-                    result["chunks"] = doc_data[did]["chunks"]
-                combined_results.append(result)
+        combined_results = _rrf_fuse(chunk_results, doc_results, top_k)
 
         perf.info(
             "[connector_svc] _combined_rrf_search TOTAL in %.3fs results=%d type=%s space=%d",
@@ -299,6 +311,135 @@ class ConnectorService:
         )
         return combined_results
 
+    async def _combined_rrf_search_many(
+        self,
+        query_text: str,
+        workspace_id: int,
+        document_types: list[str],
+        top_k: int = 20,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        :meth:`_combined_rrf_search` for several document types at once.
+
+        The chunk-level and document-level legs each run once across all the
+        types, with a separate top-k per type, and are RRF-fused per type
+        here. Latency stays flat as sources are added instead of growing by
+        two round trips per source.
+
+        Returns:
+            Document type -> the list ``_combined_rrf_search`` returns for it
+        """
+        perf = get_perf_logger()
+        t0 = time.perf_counter()
+
+        # Expand native Google types to include legacy Composio equivalents
+        # so old documents remain searchable until re-indexed.
+        sources: dict[str, str | list[str]] = {
+            document_type: [document_type, NATIVE_TO_LEGACY_DOCTYPE[document_type]]
+            if document_type in NATIVE_TO_LEGACY_DOCTYPE
+            else document_type
+            for document_type in document_types
+        }
+
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
+
+        search_kwargs = {
+            "query_text": query_text,
+            # Get more results from each retriever for better fusion
+            "top_k": top_k * 2,
+            "workspace_id": workspace_id,
+            "sources": sources,
+            "start_date": start_date,
+            "end_date": end_date,
+            "query_embedding": query_embedding,
+        }
+
+        async def _run_chunk_search() -> dict[str, list[dict[str, Any]]]:
+            async with async_session_maker() as session:
+                retriever = ChucksHybridSearchRetriever(session)
+                return await retriever.hybrid_search_by_source(**search_kwargs)
+
+        async def _run_doc_search() -> dict[str, list[dict[str, Any]]]:
+            async with async_session_maker() as session:
+                retriever = DocumentHybridSearchRetriever(session)
+                return await retriever.hybrid_search_by_source(**search_kwargs)
+
+        chunk_results, doc_results = await asyncio.gather(
+            _run_chunk_search(), _run_doc_search()
+        )
+        combined = {
+            document_type: _rrf_fuse(
+                chunk_results.get(document_type, []),
+                doc_results.get(document_type, []),
+                top_k,
+            )
+            for document_type in sources
+        }
+
+        perf.info(
+            "[connector_svc] _combined_rrf_search_many TOTAL in %.3fs types=%d "
+            "results=%d space=%d",
+            time.perf_counter() - t0,
+            len(sources),
+            sum(len(results) for results in combined.values()),
+            workspace_id,
+        )
+        return combined
+
+    async def search_connectors(
+        self,
+        user_query: str,
+        workspace_id: int,
+        document_types: list[str],
+        top_k: int = 20,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> dict[str, tuple]:
+        """
+        Search several connectors with one batched retrieval.
+
+        Equivalent to calling each connector's ``search_<connector>`` method
+        (``search_slack`` for ``"SLACK_CONNECTOR"``, ...) with the same
+        arguments, but the hybrid searches run once across all of them.
+
+        Args:
+            user_query: The user's query
+            workspace_id: The workspace ID to search in
+            document_types: Document types to search, e.g. ``["FILE", "SLACK_CONNECTOR"]``
+            top_k: Maximum number of results to return per connector
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+
+        Returns:
+            dict: document type -> (sources_info, langchain_documents)
+        """
+        unknown = [t for t in document_types if t not in _FORMATTER_BY_TYPE]
+        if unknown:
+            raise ValueError(f"No connector search for document types: {unknown}")
+        document_types = list(dict.fromkeys(document_types))
+        if not document_types:
+            return {}
+
+        batched = await self._combined_rrf_search_many(
+            query_text=user_query,
+            workspace_id=workspace_id,
+            document_types=document_types,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        return {
+            document_type: _FORMATTER_BY_TYPE[document_type](
+                self, batched[document_type]
+            )
+            for document_type in document_types
+        }
+
     def _get_doc_url(self, metadata: dict[str, Any]) -> str:
         return (
             metadata.get("url")
@@ -416,7 +557,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_slack(slack_docs)
 
+    def _format_slack(self, slack_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_slack`` returns them."""
         # Early return if no results
         if not slack_docs:
             return {
@@ -490,7 +634,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_notion(notion_docs)
 
+    def _format_notion(self, notion_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_notion`` returns them."""
         # Early return if no results
         if not notion_docs:
             return {
@@ -560,7 +707,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_extension(extension_docs)
 
+    def _format_extension(self, extension_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_extension`` returns them."""
         # Early return if no results
         if not extension_docs:
             return {
@@ -657,7 +807,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_youtube(youtube_docs)
 
+    def _format_youtube(self, youtube_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_youtube`` returns them."""
         # Early return if no results
         if not youtube_docs:
             return {
@@ -738,7 +891,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_github(github_docs)
 
+    def _format_github(self, github_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_github`` returns them."""
         # Early return if no results
         if not github_docs:
             return {
@@ -797,7 +953,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_linear(linear_docs)
 
+    def _format_linear(self, linear_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_linear`` returns them."""
         # Early return if no results
         if not linear_docs:
             return {
@@ -897,7 +1056,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_jira(jira_docs)
 
+    def _format_jira(self, jira_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_jira`` returns them."""
         # Early return if no results
         if not jira_docs:
             return {
@@ -999,7 +1161,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_google_calendar(calendar_docs)
 
+    def _format_google_calendar(self, calendar_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_google_calendar`` returns them."""
         # Early return if no results
         if not calendar_docs:
             return {
@@ -1105,7 +1270,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_airtable(airtable_docs)
 
+    def _format_airtable(self, airtable_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_airtable`` returns them."""
         # Early return if no results
         if not airtable_docs:
             return {
@@ -1181,7 +1349,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_google_gmail(gmail_docs)
 
+    def _format_google_gmail(self, gmail_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_google_gmail`` returns them."""
         # Early return if no results
         if not gmail_docs:
             return {
@@ -1281,7 +1452,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_google_drive(drive_docs)
 
+    def _format_google_drive(self, drive_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_google_drive`` returns them."""
         # Early return if no results
         if not drive_docs:
             return {
@@ -1381,7 +1555,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_confluence(confluence_docs)
 
+    def _format_confluence(self, confluence_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_confluence`` returns them."""
         # Early return if no results
         if not confluence_docs:
             return {
@@ -1452,7 +1629,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_clickup(clickup_docs)
 
+    def _format_clickup(self, clickup_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_clickup`` returns them."""
         # Early return if no results
         if not clickup_docs:
             return {
@@ -1546,7 +1726,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_discord(discord_docs)
 
+    def _format_discord(self, discord_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_discord`` returns them."""
         # Early return if no results
         if not discord_docs:
             return {
@@ -1621,7 +1804,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_teams(teams_docs)
 
+    def _format_teams(self, teams_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_teams`` returns them."""
         # Early return if no results
         if not teams_docs:
             return {
@@ -1695,7 +1881,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_luma(luma_docs)
 
+    def _format_luma(self, luma_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_luma`` returns them."""
         # Early return if no results
         if not luma_docs:
             return {
@@ -1800,7 +1989,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_elasticsearch(elasticsearch_docs)
 
+    def _format_elasticsearch(self, elasticsearch_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_elasticsearch`` returns them."""
         # Early return if no results
         if not elasticsearch_docs:
             return {
@@ -1886,7 +2078,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_notes(notes_docs)
 
+    def _format_notes(self, notes_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_notes`` returns them."""
         # Early return if no results
         if not notes_docs:
             return {
@@ -1956,7 +2151,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_bookstack(bookstack_docs)
 
+    def _format_bookstack(self, bookstack_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_bookstack`` returns them."""
         # Early return if no results
         if not bookstack_docs:
             return {
@@ -2029,7 +2227,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_circleback(circleback_docs)
 
+    def _format_circleback(self, circleback_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_circleback`` returns them."""
         # Early return if no results
         if not circleback_docs:
             return {
@@ -2129,7 +2330,10 @@ class ConnectorService:
             start_date=start_date,
             end_date=end_date,
         )
+        return self._format_obsidian(obsidian_docs)
 
+    def _format_obsidian(self, obsidian_docs: list[dict[str, Any]]) -> tuple:
+        """Format fused results the way ``search_obsidian`` returns them."""
         # Early return if no results
         if not obsidian_docs:
             return {
@@ -2266,6 +2470,35 @@ class ConnectorService:
         return doc_types
 
 
+# Document type -> the ConnectorService formatter its search_<connector> method uses.
+_FORMATTER_BY_TYPE: dict[
+    str, Callable[[ConnectorService, list[dict[str, Any]]], tuple]
+] = {
+    "FILE": ConnectorService._format_files,
+    "SLACK_CONNECTOR": ConnectorService._format_slack,
+    "NOTION_CONNECTOR": ConnectorService._format_notion,
+    "EXTENSION": ConnectorService._format_extension,
+    "YOUTUBE_VIDEO": ConnectorService._format_youtube,
+    "GITHUB_CONNECTOR": ConnectorService._format_github,
+    "LINEAR_CONNECTOR": ConnectorService._format_linear,
+    "JIRA_CONNECTOR": ConnectorService._format_jira,
+    "GOOGLE_CALENDAR_CONNECTOR": ConnectorService._format_google_calendar,
+    "AIRTABLE_CONNECTOR": ConnectorService._format_airtable,
+    "GOOGLE_GMAIL_CONNECTOR": ConnectorService._format_google_gmail,
+    "GOOGLE_DRIVE_FILE": ConnectorService._format_google_drive,
+    "CONFLUENCE_CONNECTOR": ConnectorService._format_confluence,
+    "CLICKUP_CONNECTOR": ConnectorService._format_clickup,
+    "DISCORD_CONNECTOR": ConnectorService._format_discord,
+    "TEAMS_CONNECTOR": ConnectorService._format_teams,
+    "LUMA_CONNECTOR": ConnectorService._format_luma,
+    "ELASTICSEARCH_CONNECTOR": ConnectorService._format_elasticsearch,
+    "NOTE": ConnectorService._format_notes,
+    "BOOKSTACK_CONNECTOR": ConnectorService._format_bookstack,
+    "CIRCLEBACK": ConnectorService._format_circleback,
+    "OBSIDIAN_CONNECTOR": ConnectorService._format_obsidian,
+}
+
+
 # ---------------------------------------------------------------------------
 # Connector / document-type discovery TTL cache (Phase 1.4)
 # ---------------------------------------------------------------------------
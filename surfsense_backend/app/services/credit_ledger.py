@@ -0,0 +1,506 @@
+"""Redis credit ledger: premium reserve/finalize/release without User row locks.
+
+With ``CREDIT_LEDGER_BACKEND=redis`` the per-call wallet operations in
+:class:`app.services.token_quota_service.TokenQuotaService` become single Lua
+scripts against one hash per user, and :func:`settle` (run every minute by
+Celery beat) batch-applies finalized debits to ``User.credit_micros_balance``.
+
+Per-user hash ``credit_ledger:user:<id>``:
+
+- ``snapshot`` / ``pg_reserved`` / ``snapshot_at`` — the Postgres wallet as of
+  the last seed. A reserve on a snapshot older than
+  ``CREDIT_LEDGER_SNAPSHOT_MAX_AGE_SECONDS`` (or one that would be denied)
+  re-reads the row first, so top-ups from other writers show up promptly.
+- ``reserved`` + ``hold:<request_id>`` — in-flight holds. They never touch
+  ``User.credit_micros_reserved``; holds older than
+  ``CREDIT_LEDGER_HOLD_TTL_SECONDS`` (a crashed worker) are swept on reserve.
+  A reserve that fell back to Postgres has no hold here, so finalize and
+  release report that and the caller frees the row's reservation instead.
+- ``pending`` — finalized debits not yet claimed by settlement.
+- ``settling`` / ``batch`` — the claimed amount and its batch id while it is
+  applied to Postgres.
+- ``epoch`` — bumped whenever a settled batch lands, so a seed computed from a
+  row read before that can't overwrite the newer snapshot.
+
+Settlement is crash-safe: a batch id is claimed in Redis before the Postgres
+transaction and only cleared after it commits, and ``credit_ledger_settlements``
+has a unique ``batch_id``, so re-running a half-finished batch applies it at
+most once. Postgres stays the source of truth for every other writer; Redis
+should run with AOF persistence, since unsettled debits live only there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import redis.asyncio as aioredis
+from sqlalchemy import BigInteger, column, delete, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import config
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+_DIRTY_KEY = "credit_ledger:dirty"
+_SETTLEMENT_RETENTION = timedelta(days=7)
+
+# Reserve ``ARGV[1]`` micros as hold ``ARGV[2]``. Returns
+# ``{status, balance, reserved}`` with status 1 = held, 0 = blocked,
+# -1 = no snapshot (or one older than ``ARGV[4]`` seconds; -1 accepts any).
+_RESERVE_LUA = """
+local key, holds = KEYS[1], KEYS[2]
+local amount = tonumber(ARGV[1])
+local req_id = ARGV[2]
+local now = tonumber(ARGV[3])
+local max_age = tonumber(ARGV[4])
+local hold_ttl = tonumber(ARGV[5])
+
+local expired = redis.call('ZRANGEBYSCORE', holds, '-inf', now - hold_ttl)
+for _, id in ipairs(expired) do
+    local held = tonumber(redis.call('HGET', key, 'hold:' .. id) or '0')
+    redis.call('HDEL', key, 'hold:' .. id)
+    redis.call('HINCRBY', key, 'reserved', -held)
+    redis.call('ZREM', holds, id)
+end
+
+local f = redis.call('HMGET', key, 'snapshot', 'snapshot_at', 'pg_reserved',
+    'reserved', 'pending', 'settling')
+if not f[1] then
+    return {-1, 0, 0}
+end
+if max_age >= 0 and now - tonumber(f[2]) > max_age then
+    return {-1, 0, 0}
+end
+
+local balance = tonumber(f[1]) - tonumber(f[5] or '0') - tonumber(f[6] or '0')
+local reserved = tonumber(f[3] or '0') + tonumber(f[4] or '0')
+if redis.call('HEXISTS', key, 'hold:' .. req_id) == 1 then
+    return {1, balance, reserved}
+end
+if reserved + amount > balance then
+    return {0, balance, reserved}
+end
+
+redis.call('HINCRBY', key, 'reserved', amount)
+redis.call('HSET', key, 'hold:' .. req_id, amount)
+redis.call('ZADD', holds, now, req_id)
+return {1, balance, reserved + amount}
+"""
+
+# Store a Postgres read as the snapshot, unless a settled batch landed since
+# ``epoch`` ``ARGV[1]`` was read or one is mid-flight (the read may or may not
+# include it).
+_SEED_LUA = """
+local f = redis.call('HMGET', KEYS[1], 'epoch', 'settling')
+if (f[1] or '0') ~= ARGV[1] or tonumber(f[2] or '0') ~= 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'snapshot', ARGV[2], 'pg_reserved', ARGV[3],
+    'snapshot_at', ARGV[4])
+return 1
+"""
+
+# Drop hold ``ARGV[1]`` and queue ``ARGV[2]`` micros for settlement. Returns
+# ``{balance, reserved, held}`` with held 0 when there was no such hold.
+_FINALIZE_LUA = """
+local key, holds, dirty = KEYS[1], KEYS[2], KEYS[3]
+local req_id = ARGV[1]
+local actual = tonumber(ARGV[2])
+
+local held = redis.call('HGET', key, 'hold:' .. req_id)
+if held then
+    redis.call('HDEL', key, 'hold:' .. req_id)
+    redis.call('HINCRBY', key, 'reserved', -tonumber(held))
+    redis.call('ZREM', holds, req_id)
+end
+local existed = held and 1 or 0
+if actual ~= 0 then
+    redis.call('HINCRBY', key, 'pending', actual)
+    redis.call('SADD', dirty, ARGV[3])
+end
+
+local f = redis.call('HMGET', key, 'snapshot', 'pg_reserved', 'reserved',
+    'pending', 'settling')
+local balance = tonumber(f[1] or '0') - tonumber(f[4] or '0') - tonumber(f[5] or '0')
+return {balance, tonumber(f[2] or '0') + tonumber(f[3] or '0'), existed}
+"""
+
+_RELEASE_LUA = """
+local held = redis.call('HGET', KEYS[1], 'hold:' .. ARGV[1])
+if not held then
+    return 0
+end
+redis.call('HDEL', KEYS[1], 'hold:' .. ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'reserved', -tonumber(held))
+redis.call('ZREM', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Move ``pending`` into ``settling`` under batch id ``ARGV[2]``, or hand back
+# the unfinished batch from a crashed run. Returns ``{amount, batch}``.
+_CLAIM_LUA = """
+local f = redis.call('HMGET', KEYS[1], 'settling', 'batch', 'pending')
+local settling = tonumber(f[1] or '0')
+if settling ~= 0 then
+    return {settling, f[2]}
+end
+local pending = tonumber(f[3] or '0')
+if pending == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+    return {0, ''}
+end
+redis.call('HSET', KEYS[1], 'settling', pending, 'batch', ARGV[2], 'pending', 0)
+return {pending, ARGV[2]}
+"""
+
+# Batch ``ARGV[2]`` is in Postgres: fold it into the snapshot.
+_CLEAR_LUA = """
+local f = redis.call('HMGET', KEYS[1], 'batch', 'settling', 'snapshot', 'pending')
+if f[1] ~= ARGV[2] then
+    return 0
+end
+if f[3] then
+    redis.call('HINCRBY', KEYS[1], 'snapshot', -tonumber(f[2] or '0'))
+end
+redis.call('HSET', KEYS[1], 'settling', 0)
+redis.call('HDEL', KEYS[1], 'batch')
+redis.call('HINCRBY', KEYS[1], 'epoch', 1)
+if tonumber(f[4] or '0') == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return 1
+"""
+
+_redis_client: aioredis.Redis | None = None
+_redis_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _redis() -> aioredis.Redis:
+    # Celery tasks may each run on a fresh loop; a pool can't cross loops.
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        if _redis_client is not None:
+            _close_elsewhere(_redis_client, _redis_loop)
+        _redis_client = aioredis.from_url(config.REDIS_APP_URL, decode_responses=True)
+        _redis_loop = loop
+    return _redis_client
+
+
+def _close_elsewhere(
+    client: aioredis.Redis, loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Close a client replaced by another loop's, on the loop that owns it.
+
+    Its connections can only be closed there; a loop that has already closed
+    took them down with it, and there is nothing left to await.
+    """
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+def enabled() -> bool:
+    return config.CREDIT_LEDGER_BACKEND == "redis"
+
+
+def _user_key(user_id: Any) -> str:
+    return f"credit_ledger:user:{user_id}"
+
+
+def _holds_key(user_id: Any) -> str:
+    return f"credit_ledger:holds:{user_id}"
+
+
+class CreditLedgerUnavailableError(RuntimeError):
+    """The ledger can't answer right now; use the Postgres path instead."""
+
+
+@dataclass(frozen=True)
+class LedgerWallet:
+    """Wallet as the ledger sees it, in micro-USD.
+
+    ``balance`` already nets out debits that are not settled yet, and
+    ``reserved`` covers both ledger holds and Postgres-side holds.
+    """
+
+    allowed: bool
+    balance: int
+    reserved: int
+
+
+async def _read_wallet(
+    db_session: AsyncSession, user_id: Any
+) -> tuple[int, int] | None:
+    from app.db import User
+
+    row = (
+        await db_session.execute(
+            select(User.credit_micros_balance, User.credit_micros_reserved).where(
+                User.id == user_id
+            )
+        )
+    ).first()
+    # End the read's transaction, as the row-lock path does with its commit.
+    await db_session.commit()
+    if row is None:
+        return None
+    return int(row[0]), int(row[1])
+
+
+async def _refresh_snapshot(
+    db_session: AsyncSession, user_id: Any
+) -> tuple[int, int] | None:
+    """Re-seed the snapshot from Postgres; returns the row read (None = no user)."""
+    r = _redis()
+    key = _user_key(user_id)
+    epoch = await r.hget(key, "epoch") or "0"
+    wallet = await _read_wallet(db_session, user_id)
+    if wallet is None:
+        return None
+    await r.eval(_SEED_LUA, 1, key, epoch, wallet[0], wallet[1], int(time.time()))
+    return wallet
+
+
+async def _eval_reserve(
+    user_id: Any, request_id: str, amount: int, max_age: int
+) -> tuple[int, int, int]:
+    status, balance, reserved = await _redis().eval(
+        _RESERVE_LUA,
+        2,
+        _user_key(user_id),
+        _holds_key(user_id),
+        amount,
+        request_id,
+        int(time.time()),
+        max_age,
+        config.CREDIT_LEDGER_HOLD_TTL_SECONDS,
+    )
+    return int(status), int(balance), int(reserved)
+
+
+async def reserve(
+    db_session: AsyncSession, user_id: Any, request_id: str, amount: int
+) -> LedgerWallet | None:
+    """Hold ``amount`` for ``request_id``; None when the user doesn't exist.
+
+    The hot path is one script call. A missing or stale snapshot, or a denial
+    that a top-up might have lifted, costs one unlocked Postgres read.
+    """
+    status, balance, reserved = await _eval_reserve(
+        user_id, request_id, amount, config.CREDIT_LEDGER_SNAPSHOT_MAX_AGE_SECONDS
+    )
+    if status == 1:
+        return LedgerWallet(True, balance, reserved)
+
+    if await _refresh_snapshot(db_session, user_id) is None:
+        return None
+    status, balance, reserved = await _eval_reserve(user_id, request_id, amount, -1)
+    if status == -1:
+        # First use while a batch is mid-settlement: no snapshot can be trusted.
+        raise CreditLedgerUnavailableError(f"no ledger snapshot for user {user_id}")
+    return LedgerWallet(status == 1, balance, reserved)
+
+
+async def finalize(
+    user_id: Any, request_id: str, actual: int
+) -> tuple[LedgerWallet, bool]:
+    """Drop the hold and queue ``actual`` for settlement.
+
+    The flag is False when no ledger hold existed: the reserve fell back to
+    Postgres (or the hold was swept), so only the row can release it.
+    """
+    balance, reserved, held = await _redis().eval(
+        _FINALIZE_LUA,
+        3,
+        _user_key(user_id),
+        _holds_key(user_id),
+        _DIRTY_KEY,
+        request_id,
+        actual,
+        str(user_id),
+    )
+    return LedgerWallet(True, int(balance), int(reserved)), bool(held)
+
+
+async def release(user_id: Any, request_id: str) -> bool:
+    """Drop the hold; False when there was none (see :func:`finalize`)."""
+    released = await _redis().eval(
+        _RELEASE_LUA, 2, _user_key(user_id), _holds_key(user_id), request_id
+    )
+    return bool(released)
+
+
+async def usage(db_session: AsyncSession, user_id: Any) -> LedgerWallet | None:
+    """The wallet including unsettled debits and ledger holds."""
+    wallet = await _refresh_snapshot(db_session, user_id)
+    if wallet is None:
+        return None
+    snapshot, pending, settling, held = await _redis().hmget(
+        _user_key(user_id), "snapshot", "pending", "settling", "reserved"
+    )
+    # Without a snapshot the seed was refused mid-settlement; the row may not
+    # include ``settling`` yet, so count it as unapplied (errs low).
+    base = int(snapshot) if snapshot is not None else wallet[0]
+    balance = base - int(pending or 0) - int(settling or 0)
+    reserved = wallet[1] + int(held or 0)
+    return LedgerWallet(balance - reserved > 0, balance, reserved)
+
+
+@dataclass(frozen=True)
+class SettlementResult:
+    users: int
+    micros: int
+
+
+async def settle(
+    session_maker: async_sessionmaker[AsyncSession],
+    *,
+    batch_size: int,
+    time_budget: float | None = None,
+) -> SettlementResult:
+    """Apply pending debits to Postgres, ``batch_size`` users per transaction.
+
+    Batches run until the dirty set is drained or ``time_budget`` seconds
+    have passed, so a minute with more dirty users than one batch does not
+    leave a backlog that grows run over run.
+
+    Each batch: claim in Redis, then one transaction that records each batch
+    id and debits only the rows whose batch id was new, then clear in Redis.
+    A crash between any two steps is picked up by the next run: a claimed
+    batch is reclaimed under the same id, and an already-recorded one is
+    skipped.
+
+    Debits of users deleted since are dropped with their ledger keys: their
+    settlement rows would violate the ``user_id`` foreign key and roll back
+    everyone else's with them, on every run.
+    """
+    # A client of its own, closed on the loop that opened it: beat runs each
+    # settlement on whatever loop the worker gives it.
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    users = micros = 0
+    async with aioredis.from_url(config.REDIS_APP_URL, decode_responses=True) as r:
+        while True:
+            result, scanned = await _settle_batch(r, session_maker, batch_size)
+            users += result.users
+            micros += result.micros
+            if scanned < batch_size:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(
+                    "Credit-ledger settlement ran out of time with %d users "
+                    "still dirty",
+                    await r.scard(_DIRTY_KEY),
+                )
+                break
+    return SettlementResult(users=users, micros=micros)
+
+
+async def _settle_batch(
+    r: aioredis.Redis,
+    session_maker: async_sessionmaker[AsyncSession],
+    batch_size: int,
+) -> tuple[SettlementResult, int]:
+    """Settle one batch; also returns how many dirty users it looked at."""
+    from app.db import CreditLedgerSettlement, User
+
+    user_ids: list[str] = []
+    async for member in r.sscan_iter(_DIRTY_KEY, count=batch_size):
+        user_ids.append(member)
+        if len(user_ids) >= batch_size:
+            break
+
+    claims: list[tuple[str, int, str]] = []
+    for user_id in user_ids:
+        amount, batch_id = await r.eval(
+            _CLAIM_LUA, 2, _user_key(user_id), _DIRTY_KEY, user_id, uuid.uuid4().hex
+        )
+        if int(amount):
+            claims.append((user_id, int(amount), batch_id))
+    if not claims:
+        return SettlementResult(users=0, micros=0), len(user_ids)
+
+    debits: list = []
+    async with session_maker() as session:
+        # KEY SHARE, as the foreign key check takes: no claimed user can be
+        # deleted between this read and the commit.
+        live = set(
+            await session.scalars(
+                select(User.id)
+                .where(User.id.in_([uuid.UUID(user_id) for user_id, _, _ in claims]))
+                .with_for_update(key_share=True)
+            )
+        )
+        gone = [claim for claim in claims if uuid.UUID(claim[0]) not in live]
+        claims = [claim for claim in claims if uuid.UUID(claim[0]) in live]
+        if claims:
+            recorded = await session.execute(
+                pg_insert(CreditLedgerSettlement)
+                .values(
+                    [
+                        {
+                            "batch_id": batch_id,
+                            "user_id": uuid.UUID(user_id),
+                            "amount_micros": amount,
+                        }
+                        for user_id, amount, batch_id in claims
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["batch_id"])
+                .returning(
+                    CreditLedgerSettlement.user_id, CreditLedgerSettlement.amount_micros
+                )
+            )
+            debits = sorted(recorded.all())
+            if debits:
+                settled = values(
+                    column("user_id", PG_UUID(as_uuid=True)),
+                    column("amount", BigInteger),
+                    name="settled",
+                ).data(debits)
+                await session.execute(
+                    update(User)
+                    .where(User.id == settled.c.user_id)
+                    .values(
+                        credit_micros_balance=User.credit_micros_balance
+                        - settled.c.amount
+                    )
+                )
+        await session.execute(
+            delete(CreditLedgerSettlement).where(
+                CreditLedgerSettlement.created_at
+                < datetime.now(UTC) - _SETTLEMENT_RETENTION
+            )
+        )
+        await session.commit()
+
+    for user_id, _amount, batch_id in claims:
+        await r.eval(_CLEAR_LUA, 2, _user_key(user_id), _DIRTY_KEY, user_id, batch_id)
+    for user_id, amount, _batch_id in gone:
+        logger.warning(
+            "Dropping %d unsettled credit-ledger micros of deleted user %s",
+            amount,
+            user_id,
+        )
+        await r.delete(_user_key(user_id), _holds_key(user_id))
+        await r.srem(_DIRTY_KEY, user_id)
+
+    # Balances only move here in ledger mode, so this is where reloads start.
+    try:
+        from app.services.auto_reload_service import maybe_trigger_auto_reload
+
+        for user_id, _amount in debits:
+            await maybe_trigger_auto_reload(str(user_id))
+    except Exception:
+        logger.warning("Auto-reload nudge after settlement failed", exc_info=True)
+
+    micros = sum(amount for _user_id, amount in debits)
+    metrics.record_credit_ledger_settlement(users=len(debits), micros=micros)
+    return SettlementResult(users=len(debits), micros=micros), len(user_ids)
@@ -10,12 +10,12 @@ Protocol Reference:
 - Supports text, reasoning, sources, files, tools, data, and error parts
 """
 
-import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+from app.services.streaming.envelope import dumps_json, format_delta_sse
 from app.services.streaming.types import ActivityData
 
 
@@ -94,7 +94,7 @@ class VercelStreamingService:
         """
         if isinstance(data, str):
             return f"data: {data}\n\n"
-        return f"data: {json.dumps(data)}\n\n"
+        return f"data: {dumps_json(data)}\n\n"
 
     @staticmethod
     def generate_text_id() -> str:
@@ -197,7 +197,7 @@ class VercelStreamingService:
         Example output:
             data: {"type":"text-delta","id":"text_abc123","delta":"Hello"}
         """
-        return self._format_sse({"type": "text-delta", "id": text_id, "delta": delta})
+        return format_delta_sse("text-delta", text_id, delta)
 
     def format_text_end(self, text_id: str) -> str:
         """
@@ -216,18 +216,23 @@ class VercelStreamingService:
             self.context.active_text_id = None
         return self._format_sse({"type": "text-end", "id": text_id})
 
-    def stream_text(self, text_id: str, text: str, chunk_size: int = 10) -> list[str]:
+    def stream_text(
+        self, text_id: str, text: str, chunk_size: int | None = None
+    ) -> list[str]:
         """
         Convenience method to stream text in chunks.
 
         Args:
             text_id: The text block ID
             text: The full text to stream
-            chunk_size: Size of each chunk (default 10 characters)
+            chunk_size: Size of each chunk (default: the whole text in one
+                frame, since the text is already complete)
 
         Returns:
             list[str]: List of SSE formatted text delta parts
         """
+        if not chunk_size:
+            return [self.format_text_delta(text_id, text)] if text else []
         parts = []
         for i in range(0, len(text), chunk_size):
             chunk = text[i : i + chunk_size]
@@ -276,9 +281,7 @@ class VercelStreamingService:
         Example output:
             data: {"type":"reasoning-delta","id":"reasoning_abc123","delta":"Let me think..."}
         """
-        return self._format_sse(
-            {"type": "reasoning-delta", "id": reasoning_id, "delta": delta}
-        )
+        return format_delta_sse("reasoning-delta", reasoning_id, delta)
 
     def format_reasoning_end(self, reasoning_id: str) -> str:
         """
@@ -772,7 +775,7 @@ class VercelStreamingService:
     # Convenience Methods
     # =========================================================================
 
-    def stream_full_text(self, text: str, chunk_size: int = 10) -> list[str]:
+    def stream_full_text(self, text: str, chunk_size: int | None = None) -> list[str]:
         """
         Convenience method to stream a complete text block.
 
@@ -780,7 +783,7 @@ class VercelStreamingService:
 
         Args:
             text: The full text to stream
-            chunk_size: Size of each chunk
+            chunk_size: Size of each chunk (default: one frame)
 
         Returns:
             list[str]: List of all SSE formatted parts
@@ -791,7 +794,9 @@ class VercelStreamingService:
         parts.append(self.format_text_end(text_id))
         return parts
 
-    def stream_full_reasoning(self, reasoning: str, chunk_size: int = 20) -> list[str]:
+    def stream_full_reasoning(
+        self, reasoning: str, chunk_size: int | None = None
+    ) -> list[str]:
         """
         Convenience method to stream a complete reasoning block.
 
@@ -799,15 +804,16 @@ class VercelStreamingService:
 
         Args:
             reasoning: The full reasoning text
-            chunk_size: Size of each chunk
+            chunk_size: Size of each chunk (default: one frame)
 
         Returns:
             list[str]: List of all SSE formatted parts
         """
         reasoning_id = self.generate_reasoning_id()
         parts = [self.format_reasoning_start(reasoning_id)]
-        for i in range(0, len(reasoning), chunk_size):
-            chunk = reasoning[i : i + chunk_size]
+        step = chunk_size or len(reasoning) or 1
+        for i in range(0, len(reasoning), step):
+            chunk = reasoning[i : i + step]
             parts.append(self.format_reasoning_delta(reasoning_id, chunk))
         parts.append(self.format_reasoning_end(reasoning_id))
         return parts
@@ -818,7 +824,7 @@ class VercelStreamingService:
         sources: list[dict[str, Any]] | None = None,
         reasoning: str | None = None,
         further_questions: list[str] | None = None,
-        chunk_size: int = 10,
+        chunk_size: int | None = None,
     ) -> list[str]:
         """
         Create a complete streaming response with all parts.
@@ -832,7 +838,7 @@ class VercelStreamingService:
             sources: Optional list of source references
             reasoning: Optional reasoning/thinking content
             further_questions: Optional follow-up questions
-            chunk_size: Size of text chunks
+            chunk_size: Size of text chunks (default: one frame)
 
         Returns:
             list[str]: List of all SSE formatted parts in correct order
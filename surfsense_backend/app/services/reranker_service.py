@@ -1,8 +1,18 @@
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from rerankers import Document as RerankerDocument
 
+from app.config import config
+from app.observability import metrics
+
 
 class RerankerService:
     """
@@ -28,6 +38,8 @@ class RerankerService:
         - Document-grouped (new format): Has `document_id`, `chunks` list, and `content` (concatenated)
         - Chunk-based (legacy format): Individual chunks with `chunk_id` and `content`
 
+        Blocks on the model; async callers use :meth:`arerank_documents`.
+
         Args:
             query_text: The query text to use for reranking
             documents: List of document dictionaries to rerank
@@ -39,75 +51,44 @@ class RerankerService:
             return documents
 
         try:
-            # Create Document objects for the rerankers library
-            reranker_docs = []
-            for i, doc in enumerate(documents):
-                # Use document_id for matching
-                doc_id = doc.get("document_id") or f"doc_{i}"
-                # Use concatenated content for reranking
-                content = doc.get("content", "")
-                score = doc.get("score", 0.0)
-                document_info = doc.get("document", {})
-
-                reranker_docs.append(
-                    RerankerDocument(
-                        text=content,
-                        doc_id=doc_id,
-                        metadata={
-                            "document_id": document_info.get("id", ""),
-                            "document_title": document_info.get("title", ""),
-                            "document_type": document_info.get("document_type", ""),
-                            "rrf_score": score,
-                            # Track original index for fallback matching
-                            "original_index": i,
-                        },
-                    )
-                )
+            passages = [_passage(doc) for doc in documents]
+            scores, _ = _score_passages(self.reranker_instance, query_text, passages)
+            return _reorder(documents, [scores.get(i) for i in range(len(passages))])
+        except Exception as e:
+            # Log the error
+            logging.error(f"Error during reranking: {e!s}")
+            # Fall back to original documents without reranking
+            return documents
 
-            # Rerank using the configured reranker
-            reranking_results = self.reranker_instance.rank(
-                query=query_text, docs=reranker_docs
-            )
+    async def arerank_documents(
+        self, query_text: str, documents: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        :meth:`rerank_documents` without blocking the event loop.
 
-            # Process the results from the reranker
-            # Convert to serializable dictionaries while preserving full structure
-            serialized_results = []
-            for result in reranking_results.results:
-                result_doc_id = result.document.doc_id
-                original_index = result.document.metadata.get("original_index")
-
-                # Find the original document by document_id
-                original_doc = None
-                for doc in documents:
-                    if doc.get("document_id") == result_doc_id:
-                        original_doc = doc
-                        break
-
-                # Fallback to original index if ID matching fails
-                if (
-                    original_doc is None
-                    and original_index is not None
-                    and 0 <= original_index < len(documents)
-                ):
-                    original_doc = documents[original_index]
-
-                if original_doc:
-                    # Create a deep copy to preserve the full structure including chunks
-                    reranked_doc = original_doc.copy()
-                    # Preserve chunks list if present (important for citation formatting)
-                    if "chunks" in original_doc:
-                        reranked_doc["chunks"] = original_doc["chunks"]
-                    reranked_doc["score"] = float(result.score)
-                    reranked_doc["rank"] = result.rank
-                    serialized_results.append(reranked_doc)
-
-            return serialized_results
+        Scores come from the (query, passage) cache where possible; the rest
+        are scored on the reranker thread pool, in one model call shared with
+        concurrent requests for the same query.
+        """
+        if not self.reranker_instance or not documents:
+            return documents
 
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            passages = [_passage(doc) for doc in documents]
+            scores = await _scheduler.scores(
+                self.reranker_instance, query_text, passages
+            )
+            return _reorder(documents, scores)
         except Exception as e:
-            # Log the error
+            outcome = "error"
             logging.error(f"Error during reranking: {e!s}")
-            # Fall back to original documents without reranking
             return documents
+        finally:
+            metrics.record_rerank_duration(
+                (time.perf_counter() - started) * 1000, outcome=outcome
+            )
 
     @staticmethod
     def get_reranker_instance() -> Optional["RerankerService"]:
@@ -117,8 +98,211 @@ class RerankerService:
         Returns:
             Optional[RerankerService]: A reranker service instance if configured, None otherwise
         """
-        from app.config import config
-
         if hasattr(config, "reranker_instance") and config.reranker_instance:
             return RerankerService(config.reranker_instance)
         return None
+
+
+def _passage(document: dict[str, Any]) -> str:
+    content = document.get("content", "") or ""
+    return content[: config.RERANKERS_MAX_PASSAGE_CHARS]
+
+
+def _score_passages(
+    reranker: Any, query: str, passages: list[str]
+) -> tuple[dict[int, float], bool]:
+    """Score per passage index, and whether the scores are absolute.
+
+    The index doubles as ``doc_id`` so results map back in one pass; a passage
+    the reranker dropped is simply missing. Rank-only rankers (no score) get
+    ``-rank``, which orders correctly but means nothing outside this call.
+    """
+    docs = [
+        RerankerDocument(text=text, doc_id=index) for index, text in enumerate(passages)
+    ]
+    ranked = reranker.rank(query=query, docs=docs)
+    scores: dict[int, float] = {}
+    absolute = True
+    for result in ranked.results:
+        index = int(result.document.doc_id)
+        if result.score is None:
+            absolute = False
+            scores[index] = -float(result.rank)
+        else:
+            scores[index] = float(result.score)
+    return scores, absolute
+
+
+def _reorder(
+    documents: list[dict[str, Any]], scores: list[float | None]
+) -> list[dict[str, Any]]:
+    """Documents by descending score, each copied with ``score`` and ``rank``.
+
+    Documents the reranker dropped keep their relative order after the rest.
+    """
+    order = sorted(
+        range(len(documents)),
+        key=lambda i: (scores[i] is None, -(scores[i] or 0.0)),
+    )
+    reranked = []
+    for rank, index in enumerate(order, start=1):
+        doc = documents[index].copy()
+        if scores[index] is not None:
+            doc["score"] = scores[index]
+        doc["rank"] = rank
+        reranked.append(doc)
+    return reranked
+
+
+@dataclass
+class _Batch:
+    """Passages for one query, gathered from concurrent requests."""
+
+    reranker: Any
+    query: str
+    result: asyncio.Future
+    passages: dict[str, str] = field(default_factory=dict)
+    requests: int = 0
+
+
+class _RerankScheduler:
+    """Score cache plus per-query micro-batching onto a dedicated thread pool.
+
+    The local cross-encoder holds the GIL-heavy work and a remote runtime call
+    blocks on HTTP, so neither may run on the event loop. Requests for the
+    same query (subagents re-issue them) that arrive within
+    ``RERANKERS_BATCH_WINDOW_MS`` are merged into one ``rank`` call over their
+    deduplicated, uncached passages. Batches are per event loop: Celery runs
+    each task on a fresh one.
+    """
+
+    def __init__(self) -> None:
+        self._cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._open: dict[tuple[int, int, str], _Batch] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, config.RERANKERS_EXECUTOR_WORKERS),
+                    thread_name_prefix="reranker",
+                )
+            return self._executor
+
+    @staticmethod
+    def _model_key() -> str:
+        model_type = getattr(config, "RERANKERS_MODEL_TYPE", None)
+        return f"{model_type}:{getattr(config, 'RERANKERS_MODEL_NAME', None)}"
+
+    def _cached(self, key: tuple[str, str, str]) -> float | None:
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _remember(self, query: str, scores: dict[str, float]) -> None:
+        limit = config.RERANKERS_SCORE_CACHE_SIZE
+        if limit <= 0:
+            return
+        model_key = self._model_key()
+        with self._lock:
+            for digest, score in scores.items():
+                self._cache[(model_key, query, digest)] = score
+                self._cache.move_to_end((model_key, query, digest))
+            while len(self._cache) > limit:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    async def scores(
+        self, reranker: Any, query: str, passages: list[str]
+    ) -> list[float | None]:
+        digests = [hashlib.sha1(text.encode()).hexdigest() for text in passages]
+        model_key = self._model_key()
+        known: dict[str, float] = {}
+        missing: dict[str, str] = {}
+        for digest, text in zip(digests, passages, strict=True):
+            if digest in known or digest in missing:
+                continue
+            score = self._cached((model_key, query, digest))
+            if score is None:
+                missing[digest] = text
+            else:
+                known[digest] = score
+        metrics.record_rerank_cache_lookup(hits=len(known), misses=len(missing))
+
+        if missing:
+            known.update(await self._submit(reranker, query, missing))
+        return [known.get(digest) for digest in digests]
+
+    async def _submit(
+        self, reranker: Any, query: str, passages: dict[str, str]
+    ) -> dict[str, float]:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), id(reranker), query)
+        batch = self._open.get(key)
+        if batch is None or (
+            len(batch.passages.keys() | passages.keys())
+            > config.RERANKERS_BATCH_MAX_DOCS
+        ):
+            batch = _Batch(reranker=reranker, query=query, result=loop.create_future())
+            # Nobody may await it if every caller is cancelled.
+            batch.result.add_done_callback(
+                lambda done: done.cancelled() or done.exception()
+            )
+            self._open[key] = batch
+            window = config.RERANKERS_BATCH_WINDOW_MS / 1000
+            loop.call_later(window, self._start, key, batch)
+        batch.passages.update(passages)
+        batch.requests += 1
+        # Shielded: one cancelled caller must not cancel the shared result.
+        scores = await asyncio.shield(batch.result)
+        return {digest: scores[digest] for digest in passages if digest in scores}
+
+    def _start(self, key: tuple[int, int, str], batch: _Batch) -> None:
+        if self._open.get(key) is batch:
+            del self._open[key]
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        digests = list(batch.passages)
+        texts = [batch.passages[digest] for digest in digests]
+        metrics.record_rerank_batch(requests=batch.requests, docs=len(texts))
+        metrics.record_rerank_queue_depth_delta(1)
+        enqueued = time.perf_counter()
+
+        def work() -> tuple[dict[int, float], bool]:
+            metrics.record_rerank_queue_wait((time.perf_counter() - enqueued) * 1000)
+            return _score_passages(batch.reranker, batch.query, texts)
+
+        try:
+            by_index, absolute = await asyncio.get_running_loop().run_in_executor(
+                self._pool(), work
+            )
+        except Exception as exc:
+            if not batch.result.done():
+                batch.result.set_exception(exc)
+            return
+        finally:
+            metrics.record_rerank_queue_depth_delta(-1)
+        scores = {digests[index]: score for index, score in by_index.items()}
+        if absolute:
+            self._remember(batch.query, scores)
+        if not batch.result.done():
+            batch.result.set_result(scores)
+
+
+_scheduler = _RerankScheduler()
+
+
+def clear_rerank_score_cache() -> None:
+    """Drop cached (query, passage) scores."""
+    _scheduler.clear()
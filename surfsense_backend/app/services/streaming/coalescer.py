@@ -0,0 +1,85 @@
+"""Merge consecutive text/reasoning deltas into fewer SSE frames.
+
+Providers stream one token per chunk, so a turn otherwise costs one frame,
+one serialization, one socket write and one content-builder append per
+token. The coalescer holds deltas of the open block for at most ``window``
+seconds (or ``max_chars``) and hands them back joined.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+DeltaKind = Literal["text", "reasoning"]
+
+
+@dataclass(frozen=True)
+class Delta:
+    kind: DeltaKind
+    block_id: str
+    text: str
+
+
+class DeltaCoalescer:
+    """Buffers consecutive deltas of one text or reasoning block.
+
+    A delta goes out at once when the block's last frame is at least
+    ``window`` seconds old, so the first token of a block (and the first one
+    after a pause) is never held back. Otherwise it joins the buffer, which is
+    released when it reaches ``max_chars``, when the window has passed by the
+    time the next delta arrives, when another block starts, or when the caller
+    flushes before emitting any other frame. A ``window`` of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float,
+        max_chars: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window = window
+        self._max_chars = max_chars
+        self._clock = clock
+        self._key: tuple[DeltaKind, str] | None = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_frame_at = float("-inf")
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._parts)
+
+    def push(self, kind: DeltaKind, block_id: str, text: str) -> list[Delta]:
+        """Add ``text``; returns the deltas that are due (possibly none)."""
+        if not text:
+            return []
+        out: list[Delta] = []
+        if self._key != (kind, block_id):
+            out = self.flush()
+            self._key = (kind, block_id)
+            self._last_frame_at = float("-inf")
+        self._parts.append(text)
+        self._size += len(text)
+        now = self._clock()
+        if self._size >= self._max_chars or now - self._last_frame_at >= self._window:
+            out.extend(self._take(now))
+        return out
+
+    def flush(self) -> list[Delta]:
+        """Everything buffered, as at most one delta."""
+        if not self._parts:
+            return []
+        return self._take(self._clock())
+
+    def _take(self, now: float) -> list[Delta]:
+        assert self._key is not None
+        kind, block_id = self._key
+        text = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._last_frame_at = now
+        return [Delta(kind=kind, block_id=block_id, text=text)]
@@ -9,9 +9,17 @@ from .identifiers import (
     generate_text_id,
     generate_tool_call_id,
 )
-from .sse import format_done, format_sse, get_response_headers
+from .sse import (
+    dumps_json,
+    format_delta_sse,
+    format_done,
+    format_sse,
+    get_response_headers,
+)
 
 __all__ = [
+    "dumps_json",
+    "format_delta_sse",
     "format_done",
     "format_sse",
     "generate_message_id",
@@ -5,11 +5,30 @@ from __future__ import annotations
 import json
 from typing import Any
 
+import orjson
+
+
+def dumps_json(data: Any) -> str:
+    """Compact JSON via orjson; stdlib ``json`` for what orjson rejects (ints
+    wider than 64 bits, lone surrogates in model output)."""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(data, separators=(",", ":"))
+
 
 def format_sse(data: Any) -> str:
     if isinstance(data, str):
         return f"data: {data}\n\n"
-    return f"data: {json.dumps(data)}\n\n"
+    return f"data: {dumps_json(data)}\n\n"
+
+
+def format_delta_sse(event_type: str, block_id: str, delta: str) -> str:
+    """``{"type", "id", "delta"}`` frame without building a dict per token."""
+    return (
+        f'data: {{"type":"{event_type}","id":{orjson.dumps(block_id).decode()},'
+        f'"delta":{dumps_json(delta)}}}\n\n'
+    )
 
 
 def format_done() -> str:
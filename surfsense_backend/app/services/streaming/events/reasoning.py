@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 
 from ..emitter import Emitter, attach_emitted_by
-from ..envelope import format_sse
+from ..envelope import format_delta_sse, format_sse
 
 
 def format_reasoning_start(reasoning_id: str, *, emitter: Emitter | None = None) -> str:
@@ -27,6 +27,8 @@ def format_reasoning_delta(
     *,
     emitter: Emitter | None = None,
 ) -> str:
+    if emitter is None:
+        return format_delta_sse("reasoning-delta", reasoning_id, delta)
     return format_sse(
         attach_emitted_by(
             {"type": "reasoning-delta", "id": reasoning_id, "delta": delta},
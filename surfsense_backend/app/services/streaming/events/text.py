@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from ..emitter import Emitter, attach_emitted_by
-from ..envelope import format_sse
+from ..envelope import format_delta_sse, format_sse
 
 
 def format_text_start(text_id: str, *, emitter: Emitter | None = None) -> str:
@@ -16,6 +16,8 @@ def format_text_delta(
     *,
     emitter: Emitter | None = None,
 ) -> str:
+    if emitter is None:
+        return format_delta_sse("text-delta", text_id, delta)
     return format_sse(
         attach_emitted_by(
             {"type": "text-delta", "id": text_id, "delta": delta}, emitter
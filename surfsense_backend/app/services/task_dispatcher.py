@@ -20,6 +20,7 @@ class TaskDispatcher(Protocol):
         user_id: str,
         use_vision_llm: bool = False,
         processing_mode: str = "basic",
+        source_sha256: str | None = None,
     ) -> None: ...
 
 
@@ -36,6 +37,7 @@ class CeleryTaskDispatcher:
         user_id: str,
         use_vision_llm: bool = False,
         processing_mode: str = "basic",
+        source_sha256: str | None = None,
     ) -> None:
         from app.tasks.celery_tasks.document_tasks import (
             process_file_upload_with_document_task,
@@ -49,6 +51,7 @@ class CeleryTaskDispatcher:
             user_id=user_id,
             use_vision_llm=use_vision_llm,
             processing_mode=processing_mode,
+            source_sha256=source_sha256,
         )
 
 
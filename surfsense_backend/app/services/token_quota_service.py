@@ -3,7 +3,9 @@ Atomic token quota service for anonymous and registered users.
 
 Provides reserve/finalize/release/get_usage operations with race-safe
 implementation using Redis Lua scripts (anonymous) and Postgres row locks
-(registered premium).
+(registered premium). With ``CREDIT_LEDGER_BACKEND=redis`` the premium path
+goes through :mod:`app.services.credit_ledger` instead, falling back to the
+row locks whenever Redis can't answer.
 """
 
 from __future__ import annotations
@@ -18,6 +20,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
+from app.observability import metrics
+from app.services import credit_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -229,6 +233,14 @@ return 1
 """
 
 
+# Ledger failures that send a premium credit operation back to the row locks.
+_LEDGER_ERRORS = (
+    aioredis.RedisError,
+    OSError,
+    credit_ledger.CreditLedgerUnavailableError,
+)
+
+
 def _get_anon_redis() -> aioredis.Redis:
     return aioredis.from_url(config.REDIS_APP_URL, decode_responses=True)
 
@@ -532,6 +544,37 @@ class TokenQuotaService:
             return QuotaStatus.WARNING
         return QuotaStatus.OK
 
+    @staticmethod
+    def _ledger_result(wallet: credit_ledger.LedgerWallet | None) -> QuotaResult:
+        if wallet is None:
+            return QuotaResult(
+                allowed=False, status=QuotaStatus.BLOCKED, used=0, limit=0
+            )
+        remaining = max(0, wallet.balance - wallet.reserved)
+        return QuotaResult(
+            allowed=wallet.allowed,
+            status=(
+                TokenQuotaService._credit_status(remaining)
+                if wallet.allowed
+                else QuotaStatus.BLOCKED
+            ),
+            used=0,
+            limit=wallet.balance,
+            reserved=wallet.reserved,
+            remaining=remaining,
+            balance=wallet.balance,
+        )
+
+    @staticmethod
+    def _ledger_fallback(operation: str, user_id: Any) -> None:
+        logger.warning(
+            "[credit_ledger] %s for user %s fell back to Postgres",
+            operation,
+            user_id,
+            exc_info=True,
+        )
+        metrics.record_credit_ledger_fallback(operation=operation)
+
     @staticmethod
     async def credit_reserve(
         db_session: AsyncSession,
@@ -547,6 +590,16 @@ class TokenQuotaService:
         convert to dollars by dividing by 1_000_000. ``remaining`` is the
         spendable amount (``balance - reserved``).
         """
+        if credit_ledger.enabled():
+            try:
+                wallet = await credit_ledger.reserve(
+                    db_session, user_id, request_id, reserve_micros
+                )
+            except _LEDGER_ERRORS:
+                TokenQuotaService._ledger_fallback("reserve", user_id)
+            else:
+                return TokenQuotaService._ledger_result(wallet)
+
         from app.db import User
 
         user = (
@@ -611,6 +664,21 @@ class TokenQuotaService:
         ``actual_micros`` (the LiteLLM-reported provider cost in micro-USD)
         from the balance.
         """
+        if credit_ledger.enabled():
+            try:
+                wallet, held = await credit_ledger.finalize(
+                    user_id, request_id, actual_micros
+                )
+            except _LEDGER_ERRORS:
+                TokenQuotaService._ledger_fallback("finalize", user_id)
+            else:
+                if not held:
+                    # Reserved on the row by a Postgres fallback; free it there.
+                    await TokenQuotaService._release_row_reservation(
+                        db_session, user_id, reserved_micros
+                    )
+                return TokenQuotaService._ledger_result(wallet)
+
         from app.db import User
 
         user = (
@@ -661,12 +729,31 @@ class TokenQuotaService:
         db_session: AsyncSession,
         user_id: Any,
         reserved_micros: int,
+        request_id: str | None = None,
     ) -> None:
         """Release ``reserved_micros`` previously held by ``credit_reserve``.
 
         Used when a request fails before finalize (so the reservation
-        doesn't leak credit).
+        doesn't leak credit). Ledger holds are keyed by ``request_id``;
+        without it the release goes to Postgres.
         """
+        if credit_ledger.enabled() and request_id is not None:
+            try:
+                held = await credit_ledger.release(user_id, request_id)
+            except _LEDGER_ERRORS:
+                TokenQuotaService._ledger_fallback("release", user_id)
+            else:
+                if held:
+                    return
+
+        await TokenQuotaService._release_row_reservation(
+            db_session, user_id, reserved_micros
+        )
+
+    @staticmethod
+    async def _release_row_reservation(
+        db_session: AsyncSession, user_id: Any, reserved_micros: int
+    ) -> None:
         from app.db import User
 
         user = (
@@ -689,6 +776,14 @@ class TokenQuotaService:
         db_session: AsyncSession,
         user_id: Any,
     ) -> QuotaResult:
+        if credit_ledger.enabled():
+            try:
+                wallet = await credit_ledger.usage(db_session, user_id)
+            except _LEDGER_ERRORS:
+                TokenQuotaService._ledger_fallback("usage", user_id)
+            else:
+                return TokenQuotaService._ledger_result(wallet)
+
         from app.db import User
 
         user = (
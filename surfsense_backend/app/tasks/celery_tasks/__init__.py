@@ -10,25 +10,60 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import os
+import threading
+import time
 from collections.abc import Awaitable, Callable
 from typing import TypeVar
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import config
+from app.observability import metrics
 
 logger = logging.getLogger(__name__)
 
 _celery_engine = None
 _celery_session_maker = None
 
+# The worker process's long-lived event loop (see start_worker_event_loop).
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_loop_thread: threading.Thread | None = None
+_worker_loop_pid: int | None = None
+_worker_loop_guard = threading.Lock()
+
+
+class _MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports checkout wait and connection reuse."""
+
+    _opened = 0
+
+    def _create_connection(self):
+        self._opened += 1
+        return super()._create_connection()
+
+    def _do_get(self):
+        opened = self._opened
+        t0 = time.perf_counter()
+        connection = super()._do_get()
+        metrics.record_db_pool_checkout(
+            (time.perf_counter() - t0) * 1000,
+            pool="celery",
+            reused=self._opened == opened,
+        )
+        return connection
+
 
 def get_celery_session_maker() -> async_sessionmaker:
     """Return a shared async session maker for Celery tasks.
 
-    A single NullPool engine is created per worker process and reused
-    across all task invocations to avoid leaking engine objects.
+    One engine is created per worker process and reused across all task
+    invocations. While the worker's long-lived event loop runs it has a
+    bounded connection pool, so tasks reuse connections instead of opening
+    one per session; otherwise each task runs on its own loop and the
+    engine uses a NullPool, since asyncpg connections cannot outlive the
+    loop that opened them.
     """
     global _celery_engine, _celery_session_maker
     if _celery_session_maker is None:
@@ -48,11 +83,22 @@ def get_celery_session_maker() -> async_sessionmaker:
             connect_args["server_settings"] = {
                 "idle_in_transaction_session_timeout": str(idle_ms)
             }
+        if _worker_loop_running():
+            pool_kwargs: dict = {
+                "poolclass": _MeteredQueuePool,
+                "pool_size": config.CELERY_DB_POOL_SIZE,
+                "max_overflow": config.CELERY_DB_POOL_MAX_OVERFLOW,
+                "pool_timeout": config.CELERY_DB_POOL_TIMEOUT_SECONDS,
+                "pool_recycle": 1800,
+                "pool_pre_ping": True,
+            }
+        else:
+            pool_kwargs = {"poolclass": NullPool}
         _celery_engine = create_async_engine(
             config.DATABASE_URL,
-            poolclass=NullPool,
             echo=False,
             connect_args=connect_args,
+            **pool_kwargs,
         )
         with contextlib.suppress(Exception):
             from app.observability.bootstrap import instrument_sqlalchemy_engine
@@ -109,6 +155,97 @@ def _dispose_shared_checkpointer_pool(loop: asyncio.AbstractEventLoop) -> None:
         logger.warning("Shared checkpointer pool dispose() failed", exc_info=True)
 
 
+def _worker_loop_running() -> bool:
+    return (
+        _worker_loop is not None
+        and _worker_loop_pid == os.getpid()
+        and not _worker_loop.is_closed()
+    )
+
+
+def start_worker_event_loop() -> None:
+    """Start this worker process's long-lived event loop.
+
+    Called from ``worker_process_init``. From then on every
+    :func:`run_async_celery_task` body runs on this one loop, in a
+    background thread, so the shared ``app.db.engine`` pool, the Celery
+    session pool and the checkpointer pool keep their connections across
+    tasks instead of reconnecting (TCP + TLS + auth) for each one.
+    No-op when ``CELERY_PERSISTENT_EVENT_LOOP`` is off.
+    """
+    global _worker_loop, _worker_loop_thread, _worker_loop_pid
+    global _celery_engine, _celery_session_maker
+    if not config.CELERY_PERSISTENT_EVENT_LOOP:
+        return
+    with _worker_loop_guard:
+        if _worker_loop_running():
+            return
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=_run_worker_loop, args=(loop,), name="celery-loop", daemon=True
+        )
+        thread.start()
+        # An engine built before (or inherited across fork) is per-task.
+        _celery_engine = _celery_session_maker = None
+        _worker_loop, _worker_loop_thread = loop, thread
+        _worker_loop_pid = os.getpid()
+    logger.info("Started persistent Celery event loop in pid=%d", os.getpid())
+
+
+def _run_worker_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def stop_worker_event_loop(timeout: float = 10.0) -> None:
+    """Close the worker loop's pools and stop it (``worker_process_shutdown``)."""
+    global _worker_loop, _worker_loop_thread, _celery_engine, _celery_session_maker
+    with _worker_loop_guard:
+        if not _worker_loop_running():
+            return
+        loop, thread = _worker_loop, _worker_loop_thread
+        _worker_loop = _worker_loop_thread = None
+
+    async def _close_pools() -> None:
+        if _celery_engine is not None:
+            await _celery_engine.dispose()
+        from app.agents.chat.runtime.checkpointer import close_checkpointer
+        from app.db import engine as shared_engine
+
+        await shared_engine.dispose()
+        await close_checkpointer()
+
+    try:
+        asyncio.run_coroutine_threadsafe(_close_pools(), loop).result(timeout)
+    except Exception:
+        logger.warning("Closing the Celery worker pools failed", exc_info=True)
+    _celery_engine = _celery_session_maker = None
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout)
+    if not loop.is_running():
+        loop.close()
+
+
+def _run_on_worker_loop[T](
+    loop: asyncio.AbstractEventLoop, coro_factory: Callable[[], Awaitable[T]]
+) -> T:
+    if threading.current_thread() is _worker_loop_thread:
+        raise RuntimeError("run_async_celery_task called from the worker event loop")
+
+    async def _body() -> T:
+        return await coro_factory()
+
+    # The task inherits this thread's contextvars (trace context included).
+    future = asyncio.run_coroutine_threadsafe(_body(), loop)
+    try:
+        return future.result()
+    except BaseException:
+        # Soft time limit, worker shutdown: don't leave the body running on.
+        future.cancel()
+        raise
+
+
 T = TypeVar("T")
 
 
@@ -132,12 +269,19 @@ def run_async_celery_task[T](coro_factory: Callable[[], Awaitable[T]]) -> T:
        loop closes (avoids ``coroutine 'Connection._cancel' was
        never awaited`` warnings and the next-task hang).
 
+    Inside a worker whose persistent loop is running (see
+    :func:`start_worker_event_loop`) the body runs on that loop instead,
+    and nothing is disposed: every pool lives on that one loop.
+
     Use as::
 
         @celery_app.task(name="my_task", bind=True)
         def my_task(self, *args):
             return run_async_celery_task(lambda: _my_task_impl(*args))
     """
+    if _worker_loop_running():
+        return _run_on_worker_loop(_worker_loop, coro_factory)
+
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
@@ -161,4 +305,6 @@ def run_async_celery_task[T](coro_factory: Callable[[], Awaitable[T]]) -> T:
 __all__ = [
     "get_celery_session_maker",
     "run_async_celery_task",
+    "start_worker_event_loop",
+    "stop_worker_event_loop",
 ]
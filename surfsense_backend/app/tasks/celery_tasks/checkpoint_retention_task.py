@@ -0,0 +1,72 @@
+"""Prune old LangGraph checkpoints and their orphaned channel blobs.
+
+Runs nightly from beat. One transaction per batch of threads, so a long run
+holds no lock for long and a crash loses at most one batch of progress. See
+:mod:`app.agents.chat.runtime.checkpoint_retention` for what is kept.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from app.agents.chat.runtime import checkpoint_retention
+from app.agents.chat.runtime.checkpoint_retention import PruneResult
+from app.celery_app import celery_app
+from app.config import config
+from app.observability import metrics
+from app.tasks.celery_tasks import get_celery_session_maker, run_async_celery_task
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="prune_chat_checkpoints")
+def prune_chat_checkpoints_task():
+    return run_async_celery_task(_prune)
+
+
+async def _prune() -> None:
+    if not config.CHECKPOINT_RETENTION_ENABLED:
+        return
+    keep_latest = max(config.CHECKPOINT_RETENTION_KEEP_LATEST, 1)
+    batch = max(config.CHECKPOINT_RETENTION_THREAD_BATCH, 1)
+    session_maker = get_celery_session_maker()
+
+    async with session_maker() as session:
+        if not await checkpoint_retention.checkpoint_tables_exist(session):
+            return
+
+    total = PruneResult()
+    after = ""
+    while True:
+        async with session_maker() as session:
+            thread_ids = await checkpoint_retention.candidate_threads(
+                session, keep_latest=keep_latest, after=after, limit=batch
+            )
+            if not thread_ids:
+                break
+            result = await checkpoint_retention.prune_checkpoints(
+                session, thread_ids, keep_latest=keep_latest
+            )
+            await session.commit()
+        metrics.record_checkpoint_prune(
+            checkpoints=result.checkpoints,
+            writes=result.writes,
+            blobs=result.blobs,
+            blob_bytes=result.blob_bytes,
+        )
+        total += result
+        after = thread_ids[-1]
+
+    async with session_maker() as session:
+        sizes = await checkpoint_retention.table_sizes(session)
+    for table, size in sizes.items():
+        metrics.record_checkpoint_table_size(table=table, size_bytes=size)
+
+    logger.info(
+        "Pruned %d checkpoints, %d writes and %d blobs (%d bytes) across %d threads",
+        total.checkpoints,
+        total.writes,
+        total.blobs,
+        total.blob_bytes,
+        total.threads,
+    )
@@ -0,0 +1,38 @@
+"""Settle Redis credit-ledger debits into ``user.credit_micros_balance``.
+
+Runs every minute from beat; a no-op unless ``CREDIT_LEDGER_BACKEND=redis``.
+See :mod:`app.services.credit_ledger` for the crash-safety argument.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from app.celery_app import celery_app
+from app.config import config
+from app.services import credit_ledger
+from app.tasks.celery_tasks import get_celery_session_maker, run_async_celery_task
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="settle_credit_ledger")
+def settle_credit_ledger_task():
+    """Apply finalized ledger debits to Postgres, batch by batch."""
+    return run_async_celery_task(_settle_credit_ledger)
+
+
+async def _settle_credit_ledger() -> None:
+    if not credit_ledger.enabled():
+        return
+    result = await credit_ledger.settle(
+        get_celery_session_maker(),
+        batch_size=config.CREDIT_LEDGER_SETTLE_BATCH,
+        time_budget=config.CREDIT_LEDGER_SETTLE_BUDGET_SECONDS,
+    )
+    if result.users:
+        logger.info(
+            "Settled %d micros of credit-ledger debits for %d users",
+            result.micros,
+            result.users,
+        )
@@ -150,16 +150,41 @@ def delete_document_task(self, document_id: int):
     return run_async_celery_task(lambda: _delete_document_background(document_id))
 
 
-async def _purge_documents(session, document_ids: list[int]) -> None:
-    """Remove documents and everything hanging off them: chunks, blobs, rows.
+# Set-based purge: documents go in batches keyed by id, chunks are deleted
+# across a whole batch per statement (bounded by row count so one statement
+# never holds locks on an unbounded set), and each batch commits once.
+PURGE_DOCUMENT_BATCH_SIZE = 500
+PURGE_CHUNK_BATCH_SIZE = 10_000
+
+
+def _report_purge_progress(notification_id: int | None, done: int, total: int):
+    """Refresh the task's heartbeat key with how far the purge has got."""
+    logger.info("Purged %d/%d documents", done, total)
+    if notification_id is None:
+        return
+    try:
+        _get_doc_heartbeat_redis().setex(
+            _get_heartbeat_key(notification_id),
+            HEARTBEAT_TTL_SECONDS,
+            f"purged:{done}/{total}",
+        )
+        ot_metrics.record_celery_heartbeat_refresh(heartbeat_type="document")
+    except Exception as e:
+        ot_metrics.record_celery_heartbeat_failure(heartbeat_type="document")
+        logger.warning(
+            f"Failed to refresh heartbeat for notification {notification_id}: {e}"
+        )
+
+
+async def _purge_document_batch(
+    session, document_ids: list[int], *, record_deletions: bool = True
+) -> int:
+    """Purge one batch of documents with a handful of statements; return count.
 
     The knowledge store is told first, while the rows are still there to say
     where their files are. A row deleted ahead of the recording takes that
     answer with it, and the file it leaves behind is read back as a document by
     the next whole-tree rebuild.
-
-    Every document must belong to one workspace, as everywhere else in the
-    adapter — both callers delete within a single one.
     """
     from sqlalchemy import delete as sa_delete, select
 
@@ -167,35 +192,63 @@ async def _purge_documents(session, document_ids: list[int]) -> None:
     from app.file_storage.service import purge_document_blobs
     from app.knowledge_store.service import record_deleted_documents
 
-    documents = (
-        (await session.execute(select(Document).where(Document.id.in_(document_ids))))
-        .scalars()
-        .all()
-    )
-    if not documents:
-        return
+    if record_deletions:
+        documents = (
+            (
+                await session.execute(
+                    select(Document).where(Document.id.in_(document_ids))
+                )
+            )
+            .scalars()
+            .all()
+        )
+        document_ids = [document.id for document in documents]
+        await record_deleted_documents(session, documents)
+    if not document_ids:
+        return 0
+
+    while True:
+        chunk_ids = (
+            select(Chunk.id)
+            .where(Chunk.document_id.in_(document_ids))
+            .limit(PURGE_CHUNK_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            sa_delete(Chunk)
+            .where(Chunk.id.in_(chunk_ids))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount < PURGE_CHUNK_BATCH_SIZE:
+            break
 
-    await record_deleted_documents(session, documents)
+    # Remove stored blobs before the document_files rows cascade away.
+    await purge_document_blobs(session, document_ids=document_ids)
 
-    batch_size = 500
-    for document in documents:
-        while True:
-            chunk_ids_result = await session.execute(
-                select(Chunk.id)
-                .where(Chunk.document_id == document.id)
-                .limit(batch_size)
-            )
-            chunk_ids = chunk_ids_result.scalars().all()
-            if not chunk_ids:
-                break
-            await session.execute(sa_delete(Chunk).where(Chunk.id.in_(chunk_ids)))
-            await session.commit()
+    await session.execute(
+        sa_delete(Document)
+        .where(Document.id.in_(document_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return len(document_ids)
 
-        # Remove stored blobs before the document_files rows cascade away.
-        await purge_document_blobs(session, document_ids=[document.id])
 
-        await session.delete(document)
-        await session.commit()
+async def _purge_documents(
+    session, document_ids: list[int], *, notification_id: int | None = None
+) -> None:
+    """Remove documents and everything hanging off them: chunks, blobs, rows.
+
+    Every document must belong to one workspace, as everywhere else in the
+    adapter — both callers delete within a single one.
+    """
+    ids = sorted(set(document_ids))
+    done = 0
+    for start in range(0, len(ids), PURGE_DOCUMENT_BATCH_SIZE):
+        done += await _purge_document_batch(
+            session, ids[start : start + PURGE_DOCUMENT_BATCH_SIZE]
+        )
+        _report_purge_progress(notification_id, done, len(ids))
 
 
 async def _delete_document_background(document_id: int) -> None:
@@ -216,16 +269,20 @@ def delete_folder_documents_task(
     self,
     document_ids: list[int],
     folder_subtree_ids: list[int] | None = None,
+    notification_id: int | None = None,
 ):
     """Celery task to delete documents first, then the folder rows."""
     return run_async_celery_task(
-        lambda: _delete_folder_documents(document_ids, folder_subtree_ids)
+        lambda: _delete_folder_documents(
+            document_ids, folder_subtree_ids, notification_id
+        )
     )
 
 
 async def _delete_folder_documents(
     document_ids: list[int],
     folder_subtree_ids: list[int] | None = None,
+    notification_id: int | None = None,
 ) -> None:
     """Delete chunks in batches, then document rows, then folder rows."""
     from sqlalchemy import delete as sa_delete
@@ -233,7 +290,7 @@ async def _delete_folder_documents(
     from app.db import Folder
 
     async with get_celery_session_maker()() as session:
-        await _purge_documents(session, document_ids)
+        await _purge_documents(session, document_ids, notification_id=notification_id)
 
         if folder_subtree_ids:
             await session.execute(
@@ -250,48 +307,54 @@ async def _delete_folder_documents(
     retry_backoff_max=300,
     max_retries=5,
 )
-def delete_workspace_task(self, workspace_id: int):
+def delete_workspace_task(self, workspace_id: int, notification_id: int | None = None):
     """Celery task to delete a workspace and heavy child rows in batches."""
-    return run_async_celery_task(lambda: _delete_workspace_background(workspace_id))
+    return run_async_celery_task(
+        lambda: _delete_workspace_background(workspace_id, notification_id)
+    )
 
 
-async def _delete_workspace_background(workspace_id: int) -> None:
-    """Delete chunks/docs in batches first, then delete the workspace."""
-    from sqlalchemy import delete as sa_delete, select
+async def _delete_workspace_background(
+    workspace_id: int, notification_id: int | None = None
+) -> None:
+    """Delete chunks/docs in id-ordered batches first, then the workspace."""
+    from sqlalchemy import func, select
 
-    from app.db import Chunk, Document, Workspace
-    from app.file_storage.service import purge_document_blobs
+    from app.db import Document, Workspace
     from app.knowledge_store.service import drop_workspace_store
 
     async with get_celery_session_maker()() as session:
-        batch_size = 500
-
-        while True:
-            chunk_ids_result = await session.execute(
-                select(Chunk.id)
-                .join(Document, Chunk.document_id == Document.id)
-                .where(Document.workspace_id == workspace_id)
-                .limit(batch_size)
-            )
-            chunk_ids = chunk_ids_result.scalars().all()
-            if not chunk_ids:
-                break
-            await session.execute(sa_delete(Chunk).where(Chunk.id.in_(chunk_ids)))
-            await session.commit()
-
+        total = await session.scalar(
+            select(func.count())
+            .select_from(Document)
+            .where(Document.workspace_id == workspace_id)
+        )
+        done = 0
+        last_id = 0
         while True:
-            doc_ids_result = await session.execute(
-                select(Document.id)
-                .where(Document.workspace_id == workspace_id)
-                .limit(batch_size)
+            doc_ids = (
+                (
+                    await session.execute(
+                        select(Document.id)
+                        .where(
+                            Document.workspace_id == workspace_id,
+                            Document.id > last_id,
+                        )
+                        .order_by(Document.id)
+                        .limit(PURGE_DOCUMENT_BATCH_SIZE)
+                    )
+                )
+                .scalars()
+                .all()
             )
-            doc_ids = doc_ids_result.scalars().all()
             if not doc_ids:
                 break
-            # Remove stored blobs before the document_files rows cascade away.
-            await purge_document_blobs(session, document_ids=list(doc_ids))
-            await session.execute(sa_delete(Document).where(Document.id.in_(doc_ids)))
-            await session.commit()
+            last_id = doc_ids[-1]
+            # The whole store is dropped below; no per-document recording.
+            done += await _purge_document_batch(
+                session, list(doc_ids), record_deletions=False
+            )
+            _report_purge_progress(notification_id, done, total or done)
 
         space = await session.get(Workspace, workspace_id)
         if space:
@@ -729,6 +792,7 @@ def process_file_upload_with_document_task(
     user_id: str,
     use_vision_llm: bool = False,
     processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ):
     """
     Celery task to process uploaded file with existing pending document.
@@ -743,6 +807,7 @@ def process_file_upload_with_document_task(
         filename: Original filename
         workspace_id: ID of the workspace
         user_id: ID of the user
+        source_sha256: sha256 of the file computed while spooling the upload
     """
     import traceback
 
@@ -777,6 +842,7 @@ def process_file_upload_with_document_task(
                 user_id,
                 use_vision_llm=use_vision_llm,
                 processing_mode=processing_mode,
+                source_sha256=source_sha256,
             )
         )
         logger.info(
@@ -826,6 +892,7 @@ async def _process_file_with_document(
     user_id: str,
     use_vision_llm: bool = False,
     processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ):
     """
     Process file and update existing pending document status.
@@ -936,6 +1003,7 @@ async def _process_file_with_document(
                 notification=notification,
                 use_vision_llm=use_vision_llm,
                 processing_mode=processing_mode,
+                source_sha256=source_sha256,
             )
 
             # Update notification on success
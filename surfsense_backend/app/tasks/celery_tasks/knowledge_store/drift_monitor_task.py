@@ -14,7 +14,6 @@ someone noticing the alert.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from sqlalchemy import select
@@ -23,6 +22,7 @@ from app.celery_app import celery_app
 from app.knowledge_store.migrate import MigrationReport, migrate_workspace
 from app.knowledge_store.settings import load_knowledge_store_settings
 from app.observability import metrics
+from app.tasks.celery_tasks import run_async_celery_task
 from app.tasks.celery_tasks.knowledge_store.index_tasks import reindex_knowledge_store
 
 logger = logging.getLogger(__name__)
@@ -44,7 +44,7 @@ def check_knowledge_store_drift() -> dict[str, int]:
     """Return status counts, e.g. ``{"ok": 12, "drift": 1}``."""
     if not load_knowledge_store_settings().enabled:
         return {}
-    return asyncio.run(_check_flipped_workspaces())
+    return run_async_celery_task(_check_flipped_workspaces)
 
 
 async def _check_flipped_workspaces() -> dict[str, int]:
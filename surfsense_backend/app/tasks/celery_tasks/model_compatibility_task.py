@@ -7,7 +7,6 @@ probed, so each run costs a fraction of the full catalogue.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from app.celery_app import celery_app
@@ -18,13 +17,14 @@ from app.services.model_compatibility_sweep import (
     resolve_api_key,
     sweep_models,
 )
+from app.tasks.celery_tasks import run_async_celery_task
 
 logger = logging.getLogger(__name__)
 
 
 @celery_app.task(name="sweep_model_compatibility")
 def sweep_model_compatibility() -> dict[str, int]:
-    return asyncio.run(_sweep())
+    return run_async_celery_task(_sweep)
 
 
 async def _sweep() -> dict[str, int]:
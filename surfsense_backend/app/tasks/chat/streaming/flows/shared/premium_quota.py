@@ -124,6 +124,7 @@ async def release_credit(
                 db_session=quota_session,
                 user_id=UUID(user_id),
                 reserved_micros=reservation.reserved_micros,
+                request_id=reservation.request_id,
             )
     except Exception:
         logging.getLogger(__name__).warning(
@@ -2,16 +2,62 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 from typing import Any
 
+from app.services.streaming.coalescer import Delta
 from app.tasks.chat.streaming.helpers.chunk_parts import extract_chunk_parts
 from app.tasks.chat.streaming.relay.activity_sse import emit_activity_frame
 from app.tasks.chat.streaming.relay.state import AgentEventRelayState
 from app.tasks.chat.streaming.relay.task_span import ensure_pending_task_span_for_lc
 
 
+def apply_delta(
+    delta: Delta,
+    *,
+    state: AgentEventRelayState,
+    content_builder: Any | None,
+) -> None:
+    """Record a released delta in the turn text and the persisted content."""
+    if delta.kind == "text":
+        state.accumulated_text += delta.text
+        if content_builder is not None:
+            content_builder.on_text_delta(delta.block_id, delta.text)
+    elif content_builder is not None:
+        content_builder.on_reasoning_delta(delta.block_id, delta.text)
+
+
+def iter_delta_frames(
+    deltas: Iterable[Delta],
+    *,
+    state: AgentEventRelayState,
+    streaming_service: Any,
+    content_builder: Any | None,
+) -> Iterator[str]:
+    for delta in deltas:
+        apply_delta(delta, state=state, content_builder=content_builder)
+        if delta.kind == "text":
+            yield streaming_service.format_text_delta(delta.block_id, delta.text)
+        else:
+            yield streaming_service.format_reasoning_delta(delta.block_id, delta.text)
+
+
+def flush_delta_frames(
+    *,
+    state: AgentEventRelayState,
+    streaming_service: Any,
+    content_builder: Any | None,
+) -> Iterator[str]:
+    """Frames for held deltas; call before emitting any other frame."""
+    return iter_delta_frames(
+        state.deltas.flush(),
+        state=state,
+        streaming_service=streaming_service,
+        content_builder=content_builder,
+    )
+
+
 def iter_chat_model_stream_frames(
     event: dict[str, Any],
     *,
@@ -32,6 +78,12 @@ def iter_chat_model_stream_frames(
 
     for part_type, value in parts["ordered"]:
         if part_type == "reasoning":
+            if state.current_text_id is not None or state.current_reasoning_id is None:
+                yield from flush_delta_frames(
+                    state=state,
+                    streaming_service=streaming_service,
+                    content_builder=content_builder,
+                )
             if state.current_text_id is not None:
                 yield streaming_service.format_text_end(state.current_text_id)
                 if content_builder is not None:
@@ -52,14 +104,21 @@ def iter_chat_model_stream_frames(
                 )
                 if content_builder is not None:
                     content_builder.on_reasoning_start(state.current_reasoning_id)
-            yield streaming_service.format_reasoning_delta(
-                state.current_reasoning_id, value
+            yield from iter_delta_frames(
+                state.deltas.push("reasoning", state.current_reasoning_id, value),
+                state=state,
+                streaming_service=streaming_service,
+                content_builder=content_builder,
             )
-            if content_builder is not None:
-                content_builder.on_reasoning_delta(state.current_reasoning_id, value)
             continue
 
         if part_type == "text":
+            if state.current_reasoning_id is not None or state.current_text_id is None:
+                yield from flush_delta_frames(
+                    state=state,
+                    streaming_service=streaming_service,
+                    content_builder=content_builder,
+                )
             if state.current_reasoning_id is not None:
                 yield streaming_service.format_reasoning_end(state.current_reasoning_id)
                 if content_builder is not None:
@@ -78,13 +137,20 @@ def iter_chat_model_stream_frames(
                 yield streaming_service.format_text_start(state.current_text_id)
                 if content_builder is not None:
                     content_builder.on_text_start(state.current_text_id)
-            yield streaming_service.format_text_delta(state.current_text_id, value)
-            state.accumulated_text += value
-            if content_builder is not None:
-                content_builder.on_text_delta(state.current_text_id, value)
+            yield from iter_delta_frames(
+                state.deltas.push("text", state.current_text_id, value),
+                state=state,
+                streaming_service=streaming_service,
+                content_builder=content_builder,
+            )
             continue
 
         if part_type == "tool_call_chunk":
+            yield from flush_delta_frames(
+                state=state,
+                streaming_service=streaming_service,
+                content_builder=content_builder,
+            )
             tcc = value
             idx = tcc.get("index")
 
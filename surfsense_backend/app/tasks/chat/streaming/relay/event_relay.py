@@ -10,6 +10,8 @@ from app.services.streaming.emitter import EmitterRegistry
 from app.tasks.chat.streaming.graph_stream.result import StreamingResult
 from app.tasks.chat.streaming.handlers.chain_end import iter_chain_end_frames
 from app.tasks.chat.streaming.handlers.chat_model_stream import (
+    apply_delta,
+    flush_delta_frames,
     iter_chat_model_stream_frames,
 )
 from app.tasks.chat.streaming.handlers.custom_event_dispatch import (
@@ -57,57 +59,77 @@ class EventRelay:
         """Yield SSE for each event and retain canonical activity state."""
         graph_config = config or {}
         result.activity_state = state
-        async for event in events:
-            event_type = event.get("event", "")
-            if event_type == "on_chat_model_stream":
-                for frame in iter_chat_model_stream_frames(
-                    event,
-                    state=state,
-                    streaming_service=self.streaming_service,
-                    content_builder=content_builder,
-                    step_prefix=step_prefix,
-                ):
-                    yield frame
-            elif event_type == "on_tool_start":
-                for frame in iter_tool_start_frames(
-                    event,
-                    state=state,
-                    streaming_service=self.streaming_service,
-                    content_builder=content_builder,
-                    result=result,
-                    step_prefix=step_prefix,
-                ):
-                    yield frame
-            elif event_type == "on_tool_end":
-                for frame in iter_tool_end_frames(
-                    event,
-                    state=state,
-                    streaming_service=self.streaming_service,
-                    content_builder=content_builder,
-                    result=result,
-                    step_prefix=step_prefix,
-                    config=graph_config,
-                ):
-                    yield frame
-            elif event_type == "on_custom_event":
-                for frame in iter_custom_event_frames(
-                    event,
-                    state=state,
-                    streaming_service=self.streaming_service,
-                    content_builder=content_builder,
-                ):
-                    yield frame
-            elif event_type in ("on_chain_end", "on_agent_end"):
-                for frame in iter_chain_end_frames(
-                    event,
+        try:
+            async for event in events:
+                event_type = event.get("event", "")
+                if event_type == "on_chat_model_stream":
+                    for frame in iter_chat_model_stream_frames(
+                        event,
+                        state=state,
+                        streaming_service=self.streaming_service,
+                        content_builder=content_builder,
+                        step_prefix=step_prefix,
+                    ):
+                        yield frame
+                    continue
+                # Any other graph activity releases held deltas, which also
+                # bounds how long a token waits when the model pauses.
+                for frame in flush_delta_frames(
                     state=state,
                     streaming_service=self.streaming_service,
                     content_builder=content_builder,
                 ):
                     yield frame
+                if event_type == "on_tool_start":
+                    for frame in iter_tool_start_frames(
+                        event,
+                        state=state,
+                        streaming_service=self.streaming_service,
+                        content_builder=content_builder,
+                        result=result,
+                        step_prefix=step_prefix,
+                    ):
+                        yield frame
+                elif event_type == "on_tool_end":
+                    for frame in iter_tool_end_frames(
+                        event,
+                        state=state,
+                        streaming_service=self.streaming_service,
+                        content_builder=content_builder,
+                        result=result,
+                        step_prefix=step_prefix,
+                        config=graph_config,
+                    ):
+                        yield frame
+                elif event_type == "on_custom_event":
+                    for frame in iter_custom_event_frames(
+                        event,
+                        state=state,
+                        streaming_service=self.streaming_service,
+                        content_builder=content_builder,
+                    ):
+                        yield frame
+                elif event_type in ("on_chain_end", "on_agent_end"):
+                    for frame in iter_chain_end_frames(
+                        event,
+                        state=state,
+                        streaming_service=self.streaming_service,
+                        content_builder=content_builder,
+                    ):
+                        yield frame
 
-        if state.current_text_id is not None:
-            yield self.streaming_service.format_text_end(state.current_text_id)
-            if content_builder is not None:
-                content_builder.on_text_end(state.current_text_id)
-            state.current_text_id = None
+            for frame in flush_delta_frames(
+                state=state,
+                streaming_service=self.streaming_service,
+                content_builder=content_builder,
+            ):
+                yield frame
+            if state.current_text_id is not None:
+                yield self.streaming_service.format_text_end(state.current_text_id)
+                if content_builder is not None:
+                    content_builder.on_text_end(state.current_text_id)
+                state.current_text_id = None
+        finally:
+            # A disconnect or error mid-block still persists the held text.
+            for delta in state.deltas.flush():
+                apply_delta(delta, state=state, content_builder=content_builder)
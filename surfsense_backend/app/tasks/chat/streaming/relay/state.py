@@ -6,6 +6,8 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.config import config
+from app.services.streaming.coalescer import DeltaCoalescer
 from app.services.streaming.types import ActivityData
 from app.tasks.chat.streaming.relay.activity_journal import ActivityJournal
 
@@ -44,6 +46,14 @@ class AgentEventRelayState:
     deliverable_needs_repair: bool = False
     # Span id minted when a ``task`` tool_call_chunk registers (before ``on_tool_start``).
     pending_task_span_by_lc: dict[str, str] = field(default_factory=dict)
+    # Text/reasoning deltas held back to share one SSE frame; anything that
+    # emits another frame flushes it first.
+    deltas: DeltaCoalescer = field(
+        default_factory=lambda: DeltaCoalescer(
+            window=config.STREAM_DELTA_COALESCE_MS / 1000,
+            max_chars=config.STREAM_DELTA_COALESCE_MAX_CHARS,
+        )
+    )
 
     def span_metadata_if_active(self) -> dict[str, Any] | None:
         """``{"spanId": ...}`` when a span is active; ``None`` otherwise."""
@@ -155,7 +155,12 @@ def scan_folder(
 
 
 async def _read_file_content(
-    file_path: str, filename: str, *, vision_llm=None, processing_mode: str = "basic"
+    file_path: str,
+    filename: str,
+    *,
+    vision_llm=None,
+    processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ) -> str:
     """Read file content via the unified ETL pipeline.
 
@@ -167,7 +172,12 @@ async def _read_file_content(
 
     mode = ProcessingMode.coerce(processing_mode)
     result = await extract_with_cache(
-        EtlRequest(file_path=file_path, filename=filename, processing_mode=mode),
+        EtlRequest(
+            file_path=file_path,
+            filename=filename,
+            processing_mode=mode,
+            source_sha256=source_sha256,
+        ),
         vision_llm=vision_llm,
     )
     return result.markdown_content
@@ -207,13 +217,18 @@ async def _compute_file_content_hash(
     *,
     vision_llm=None,
     processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ) -> tuple[str, str]:
     """Read a file (via ETL if needed) and compute its content hash.
 
     Returns (content_text, content_hash).
     """
     content = await _read_file_content(
-        file_path, filename, vision_llm=vision_llm, processing_mode=processing_mode
+        file_path,
+        filename,
+        vision_llm=vision_llm,
+        processing_mode=processing_mode,
+        source_sha256=source_sha256,
     )
     return content, _content_hash(content, workspace_id)
 
@@ -1271,7 +1286,8 @@ async def index_uploaded_files(
 ) -> tuple[int, int, str | None]:
     """Index files uploaded from the desktop app via temp paths.
 
-    Each entry in *file_mappings* is ``{temp_path, relative_path, filename}``.
+    Each entry in *file_mappings* is ``{temp_path, relative_path, filename}``,
+    plus ``sha256`` of the raw bytes when the upload was hashed while spooled.
     This function mirrors the folder structure from the provided relative
     paths, then indexes each file exactly like ``_index_single_file`` but
     reads from the temp path.  Temp files are cleaned up after processing.
@@ -1330,7 +1346,9 @@ async def index_uploaded_files(
                     workspace_id,
                 )
 
-                raw_hash = await asyncio.to_thread(_compute_raw_file_hash, temp_path)
+                raw_hash = mapping.get("sha256") or await asyncio.to_thread(
+                    _compute_raw_file_hash, temp_path
+                )
 
                 existing = await check_document_by_unique_identifier(session, uid_hash)
 
@@ -1368,6 +1386,7 @@ async def index_uploaded_files(
                         workspace_id,
                         vision_llm=vision_llm_instance,
                         processing_mode=mode.value,
+                        source_sha256=raw_hash,
                     )
                 except Exception as e:
                     logger.warning(f"Could not read {relative_path}: {e}")
@@ -376,6 +376,7 @@ async def _extract_file_content(
     notification: Notification | None,
     use_vision_llm: bool = False,
     processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ) -> tuple[str, str, int]:
     """
     Extract markdown content from a file regardless of type.
@@ -442,6 +443,7 @@ async def _extract_file_content(
             filename=filename,
             estimated_pages=estimated_pages,
             processing_mode=mode,
+            source_sha256=source_sha256,
         ),
         vision_llm=vision_llm,
     )
@@ -468,6 +470,7 @@ async def process_file_in_background_with_document(
     notification: Notification | None = None,
     use_vision_llm: bool = False,
     processing_mode: str = "basic",
+    source_sha256: str | None = None,
 ) -> Document | None:
     """
     Process file and update existing pending document (2-phase pattern).
@@ -499,6 +502,7 @@ async def process_file_in_background_with_document(
             notification,
             use_vision_llm=use_vision_llm,
             processing_mode=processing_mode,
+            source_sha256=source_sha256,
         )
 
         if not markdown_content:
@@ -1,4 +1,3 @@
-import asyncio
 import hashlib
 import logging
 import threading
@@ -9,6 +8,7 @@ from litellm import get_model_info, token_counter
 
 from app.config import config
 from app.db import Chunk, DocumentType
+from app.indexing_pipeline.embedding_batcher import embed_coalesced
 
 logger = logging.getLogger(__name__)
 
@@ -186,7 +186,7 @@ async def create_document_chunks(content: str) -> list[Chunk]:
         List of Chunk objects with embeddings
     """
     chunk_texts = [c.text for c in config.chunker_instance.chunk(content)]
-    chunk_embeddings = await asyncio.to_thread(embed_texts, chunk_texts)
+    chunk_embeddings = await embed_coalesced(chunk_texts, embed_texts)
     return [
         Chunk(content=text, embedding=emb, position=i)
         for i, (text, emb) in enumerate(
@@ -1,7 +1,84 @@
 import asyncio
+import contextlib
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
 from pathlib import Path
 
+# Upload copies move this much per read; peak memory per file stays here.
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
 
 async def write_bytes(path: str, content: bytes) -> None:
     """Write bytes without blocking the event loop."""
     await asyncio.to_thread(Path(path).write_bytes, content)
+
+
+class FileTooLargeError(ValueError):
+    """A spooled upload grew past its size cap; nothing was kept on disk."""
+
+    def __init__(self, size: int, max_bytes: int) -> None:
+        super().__init__(f"{size} bytes exceeds the {max_bytes} byte limit")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class SpooledFile:
+    """A temp file written from a stream, with the size and sha256 of its bytes."""
+
+    path: str
+    size: int
+    sha256: str
+
+
+async def spool_to_temp(
+    read: Callable[[int], Awaitable[bytes]],
+    *,
+    suffix: str = "",
+    max_bytes: int | None = None,
+    chunk_size: int = SPOOL_CHUNK_SIZE,
+) -> SpooledFile:
+    """Copy ``read`` (e.g. ``UploadFile.read``) into a temp file chunk by chunk.
+
+    The sha256 is computed during the copy, so callers never re-read the
+    file to hash it. Raises :class:`FileTooLargeError` (after removing the
+    partial file) as soon as more than ``max_bytes`` arrive.
+    """
+    handle = await asyncio.to_thread(
+        tempfile.NamedTemporaryFile, delete=False, suffix=suffix
+    )
+    digest = hashlib.sha256()
+    size = 0
+
+    def _write(chunk: bytes) -> None:
+        handle.write(chunk)
+        digest.update(chunk)
+
+    try:
+        while chunk := await read(chunk_size):
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise FileTooLargeError(size, max_bytes)
+            await asyncio.to_thread(_write, chunk)
+        await asyncio.to_thread(handle.close)
+    except BaseException:
+        await asyncio.to_thread(handle.close)
+        with contextlib.suppress(OSError):
+            os.unlink(handle.name)
+        raise
+    return SpooledFile(path=handle.name, size=size, sha256=digest.hexdigest())
+
+
+async def iter_file_chunks(
+    path: str, chunk_size: int = SPOOL_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a file's bytes in chunks without blocking the event loop."""
+    handle = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(handle.read, chunk_size):
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
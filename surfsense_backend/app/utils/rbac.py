@@ -4,6 +4,7 @@ Provides helpers for checking user permissions in workspaces.
 """
 
 import secrets
+import time
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -13,12 +14,13 @@ from sqlalchemy.orm import selectinload
 
 from app.auth.context import AuthContext
 from app.db import (
-    Permission,
     Workspace,
     WorkspaceMembership,
     WorkspaceRole,
     has_permission,
 )
+from app.observability import metrics
+from app.utils.rbac_cache import ResolvedAccess, resolve_access
 
 
 async def get_user_membership(
@@ -64,20 +66,13 @@ async def get_user_permissions(
     Returns:
         List of permission strings
     """
-    membership = await get_user_membership(session, user_id, workspace_id)
+    access = await resolve_access(session, user_id, workspace_id)
 
-    if not membership:
+    if not access:
         return []
 
     # Owners always have full access
-    if membership.is_owner:
-        return [Permission.FULL_ACCESS.value]
-
-    # Get permissions from role
-    if membership.role:
-        return membership.role.permissions or []
-
-    return []
+    return access.permissions
 
 
 async def get_allowed_read_space_ids(
@@ -126,17 +121,65 @@ async def _enforce_api_access_gate(
     return workspace
 
 
+def _enforce_resolved_api_access_gate(
+    auth: AuthContext, access: ResolvedAccess
+) -> None:
+    if auth.is_gated and not access.api_access_enabled:
+        raise HTTPException(
+            status_code=403,
+            detail="API access is not enabled for this workspace.",
+        )
+
+
+async def _authorize(
+    session: AsyncSession,
+    auth: AuthContext,
+    workspace_id: int,
+    required_permission: str | None,
+    error_message: str,
+) -> ResolvedAccess:
+    started = time.perf_counter()
+    outcome = "denied"
+    try:
+        access = await resolve_access(session, auth.user.id, workspace_id)
+
+        if not access:
+            raise HTTPException(
+                status_code=403,
+                detail="You don't have access to this workspace",
+            )
+
+        if required_permission is not None and not has_permission(
+            access.permissions, required_permission
+        ):
+            raise HTTPException(status_code=403, detail=error_message)
+
+        _enforce_resolved_api_access_gate(auth, access)
+
+        outcome = "allowed"
+        return access
+    finally:
+        metrics.record_rbac_check_duration(
+            (time.perf_counter() - started) * 1000,
+            check="permission" if required_permission is not None else "access",
+            outcome=outcome,
+        )
+
+
 async def check_permission(
     session: AsyncSession,
     auth: AuthContext,
     workspace_id: int,
     required_permission: str,
     error_message: str = "You don't have permission to perform this action",
-) -> WorkspaceMembership:
+) -> ResolvedAccess:
     """
     Check if a user has a specific permission in a workspace.
     Raises HTTPException if permission is denied.
 
+    Membership, role permissions and the API-access gate are resolved in one
+    query and cached per (user, workspace); see :mod:`app.utils.rbac_cache`.
+
     Args:
         session: Database session
         user: User object
@@ -145,40 +188,21 @@ async def check_permission(
         error_message: Custom error message for permission denied
 
     Returns:
-        WorkspaceMembership if permission granted
+        ResolvedAccess if permission granted
 
     Raises:
         HTTPException: If user doesn't have access or permission
     """
-    membership = await get_user_membership(session, auth.user.id, workspace_id)
-
-    if not membership:
-        raise HTTPException(
-            status_code=403,
-            detail="You don't have access to this workspace",
-        )
-
-    # Get user's permissions
-    if membership.is_owner:
-        permissions = [Permission.FULL_ACCESS.value]
-    elif membership.role:
-        permissions = membership.role.permissions or []
-    else:
-        permissions = []
-
-    if not has_permission(permissions, required_permission):
-        raise HTTPException(status_code=403, detail=error_message)
-
-    await _enforce_api_access_gate(session, auth, workspace_id)
-
-    return membership
+    return await _authorize(
+        session, auth, workspace_id, required_permission, error_message
+    )
 
 
 async def check_workspace_access(
     session: AsyncSession,
     auth: AuthContext,
     workspace_id: int,
-) -> WorkspaceMembership:
+) -> ResolvedAccess:
     """
     Check if a user has any access to a workspace.
     This is used for basic access control (user is a member).
@@ -189,22 +213,12 @@ async def check_workspace_access(
         workspace_id: Workspace ID
 
     Returns:
-        WorkspaceMembership if user has access
+        ResolvedAccess if user has access
 
     Raises:
         HTTPException: If user doesn't have access
     """
-    membership = await get_user_membership(session, auth.user.id, workspace_id)
-
-    if not membership:
-        raise HTTPException(
-            status_code=403,
-            detail="You don't have access to this workspace",
-        )
-
-    await _enforce_api_access_gate(session, auth, workspace_id)
-
-    return membership
+    return await _authorize(session, auth, workspace_id, None, "")
 
 
 async def is_workspace_owner(
@@ -223,8 +237,8 @@ async def is_workspace_owner(
     Returns:
         True if user is the owner, False otherwise
     """
-    membership = await get_user_membership(session, user_id, workspace_id)
-    return membership is not None and membership.is_owner
+    access = await resolve_access(session, user_id, workspace_id)
+    return access is not None and access.is_owner
 
 
 async def get_workspace_with_access_check(
@@ -232,7 +246,7 @@ async def get_workspace_with_access_check(
     auth: AuthContext,
     workspace_id: int,
     required_permission: str | None = None,
-) -> tuple[Workspace, WorkspaceMembership]:
+) -> tuple[Workspace, ResolvedAccess]:
     """
     Get a workspace with access and optional permission check.
 
@@ -243,7 +257,7 @@ async def get_workspace_with_access_check(
         required_permission: Optional permission to check
 
     Returns:
-        Tuple of (Workspace, WorkspaceMembership)
+        Tuple of (Workspace, ResolvedAccess)
 
     Raises:
         HTTPException: If workspace not found or user lacks access/permission
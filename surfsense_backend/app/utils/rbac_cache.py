@@ -0,0 +1,448 @@
+"""Cache of resolved workspace access for :mod:`app.utils.rbac`.
+
+Every workspace route authorizes through ``check_permission``; uncached, that
+is a membership query, a ``selectinload`` of its role and a re-select of the
+workspace for the API-access gate before the route does any work. Here the
+three collapse into one joined query whose result is cached per
+``(user, workspace)``: in process, and in Redis when
+``RBAC_CACHE_REDIS_ENABLED`` is set so replicas share fills.
+
+Invalidation is by a per-workspace RBAC version, bumped from SQLAlchemy ORM
+events on memberships, roles and ``Workspace.api_access_enabled`` (the same
+mechanism ``ConnectorService`` uses for its discovery cache). The version is
+bumped at flush, so the writing session stops seeing cached entries, and again
+at commit or rollback, so nothing filled from pre-commit reads survives. A
+session with pending RBAC changes bypasses the cache entirely.
+
+With ``RBAC_CACHE_REDIS_ENABLED`` the version also lives in Redis, bumped at
+commit from a task on the committing loop. Redis entries carry the version
+they were read under and are ignored once it moves; in-process entries carry
+it too, and a memory hit costs one ``GET`` of it, so another replica's bump is
+seen on the next check. Redis is best-effort: a failed read falls through to
+Postgres, and a memory hit that cannot be validated is served as if Redis
+were off. Without Redis, another replica's in-process entries are not told
+about a bump; they live at most ``RBAC_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import event, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.config import config
+from app.db import (
+    Permission,
+    Workspace,
+    WorkspaceMembership,
+    WorkspaceRole,
+)
+from app.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "rbac:v1:"
+# Session.info key holding workspace ids with unflushed-or-uncommitted changes.
+_DIRTY_KEY = "rbac_cache_dirty_workspaces"
+
+_redis_client: aioredis.Redis | None = None
+_redis_loop: asyncio.AbstractEventLoop | None = None
+_sync_redis_client: redis.Redis | None = None
+# Redis version bumps scheduled at commit; referenced until they finish.
+_pending_bumps: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class ResolvedAccess:
+    """A user's membership in a workspace, as the RBAC checks need it."""
+
+    user_id: UUID
+    workspace_id: int
+    is_owner: bool
+    role_name: str | None
+    role_permissions: tuple[str, ...]
+    api_access_enabled: bool
+
+    @property
+    def permissions(self) -> list[str]:
+        if self.is_owner:
+            return [Permission.FULL_ACCESS.value]
+        return list(self.role_permissions)
+
+    def _to_json(self) -> dict:
+        return {
+            "owner": self.is_owner,
+            "role": self.role_name,
+            "perms": list(self.role_permissions),
+            "api": self.api_access_enabled,
+        }
+
+    @classmethod
+    def _from_json(cls, user_id: UUID, workspace_id: int, data: dict) -> ResolvedAccess:
+        return cls(
+            user_id=user_id,
+            workspace_id=workspace_id,
+            is_owner=bool(data["owner"]),
+            role_name=data["role"],
+            role_permissions=tuple(data["perms"]),
+            api_access_enabled=bool(data["api"]),
+        )
+
+
+def _redis() -> aioredis.Redis:
+    # Celery tasks may each run on a fresh loop; a pool can't cross loops.
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        old, old_loop = _redis_client, _redis_loop
+        _redis_client = aioredis.from_url(config.REDIS_APP_URL, decode_responses=True)
+        _redis_loop = loop
+        if old is not None and old_loop is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(old.aclose(), old_loop)
+    return _redis_client
+
+
+def _sync_redis() -> redis.Redis:
+    # Only for bumps committed outside an event loop, where blocking is fine.
+    global _sync_redis_client
+    if _sync_redis_client is None:
+        _sync_redis_client = redis.from_url(
+            config.REDIS_APP_URL,
+            decode_responses=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _sync_redis_client
+
+
+def _version_key(workspace_id: int) -> str:
+    return f"{_REDIS_KEY_PREFIX}ver:{workspace_id}"
+
+
+def _entries_key(workspace_id: int) -> str:
+    return f"{_REDIS_KEY_PREFIX}acc:{workspace_id}"
+
+
+class _AccessCache:
+    """LRU of resolved access, validated against per-workspace versions."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max(0, max_entries)
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[
+            tuple[UUID, int], tuple[float, int, str | None, ResolvedAccess | None]
+        ] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, workspace_id: int) -> int:
+        with self._lock:
+            return self._versions.get(workspace_id, 0)
+
+    def bump(self, workspace_id: int) -> None:
+        with self._lock:
+            self._versions[workspace_id] = self._versions.get(workspace_id, 0) + 1
+
+    def get(
+        self, user_id: UUID, workspace_id: int
+    ) -> tuple[bool, str | None, ResolvedAccess | None]:
+        """``(found, redis_version, access)``.
+
+        ``access`` is ``None`` for a cached non-member; ``redis_version`` is
+        the Redis RBAC version the entry was filled under, if known.
+        """
+        key = (user_id, workspace_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None, None
+            expires_at, version, redis_version, access = entry
+            if time.monotonic() >= expires_at or version != self._versions.get(
+                workspace_id, 0
+            ):
+                del self._entries[key]
+                return False, None, None
+            self._entries.move_to_end(key)
+            return True, redis_version, access
+
+    def discard(self, user_id: UUID, workspace_id: int) -> None:
+        with self._lock:
+            self._entries.pop((user_id, workspace_id), None)
+
+    def put(
+        self,
+        user_id: UUID,
+        workspace_id: int,
+        version: int,
+        access: ResolvedAccess | None,
+        redis_version: str | None = None,
+    ) -> None:
+        if self._max_entries == 0 or self._ttl <= 0:
+            return
+        key = (user_id, workspace_id)
+        with self._lock:
+            if version != self._versions.get(workspace_id, 0):
+                return
+            self._entries[key] = (
+                time.monotonic() + self._ttl,
+                version,
+                redis_version,
+                access,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _AccessCache(config.RBAC_CACHE_MAX_ENTRIES, config.RBAC_CACHE_TTL_SECONDS)
+
+
+async def _load(
+    session: AsyncSession, user_id: UUID, workspace_id: int
+) -> ResolvedAccess | None:
+    row = (
+        await session.execute(
+            select(
+                WorkspaceMembership.is_owner,
+                WorkspaceRole.name,
+                WorkspaceRole.permissions,
+                Workspace.api_access_enabled,
+            )
+            .select_from(WorkspaceMembership)
+            .join(Workspace, Workspace.id == WorkspaceMembership.workspace_id)
+            .outerjoin(WorkspaceRole, WorkspaceRole.id == WorkspaceMembership.role_id)
+            .where(
+                WorkspaceMembership.user_id == user_id,
+                WorkspaceMembership.workspace_id == workspace_id,
+            )
+            .limit(1)
+        )
+    ).first()
+    if row is None:
+        return None
+    is_owner, role_name, role_permissions, api_access_enabled = row
+    return ResolvedAccess(
+        user_id=user_id,
+        workspace_id=workspace_id,
+        is_owner=bool(is_owner),
+        role_name=role_name,
+        role_permissions=tuple(role_permissions or ()),
+        api_access_enabled=bool(api_access_enabled),
+    )
+
+
+async def _redis_version(workspace_id: int) -> str | None:
+    """The workspace's Redis RBAC version, or ``None`` on error."""
+    try:
+        version = await _redis().get(_version_key(workspace_id))
+    except Exception as exc:  # best-effort tier; never fail the request
+        logger.debug("RBAC cache Redis version read failed: %s", exc)
+        return None
+    return version or "0"
+
+
+async def _redis_get(
+    user_id: UUID, workspace_id: int
+) -> tuple[str | None, bool, ResolvedAccess | None]:
+    """``(version, found, access)`` from Redis; ``version`` is ``None`` on error."""
+    try:
+        async with _redis().pipeline(transaction=False) as pipe:
+            pipe.get(_version_key(workspace_id))
+            pipe.hget(_entries_key(workspace_id), str(user_id))
+            version, raw = await pipe.execute()
+    except Exception as exc:  # best-effort tier; never fail the request
+        logger.debug("RBAC cache Redis read failed: %s", exc)
+        return None, False, None
+    version = version or "0"
+    if raw is None:
+        return version, False, None
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return version, False, None
+    if payload.get("v") != version:
+        return version, False, None
+    data = payload.get("m")
+    access = (
+        None if data is None else ResolvedAccess._from_json(user_id, workspace_id, data)
+    )
+    return version, True, access
+
+
+async def _redis_put(
+    user_id: UUID, workspace_id: int, version: str, access: ResolvedAccess | None
+) -> None:
+    payload = json.dumps(
+        {"v": version, "m": None if access is None else access._to_json()}
+    )
+    key = _entries_key(workspace_id)
+    try:
+        async with _redis().pipeline(transaction=False) as pipe:
+            pipe.hset(key, str(user_id), payload)
+            pipe.expire(key, config.RBAC_CACHE_REDIS_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as exc:  # best-effort tier; never fail the request
+        logger.debug("RBAC cache Redis write failed: %s", exc)
+
+
+_RBAC_MODELS = (Workspace, WorkspaceMembership, WorkspaceRole)
+
+
+def _session_has_pending_changes(session: AsyncSession) -> bool:
+    """Whether ``session`` holds RBAC writes other sessions cannot see yet."""
+    sync_session = session.sync_session
+    if sync_session.info.get(_DIRTY_KEY):
+        return True
+    return any(
+        isinstance(obj, _RBAC_MODELS)
+        for obj in (*sync_session.new, *sync_session.dirty, *sync_session.deleted)
+    )
+
+
+async def resolve_access(
+    session: AsyncSession, user_id: UUID, workspace_id: int
+) -> ResolvedAccess | None:
+    """The user's access to the workspace, or ``None`` when not a member."""
+    if not config.RBAC_CACHE_ENABLED or _session_has_pending_changes(session):
+        return await _load(session, user_id, workspace_id)
+
+    # Read before the load: a bump racing the query invalidates what it fills.
+    version = _cache.version(workspace_id)
+    found, filled_under, access = _cache.get(user_id, workspace_id)
+    if found and config.RBAC_CACHE_REDIS_ENABLED:
+        # Another replica's bump only reaches this one through Redis.
+        current = await _redis_version(workspace_id)
+        if current is not None and current != filled_under:
+            _cache.discard(user_id, workspace_id)
+            found = False
+    if found:
+        metrics.record_rbac_cache_lookup(tier="memory", outcome="hit")
+        return access
+    metrics.record_rbac_cache_lookup(tier="memory", outcome="miss")
+
+    redis_version: str | None = None
+    if config.RBAC_CACHE_REDIS_ENABLED:
+        redis_version, found, access = await _redis_get(user_id, workspace_id)
+        if found:
+            metrics.record_rbac_cache_lookup(tier="redis", outcome="hit")
+            _cache.put(user_id, workspace_id, version, access, redis_version)
+            return access
+        metrics.record_rbac_cache_lookup(tier="redis", outcome="miss")
+
+    access = await _load(session, user_id, workspace_id)
+    _cache.put(user_id, workspace_id, version, access, redis_version)
+    if redis_version is not None:
+        await _redis_put(user_id, workspace_id, redis_version, access)
+    return access
+
+
+def invalidate_workspace_access(workspace_id: int) -> None:
+    """Bump ``workspace_id``'s RBAC version here and, if enabled, in Redis.
+
+    The ORM listeners call this; RBAC writes that bypass the ORM (bulk
+    ``update()``/``delete()`` statements) must call it after committing.
+    Inside an event loop the Redis bump is scheduled on it rather than
+    blocking the caller, which may be a commit hook.
+    """
+    _cache.bump(workspace_id)
+    if not (config.RBAC_CACHE_ENABLED and config.RBAC_CACHE_REDIS_ENABLED):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(_bump_redis_version(workspace_id))
+        _pending_bumps.add(task)
+        task.add_done_callback(_pending_bumps.discard)
+        return
+    try:
+        _sync_redis().incr(_version_key(workspace_id))
+    except Exception as exc:
+        _log_bump_failure(workspace_id, exc)
+
+
+async def _bump_redis_version(workspace_id: int) -> None:
+    try:
+        await _redis().incr(_version_key(workspace_id))
+    except Exception as exc:
+        _log_bump_failure(workspace_id, exc)
+
+
+def _log_bump_failure(workspace_id: int, exc: Exception) -> None:
+    logger.warning(
+        "RBAC cache Redis version bump failed for workspace %s: %s",
+        workspace_id,
+        exc,
+    )
+
+
+def clear_rbac_cache() -> None:
+    """Drop this process's in-memory entries."""
+    _cache.clear()
+
+
+def _mark_changed(target, workspace_id: int | None) -> None:
+    if workspace_id is None:
+        return
+    _cache.bump(int(workspace_id))
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_DIRTY_KEY, set()).add(int(workspace_id))
+
+
+def _register_invalidation_listeners() -> None:
+    def _membership_or_role_changed(_mapper, _connection, target) -> None:
+        _mark_changed(target, getattr(target, "workspace_id", None))
+
+    def _workspace_updated(_mapper, _connection, target) -> None:
+        if sa_inspect(target).attrs.api_access_enabled.history.has_changes():
+            _mark_changed(target, target.id)
+
+    def _workspace_deleted(_mapper, _connection, target) -> None:
+        _mark_changed(target, target.id)
+
+    def _transaction_ended(session: Session) -> None:
+        for workspace_id in session.info.pop(_DIRTY_KEY, ()):
+            invalidate_workspace_access(workspace_id)
+
+    def _rolled_back(session: Session, _previous_transaction) -> None:
+        # Nothing reached other processes; only this one may hold reads of the
+        # discarded rows. A savepoint rollback leaves the outer changes pending.
+        for workspace_id in session.info.get(_DIRTY_KEY, ()):
+            _cache.bump(workspace_id)
+        if not session.in_transaction():
+            session.info.pop(_DIRTY_KEY, None)
+
+    for model in (WorkspaceMembership, WorkspaceRole):
+        for evt in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, evt, _membership_or_role_changed)
+    event.listen(Workspace, "after_update", _workspace_updated)
+    event.listen(Workspace, "after_delete", _workspace_deleted)
+    event.listen(Session, "after_commit", _transaction_ended)
+    event.listen(Session, "after_soft_rollback", _rolled_back)
+
+
+try:
+    _register_invalidation_listeners()
+except Exception:  # pragma: no cover - defensive; never block module import
+    logger.exception(
+        "Failed to register RBAC cache invalidation listeners; "
+        "stale cache risk: explicit invalidate_workspace_access calls "
+        "may be required."
+    )
@@ -0,0 +1,383 @@
+"""Backfill ``chunks.workspace_id`` and, optionally, hash-partition ``chunks``.
+
+Dry run by default: every command reports what it would do and writes
+nothing until re-run with --yes.
+
+``backfill`` fills ``workspace_id`` on rows written before migration 194, in
+id-ordered batches that each commit on their own, then validates the foreign
+key. It is safe to re-run and safe while the app is writing. Every rewritten
+row adds an entry to each chunk index, HNSW included, so throttle busy
+databases with --batch/--pause. Once it reports nothing left, set
+CHUNKS_WORKSPACE_FILTER_ENABLED=true.
+
+``partition`` rebuilds ``chunks`` as ``PARTITION BY HASH (workspace_id)``
+with --partitions partitions, each with its own HNSW, GIN and btree indexes,
+while the app keeps running:
+
+1. create ``chunks_partitioned`` and its partitions;
+2. mirror every write on ``chunks`` into it with a trigger;
+3. copy existing rows in batches (``FOR SHARE``, so a concurrent update or
+   delete can never leave a stale copy behind);
+4. build each partition's indexes ``CONCURRENTLY`` and attach them;
+5. swap the tables in one short ``ACCESS EXCLUSIVE`` transaction.
+
+A failed run leaves ``chunks`` untouched; ``abort`` drops the half-built copy
+and the mirror trigger so ``partition`` can start over. On a partitioned
+``chunks``, later migrations that touch the table must use DDL that
+PostgreSQL supports on partitioned tables (no ``CONCURRENTLY`` on the parent).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.config import config
+from app.db import engine, quantized_vector_index
+
+NEW_TABLE = "chunks_partitioned"
+MIRROR = "chunks_mirror_to_partitioned"
+WORKSPACE_FKEY = "chunks_workspace_id_fkey"
+
+# (final name, definition). Built per partition, attached to a parent index.
+INDEXES: tuple[tuple[str, str], ...] = (
+    ("chucks_vector_index", "USING hnsw (embedding public.vector_cosine_ops)"),
+    ("chunks_search_vector_index", "USING gin (search_vector)"),
+    ("ix_chunks_content_trgm", "USING gin (content gin_trgm_ops)"),
+    ("ix_chunks_document_id", "(document_id)"),
+    ("ix_chunks_workspace_id", "(workspace_id)"),
+    ("ix_chunks_created_at", "(created_at)"),
+    # The candidate index of the configured VECTOR_SEARCH_QUANTIZATION, if any.
+    *filter(
+        None, [quantized_vector_index("chunks", config.VECTOR_SEARCH_QUANTIZATION)]
+    ),
+)
+
+
+async def _autocommit():
+    conn = await engine.connect()
+    return await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def _scalar(conn, sql: str, **params):
+    return (await conn.execute(text(sql), params)).scalar()
+
+
+async def _is_partitioned(conn, table: str) -> bool:
+    relkind = await _scalar(
+        conn, "SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)", t=table
+    )
+    return relkind == "p"
+
+
+async def _missing_workspace_ids(conn) -> int:
+    return await _scalar(conn, "SELECT count(*) FROM chunks WHERE workspace_id IS NULL")
+
+
+async def backfill(*, apply: bool, batch: int, pause: float) -> None:
+    conn = await _autocommit()
+    try:
+        missing = await _missing_workspace_ids(conn)
+        print(f"{missing} chunk(s) without a workspace_id.")
+        if not apply:
+            print("Dry run. Re-run with --yes to fill them.")
+            return
+
+        after, done = 0, 0
+        while True:
+            upper = await _scalar(
+                conn,
+                "SELECT max(id) FROM (SELECT id FROM chunks WHERE id > :after "
+                "ORDER BY id LIMIT :batch) AS b",
+                after=after,
+                batch=batch,
+            )
+            if upper is None:
+                break
+            result = await conn.execute(
+                text(
+                    "UPDATE chunks AS c SET workspace_id = d.workspace_id "
+                    "FROM documents AS d "
+                    "WHERE c.id > :after AND c.id <= :upper "
+                    "AND d.id = c.document_id "
+                    "AND c.workspace_id IS DISTINCT FROM d.workspace_id"
+                ),
+                {"after": after, "upper": upper},
+            )
+            done += result.rowcount
+            after = upper
+            print(f"  through id {upper}: {done} row(s) filled")
+            if pause:
+                await asyncio.sleep(pause)
+
+        validated = await _scalar(
+            conn,
+            "SELECT convalidated FROM pg_constraint WHERE conname = :name",
+            name=WORKSPACE_FKEY,
+        )
+        if validated is False:
+            # SHARE UPDATE EXCLUSIVE: writes keep flowing while it scans.
+            await conn.execute(
+                text(f"ALTER TABLE chunks VALIDATE CONSTRAINT {WORKSPACE_FKEY}")
+            )
+        left = await _missing_workspace_ids(conn)
+        print(f"Filled {done} row(s); {left} left without a workspace_id.")
+        if left == 0:
+            print("Set CHUNKS_WORKSPACE_FILTER_ENABLED=true to filter on it.")
+    finally:
+        await conn.close()
+
+
+async def _copy_columns(conn) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'chunks' "
+            "AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        )
+    )
+    return [row[0] for row in result]
+
+
+async def _create_table(conn, partitions: int, columns: list[str]) -> None:
+    await conn.execute(
+        text(
+            f"CREATE TABLE {NEW_TABLE} ("
+            "LIKE chunks INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE"
+            ") PARTITION BY HASH (workspace_id)"
+        )
+    )
+    await conn.execute(
+        text(f"ALTER TABLE {NEW_TABLE} ALTER COLUMN workspace_id SET NOT NULL")
+    )
+    await conn.execute(
+        text(f"ALTER TABLE {NEW_TABLE} ADD PRIMARY KEY (id, workspace_id)")
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {NEW_TABLE} ADD FOREIGN KEY (document_id) "
+            "REFERENCES documents(id) ON DELETE CASCADE"
+        )
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {NEW_TABLE} ADD FOREIGN KEY (workspace_id) "
+            "REFERENCES workspaces(id) ON DELETE CASCADE"
+        )
+    )
+    for remainder in range(partitions):
+        await conn.execute(
+            text(
+                f"CREATE TABLE {_partition(remainder)} PARTITION OF {NEW_TABLE} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        )
+
+    names = ", ".join(f'"{c}"' for c in columns)
+    values = ", ".join(f'NEW."{c}"' for c in columns)
+    await conn.execute(
+        text(
+            f"""
+            CREATE FUNCTION {MIRROR}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP <> 'INSERT' THEN
+                    DELETE FROM {NEW_TABLE} WHERE id = OLD.id;
+                END IF;
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO {NEW_TABLE} ({names}) VALUES ({values})
+                    ON CONFLICT DO NOTHING;
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    await conn.execute(
+        text(
+            f"CREATE TRIGGER {MIRROR} AFTER INSERT OR UPDATE OR DELETE ON chunks "
+            f"FOR EACH ROW EXECUTE FUNCTION {MIRROR}()"
+        )
+    )
+
+
+def _partition(remainder: int) -> str:
+    return f"chunks_p{remainder:03d}"
+
+
+async def _copy_rows(conn, columns: list[str], batch: int, pause: float) -> None:
+    names = ", ".join(f'"{c}"' for c in columns)
+    after, copied = 0, 0
+    while True:
+        upper = await _scalar(
+            conn,
+            "SELECT max(id) FROM (SELECT id FROM chunks WHERE id > :after "
+            "ORDER BY id LIMIT :batch) AS b",
+            after=after,
+            batch=batch,
+        )
+        if upper is None:
+            return
+        # FOR SHARE waits out (and re-reads after) a concurrent update or
+        # delete, whose mirror trigger then supersedes this copy.
+        result = await conn.execute(
+            text(
+                f"INSERT INTO {NEW_TABLE} ({names}) "
+                f"SELECT {names} FROM chunks WHERE id > :after AND id <= :upper "
+                "FOR SHARE ON CONFLICT DO NOTHING"
+            ),
+            {"after": after, "upper": upper},
+        )
+        copied += result.rowcount
+        after = upper
+        print(f"  through id {upper}: {copied} row(s) copied")
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def _build_indexes(conn, partitions: int) -> None:
+    lock_timeout_ms = int(config.DB_DDL_LOCK_TIMEOUT_MS)
+    await conn.execute(text(f"SET lock_timeout = {lock_timeout_ms}"))
+    for name, definition in INDEXES:
+        parent = f"{NEW_TABLE}_{name}"
+        await conn.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS {parent} ON ONLY {NEW_TABLE} {definition}"
+            )
+        )
+        for remainder in range(partitions):
+            child = f"{_partition(remainder)}_{name}"
+            started = time.perf_counter()
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} "
+                    f"ON {_partition(remainder)} {definition}"
+                )
+            )
+            await conn.execute(text(f"ALTER INDEX {parent} ATTACH PARTITION {child}"))
+            print(f"  {child} in {time.perf_counter() - started:.1f}s")
+
+
+async def _swap() -> None:
+    lock_timeout_ms = int(config.DB_DDL_LOCK_TIMEOUT_MS)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL lock_timeout = {lock_timeout_ms}"))
+        await conn.execute(text("LOCK TABLE chunks IN ACCESS EXCLUSIVE MODE"))
+        sequence = await _scalar(conn, "SELECT pg_get_serial_sequence('chunks', 'id')")
+        if sequence:
+            # Otherwise dropping the old table would take the id sequence along.
+            await conn.execute(
+                text(f"ALTER SEQUENCE {sequence} OWNED BY {NEW_TABLE}.id")
+            )
+        await conn.execute(text("DROP TABLE chunks"))
+        await conn.execute(text(f"DROP FUNCTION {MIRROR}()"))
+        await conn.execute(text(f"ALTER TABLE {NEW_TABLE} RENAME TO chunks"))
+        await conn.execute(text(f"ALTER INDEX {NEW_TABLE}_pkey RENAME TO chunks_pkey"))
+        for name, _ in INDEXES:
+            await conn.execute(text(f"ALTER INDEX {NEW_TABLE}_{name} RENAME TO {name}"))
+        for column in ("document_id", "workspace_id"):
+            await conn.execute(
+                text(
+                    f"ALTER TABLE chunks RENAME CONSTRAINT "
+                    f"{NEW_TABLE}_{column}_fkey TO chunks_{column}_fkey"
+                )
+            )
+        # No BEFORE INSERT trigger here: rows are routed to a partition before
+        # it would run, so workspace_id must arrive with the INSERT (the ORM
+        # flush hook in app.db sets it).
+
+
+async def partition(*, apply: bool, partitions: int, batch: int, pause: float) -> None:
+    conn = await _autocommit()
+    try:
+        if await _is_partitioned(conn, "chunks"):
+            print("chunks is already partitioned; nothing to do.")
+            return
+        if await _scalar(conn, "SELECT to_regclass(:t)", t=NEW_TABLE):
+            raise SystemExit(
+                f"{NEW_TABLE} exists from an earlier run; run `abort --yes` first."
+            )
+        missing = await _missing_workspace_ids(conn)
+        if missing:
+            raise SystemExit(
+                f"{missing} chunk(s) have no workspace_id; run `backfill --yes` first."
+            )
+        rows = await _scalar(conn, "SELECT count(*) FROM chunks")
+        print(f"{rows} chunk(s) would move into {partitions} hash partitions.")
+        if not apply:
+            print("Dry run. Re-run with --yes to partition.")
+            return
+
+        columns = await _copy_columns(conn)
+        print(f"Creating {NEW_TABLE} and mirroring writes into it...")
+        await _create_table(conn, partitions, columns)
+        print("Copying rows...")
+        await _copy_rows(conn, columns, batch, pause)
+        print("Building per-partition indexes...")
+        await _build_indexes(conn, partitions)
+        await conn.execute(text(f"ANALYZE {NEW_TABLE}"))
+    finally:
+        await conn.close()
+
+    print("Swapping tables...")
+    await _swap()
+    print(f"chunks is now hash-partitioned by workspace_id ({partitions} partitions).")
+
+
+async def abort(*, apply: bool) -> None:
+    conn = await _autocommit()
+    try:
+        exists = await _scalar(conn, "SELECT to_regclass(:t)", t=NEW_TABLE)
+        print(f"{NEW_TABLE}: {'present' if exists else 'absent'}.")
+        if not apply:
+            print("Dry run. Re-run with --yes to drop it and the mirror trigger.")
+            return
+        await conn.execute(text(f"DROP TRIGGER IF EXISTS {MIRROR} ON chunks"))
+        await conn.execute(text(f"DROP FUNCTION IF EXISTS {MIRROR}()"))
+        await conn.execute(text(f"DROP TABLE IF EXISTS {NEW_TABLE} CASCADE"))
+        print("Dropped.")
+    finally:
+        await conn.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Actually write. Without this flag every command is a dry run.",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=5000, help="Rows per backfill/copy batch."
+    )
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="Seconds to sleep between batches."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("backfill", help="Fill chunks.workspace_id on old rows.")
+    split = commands.add_parser("partition", help="Hash-partition chunks online.")
+    split.add_argument("--partitions", type=int, default=16)
+    commands.add_parser("abort", help="Drop a half-built partitioned copy.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "backfill":
+            await backfill(apply=args.yes, batch=args.batch, pause=args.pause)
+        elif args.command == "partition":
+            await partition(
+                apply=args.yes,
+                partitions=args.partitions,
+                batch=args.batch,
+                pause=args.pause,
+            )
+        else:
+            await abort(apply=args.yes)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
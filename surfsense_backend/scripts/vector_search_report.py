@@ -0,0 +1,216 @@
+"""Compare recall and latency of quantized vector search against exact search.
+
+Samples stored embeddings as queries and, for each VECTOR_SEARCH_QUANTIZATION
+mode, runs the same nearest-neighbour leg the retrievers use. Recall@k is
+measured against an exact sequential scan; latency is the wall time of the
+query, index scan and re-scoring included. Run it before switching a
+deployment's mode, and again with a few --rescore-factor values: ``binary``
+usually needs a larger factor than ``halfvec`` to keep recall.
+
+Read-only unless --build-indexes --yes, which builds the missing quantized
+HNSW indexes ``CONCURRENTLY`` (a mode without its index measures a
+sequential scan, reported as such).
+
+    python scripts/vector_search_report.py --table chunks --queries 50 --top-k 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, select, text
+
+from app.config import config
+from app.db import Chunk, Document, async_session_maker, engine, quantized_vector_index
+from app.retriever.scoping import enable_iterative_scan, scope_chunks
+from app.retriever.vector_ranking import QUANTIZATION_MODES, nearest
+
+# Full-precision HNSW index per table, as named in app.db._INDEX_DEFINITIONS.
+EXACT_INDEXES = {"chunks": "chucks_vector_index", "documents": "document_vector_index"}
+MODELS = {"chunks": Chunk, "documents": Document}
+
+
+def _index_name(table: str, mode: str) -> str:
+    if mode == "off":
+        return EXACT_INDEXES[table]
+    return quantized_vector_index(table, mode)[0]
+
+
+def _candidates(table: str, workspace_id: int | None):
+    if table == "chunks":
+        stmt = select(Chunk.id)
+        return stmt if workspace_id is None else scope_chunks(stmt, workspace_id)
+    stmt = select(Document.id)
+    if workspace_id is not None:
+        stmt = stmt.where(Document.workspace_id == workspace_id)
+    return stmt
+
+
+async def _index_size(session, name: str) -> int | None:
+    return await session.scalar(
+        text("SELECT pg_relation_size(to_regclass(:n))"), {"n": name}
+    )
+
+
+async def _build_indexes(table: str, modes: list[str], *, apply: bool) -> None:
+    async with engine.connect() as base_conn:
+        conn = await base_conn.execution_options(isolation_level="AUTOCOMMIT")
+        for mode in modes:
+            index = quantized_vector_index(table, mode)
+            if index is None:
+                continue
+            name, definition = index
+            exists = await conn.scalar(text("SELECT to_regclass(:n)"), {"n": name})
+            if exists:
+                continue
+            if not apply:
+                print(f"Would build {name}. Re-run with --yes to build it.")
+                continue
+            print(f"Building {name}...")
+            started = time.perf_counter()
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {table} {definition}"
+                )
+            )
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+
+
+async def _sample_queries(
+    table: str, count: int, workspace_id: int | None
+) -> list[list[float]]:
+    model = MODELS[table]
+    stmt = select(model.embedding).where(model.embedding.is_not(None))
+    if workspace_id is not None:
+        stmt = stmt.where(model.workspace_id == workspace_id)
+    async with async_session_maker() as session:
+        rows = await session.scalars(stmt.order_by(func.random()).limit(count))
+        return [[float(value) for value in embedding] for embedding in rows]
+
+
+async def _search(
+    table: str,
+    query: list[float],
+    top_k: int,
+    workspace_id: int | None,
+    mode: str,
+    *,
+    exact: bool = False,
+) -> tuple[list[int], float]:
+    stmt = nearest(
+        _candidates(table, workspace_id),
+        MODELS[table].embedding,
+        query,
+        top_k,
+        quantization=mode,
+    )
+    async with async_session_maker() as session, session.begin():
+        if exact:
+            # Ground truth: a sequential scan sees every row.
+            await session.execute(text("SET LOCAL enable_indexscan = off"))
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        else:
+            await enable_iterative_scan(session)
+        started = time.perf_counter()
+        ids = list(await session.scalars(stmt))
+        return ids, (time.perf_counter() - started) * 1000
+
+
+def _percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+async def report(
+    *,
+    table: str,
+    modes: list[str],
+    queries: int,
+    top_k: int,
+    workspace_id: int | None,
+) -> None:
+    samples = await _sample_queries(table, queries, workspace_id)
+    if not samples:
+        print(f"No embedded {table} to sample queries from.")
+        return
+    truths = [
+        set((await _search(table, q, top_k, workspace_id, "off", exact=True))[0])
+        for q in samples
+    ]
+
+    print(
+        f"{len(samples)} queries, top_k={top_k}, "
+        f"rescore factor {config.VECTOR_SEARCH_RESCORE_FACTOR}"
+    )
+    print(f"{'mode':<8} {'index':>10} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}")
+    for mode in modes:
+        async with async_session_maker() as session:
+            size = await _index_size(session, _index_name(table, mode))
+        latencies, recalls = [], []
+        for query, truth in zip(samples, truths, strict=True):
+            ids, elapsed_ms = await _search(table, query, top_k, workspace_id, mode)
+            latencies.append(elapsed_ms)
+            recalls.append(len(truth.intersection(ids)) / max(1, len(truth)))
+        index = f"{size / 2**20:.1f} MiB" if size is not None else "missing"
+        print(
+            f"{mode:<8} {index:>10} {_percentile(latencies, 50):>8.1f} "
+            f"{_percentile(latencies, 95):>8.1f} {statistics.fmean(recalls):>7.3f}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--table", choices=sorted(MODELS), default="chunks")
+    parser.add_argument(
+        "--modes",
+        default=",".join(QUANTIZATION_MODES),
+        help="Comma-separated modes to compare.",
+    )
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--workspace", type=int, help="Only search this workspace.")
+    parser.add_argument(
+        "--rescore-factor",
+        type=int,
+        help="Override VECTOR_SEARCH_RESCORE_FACTOR for this run.",
+    )
+    parser.add_argument(
+        "--build-indexes",
+        action="store_true",
+        help="Build missing quantized indexes for --modes first (needs --yes).",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Actually build indexes. Without this flag --build-indexes is a dry run.",
+    )
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(QUANTIZATION_MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+    if args.rescore_factor is not None:
+        config.VECTOR_SEARCH_RESCORE_FACTOR = max(1, args.rescore_factor)
+
+    try:
+        if args.build_indexes:
+            await _build_indexes(args.table, modes, apply=args.yes)
+        await report(
+            table=args.table,
+            modes=modes,
+            queries=args.queries,
+            top_k=args.top_k,
+            workspace_id=args.workspace,
+        )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
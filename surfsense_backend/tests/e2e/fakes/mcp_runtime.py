@@ -93,6 +93,9 @@ class _FakeClientSession(_StrictFakeMixin):
     async def initialize(self) -> None:
         return None
 
+    async def send_ping(self) -> None:
+        return None
+
     async def list_tools(self) -> SimpleNamespace:
         result = self.handler.list_tools()
         if inspect.isawaitable(result):
@@ -0,0 +1,219 @@
+"""Benchmark: projected fused-chunk rows vs hydrating ``Chunk`` + ``Document``.
+
+``_fused_chunks`` used to select whole ``Chunk`` rows with
+``joinedload(Chunk.document)``, which ships every candidate's document
+``content``, ``source_markdown`` and both embeddings just so grouping could
+read an id, title, type and metadata. This seeds a workspace with realistic
+document bodies and compares, for a ``top_k=20`` search over a 5x candidate
+pool:
+
+* bytes — ``pg_column_size`` of the row each shape puts on the wire, summed
+  over the same fused candidates (documents repeat once per chunk, exactly as
+  a joined eager load returns them);
+* latency — median wall time of each query shape over a few runs.
+
+The numbers are printed (run with ``-s``); the assertions only pin the
+direction so the test stays stable on any hardware.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import time
+import uuid
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import joinedload
+
+from app.agents.chat.multi_agent_chat.shared.retrieval.hybrid_search import (
+    _CANDIDATE_MULTIPLIER,
+    _RRF_K,
+    _fused_chunks,
+)
+from app.config import config
+from app.db import Chunk, Document, DocumentType
+
+pytestmark = pytest.mark.integration
+
+_DIM = config.embedding_model_instance.dimension
+_TOP_K = 20
+_DOCUMENTS = 120
+_CHUNKS_PER_DOCUMENT = 6
+_DOCUMENT_BODY_CHARS = 16_000
+_RUNS = 7
+_VOCABULARY = [
+    f"{stem}{suffix}"
+    for stem in ("budget", "hiring", "roadmap", "launch", "review", "forecast")
+    for suffix in ("", "s", "ed", "ing", "er", "al", "ly")
+] + [uuid.UUID(int=n).hex[-6:] for n in range(400)]
+
+_PROJECTED_ROW_BYTES = """
+    SELECT coalesce(sum(pg_column_size(ROW(
+        c.id, c.content, c.position,
+        d.id, d.title, d.document_type, d.document_metadata
+    ))), 0)
+    FROM chunks c JOIN documents d ON d.id = c.document_id
+    WHERE c.id = ANY(:ids)
+"""
+
+# Everything the ORM loads for both entities; ``search_vector`` is deferred
+# and never part of an entity load.
+_HYDRATED_ROW_BYTES = """
+    SELECT coalesce(sum(
+        pg_column_size(c.*) - coalesce(pg_column_size(c.search_vector), 0)
+        + pg_column_size(d.*) - coalesce(pg_column_size(d.search_vector), 0)
+    ), 0)
+    FROM chunks c JOIN documents d ON d.id = c.document_id
+    WHERE c.id = ANY(:ids)
+"""
+
+
+def _vector(rng: random.Random) -> list[float]:
+    return [rng.uniform(-1.0, 1.0) for _ in range(_DIM)]
+
+
+async def _seed(db_session, workspace_id: int) -> None:
+    rng = random.Random(7)
+    for index in range(_DOCUMENTS):
+        # Random words, so TOAST compression can't shrink the body to nothing.
+        body = " ".join(
+            rng.choice(_VOCABULARY) for _ in range(_DOCUMENT_BODY_CHARS // 6)
+        )
+        document = Document(
+            title=f"Planning doc {index}",
+            document_type=DocumentType.FILE,
+            document_metadata={"source": "benchmark", "index": index},
+            content=body,
+            source_markdown=body,
+            content_hash=uuid.uuid4().hex,
+            workspace_id=workspace_id,
+            embedding=_vector(rng),
+            status={"state": "ready"},
+        )
+        db_session.add(document)
+        await db_session.flush()
+        db_session.add_all(
+            Chunk(
+                content=f"Section {position} of the quarterly budget plan.",
+                document_id=document.id,
+                position=position,
+                embedding=_vector(rng),
+            )
+            for position in range(_CHUNKS_PER_DOCUMENT)
+        )
+    await db_session.flush()
+
+
+async def _hydrated_fused_chunks(
+    db_session,
+    *,
+    query,
+    query_embedding,
+    workspace_id,
+    document_conditions,
+    candidate_pool,
+):
+    """The pre-projection query shape: whole ORM rows plus the joined document."""
+    conditions = [
+        Document.workspace_id == workspace_id,
+        func.coalesce(Document.status["state"].astext, "ready") != "deleting",
+        *document_conditions,
+    ]
+    tsquery = func.plainto_tsquery("english", query)
+    semantic = (
+        select(
+            Chunk.id,
+            func.rank()
+            .over(order_by=Chunk.embedding.op("<=>")(query_embedding))
+            .label("rank"),
+        )
+        .join(Document, Chunk.document_id == Document.id)
+        .where(*conditions)
+        .order_by(Chunk.embedding.op("<=>")(query_embedding))
+        .limit(candidate_pool)
+        .cte("semantic_search")
+    )
+    keyword = (
+        select(
+            Chunk.id,
+            func.rank()
+            .over(order_by=func.ts_rank_cd(Chunk.search_vector, tsquery).desc())
+            .label("rank"),
+        )
+        .join(Document, Chunk.document_id == Document.id)
+        .where(*conditions)
+        .where(Chunk.search_vector.op("@@")(tsquery))
+        .order_by(func.ts_rank_cd(Chunk.search_vector, tsquery).desc())
+        .limit(candidate_pool)
+        .cte("keyword_search")
+    )
+    fused = (
+        select(
+            Chunk,
+            (
+                func.coalesce(1.0 / (_RRF_K + semantic.c.rank), 0.0)
+                + func.coalesce(1.0 / (_RRF_K + keyword.c.rank), 0.0)
+            ).label("score"),
+        )
+        .select_from(
+            semantic.outerjoin(keyword, semantic.c.id == keyword.c.id, full=True)
+        )
+        .join(Chunk, Chunk.id == func.coalesce(semantic.c.id, keyword.c.id))
+        .options(joinedload(Chunk.document))
+        .order_by(text("score DESC"))
+        .limit(candidate_pool)
+    )
+    return (await db_session.execute(fused)).all()
+
+
+async def _median_ms(db_session, search, **kwargs) -> tuple[float, list]:
+    timings: list[float] = []
+    rows: list = []
+    for _ in range(_RUNS):
+        # Hydrated rows would otherwise be served from the identity map.
+        db_session.expunge_all()
+        started = time.perf_counter()
+        rows = await search(db_session, **kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), rows
+
+
+async def _row_bytes(db_session, statement: str, chunk_ids: list[int]) -> int:
+    result = await db_session.execute(text(statement), {"ids": chunk_ids})
+    return int(result.scalar_one())
+
+
+async def test_projected_fused_rows_transfer_less_than_hydrated_rows(
+    db_session, db_workspace
+):
+    await _seed(db_session, db_workspace.id)
+    kwargs = {
+        "query": "quarterly budget plan",
+        "query_embedding": _vector(random.Random(11)),
+        "workspace_id": db_workspace.id,
+        "document_conditions": [],
+        "candidate_pool": _TOP_K * _CANDIDATE_MULTIPLIER,
+    }
+
+    hydrated_ms, hydrated_rows = await _median_ms(
+        db_session, _hydrated_fused_chunks, **kwargs
+    )
+    projected_ms, projected_rows = await _median_ms(db_session, _fused_chunks, **kwargs)
+
+    chunk_ids = [row.chunk_id for row in projected_rows]
+    assert sorted(chunk_ids) == sorted(chunk.id for chunk, _ in hydrated_rows)
+
+    hydrated_bytes = await _row_bytes(db_session, _HYDRATED_ROW_BYTES, chunk_ids)
+    projected_bytes = await _row_bytes(db_session, _PROJECTED_ROW_BYTES, chunk_ids)
+
+    print(
+        f"\n[fused chunks] top_k={_TOP_K} pool={kwargs['candidate_pool']} "
+        f"rows={len(chunk_ids)}\n"
+        f"  hydrated : {hydrated_bytes:>12,} B  {hydrated_ms:8.2f} ms\n"
+        f"  projected: {projected_bytes:>12,} B  {projected_ms:8.2f} ms\n"
+        f"  bytes saved: {1 - projected_bytes / hydrated_bytes:.1%}"
+    )
+
+    assert projected_bytes * 10 < hydrated_bytes
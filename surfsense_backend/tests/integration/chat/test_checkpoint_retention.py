@@ -0,0 +1,155 @@
+"""Checkpoint retention against the real checkpointer tables.
+
+Checkpoints are written by a real ``AsyncPostgresSaver`` (autocommit, so the
+rows are visible to ``db_session``); pruning runs inside the test transaction
+and is rolled back with it, and the saver's rows are deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg import AsyncConnection
+from psycopg.rows import dict_row
+from sqlalchemy import text
+
+from app.agents.chat.runtime import checkpoint_retention
+from tests.conftest import TEST_DATABASE_URL
+
+pytestmark = pytest.mark.integration
+
+
+@pytest_asyncio.fixture
+async def saver():
+    """Request before ``db_session``: its teardown deletes rows the test
+    transaction may still lock, so that transaction must roll back first."""
+    conn = await AsyncConnection.connect(
+        TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"),
+        autocommit=True,
+        prepare_threshold=0,
+        row_factory=dict_row,
+    )
+    saver = AsyncPostgresSaver(conn=conn)
+    await saver.setup()
+    yield saver
+    async with conn.cursor() as cur:
+        for table in checkpoint_retention.CHECKPOINT_TABLES:
+            await cur.execute(f"DELETE FROM {table} WHERE thread_id LIKE 'retention-%'")
+    await conn.close()
+
+
+async def _write_turns(saver, *, turns: int, steps: int) -> tuple[str, list[str]]:
+    """``turns`` turns of ``steps`` checkpoints; ``messages`` changes every
+    step, ``files`` never does."""
+    thread_id = f"retention-{uuid.uuid4()}"
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    ids: list[str] = []
+    for step in range(turns * steps):
+        checkpoint = empty_checkpoint()
+        version = f"{step + 1:032}.0"
+        checkpoint["channel_values"] = {
+            "messages": [f"message {step}"],
+            "files": ["a.md"],
+        }
+        checkpoint["channel_versions"] = {"messages": version, "files": f"{1:032}.0"}
+        new_versions = {"messages": version}
+        if step == 0:
+            new_versions["files"] = f"{1:032}.0"
+        config = await saver.aput(
+            config,
+            checkpoint,
+            {"source": "loop", "step": step, "turn_id": f"turn-{step // steps}"},
+            new_versions,
+        )
+        ids.append(checkpoint["id"])
+    return thread_id, ids
+
+
+async def _interrupt(saver, thread_id: str, checkpoint_id: str, *, resumed: bool):
+    config = {
+        "configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": "",
+            "checkpoint_id": checkpoint_id,
+        }
+    }
+    writes = [("__interrupt__", [{"value": {"type": "approval"}}])]
+    if resumed:
+        writes.append(("__resume__", {"decision": "approve"}))
+    await saver.aput_writes(config, writes, task_id=str(uuid.uuid4()))
+
+
+async def _surviving(db_session, thread_id: str) -> list[str]:
+    rows = await db_session.execute(
+        text(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = :t "
+            "ORDER BY checkpoint_id"
+        ),
+        {"t": thread_id},
+    )
+    return [row[0] for row in rows]
+
+
+async def _blob_versions(db_session, thread_id: str, channel: str) -> set[str]:
+    rows = await db_session.execute(
+        text(
+            "SELECT version FROM checkpoint_blobs WHERE thread_id = :t AND channel = :c"
+        ),
+        {"t": thread_id, "c": channel},
+    )
+    return {row[0] for row in rows}
+
+
+async def test_keeps_latest_and_each_turns_last_checkpoint(saver, db_session):
+    thread_id, ids = await _write_turns(saver, turns=3, steps=3)
+
+    result = await checkpoint_retention.prune_checkpoints(
+        db_session, [thread_id], keep_latest=2
+    )
+
+    # Newest two (both turn-2), plus the last of turn-0 and turn-1.
+    assert await _surviving(db_session, thread_id) == [ids[2], ids[5], ids[7], ids[8]]
+    assert result.checkpoints == 5
+    assert result.blobs == 5
+    assert result.blob_bytes > 0
+    assert await _blob_versions(db_session, thread_id, "messages") == {
+        f"{step + 1:032}.0" for step in (2, 5, 7, 8)
+    }
+    # Shared by every checkpoint, so it outlives the pruned ones.
+    assert await _blob_versions(db_session, thread_id, "files") == {f"{1:032}.0"}
+
+
+async def test_a_pending_interrupt_pins_its_checkpoint(saver, db_session):
+    thread_id, ids = await _write_turns(saver, turns=1, steps=5)
+    await _interrupt(saver, thread_id, ids[0], resumed=False)
+    await _interrupt(saver, thread_id, ids[1], resumed=True)
+
+    result = await checkpoint_retention.prune_checkpoints(
+        db_session, [thread_id], keep_latest=2
+    )
+
+    assert await _surviving(db_session, thread_id) == [ids[0], ids[3], ids[4]]
+    assert result.writes == 2
+    remaining_writes = await db_session.scalar(
+        text("SELECT count(*) FROM checkpoint_writes WHERE thread_id = :t"),
+        {"t": thread_id},
+    )
+    assert remaining_writes == 1
+
+
+async def test_candidates_skip_threads_within_the_limit(saver, db_session):
+    short, _ = await _write_turns(saver, turns=1, steps=2)
+    long, _ = await _write_turns(saver, turns=1, steps=4)
+
+    candidates = await checkpoint_retention.candidate_threads(
+        db_session, keep_latest=2, after="retention-", limit=1000
+    )
+
+    assert long in candidates
+    assert short not in candidates
+    sizes = await checkpoint_retention.table_sizes(db_session)
+    assert set(sizes) == set(checkpoint_retention.CHECKPOINT_TABLES)
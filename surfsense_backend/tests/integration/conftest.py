@@ -179,7 +179,9 @@ def _derivation_caches_disabled(monkeypatch):
     tests opt back in explicitly via ``monkeypatch.setattr``.
     """
     monkeypatch.setattr(app_config, "ETL_CACHE_ENABLED", False)
+    monkeypatch.setattr(app_config, "ETL_IMAGE_CACHE_ENABLED", False)
     monkeypatch.setattr(app_config, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(app_config, "EMBEDDING_VECTOR_CACHE_ENABLED", False)
 
 
 @pytest.fixture
@@ -70,6 +70,7 @@ class InlineTaskDispatcher:
         user_id: str,
         use_vision_llm: bool = False,
         processing_mode: str = "basic",
+        source_sha256: str | None = None,
     ) -> None:
         from app.tasks.celery_tasks.document_tasks import (
             _process_file_with_document,
@@ -84,6 +85,7 @@ class InlineTaskDispatcher:
                 user_id,
                 use_vision_llm=use_vision_llm,
                 processing_mode=processing_mode,
+                source_sha256=source_sha256,
             )
 
 
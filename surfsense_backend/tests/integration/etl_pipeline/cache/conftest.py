@@ -3,7 +3,8 @@
 ``cache_local_storage`` points the cache's blob store at a throwaway directory so
 tests exercise the real ``LocalFileBackend`` (no cloud, no mocks). ``clean_cache_table``
 removes rows written through the facade's own committing session, which the
-savepoint-rolled-back ``db_session`` cannot undo.
+savepoint-rolled-back ``db_session`` cannot undo; ``clean_image_cache_table`` does
+the same for the picture-description tier.
 """
 
 from __future__ import annotations
@@ -30,3 +31,10 @@ async def clean_cache_table(async_engine):
     yield
     async with async_engine.begin() as conn:
         await conn.execute(text("DELETE FROM etl_cache_parses"))
+
+
+@pytest_asyncio.fixture
+async def clean_image_cache_table(async_engine):
+    yield
+    async with async_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM etl_cache_image_descriptions"))
@@ -0,0 +1,121 @@
+"""The picture-description tier against real Postgres.
+
+``ImageDescriptionCacheService`` scopes entries to the vision model and prompt
+version, and only hands OCR back when the current ETL service produced it; a
+later write carrying OCR fills it in without replacing the description.
+Recording a hit is throttled and best-effort.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.etl_pipeline.cache.persistence import (
+    CachedImageDescription,
+    CachedImageDescriptionRepository,
+)
+from app.etl_pipeline.cache.service import ImageDescriptionCacheService
+from app.etl_pipeline.picture_describer import CachedPicture
+
+pytestmark = pytest.mark.integration
+
+_LOGO = "a" * 64
+
+
+def _service(
+    db_session,
+    *,
+    vision_model: str = "openai/gpt-4o",
+    prompt_version: int = 1,
+    ocr_service: str | None = "DOCLING",
+) -> ImageDescriptionCacheService:
+    return ImageDescriptionCacheService(
+        db_session,
+        vision_model=vision_model,
+        prompt_version=prompt_version,
+        ocr_service=ocr_service,
+    )
+
+
+async def test_remembered_description_recalls_with_its_ocr(db_session):
+    picture = CachedPicture(description="A blue logo.", ocr_text="ACME", ocr_done=True)
+
+    await _service(db_session).remember_many({_LOGO: picture})
+    recalled = await _service(db_session).recall_many([_LOGO, "b" * 64])
+
+    assert recalled == {_LOGO: picture}
+
+
+async def test_recall_is_scoped_to_the_model_and_prompt_version(db_session):
+    await _service(db_session).remember_many(
+        {_LOGO: CachedPicture(description="A blue logo.")}
+    )
+
+    other_model = _service(db_session, vision_model="anthropic/claude")
+    new_prompt = _service(db_session, prompt_version=2)
+
+    assert await other_model.recall_many([_LOGO]) == {}
+    assert await new_prompt.recall_many([_LOGO]) == {}
+
+
+async def test_ocr_from_another_service_is_a_partial_hit(db_session):
+    await _service(db_session, ocr_service="LLAMACLOUD").remember_many(
+        {
+            _LOGO: CachedPicture(
+                description="A blue logo.", ocr_text="ACME", ocr_done=True
+            )
+        }
+    )
+
+    recalled = await _service(db_session).recall_many([_LOGO])
+
+    assert recalled == {_LOGO: CachedPicture(description="A blue logo.")}
+
+
+async def test_later_ocr_fills_in_without_replacing_the_description(db_session):
+    service = _service(db_session)
+    await service.remember_many({_LOGO: CachedPicture(description="First.")})
+
+    await service.remember_many(
+        {_LOGO: CachedPicture(description="Second.", ocr_text="ACME", ocr_done=True)}
+    )
+    await service.remember_many({_LOGO: CachedPicture(description="Third.")})
+
+    assert await service.recall_many([_LOGO]) == {
+        _LOGO: CachedPicture(description="First.", ocr_text="ACME", ocr_done=True)
+    }
+
+
+async def test_recall_touches_a_row_at_most_once_an_hour(db_session):
+    service = _service(db_session)
+    await service.remember_many({_LOGO: CachedPicture(description="A blue logo.")})
+    await db_session.execute(
+        update(CachedImageDescription)
+        .where(CachedImageDescription.image_sha256 == _LOGO)
+        .values(last_used_at=datetime.now(UTC) - timedelta(hours=2))
+    )
+
+    await service.recall_many([_LOGO])
+    await service.recall_many([_LOGO])
+
+    times_reused = await db_session.scalar(
+        select(CachedImageDescription.times_reused)
+        .where(CachedImageDescription.image_sha256 == _LOGO)
+        .execution_options(populate_existing=True)
+    )
+    assert times_reused == 1
+
+
+async def test_a_failed_touch_still_serves_the_descriptions(db_session, monkeypatch):
+    picture = CachedPicture(description="A blue logo.")
+    await _service(db_session).remember_many({_LOGO: picture})
+
+    async def _fail(self, row_ids):
+        raise RuntimeError("lock timeout")
+
+    monkeypatch.setattr(CachedImageDescriptionRepository, "mark_used", _fail)
+
+    assert await _service(db_session).recall_many([_LOGO]) == {_LOGO: picture}
@@ -0,0 +1,99 @@
+"""Integration tests: ``ConnectorService.search_connectors`` batches per-connector searches.
+
+One batched call must return, for every requested connector, exactly what
+that connector's own ``search_<connector>`` method returns — legacy Composio
+alias expansion included.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.routes import documents_routes
+from app.services.connector_service import ConnectorService
+
+pytestmark = pytest.mark.integration
+
+
+def _doc_ids(raw_docs: list[dict]) -> set[int]:
+    # Sets: the seeded documents tie on the patched embedding, so their
+    # relative order is not meaningful.
+    return {doc["document_id"] for doc in raw_docs}
+
+
+async def test_search_connectors_matches_individual_searches(
+    async_engine, committed_google_data, patched_session_factory, patched_embed
+):
+    space_id = committed_google_data["workspace_id"]
+    kwargs = {"user_query": "quarterly budget", "workspace_id": space_id, "top_k": 10}
+
+    async with patched_session_factory() as session:
+        service = ConnectorService(session, workspace_id=space_id)
+        batched = await service.search_connectors(
+            document_types=["GOOGLE_DRIVE_FILE", "FILE", "SLACK_CONNECTOR"], **kwargs
+        )
+        drive = await service.search_google_drive(**kwargs)
+        files = await service.search_files(**kwargs)
+        slack = await service.search_slack(**kwargs)
+
+    assert set(batched) == {"GOOGLE_DRIVE_FILE", "FILE", "SLACK_CONNECTOR"}
+    assert _doc_ids(batched["GOOGLE_DRIVE_FILE"][1]) == _doc_ids(drive[1])
+    assert _doc_ids(batched["FILE"][1]) == _doc_ids(files[1])
+    assert batched["SLACK_CONNECTOR"] == slack
+    assert batched["GOOGLE_DRIVE_FILE"][0]["name"] == drive[0]["name"]
+
+    drive_types = {
+        doc["document"]["document_type"] for doc in batched["GOOGLE_DRIVE_FILE"][1]
+    }
+    assert drive_types == {"GOOGLE_DRIVE_FILE", "COMPOSIO_GOOGLE_DRIVE_CONNECTOR"}
+
+
+async def test_search_connectors_rejects_unknown_types(
+    async_engine, committed_google_data, patched_session_factory, patched_embed
+):
+    space_id = committed_google_data["workspace_id"]
+
+    async with patched_session_factory() as session:
+        service = ConnectorService(session, workspace_id=space_id)
+        with pytest.raises(ValueError, match="NOT_A_CONNECTOR"):
+            await service.search_connectors(
+                user_query="quarterly budget",
+                workspace_id=space_id,
+                document_types=["FILE", "NOT_A_CONNECTOR"],
+            )
+
+
+async def test_search_connectors_route_returns_each_connectors_sources(
+    async_engine,
+    committed_google_data,
+    patched_session_factory,
+    patched_embed,
+    monkeypatch,
+):
+    space_id = committed_google_data["workspace_id"]
+
+    async def _allow(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(documents_routes, "check_permission", _allow)
+    request = documents_routes.ConnectorSearchRequest(
+        workspace_id=space_id,
+        query="quarterly budget",
+        document_types=["GOOGLE_DRIVE_FILE", "FILE"],
+        top_k=10,
+    )
+
+    async with patched_session_factory() as session:
+        response = await documents_routes.search_documents_by_connector(
+            request, session=session, auth=None
+        )
+        service = ConnectorService(session, workspace_id=space_id)
+        drive, _ = await service.search_google_drive(
+            user_query="quarterly budget", workspace_id=space_id, top_k=10
+        )
+
+    assert set(response.results) == {"GOOGLE_DRIVE_FILE", "FILE"}
+    assert response.results["GOOGLE_DRIVE_FILE"]["type"] == drive["type"]
+    assert {s["id"] for s in response.results["GOOGLE_DRIVE_FILE"]["sources"]} == {
+        s["id"] for s in drive["sources"]
+    }
@@ -4,7 +4,8 @@
 so tests exercise the real ``LocalFileBackend`` (no cloud, no mocks); the
 embedding cache reuses the ETL cache backend, hence the ``ETL_CACHE_STORAGE_*``
 knobs. ``clean_embedding_cache_table`` removes rows written through the store's
-own committing session, which the savepoint-rolled-back ``db_session`` cannot undo.
+own committing session, which the savepoint-rolled-back ``db_session`` cannot undo;
+``clean_embedding_vector_table`` does the same for the per-chunk vector tier.
 """
 
 from __future__ import annotations
@@ -31,3 +32,10 @@ async def clean_embedding_cache_table(async_engine):
     yield
     async with async_engine.begin() as conn:
         await conn.execute(text("DELETE FROM embedding_cache_sets"))
+
+
+@pytest_asyncio.fixture
+async def clean_embedding_vector_table(async_engine):
+    yield
+    async with async_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM embedding_cache_vectors"))
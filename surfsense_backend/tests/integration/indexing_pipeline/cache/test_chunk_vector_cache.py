@@ -0,0 +1,143 @@
+"""The per-chunk vector tier against real Postgres: reuse below the document level.
+
+``ChunkVectorCacheService`` round-trips float32 vectors through the row itself
+and refuses rows of the wrong width. ``embed_batch`` consults it first, so a
+second document sharing some chunk texts with the first only sends the new
+texts to the model -- each distinct text once. Recording a hit is throttled
+and best-effort: it never costs the caller the vectors it recalled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select, update
+
+from app.config import config
+from app.indexing_pipeline.cache.cached_indexing import embed_batch
+from app.indexing_pipeline.cache.persistence import (
+    CachedChunkVector,
+    CachedChunkVectorRepository,
+)
+from app.indexing_pipeline.cache.service import ChunkVectorCacheService
+
+pytestmark = pytest.mark.integration
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def test_remembered_vectors_recall_unchanged(db_session):
+    service = ChunkVectorCacheService(
+        db_session, embedding_model="test-model", embedding_dim=4
+    )
+    vector = np.array([0.1, -0.2, 0.3, 0.4], dtype=np.float32)
+
+    await service.remember_many({_sha("footer"): vector})
+    recalled = await service.recall_many([_sha("footer"), _sha("unseen")])
+
+    assert list(recalled) == [_sha("footer")]
+    assert np.array_equal(recalled[_sha("footer")], vector)
+
+
+async def test_recall_is_scoped_to_the_model_and_refuses_bad_widths(db_session):
+    await CachedChunkVectorRepository(db_session).insert_many(
+        embedding_model="test-model",
+        embedding_dim=4,
+        vectors={_sha("short"): np.zeros(3, dtype="<f4").tobytes()},
+    )
+    await ChunkVectorCacheService(
+        db_session, embedding_model="test-model", embedding_dim=4
+    ).remember_many({_sha("footer"): np.ones(4, dtype=np.float32)})
+
+    other_model = ChunkVectorCacheService(
+        db_session, embedding_model="other-model", embedding_dim=4
+    )
+    same_model = ChunkVectorCacheService(
+        db_session, embedding_model="test-model", embedding_dim=4
+    )
+
+    assert await other_model.recall_many([_sha("footer")]) == {}
+    assert await same_model.recall_many([_sha("short")]) == {}
+
+
+@pytest.mark.usefixtures("clean_embedding_vector_table")
+async def test_embed_batch_only_embeds_texts_not_seen_before(
+    monkeypatch, patched_embed_texts
+):
+    monkeypatch.setattr(config, "EMBEDDING_VECTOR_CACHE_ENABLED", True)
+
+    first = await embed_batch(["intro", "shared footer", "shared footer"])
+    (embedded,) = patched_embed_texts.call_args.args
+    assert embedded == ["intro", "shared footer"]
+
+    patched_embed_texts.reset_mock()
+    second = await embed_batch(["shared footer", "new section"])
+    (embedded,) = patched_embed_texts.call_args.args
+
+    assert embedded == ["new section"]
+    assert len(first) == 3 and len(second) == 2
+    assert np.allclose(second[0], first[1])
+
+
+@pytest.mark.usefixtures("clean_embedding_vector_table")
+async def test_embed_batch_skips_the_model_when_every_text_is_cached(
+    monkeypatch, patched_embed_texts
+):
+    monkeypatch.setattr(config, "EMBEDDING_VECTOR_CACHE_ENABLED", True)
+
+    await embed_batch(["boilerplate"])
+    patched_embed_texts.reset_mock()
+    await embed_batch(["boilerplate", "boilerplate"])
+
+    patched_embed_texts.assert_not_called()
+
+
+async def _usage(db_session, text: str) -> tuple[int, datetime]:
+    row = (
+        await db_session.execute(
+            select(CachedChunkVector.times_reused, CachedChunkVector.last_used_at)
+            .where(CachedChunkVector.text_sha256 == _sha(text))
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    return row.times_reused, row.last_used_at
+
+
+async def test_recall_touches_a_row_at_most_once_an_hour(db_session):
+    service = ChunkVectorCacheService(
+        db_session, embedding_model="test-model", embedding_dim=4
+    )
+    await service.remember_many({_sha("footer"): np.ones(4, dtype=np.float32)})
+    await db_session.execute(
+        update(CachedChunkVector)
+        .where(CachedChunkVector.text_sha256 == _sha("footer"))
+        .values(last_used_at=datetime.now(UTC) - timedelta(hours=2))
+    )
+
+    await service.recall_many([_sha("footer")])
+    times_reused, touched_at = await _usage(db_session, "footer")
+    await service.recall_many([_sha("footer")])
+
+    assert times_reused == 1
+    assert await _usage(db_session, "footer") == (1, touched_at)
+
+
+async def test_a_failed_touch_still_serves_the_vectors(db_session, monkeypatch):
+    service = ChunkVectorCacheService(
+        db_session, embedding_model="test-model", embedding_dim=4
+    )
+    await service.remember_many({_sha("footer"): np.ones(4, dtype=np.float32)})
+
+    async def _fail(self, row_ids):
+        raise RuntimeError("lock timeout")
+
+    monkeypatch.setattr(CachedChunkVectorRepository, "mark_used", _fail)
+
+    recalled = await service.recall_many([_sha("footer")])
+
+    assert list(recalled) == [_sha("footer")]
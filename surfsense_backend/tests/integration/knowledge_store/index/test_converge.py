@@ -482,6 +482,30 @@ async def test_a_rebuild_prunes_a_row_whose_file_is_gone(
     assert set(await titles(db_session, db_workspace.id)) == {"b"}
 
 
+async def test_a_pipelined_rebuild_writes_every_row_and_embeds_each_once(
+    store, db_session, db_workspace, patched_embed_texts, monkeypatch
+):
+    """Later documents are read and embedded while earlier ones are written; the
+    embedding done ahead is consumed, not repeated by the pipeline."""
+    monkeypatch.setattr(app_config, "KNOWLEDGE_STORE_INDEX_CONCURRENCY", 2)
+    names = [f"note{n}" for n in range(7)]
+    await commit(store, {f"documents/{name}.xml": f"# {name}" for name in names})
+
+    outcome = await index_tree(db_session, db_workspace.id)
+
+    assert (outcome.indexed, outcome.failed, outcome.stamped) == (7, 0, True)
+    # Each document embeds its summary plus its one chunk; concurrent documents
+    # may share a call, but nothing is embedded twice.
+    embedded = [
+        text for call in patched_embed_texts.call_args_list for text in call.args[0]
+    ]
+    assert len(embedded) == 2 * len(names)
+    rows = await titles(db_session, db_workspace.id)
+    assert set(rows) == set(names)
+    for document in rows.values():
+        assert await chunk_ids(db_session, document.id)
+
+
 # ── Authorship, skips, failures ─────────────────────────────────────────────
 
 
@@ -585,3 +609,31 @@ async def test_a_failed_document_withholds_the_stamp(
     assert outcome.stamped is False
     await db_session.refresh(db_workspace)
     assert db_workspace.last_indexed_revision is None
+
+
+async def test_one_failed_document_in_a_pipelined_run_withholds_the_stamp(
+    store, db_session, db_workspace, patched_embed_texts, monkeypatch
+):
+    monkeypatch.setattr(app_config, "KNOWLEDGE_STORE_INDEX_CONCURRENCY", 2)
+    embed = patched_embed_texts.side_effect
+
+    def poisoned(texts):
+        if any("poison" in text for text in texts):
+            raise RuntimeError("Embedding unavailable")
+        return embed(texts)
+
+    patched_embed_texts.side_effect = poisoned
+    await commit(
+        store,
+        {
+            "documents/a.xml": "# A",
+            "documents/b.xml": "# poison",
+            "documents/c.xml": "# C",
+        },
+    )
+
+    outcome = await index_changes(db_session, db_workspace.id)
+
+    assert (outcome.indexed, outcome.failed, outcome.stamped) == (2, 1, False)
+    await db_session.refresh(db_workspace)
+    assert db_workspace.last_indexed_revision is None
@@ -9,6 +9,7 @@ import pytest
 import app.knowledge_store.locks as write_lock
 from app.knowledge_store.locks import (
     KnowledgeStoreLockError,
+    workspace_index_lock,
     workspace_write_lock,
 )
 
@@ -62,6 +63,20 @@ async def test_scope_error_is_not_masked_by_an_expired_hold(workspace_id, monkey
             raise RuntimeError("boom")
 
 
+async def test_index_lock_heartbeat_outlasts_its_ttl(workspace_id, monkeypatch):
+    """A rebuild may run for many TTLs; the heartbeat keeps the hold alive, so
+    releasing it at the end is not reported as a lost lock."""
+    monkeypatch.setattr(write_lock, "INDEX_LOCK_TTL_SECONDS", 0.2)
+    monkeypatch.setattr(write_lock, "INDEX_LOCK_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(write_lock, "INDEX_LOCK_WAIT_SECONDS", 0.1)
+
+    async with workspace_index_lock(workspace_id):
+        await asyncio.sleep(0.6)
+        with pytest.raises(KnowledgeStoreLockError):
+            async with workspace_index_lock(workspace_id):
+                pass
+
+
 def test_a_second_lock_on_a_new_event_loop_still_works(workspace_id):
     """Celery runs every task on its own loop, which is why the client cannot be
     cached: connections bound to a closed loop failed inside ``acquire``, after
@@ -0,0 +1,144 @@
+"""``chunks.workspace_id`` and the searches that filter on it.
+
+The column must be right however a chunk is written: through the ORM (with
+or without the document loaded) or by raw SQL. With
+``CHUNKS_WORKSPACE_FILTER_ENABLED`` on, search must return exactly what the
+documents join returned.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select, text
+
+from app.agents.chat.multi_agent_chat.shared.retrieval.hybrid_search import (
+    search_chunks,
+)
+from app.agents.chat.multi_agent_chat.shared.retrieval.models import SearchScope
+from app.config import config
+from app.db import Chunk, Document, DocumentType, Workspace
+from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
+
+pytestmark = pytest.mark.integration
+
+_DIM = config.embedding_model_instance.dimension
+
+
+def _axis(index: int) -> list[float]:
+    vector = [0.0] * _DIM
+    vector[index] = 1.0
+    return vector
+
+
+async def _document(
+    db_session,
+    workspace_id: int,
+    *,
+    title: str = "Doc",
+    document_type: DocumentType = DocumentType.FILE,
+    state: str = "ready",
+) -> Document:
+    document = Document(
+        title=title,
+        document_type=document_type,
+        content=title,
+        content_hash=uuid.uuid4().hex,
+        workspace_id=workspace_id,
+        status={"state": state},
+        chunks=[],
+    )
+    db_session.add(document)
+    await db_session.flush()
+    return document
+
+
+async def _workspace_ids(db_session, document_id: int) -> list[int | None]:
+    rows = await db_session.execute(
+        select(Chunk.workspace_id).where(Chunk.document_id == document_id)
+    )
+    return [row[0] for row in rows]
+
+
+async def test_orm_writes_carry_the_documents_workspace(db_session, db_workspace):
+    document = await _document(db_session, db_workspace.id)
+    document.chunks.append(Chunk(content="via relationship", embedding=_axis(0)))
+    db_session.add(Chunk(content="via id", document_id=document.id, embedding=_axis(1)))
+    await db_session.flush()
+
+    assert await _workspace_ids(db_session, document.id) == [db_workspace.id] * 2
+
+
+async def test_raw_inserts_are_filled_by_the_trigger(db_session, db_workspace):
+    document = await _document(db_session, db_workspace.id)
+
+    await db_session.execute(
+        text(
+            "INSERT INTO chunks (content, document_id, position, created_at) "
+            "VALUES ('raw', :document_id, 0, :now)"
+        ),
+        {"document_id": document.id, "now": datetime.now(UTC)},
+    )
+
+    assert await _workspace_ids(db_session, document.id) == [db_workspace.id]
+
+
+async def test_moving_a_document_moves_its_chunks(db_session, db_workspace):
+    other = Workspace(name="Other Space", user_id=db_workspace.user_id)
+    db_session.add(other)
+    document = await _document(db_session, db_workspace.id)
+    document.chunks.append(Chunk(content="moves along", embedding=_axis(0)))
+    await db_session.flush()
+
+    document.workspace_id = other.id
+    await db_session.flush()
+
+    assert await _workspace_ids(db_session, document.id) == [other.id]
+
+
+@pytest.fixture(params=[False, True], ids=["join", "workspace_column"])
+def workspace_filter(request, monkeypatch) -> bool:
+    monkeypatch.setattr(config, "CHUNKS_WORKSPACE_FILTER_ENABLED", request.param)
+    return request.param
+
+
+async def test_search_stays_in_scope(db_session, db_workspace, workspace_filter):
+    other = Workspace(name="Other Space", user_id=db_workspace.user_id)
+    db_session.add(other)
+    await db_session.flush()
+
+    async def seeded(workspace_id, title, **kwargs) -> Document:
+        document = await _document(db_session, workspace_id, title=title, **kwargs)
+        document.chunks.append(
+            Chunk(content=f"{title} quarterly budget", embedding=_axis(0))
+        )
+        await db_session.flush()
+        return document
+
+    mine = await seeded(db_workspace.id, "Mine")
+    crawled = await seeded(
+        db_workspace.id, "Crawled", document_type=DocumentType.CRAWLED_URL
+    )
+    await seeded(db_workspace.id, "Leaving", state="deleting")
+    await seeded(other.id, "Theirs")
+
+    hits = await search_chunks(
+        db_session,
+        workspace_id=db_workspace.id,
+        query="quarterly budget",
+        scope=SearchScope(),
+        top_k=10,
+        query_embedding=_axis(0),
+    )
+    assert {hit.document_id for hit in hits} == {mine.id, crawled.id}
+
+    typed = await ChucksHybridSearchRetriever(db_session).hybrid_search(
+        "quarterly budget",
+        10,
+        db_workspace.id,
+        document_type="CRAWLED_URL",
+        query_embedding=_axis(0),
+    )
+    assert [doc["document"]["id"] for doc in typed] == [crawled.id]
@@ -6,12 +6,13 @@ and doc metadata caching from RRF results.
 
 import pytest
 
+from app.db import DocumentType
 from app.retriever.chunks_hybrid_search import (
     _MAX_FETCH_CHUNKS_PER_DOC,
     ChucksHybridSearchRetriever,
 )
 
-from .conftest import DUMMY_EMBEDDING
+from .conftest import DUMMY_EMBEDDING, EMBEDDING_DIM, _make_chunk, _make_document
 
 pytestmark = pytest.mark.integration
 
@@ -114,3 +115,61 @@ async def test_score_is_positive_float(db_session, seed_large_doc):
     for result in results:
         assert isinstance(result["score"], float)
         assert result["score"] > 0
+
+
+def _leaning(step: int) -> list[float]:
+    # Distinct cosine distance to ``DUMMY_EMBEDDING`` per step, so RRF scores
+    # never tie and the per-source top-k is well defined.
+    return [0.1 + 0.01 * step, *([0.1] * (EMBEDDING_DIM - 1))]
+
+
+async def test_by_source_caps_each_source_like_hybrid_search(
+    db_session, db_user, db_workspace
+):
+    """A source with more than top_k matching chunks, spread over several
+    documents, must come back exactly as its own hybrid_search returns it."""
+    files = []
+    for n in range(4):
+        doc = _make_document(
+            title=f"File {n}",
+            document_type=DocumentType.FILE,
+            content=f"file {n}",
+            workspace_id=db_workspace.id,
+            created_by_id=str(db_user.id),
+        )
+        db_session.add(doc)
+        files.append(doc)
+    note = _make_document(
+        title="Note",
+        document_type=DocumentType.NOTE,
+        content="note",
+        workspace_id=db_workspace.id,
+        created_by_id=str(db_user.id),
+    )
+    db_session.add(note)
+    await db_session.flush()
+    for position in range(3):
+        for n, doc in enumerate(files):
+            chunk = _make_chunk(content=f"file {n} part {position}", document_id=doc.id)
+            chunk.embedding = _leaning(n + len(files) * position)
+            db_session.add(chunk)
+    db_session.add(_make_chunk(content="note part", document_id=note.id))
+    await db_session.flush()
+
+    retriever = ChucksHybridSearchRetriever(db_session)
+    kwargs = {
+        "query_text": "unmatched words",
+        "top_k": 2,
+        "workspace_id": db_workspace.id,
+        "query_embedding": DUMMY_EMBEDDING,
+    }
+    batched = await retriever.hybrid_search_by_source(
+        sources={"FILE": "FILE", "NOTE": "NOTE"}, **kwargs
+    )
+
+    assert batched["FILE"] == await retriever.hybrid_search(
+        document_type="FILE", **kwargs
+    )
+    assert batched["NOTE"] == await retriever.hybrid_search(
+        document_type="NOTE", **kwargs
+    )
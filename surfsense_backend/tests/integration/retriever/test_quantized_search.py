@@ -0,0 +1,82 @@
+"""Quantized vector search returns what the exact search returns.
+
+Only the candidate pass is quantized: the re-scoring on full-precision
+embeddings must give the same order whenever the candidates cover the top
+rows, which a small corpus and the default rescore factor guarantee.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.config import config
+from app.db import Chunk, Document, DocumentType
+from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
+from app.retriever.documents_hybrid_search import DocumentHybridSearchRetriever
+
+pytestmark = pytest.mark.integration
+
+_DIM = config.embedding_model_instance.dimension
+
+
+def _vector(*weights: float) -> list[float]:
+    vector = [0.0] * _DIM
+    vector[: len(weights)] = weights
+    return vector
+
+
+_QUERY = _vector(1.0, 0.2, 0.0)
+_CORPUS = {
+    "closest": _vector(1.0, 0.1, 0.0),
+    "close": _vector(1.0, 0.6, 0.0),
+    "far": _vector(0.2, 1.0, 0.4),
+    "opposite": _vector(-1.0, 0.0, 0.3),
+}
+
+
+@pytest.fixture
+async def corpus(db_session, db_workspace) -> dict[int, str]:
+    titles: dict[int, str] = {}
+    for title, embedding in _CORPUS.items():
+        document = Document(
+            title=title,
+            document_type=DocumentType.FILE,
+            content=title,
+            content_hash=uuid.uuid4().hex,
+            workspace_id=db_workspace.id,
+            embedding=embedding,
+            status={"state": "ready"},
+            chunks=[Chunk(content=title, embedding=embedding)],
+        )
+        db_session.add(document)
+        await db_session.flush()
+        titles[document.id] = title
+    return titles
+
+
+@pytest.fixture(params=["off", "halfvec", "binary"])
+def quantization(request, monkeypatch) -> str:
+    monkeypatch.setattr(config, "VECTOR_SEARCH_QUANTIZATION", request.param)
+    return request.param
+
+
+async def test_chunk_hybrid_search_order(
+    db_session, db_workspace, corpus, quantization
+):
+    results = await ChucksHybridSearchRetriever(db_session).hybrid_search(
+        "unmatched words", 4, db_workspace.id, query_embedding=_QUERY
+    )
+
+    assert [corpus[doc["document"]["id"]] for doc in results] == list(_CORPUS)
+
+
+async def test_document_hybrid_search_order(
+    db_session, db_workspace, corpus, quantization
+):
+    results = await DocumentHybridSearchRetriever(db_session).hybrid_search(
+        "unmatched words", 4, db_workspace.id, query_embedding=_QUERY
+    )
+
+    assert [corpus[doc["document"]["id"]] for doc in results] == list(_CORPUS)
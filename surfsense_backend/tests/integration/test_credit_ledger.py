@@ -0,0 +1,225 @@
+"""The Redis credit ledger against real Redis and Postgres.
+
+Holds and debits live in Redis until :func:`credit_ledger.settle` applies them
+to ``user.credit_micros_balance``, at most once per batch even when a run dies
+between the Postgres commit and the Redis clear.
+"""
+
+from __future__ import annotations
+
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import User
+from app.services import credit_ledger
+from app.services.token_quota_service import QuotaStatus, TokenQuotaService
+
+pytestmark = pytest.mark.integration
+
+
+@pytest_asyncio.fixture
+async def ledger(monkeypatch):
+    """Ledger mode with a dirty set private to this test."""
+    dirty = f"credit_ledger:dirty:test:{uuid.uuid4().hex}"
+    monkeypatch.setattr(config, "CREDIT_LEDGER_BACKEND", "redis")
+    monkeypatch.setattr(credit_ledger, "_DIRTY_KEY", dirty)
+    keys: list[str] = [dirty]
+    yield keys
+    await credit_ledger._redis().delete(*keys)
+
+
+async def _make_wallet_user(db_session: AsyncSession, ledger) -> User:
+    user = User(
+        id=uuid.uuid4(),
+        email=f"{uuid.uuid4().hex[:8]}@surfsense.net",
+        hashed_password="hashed",
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+        credit_micros_balance=1_000_000,
+        credit_micros_reserved=0,
+    )
+    db_session.add(user)
+    await db_session.flush()
+    ledger += [credit_ledger._user_key(user.id), credit_ledger._holds_key(user.id)]
+    return user
+
+
+@pytest_asyncio.fixture
+async def wallet_user(db_session: AsyncSession, ledger) -> User:
+    return await _make_wallet_user(db_session, ledger)
+
+
+def _sessions(db_session: AsyncSession):
+    @asynccontextmanager
+    async def _session():
+        yield db_session
+
+    return _session
+
+
+async def balance_of(session: AsyncSession, user: User) -> int:
+    await session.refresh(user)
+    return user.credit_micros_balance
+
+
+async def test_debits_show_at_once_and_land_in_postgres_on_settle(
+    db_session, wallet_user
+):
+    reserved = await TokenQuotaService.credit_reserve(
+        db_session, wallet_user.id, "req-1", 300_000
+    )
+    assert reserved.allowed
+    assert reserved.remaining == 700_000
+
+    await TokenQuotaService.credit_finalize(
+        db_session, wallet_user.id, "req-1", 120_000, 300_000
+    )
+
+    usage = await TokenQuotaService.credit_get_usage(db_session, wallet_user.id)
+    assert (usage.balance, usage.reserved) == (880_000, 0)
+    assert await balance_of(db_session, wallet_user) == 1_000_000
+
+    result = await credit_ledger.settle(_sessions(db_session), batch_size=10)
+
+    assert (result.users, result.micros) == (1, 120_000)
+    assert await balance_of(db_session, wallet_user) == 880_000
+    usage = await TokenQuotaService.credit_get_usage(db_session, wallet_user.id)
+    assert usage.balance == 880_000
+    assert (await credit_ledger.settle(_sessions(db_session), batch_size=10)).users == 0
+
+
+async def test_holds_block_overspend_until_released(db_session, wallet_user):
+    first = await TokenQuotaService.credit_reserve(
+        db_session, wallet_user.id, "req-1", 800_000
+    )
+    second = await TokenQuotaService.credit_reserve(
+        db_session, wallet_user.id, "req-2", 300_000
+    )
+
+    assert first.allowed
+    assert not second.allowed
+    assert second.status == QuotaStatus.BLOCKED
+
+    await TokenQuotaService.credit_release(
+        db_session, wallet_user.id, 800_000, request_id="req-1"
+    )
+    retry = await TokenQuotaService.credit_reserve(
+        db_session, wallet_user.id, "req-2", 300_000
+    )
+    assert retry.allowed
+    await db_session.refresh(wallet_user)
+    assert wallet_user.credit_micros_reserved == 0
+
+
+async def test_holds_that_fell_back_to_postgres_are_freed_on_the_row(
+    db_session, wallet_user, monkeypatch
+):
+    async def _unavailable(*args, **kwargs):
+        raise credit_ledger.CreditLedgerUnavailableError("mid-settlement")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(credit_ledger, "reserve", _unavailable)
+        for request_id in ("r1", "r2"):
+            await TokenQuotaService.credit_reserve(
+                db_session, wallet_user.id, request_id, 200_000
+            )
+    await db_session.refresh(wallet_user)
+    assert wallet_user.credit_micros_reserved == 400_000
+
+    await TokenQuotaService.credit_finalize(
+        db_session, wallet_user.id, "r1", 50_000, 200_000
+    )
+    await TokenQuotaService.credit_release(
+        db_session, wallet_user.id, 200_000, request_id="r2"
+    )
+
+    await db_session.refresh(wallet_user)
+    assert wallet_user.credit_micros_reserved == 0
+    result = await credit_ledger.settle(_sessions(db_session), batch_size=10)
+    assert result.micros == 50_000
+
+
+async def test_a_top_up_lifts_a_block_without_waiting_for_the_snapshot(
+    db_session, wallet_user
+):
+    await TokenQuotaService.credit_reserve(db_session, wallet_user.id, "r1", 900_000)
+
+    wallet_user.credit_micros_balance = 2_000_000
+    await db_session.commit()
+
+    topped_up = await TokenQuotaService.credit_reserve(
+        db_session, wallet_user.id, "r2", 900_000
+    )
+    assert topped_up.allowed
+    assert topped_up.balance == 2_000_000
+
+
+async def test_a_batch_interrupted_after_commit_is_not_applied_twice(
+    db_session, wallet_user, monkeypatch
+):
+    await TokenQuotaService.credit_reserve(db_session, wallet_user.id, "r1", 500_000)
+    await TokenQuotaService.credit_finalize(
+        db_session, wallet_user.id, "r1", 400_000, 500_000
+    )
+
+    # The worker dies after the Postgres commit, before the Redis clear.
+    clear = credit_ledger._CLEAR_LUA
+    monkeypatch.setattr(credit_ledger, "_CLEAR_LUA", "return 0")
+    await credit_ledger.settle(_sessions(db_session), batch_size=10)
+    assert await balance_of(db_session, wallet_user) == 600_000
+
+    monkeypatch.setattr(credit_ledger, "_CLEAR_LUA", clear)
+    rerun = await credit_ledger.settle(_sessions(db_session), batch_size=10)
+
+    assert rerun.users == 0
+    assert await balance_of(db_session, wallet_user) == 600_000
+    usage = await TokenQuotaService.credit_get_usage(db_session, wallet_user.id)
+    assert usage.balance == 600_000
+
+
+async def test_a_deleted_user_does_not_block_everyone_elses_settlement(
+    db_session, wallet_user, ledger
+):
+    doomed = await _make_wallet_user(db_session, ledger)
+    for user in (wallet_user, doomed):
+        await TokenQuotaService.credit_reserve(db_session, user.id, "r1", 200_000)
+        await TokenQuotaService.credit_finalize(
+            db_session, user.id, "r1", 100_000, 200_000
+        )
+    doomed_id = doomed.id
+    await db_session.delete(doomed)
+    await db_session.flush()
+
+    result = await credit_ledger.settle(_sessions(db_session), batch_size=10)
+
+    assert result.users == 1
+    assert await balance_of(db_session, wallet_user) == 900_000
+    r = credit_ledger._redis()
+    assert not await r.exists(credit_ledger._user_key(doomed_id))
+    assert not await r.sismember(credit_ledger._DIRTY_KEY, str(doomed_id))
+    assert (await credit_ledger.settle(_sessions(db_session), batch_size=10)).users == 0
+
+
+async def test_one_run_drains_more_dirty_users_than_a_batch(
+    db_session, wallet_user, ledger
+):
+    users = [wallet_user, *[await _make_wallet_user(db_session, ledger) for _ in "ab"]]
+    for user in users:
+        await TokenQuotaService.credit_reserve(db_session, user.id, "r1", 200_000)
+        await TokenQuotaService.credit_finalize(
+            db_session, user.id, "r1", 100_000, 200_000
+        )
+
+    result = await credit_ledger.settle(
+        _sessions(db_session), batch_size=1, time_budget=30
+    )
+
+    assert (result.users, result.micros) == (3, 300_000)
+    for user in users:
+        assert await balance_of(db_session, user) == 900_000
@@ -0,0 +1,100 @@
+"""Integration tests: keyset pagination and estimated counts on document listings."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.db import Document, DocumentType
+from app.routes import documents_routes
+
+pytestmark = pytest.mark.integration
+
+
+async def _list(db_session, workspace_id: int, **kwargs):
+    query = (
+        select(Document)
+        .options(selectinload(Document.created_by))
+        .filter(Document.workspace_id == workspace_id)
+    )
+    rows_query = select(Document.id).filter(Document.workspace_id == workspace_id)
+    defaults = {
+        "sort_col": Document.created_at,
+        "descending": True,
+        "skip": None,
+        "page": None,
+        "page_size": 2,
+        "cursor": None,
+        "count": "exact",
+        "output_format": "json",
+    }
+    return await documents_routes._list_documents(
+        db_session, query, rows_query, **{**defaults, **kwargs}
+    )
+
+
+async def test_cursor_walk_matches_offset_order_across_ties(db_session, db_workspace):
+    # Two timestamps for five documents: ties must be broken by id.
+    stamps = [datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)]
+    for i in range(5):
+        db_session.add(
+            Document(
+                title=f"Doc {i}",
+                document_type=DocumentType.FILE,
+                content="content",
+                content_hash=uuid.uuid4().hex,
+                workspace_id=db_workspace.id,
+                created_at=stamps[i % 2],
+            )
+        )
+    await db_session.flush()
+
+    offset_ids = [
+        item.id
+        for item in (await _list(db_session, db_workspace.id, page_size=-1)).items
+    ]
+
+    walked: list[int] = []
+    cursor = None
+    while True:
+        page = await _list(db_session, db_workspace.id, cursor=cursor)
+        walked.extend(item.id for item in page.items)
+        assert page.total == 5
+        assert page.has_more == (page.next_cursor is not None)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    assert walked == offset_ids
+    assert len(set(walked)) == 5
+
+
+async def test_estimated_count_on_a_small_listing_is_exact(db_session, db_workspace):
+    db_session.add(
+        Document(
+            title="Only",
+            document_type=DocumentType.FILE,
+            content="content",
+            content_hash=uuid.uuid4().hex,
+            workspace_id=db_workspace.id,
+        )
+    )
+    await db_session.flush()
+
+    page = await _list(db_session, db_workspace.id, count="estimate")
+
+    assert (page.total, page.total_is_estimate) == (1, False)
+    assert page.next_cursor is None
+
+
+async def test_a_cursor_for_another_sort_is_a_bad_request(db_session, db_workspace):
+    cursor = documents_routes.encode_cursor("title:asc", ["Doc", 1])
+
+    with pytest.raises(documents_routes.HTTPException) as exc_info:
+        await _list(db_session, db_workspace.id, cursor=cursor)
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,70 @@
+"""Integration tests: the set-based document purge behind folder/workspace deletion."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db import Chunk, Document, DocumentType
+from app.tasks.celery_tasks import document_tasks
+
+pytestmark = pytest.mark.integration
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.values.append(value)
+
+
+async def _add_document(db_session, workspace_id: int, chunk_count: int) -> Document:
+    document = Document(
+        title="Doc",
+        document_type=DocumentType.FILE,
+        content="content",
+        content_hash=uuid.uuid4().hex,
+        workspace_id=workspace_id,
+        status={"state": "deleting"},
+    )
+    db_session.add(document)
+    await db_session.flush()
+    db_session.add_all(
+        Chunk(content=f"chunk {i}", document_id=document.id, position=i)
+        for i in range(chunk_count)
+    )
+    await db_session.flush()
+    return document
+
+
+async def test_purge_removes_only_the_requested_documents_in_batches(
+    db_session, db_workspace, workspace_flip, monkeypatch
+):
+    workspace_flip(False)
+    monkeypatch.setattr(document_tasks, "PURGE_DOCUMENT_BATCH_SIZE", 2)
+    monkeypatch.setattr(document_tasks, "PURGE_CHUNK_BATCH_SIZE", 3)
+    redis = _FakeRedis()
+    monkeypatch.setattr(document_tasks, "_get_doc_heartbeat_redis", lambda: redis)
+
+    doomed = [await _add_document(db_session, db_workspace.id, 4) for _ in range(5)]
+    keeper = await _add_document(db_session, db_workspace.id, 2)
+    doomed_ids = [document.id for document in doomed]
+    await db_session.commit()
+
+    await document_tasks._purge_documents(
+        db_session, [*doomed_ids, doomed_ids[0]], notification_id=7
+    )
+    db_session.expire_all()
+
+    remaining = await db_session.scalars(
+        select(Document.id).where(Document.workspace_id == db_workspace.id)
+    )
+    assert list(remaining) == [keeper.id]
+    chunk_docs = await db_session.scalars(select(Chunk.document_id).distinct())
+    assert set(chunk_docs) == {keeper.id}
+    assert await db_session.scalar(select(func.count()).select_from(Chunk)) == 2
+    # One heartbeat refresh per batch of two documents.
+    assert redis.values == ["purged:2/5", "purged:4/5", "purged:5/5"]
@@ -0,0 +1,118 @@
+"""``folder_paths`` follows the folder tree through ordinary ORM flushes.
+
+Creating, renaming, moving and deleting a folder must leave the persisted
+path of it and every descendant current, and a subtree index must read the
+same paths a workspace-wide one does.
+"""
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import Document, DocumentType, Folder, FolderPath, User, Workspace
+from app.knowledge_store.paths import build_path_index, doc_to_virtual_path
+
+pytestmark = pytest.mark.integration
+
+
+async def _folder(
+    session: AsyncSession,
+    workspace: Workspace,
+    name: str,
+    parent: Folder | None = None,
+) -> Folder:
+    folder = Folder(
+        name=name,
+        position="0",
+        workspace_id=workspace.id,
+        parent_id=parent.id if parent else None,
+    )
+    session.add(folder)
+    await session.flush()
+    return folder
+
+
+async def _paths(session: AsyncSession, workspace: Workspace) -> dict[int, str]:
+    rows = await session.execute(
+        select(FolderPath.folder_id, FolderPath.path).where(
+            FolderPath.workspace_id == workspace.id
+        )
+    )
+    return dict(rows.all())
+
+
+async def test_created_folders_are_indexed(db_session, db_workspace):
+    research = await _folder(db_session, db_workspace, "Research")
+    papers = await _folder(db_session, db_workspace, "Papers: 2024", research)
+
+    assert await _paths(db_session, db_workspace) == {
+        research.id: "/documents/Research",
+        papers.id: "/documents/Research/Papers_ 2024",
+    }
+
+
+async def test_rename_and_move_update_descendants(db_session, db_workspace):
+    research = await _folder(db_session, db_workspace, "Research")
+    papers = await _folder(db_session, db_workspace, "Papers", research)
+    drafts = await _folder(db_session, db_workspace, "Drafts", papers)
+    archive = await _folder(db_session, db_workspace, "Archive")
+
+    research.name = "Reading"
+    await db_session.flush()
+    paths = await _paths(db_session, db_workspace)
+    assert paths[drafts.id] == "/documents/Reading/Papers/Drafts"
+
+    papers.parent_id = archive.id
+    await db_session.flush()
+    paths = await _paths(db_session, db_workspace)
+    assert paths[papers.id] == "/documents/Archive/Papers"
+    assert paths[drafts.id] == "/documents/Archive/Papers/Drafts"
+    assert paths[research.id] == "/documents/Reading"
+
+
+async def test_deleted_folders_leave_the_index(db_session, db_workspace):
+    research = await _folder(db_session, db_workspace, "Research")
+    await _folder(db_session, db_workspace, "Papers", research)
+
+    await db_session.execute(delete(Folder).where(Folder.id == research.id))
+
+    assert await _paths(db_session, db_workspace) == {}
+
+
+async def test_subtree_index_matches_the_workspace_index(
+    db_session, db_user: User, db_workspace
+):
+    research = await _folder(db_session, db_workspace, "Research")
+    papers = await _folder(db_session, db_workspace, "Papers", research)
+    other = await _folder(db_session, db_workspace, "Other")
+    docs = []
+    for n, folder in enumerate([papers, papers, other]):
+        doc = Document(
+            title="Same",
+            document_type=DocumentType.NOTE,
+            document_metadata={},
+            content="body",
+            content_hash=f"hash-subtree-{n}",
+            unique_identifier_hash=f"hash-subtree-{n}",
+            source_markdown="body",
+            workspace_id=db_workspace.id,
+            created_by_id=db_user.id,
+            folder_id=folder.id,
+        )
+        db_session.add(doc)
+        await db_session.flush()
+        docs.append(doc)
+
+    full = await build_path_index(db_session, db_workspace.id)
+    scoped = await build_path_index(
+        db_session, db_workspace.id, under="/documents/Research/Papers"
+    )
+
+    assert set(scoped.folder_paths) == {research.id, papers.id}
+    assert other.id not in scoped.folder_paths
+    for doc in docs[:2]:
+        assert doc_to_virtual_path(
+            doc_id=doc.id, title=doc.title, folder_id=doc.folder_id, index=scoped
+        ) == doc_to_virtual_path(
+            doc_id=doc.id, title=doc.title, folder_id=doc.folder_id, index=full
+        )
@@ -0,0 +1,182 @@
+"""The resolved-access cache behind ``check_permission`` against real Postgres.
+
+Repeat checks must skip the database, and membership, role and API-gate
+changes must show up on the very next check without waiting for the TTL,
+including, with the Redis tier on, changes committed by another replica.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.context import AuthContext
+from app.config import config
+from app.db import (
+    Permission,
+    PersonalAccessToken,
+    User,
+    Workspace,
+    WorkspaceMembership,
+    WorkspaceRole,
+)
+from app.utils import rbac_cache
+from app.utils.rbac import check_permission, check_workspace_access
+
+pytestmark = pytest.mark.integration
+
+_READ = Permission.DOCUMENTS_READ.value
+
+
+@pytest_asyncio.fixture
+async def loads(monkeypatch) -> list[int]:
+    """Workspace ids of every cache fill that went to Postgres."""
+    rbac_cache.clear_rbac_cache()
+    calls: list[int] = []
+    real_load = rbac_cache._load
+
+    async def counting_load(session, user_id, workspace_id):
+        calls.append(workspace_id)
+        return await real_load(session, user_id, workspace_id)
+
+    monkeypatch.setattr(rbac_cache, "_load", counting_load)
+    yield calls
+    rbac_cache.clear_rbac_cache()
+
+
+@pytest_asyncio.fixture
+async def editor(
+    db_session: AsyncSession, db_workspace: Workspace, make_user, add_member
+) -> User:
+    user = await make_user()
+    await add_member(db_workspace, user, "Editor")
+    await db_session.commit()
+    return user
+
+
+async def _role(db_session: AsyncSession, workspace: Workspace, name: str):
+    return await db_session.scalar(
+        select(WorkspaceRole).where(
+            WorkspaceRole.workspace_id == workspace.id, WorkspaceRole.name == name
+        )
+    )
+
+
+async def test_repeat_checks_are_served_from_the_cache(
+    db_session, db_workspace, editor, loads
+):
+    auth = AuthContext.session(editor)
+
+    first = await check_permission(db_session, auth, db_workspace.id, _READ)
+    second = await check_permission(db_session, auth, db_workspace.id, _READ)
+
+    assert first == second
+    assert first.role_name == "Editor"
+    assert loads == [db_workspace.id]
+
+
+async def test_a_role_change_is_seen_on_the_next_check(
+    db_session, db_workspace, editor, loads
+):
+    auth = AuthContext.session(editor)
+    await check_permission(db_session, auth, db_workspace.id, _READ)
+
+    role = await _role(db_session, db_workspace, "Editor")
+    role.permissions = [p for p in role.permissions if p != _READ]
+    await db_session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await check_permission(db_session, auth, db_workspace.id, _READ)
+    assert exc_info.value.status_code == 403
+    assert len(loads) == 2
+
+
+async def test_a_removed_member_is_denied_on_the_next_check(
+    db_session, db_workspace, editor, loads
+):
+    auth = AuthContext.session(editor)
+    await check_workspace_access(db_session, auth, db_workspace.id)
+
+    membership = await db_session.scalar(
+        select(WorkspaceMembership).where(
+            WorkspaceMembership.user_id == editor.id,
+            WorkspaceMembership.workspace_id == db_workspace.id,
+        )
+    )
+    await db_session.delete(membership)
+    await db_session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await check_workspace_access(db_session, auth, db_workspace.id)
+    assert exc_info.value.detail == "You don't have access to this workspace"
+
+
+async def test_pending_changes_bypass_the_cache_in_the_writing_session(
+    db_session, db_workspace, db_user, loads
+):
+    pat = AuthContext.pat_auth(
+        db_user,
+        PersonalAccessToken(
+            user_id=db_user.id,
+            user=db_user,
+            token_hash="0" * 64,
+            token_prefix="ss_pat_test",
+            label="Test PAT",
+        ),
+    )
+    db_workspace.api_access_enabled = True
+    await db_session.commit()
+    await check_workspace_access(db_session, pat, db_workspace.id)
+
+    # Not flushed yet: the cached grant must not be served to this session.
+    db_workspace.api_access_enabled = False
+
+    with pytest.raises(HTTPException) as exc_info:
+        await check_workspace_access(db_session, pat, db_workspace.id)
+    assert exc_info.value.detail == "API access is not enabled for this workspace."
+
+
+@pytest_asyncio.fixture
+async def shared_cache(monkeypatch, db_workspace: Workspace):
+    """Redis tier on, with this workspace's keys dropped afterwards."""
+    monkeypatch.setattr(config, "RBAC_CACHE_REDIS_ENABLED", True)
+    keys = [
+        rbac_cache._version_key(db_workspace.id),
+        rbac_cache._entries_key(db_workspace.id),
+    ]
+    await rbac_cache._redis().delete(*keys)
+    yield
+    await rbac_cache._redis().delete(*keys)
+
+
+async def test_another_replicas_bump_reaches_this_ones_memory_hits(
+    db_session, db_workspace, editor, loads, shared_cache
+):
+    auth = AuthContext.session(editor)
+    await check_permission(db_session, auth, db_workspace.id, _READ)
+    await check_permission(db_session, auth, db_workspace.id, _READ)
+    assert loads == [db_workspace.id]
+
+    # What another replica's commit leaves behind: only the Redis version moves.
+    await rbac_cache._redis().incr(rbac_cache._version_key(db_workspace.id))
+
+    await check_permission(db_session, auth, db_workspace.id, _READ)
+    assert loads == [db_workspace.id, db_workspace.id]
+
+
+async def test_commit_bumps_the_redis_version_from_the_loop(
+    db_session, db_workspace, editor, loads, shared_cache
+):
+    role = await _role(db_session, db_workspace, "Editor")
+    role.permissions = [p for p in role.permissions if p != _READ]
+    await db_session.commit()
+
+    assert rbac_cache._pending_bumps
+    await asyncio.gather(*rbac_cache._pending_bumps)
+    version = await rbac_cache._redis().get(rbac_cache._version_key(db_workspace.id))
+    assert int(version) >= 1
@@ -0,0 +1,100 @@
+"""Integration tests: run/spill payloads are stored and read back line by line."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.agents.chat.multi_agent_chat.subagents.shared import run_reader
+from app.capabilities.core.runs import (
+    SerializedOutput,
+    load_run_output_text,
+    record_run,
+    record_spill,
+)
+from app.db import Run, RunOutputLine
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def tools(db_session, db_workspace, monkeypatch):
+    @contextlib.asynccontextmanager
+    async def _session():
+        yield db_session
+
+    monkeypatch.setattr(run_reader, "shielded_async_session", _session)
+    read_run, search_run, _export_run = run_reader.build_run_reader_tools(
+        workspace_id=db_workspace.id
+    )
+    return read_run, search_run
+
+
+def _serialized(count: int) -> SerializedOutput:
+    body = "\n".join(json.dumps({"i": i, "name": f"item_{i}"}) for i in range(count))
+    return SerializedOutput(text=body, item_count=count, char_count=len(body))
+
+
+async def test_run_output_is_stored_one_row_per_line(db_session, db_workspace):
+    serialized = _serialized(2500)
+
+    run_id = await record_run(
+        db_session,
+        workspace_id=db_workspace.id,
+        capability="test.echo",
+        origin="api",
+        status="success",
+        serialized=serialized,
+    )
+
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    assert run.output_text is None
+    assert run.line_count == 2500
+    assert (
+        await db_session.scalar(
+            select(func.count()).where(RunOutputLine.run_id == run.id)
+        )
+        == 2500
+    )
+    assert await load_run_output_text(db_session, run) == serialized.text
+
+
+async def test_read_and_search_run_use_stored_lines(db_session, db_workspace, tools):
+    read_run, search_run = tools
+    run_id = await record_run(
+        db_session,
+        workspace_id=db_workspace.id,
+        capability="test.echo",
+        origin="api",
+        status="success",
+        serialized=_serialized(1200),
+    )
+
+    page = await read_run.ainvoke({"ref": f"run_{run_id}", "offset": 700, "limit": 2})
+    assert "Showing lines 700-701 of 1200" in page
+    assert "item_700" in page and "item_701" in page and "item_702" not in page
+
+    found = await search_run.ainvoke(
+        {"ref": f"run_{run_id}", "pattern": r"item_11\d\d"}
+    )
+    assert "Found 100 matching line(s)" in found
+    assert "[1100]" in found
+
+
+async def test_spill_lines_are_workspace_scoped(db_session, db_workspace, tools):
+    read_run, _ = tools
+    spill_id = await record_spill(
+        db_session, content="first\nsecond\nthird", workspace_id=db_workspace.id
+    )
+    other_spill_id = await record_spill(
+        db_session, content="elsewhere", workspace_id=None
+    )
+
+    page = await read_run.ainvoke({"ref": f"spill_{spill_id}", "offset": 1})
+    assert "second\nthird" in page
+    missing = await read_run.ainvoke({"ref": f"spill_{other_spill_id}"})
+    assert "not found" in missing
@@ -0,0 +1,36 @@
+"""Compression of checkpoint channel values and reading rows written without it."""
+
+from __future__ import annotations
+
+import pytest
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.agents.chat.runtime.checkpointer import CompressingSerializer
+
+pytestmark = pytest.mark.unit
+
+
+def test_large_values_are_compressed_and_round_trip() -> None:
+    serde = CompressingSerializer(JsonPlusSerializer(), min_bytes=1024)
+    value = {"messages": ["the same sentence again. " * 200]}
+
+    type_, data = serde.dumps_typed(value)
+
+    assert type_.endswith("+zlib")
+    assert len(data) < len(JsonPlusSerializer().dumps_typed(value)[1])
+    assert serde.loads_typed((type_, data)) == value
+
+
+def test_small_values_are_stored_as_before() -> None:
+    serde = CompressingSerializer(JsonPlusSerializer(), min_bytes=1024)
+
+    assert serde.dumps_typed({"a": 1}) == JsonPlusSerializer().dumps_typed({"a": 1})
+
+
+def test_compressed_rows_still_load_with_compression_off() -> None:
+    written = CompressingSerializer(JsonPlusSerializer(), min_bytes=1)
+    reader = CompressingSerializer(JsonPlusSerializer(), min_bytes=0)
+    value = ["x" * 4096]
+
+    assert reader.loads_typed(written.dumps_typed(value)) == value
+    assert reader.dumps_typed(value) == JsonPlusSerializer().dumps_typed(value)
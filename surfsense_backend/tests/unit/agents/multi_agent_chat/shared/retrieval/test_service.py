@@ -31,14 +31,14 @@ def _hit(document_id: int, chunk_id: int) -> DocumentHit:
     )
 
 
-def test_no_hits_renders_nothing() -> None:
-    assert build_context("q", [], CitationRegistry()) is None
+async def test_no_hits_renders_nothing() -> None:
+    assert await build_context("q", [], CitationRegistry()) is None
 
 
-def test_renders_block_and_registers_labels_in_order() -> None:
+async def test_renders_block_and_registers_labels_in_order() -> None:
     registry = CitationRegistry()
 
-    block = build_context("q", [_hit(1, 880), _hit(2, 12)], registry)
+    block = await build_context("q", [_hit(1, 880), _hit(2, 12)], registry)
 
     assert block is not None
     assert "[1] text 880" in block
@@ -50,16 +50,16 @@ def test_renders_block_and_registers_labels_in_order() -> None:
 class _ReverseReranker:
     """Stand-in reranker that simply reverses document order."""
 
-    def rerank_documents(
+    async def arerank_documents(
         self, query_text: str, documents: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
         return list(reversed(documents))
 
 
-def test_reranker_reorders_documents_before_labeling() -> None:
+async def test_reranker_reorders_documents_before_labeling() -> None:
     registry = CitationRegistry()
 
-    block = build_context(
+    block = await build_context(
         "q", [_hit(1, 880), _hit(2, 12)], registry, reranker=_ReverseReranker()
     )
 
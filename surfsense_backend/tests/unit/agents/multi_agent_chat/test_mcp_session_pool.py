@@ -0,0 +1,196 @@
+"""MCP tool calls reuse one open session per connector.
+
+Opening a session costs a TLS handshake plus the MCP ``initialize`` round trip
+(or a process spawn); the pool must pay it once per connector, reconnect when
+a pooled session has gone bad, and never hand out a session opened with
+credentials that were since rotated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+
+from app.agents.chat.multi_agent_chat.shared.tools.mcp.pool import (
+    MCPSessionPool,
+    connection_fingerprint,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeSession:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.broken = False
+        self.pings = 0
+        self.calls = 0
+        self.fail: BaseException | None = None
+
+    async def send_ping(self) -> None:
+        self.pings += 1
+        if self.broken:
+            raise ConnectionError("session gone")
+
+    async def call(self) -> str:
+        if self.broken:
+            # The write stream is closed: the request is never sent.
+            raise anyio.ClosedResourceError
+        self.calls += 1
+        if self.fail is not None:
+            raise self.fail
+        return self.name
+
+
+class _FakeServer:
+    def __init__(self) -> None:
+        self.opened: list[_FakeSession] = []
+        self.closed: list[_FakeSession] = []
+
+    @asynccontextmanager
+    async def open(self):
+        session = _FakeSession(f"s{len(self.opened) + 1}")
+        self.opened.append(session)
+        try:
+            yield session
+        finally:
+            self.closed.append(session)
+
+
+@pytest.fixture(autouse=True)
+def _pool_enabled(monkeypatch):
+    from app.config import config
+
+    monkeypatch.setattr(config, "MCP_SESSION_POOL_ENABLED", True)
+
+
+def _pool(**kwargs) -> MCPSessionPool:
+    return MCPSessionPool(
+        idle_seconds=kwargs.get("idle_seconds", 60),
+        ping_after_seconds=kwargs.get("ping_after_seconds", 60),
+    )
+
+
+async def _call(pool, server, *, scope=1, fingerprint="fp"):
+    return await pool.run(
+        scope, fingerprint, server.open, lambda s: s.call(), transport="http"
+    )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_repeated_calls_share_one_session():
+    pool, server = _pool(), _FakeServer()
+
+    results = [await _call(pool, server) for _ in range(5)]
+    results += await asyncio.gather(*(_call(pool, server) for _ in range(5)))
+
+    assert results == ["s1"] * 10
+    assert len(server.opened) == 1
+
+
+async def test_rotated_credentials_never_reuse_the_old_session():
+    pool, server = _pool(), _FakeServer()
+
+    old = connection_fingerprint("https://mcp.example", {"Authorization": "a"})
+    new = connection_fingerprint("https://mcp.example", {"Authorization": "b"})
+
+    assert await _call(pool, server, fingerprint=old) == "s1"
+    assert await _call(pool, server, fingerprint=new) == "s2"
+
+
+async def test_a_failed_reused_session_is_replaced_transparently():
+    pool, server = _pool(), _FakeServer()
+    await _call(pool, server)
+    server.opened[0].broken = True
+
+    assert await _call(pool, server) == "s2"
+    await _settle()
+    assert server.closed == [server.opened[0]]
+
+
+async def test_a_stale_session_is_pinged_and_reopened_when_dead():
+    pool, server = _pool(ping_after_seconds=0), _FakeServer()
+    await _call(pool, server)
+    server.opened[0].broken = True
+
+    assert await _call(pool, server) == "s2"
+    assert server.opened[0].pings == 1
+
+
+async def test_invalidate_closes_the_connectors_sessions_only():
+    pool, server = _pool(), _FakeServer()
+    await _call(pool, server, scope=1)
+    await _call(pool, server, scope=2)
+
+    pool.invalidate(1)
+    await _settle()
+
+    assert [s.name for s in server.closed] == ["s1"]
+    assert await _call(pool, server, scope=1) == "s3"
+    assert await _call(pool, server, scope=2) == "s2"
+
+
+async def test_idle_sessions_are_closed():
+    pool, server = _pool(idle_seconds=0.01), _FakeServer()
+    await _call(pool, server)
+
+    await asyncio.sleep(0.05)
+
+    assert server.closed == server.opened
+    assert await _call(pool, server) == "s2"
+
+
+async def test_a_failed_open_is_raised_to_every_waiting_caller():
+    pool = _pool()
+
+    @asynccontextmanager
+    async def refuse():
+        await asyncio.sleep(0)
+        raise PermissionError("401 Unauthorized")
+        yield
+
+    results = await asyncio.gather(
+        *(
+            pool.run(1, "fp", refuse, lambda s: s.call(), transport="http")
+            for _ in range(3)
+        ),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, PermissionError) for result in results)
+
+
+async def test_a_tool_error_is_not_retried_and_keeps_the_session():
+    pool, server = _pool(), _FakeServer()
+    await _call(pool, server)
+    server.opened[0].fail = ValueError("issue not found")
+
+    with pytest.raises(ValueError, match="issue not found"):
+        await _call(pool, server)
+
+    assert server.opened[0].calls == 2
+    server.opened[0].fail = None
+    assert await _call(pool, server) == "s1"
+    assert len(server.opened) == 1
+
+
+async def test_a_connection_lost_after_sending_is_not_retried():
+    pool, server = _pool(), _FakeServer()
+    await _call(pool, server)
+    # The server may have applied the call before the connection dropped.
+    server.opened[0].fail = ConnectionResetError("reset by peer")
+
+    with pytest.raises(ConnectionResetError):
+        await _call(pool, server)
+
+    assert server.opened[0].calls == 2
+    await _settle()
+    assert server.closed == [server.opened[0]]
+    assert await _call(pool, server) == "s2"
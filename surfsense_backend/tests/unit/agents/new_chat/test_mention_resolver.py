@@ -122,7 +122,7 @@ class TestResolveMentions:
             id=42, title="Notes", folder_id=None, document_metadata=None
         )
 
-        async def fake_build_index(_session, _ssid):
+        async def fake_build_index(_session, _ssid, **_scope):
             return PathIndex()
 
         monkeypatch.setattr(mention_resolver, "build_path_index", fake_build_index)
@@ -158,7 +158,7 @@ class TestResolveMentions:
         )
         folder_row = SimpleNamespace(id=9, name="Reports")
 
-        async def fake_build_index(_session, _ssid):
+        async def fake_build_index(_session, _ssid, **_scope):
             return PathIndex(folder_paths={9: f"{DOCUMENTS_ROOT}/Reports"})
 
         monkeypatch.setattr(mention_resolver, "build_path_index", fake_build_index)
@@ -189,7 +189,7 @@ class TestResolveMentions:
             id=99, title="ghost", document_type="EXTENSION", kind="doc"
         )
 
-        async def fake_build_index(_session, _ssid):
+        async def fake_build_index(_session, _ssid, **_scope):
             return PathIndex()
 
         monkeypatch.setattr(mention_resolver, "build_path_index", fake_build_index)
@@ -228,7 +228,7 @@ class TestResolveMentions:
             ),
         ]
 
-        async def fake_build_index(_session, _ssid):
+        async def fake_build_index(_session, _ssid, **_scope):
             return PathIndex()
 
         monkeypatch.setattr(mention_resolver, "build_path_index", fake_build_index)
@@ -257,7 +257,7 @@ class TestResolveMentions:
             id=7, title="Legacy", folder_id=None, document_metadata=None
         )
 
-        async def fake_build_index(_session, _ssid):
+        async def fake_build_index(_session, _ssid, **_scope):
             return PathIndex()
 
         monkeypatch.setattr(mention_resolver, "build_path_index", fake_build_index)
@@ -296,6 +296,7 @@ def _fake_run_row(**overrides):
         "thread_id": None,
         "input": {"value": "hi"},
         "output_text": '{"echo": "hi"}',
+        "line_count": None,
         "progress": None,
     }
     defaults.update(overrides)
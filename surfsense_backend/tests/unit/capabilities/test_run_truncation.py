@@ -109,6 +109,10 @@ class _FakeResult:
     def scalar_one_or_none(self):
         return self._value
 
+    def one_or_none(self):
+        # ``(line_count, text)``: a row stored before line storage, as one blob.
+        return None if self._value is None else (None, self._value)
+
 
 class _FakeSession:
     def __init__(self, value, calls):
@@ -271,18 +275,26 @@ _CRAWL_BODY = "\n".join(
 )
 
 
+def _rows_from_body(body: str, rows: str) -> list[dict]:
+    return [
+        record
+        for line in body.split("\n")
+        for record in run_reader._rows_from_line(line, rows)
+    ]
+
+
 def test_rows_from_body_links_explode_and_items():
-    links = run_reader._rows_from_body(_CRAWL_BODY, "links")
+    links = _rows_from_body(_CRAWL_BODY, "links")
     assert len(links) == 4
     assert links[0]["page"] == "https://x.com/team/"
     assert links[0]["text"] == "Jane Doe"
 
-    items = run_reader._rows_from_body(_CRAWL_BODY, "items")
+    items = _rows_from_body(_CRAWL_BODY, "items")
     assert [i["url"] for i in items] == ["https://x.com/team/", "https://x.com/jobs/"]
 
 
 def test_rows_to_csv_dedupes_and_orders_columns():
-    records = run_reader._rows_from_body(_CRAWL_BODY, "links")
+    records = _rows_from_body(_CRAWL_BODY, "links")
     csv_text, count = run_reader._rows_to_csv(records, ["page", "url", "text"])
     lines = csv_text.strip().split("\n")
     assert lines[0] == "page,url,text"
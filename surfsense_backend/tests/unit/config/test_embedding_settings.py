@@ -3,6 +3,7 @@ import pytest
 from app.config.embedding_settings import (
     build_embedding_kwargs,
     resolve_embedding_base_url,
+    resolve_embedding_dimension,
 )
 
 pytestmark = pytest.mark.unit
@@ -74,3 +75,23 @@ def test_build_embedding_kwargs_combines_litellm_and_azure_env_when_set() -> Non
         "azure_endpoint": "https://example.openai.azure.com",
         "azure_api_key": "test-key",
     }
+
+
+def test_resolve_embedding_dimension_prefers_the_configured_width() -> None:
+    assert (
+        resolve_embedding_dimension(
+            {"EMBEDDING_DIMENSION": " 512 "},
+            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+        )
+        == 512
+    )
+
+
+def test_resolve_embedding_dimension_knows_documented_models() -> None:
+    assert (
+        resolve_embedding_dimension(
+            {}, embedding_model="sentence-transformers/all-MiniLM-L6-v2"
+        )
+        == 384
+    )
+    assert resolve_embedding_dimension({}, embedding_model="acme/unlisted") is None
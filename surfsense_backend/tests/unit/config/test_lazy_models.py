@@ -0,0 +1,163 @@
+"""The embedding model loads on first use, not when ``app.config`` is imported."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.model_runtime import proxies
+from app.model_runtime.client import (
+    RemoteEmbeddings,
+    RemoteReranker,
+    decode_vectors,
+    encode_vectors,
+)
+from app.model_runtime.proxies import LazyChunker, LazyEmbeddings
+
+pytestmark = pytest.mark.unit
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[3]
+
+
+class _FakeModel:
+    dimension = 3
+    max_seq_length = 128
+
+    def embed(self, text: str) -> np.ndarray:
+        return np.full(3, len(text), dtype=np.float32)
+
+
+@pytest.fixture
+def loads(monkeypatch) -> list[str]:
+    loaded: list[str] = []
+
+    def load(model_name, model_kwargs):
+        loaded.append(model_name)
+        return _FakeModel()
+
+    monkeypatch.setattr(proxies, "load_local_embeddings", load)
+    return loaded
+
+
+def test_configured_dimension_does_not_load_the_model(loads):
+    embeddings = LazyEmbeddings("fake/model", {}, dimension=3)
+
+    assert embeddings.dimension == 3
+    assert loads == []
+
+
+def test_an_unknown_schema_dimension_loads_the_model_with_a_warning(loads, caplog):
+    embeddings = LazyEmbeddings("acme/unlisted", {})
+
+    with caplog.at_level("WARNING", logger=proxies.__name__):
+        assert embeddings.schema_dimension == 3
+
+    assert loads == ["acme/unlisted"]
+    assert "EMBEDDING_DIMENSION is not set" in caplog.text
+
+
+def test_importing_the_schema_does_not_build_the_model():
+    # A fresh interpreter: this one has long since imported app.db.
+    script = (
+        "import app.db\n"
+        "from app.config import config\n"
+        "assert not config.embedding_model_instance.loaded\n"
+    )
+    env = {
+        **os.environ,
+        "EMBEDDING_MODEL": "sentence-transformers/all-MiniLM-L6-v2",
+        "EMBEDDING_DIMENSION": "",
+        "MODEL_RUNTIME_URL": "",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=_BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_the_model_loads_once_on_first_use(loads):
+    embeddings = LazyEmbeddings("fake/model", {})
+
+    assert embeddings.embed("ab").tolist() == [2.0, 2.0, 2.0]
+    assert embeddings.embed("abc").tolist() == [3.0, 3.0, 3.0]
+    assert embeddings.max_seq_length == 128
+    assert loads == ["fake/model"]
+
+
+def test_a_wrong_configured_dimension_fails_on_load(loads):
+    embeddings = LazyEmbeddings("fake/model", {}, dimension=768)
+
+    with pytest.raises(ValueError, match="EMBEDDING_DIMENSION"):
+        embeddings.embed("text")
+
+
+def test_chunker_is_sized_to_the_model_when_first_used(loads):
+    sizes: list[int] = []
+    chunker = LazyChunker(sizes.append, LazyEmbeddings("fake/model", {}))
+
+    assert sizes == []
+    chunker._get()
+    assert sizes == [128]
+
+
+def test_vectors_round_trip_through_the_wire_format():
+    vectors = [np.arange(4, dtype=np.float32), np.ones(4, dtype=np.float32)]
+
+    decoded = decode_vectors(encode_vectors(vectors, 4))
+
+    assert [v.tolist() for v in decoded] == [v.tolist() for v in vectors]
+
+
+def test_remote_ranking_maps_results_back_to_caller_documents():
+    class _Client:
+        def post(self, path, payload):
+            assert payload == {"query": "q", "docs": ["a", "b"]}
+            return {
+                "results": [
+                    {"index": 1, "score": 0.9, "rank": 1},
+                    {"index": 0, "score": 0.1, "rank": 2},
+                ]
+            }
+
+    class _Doc:
+        def __init__(self, text: str) -> None:
+            self.text = text
+
+    docs = [_Doc("a"), _Doc("b")]
+    ranked = RemoteReranker("http://runtime", client=_Client()).rank("q", docs)
+
+    assert [r.document for r in ranked.results] == [docs[1], docs[0]]
+    assert [r.score for r in ranked.results] == [0.9, 0.1]
+
+
+def test_remote_token_limits_fall_back_like_the_local_model():
+    class _Client:
+        def get(self, path):
+            return {"model": "openai://x", "dimension": 3, "max_seq_length": None}
+
+    remote = RemoteEmbeddings("http://runtime", client=_Client())
+
+    assert getattr(remote, "max_seq_length", 512) == 512
+    assert getattr(remote, "_max_tokens", 8192) == 8192
+
+
+def test_remote_token_limits_are_the_models_own():
+    class _Client:
+        def get(self, path):
+            return {"dimension": 3, "max_seq_length": None, "max_tokens": 8191}
+
+    remote = RemoteEmbeddings("http://runtime", client=_Client())
+
+    assert getattr(remote, "max_seq_length", 512) == 512
+    assert remote._max_tokens == 8191
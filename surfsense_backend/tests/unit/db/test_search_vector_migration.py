@@ -0,0 +1,73 @@
+"""Smoke test for the ``187_add_search_vector_columns`` Alembic migration.
+
+A full apply/rollback test would require a live Postgres; here we verify
+the migration module's static contract:
+
+* The chain wires it as a successor of ``186``.
+* ``upgrade()`` backfills in batches inside an autocommit block and swaps the
+  expression GIN indexes for ones on the stored ``search_vector`` column.
+* The runtime index definitions and the models agree with the migration.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import inspect
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+_MIGRATION_PATH = (
+    Path(__file__).resolve().parents[3]
+    / "alembic"
+    / "versions"
+    / "187_add_search_vector_columns.py"
+)
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("_migration_187", _MIGRATION_PATH)
+    assert spec and spec.loader, "could not load migration spec"
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_migration_chain_revision_ids() -> None:
+    module = _load_migration()
+    assert module.revision == "187"
+    assert module.down_revision == "186"
+
+
+def test_upgrade_backfills_in_batches_outside_the_migration_transaction() -> None:
+    module = _load_migration()
+    upgrade_src = inspect.getsource(module.upgrade)
+    assert "autocommit_block" in upgrade_src
+    assert "_backfill(table)" in upgrade_src
+    assert "search_vector IS NULL" in inspect.getsource(module._backfill)
+
+
+def test_upgrade_replaces_expression_indexes() -> None:
+    module = _load_migration()
+    tables = {table: (index, old) for table, index, old in module._TABLES}
+    assert tables == {
+        "chunks": ("chunks_search_vector_index", "chucks_search_index"),
+        "documents": ("documents_search_vector_index", "document_search_index"),
+    }
+    upgrade_src = inspect.getsource(module.upgrade)
+    assert "USING gin (search_vector)" in upgrade_src
+    assert "DROP INDEX CONCURRENTLY IF EXISTS" in upgrade_src
+
+
+def test_models_and_runtime_indexes_use_the_stored_column() -> None:
+    from app.db import _INDEX_DEFINITIONS, Chunk, Document
+
+    for model in (Chunk, Document):
+        computed = model.__table__.c.search_vector.computed
+        assert computed is not None and computed.persisted
+    ddl = " ".join(statement for _, _, statement in _INDEX_DEFINITIONS)
+    assert "to_tsvector" not in ddl
+    assert ddl.count("USING gin (search_vector)") == 2
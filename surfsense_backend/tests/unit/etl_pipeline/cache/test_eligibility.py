@@ -1,8 +1,8 @@
 """What is allowed into the cache -- the gating rules, as pure logic.
 
 These rules decide whether a given upload may be served from / written to the
-parse cache. They live in a pure predicate so every branch (disabled, vision,
-no service, file category) is covered here without touching DB, storage, or the
+parse cache. They live in a pure predicate so every branch (disabled, no
+service, file category) is covered here without touching DB, storage, or the
 parser.
 """
 
@@ -20,7 +20,6 @@ def test_document_with_service_and_cache_on_is_cacheable():
         filename="report.pdf",
         etl_service="LLAMACLOUD",
         cache_enabled=True,
-        has_vision_llm=False,
     )
 
 
@@ -29,18 +28,6 @@ def test_disabled_cache_is_never_cacheable():
         filename="report.pdf",
         etl_service="LLAMACLOUD",
         cache_enabled=False,
-        has_vision_llm=False,
-    )
-
-
-def test_vision_llm_run_is_not_cacheable():
-    # Vision appends model output not captured by the key; sharing it would leak
-    # one run's generated text into a plain parse of the same bytes.
-    assert not is_parse_cacheable(
-        filename="report.pdf",
-        etl_service="LLAMACLOUD",
-        cache_enabled=True,
-        has_vision_llm=True,
     )
 
 
@@ -50,7 +37,6 @@ def test_missing_etl_service_is_not_cacheable(etl_service):
         filename="report.pdf",
         etl_service=etl_service,
         cache_enabled=True,
-        has_vision_llm=False,
     )
 
 
@@ -63,7 +49,6 @@ def test_document_extensions_are_cacheable(filename):
         filename=filename,
         etl_service="LLAMACLOUD",
         cache_enabled=True,
-        has_vision_llm=False,
     )
 
 
@@ -84,5 +69,4 @@ def test_non_document_categories_are_not_cacheable(filename):
         filename=filename,
         etl_service="LLAMACLOUD",
         cache_enabled=True,
-        has_vision_llm=False,
     )
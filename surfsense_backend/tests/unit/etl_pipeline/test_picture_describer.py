@@ -9,7 +9,9 @@ Covers:
   placeholders / captions in the parser markdown;
 - :func:`merge_descriptions_into_markdown` -- the top-level helper
   that inlines what it can and appends what it can't;
-- :func:`render_appended_section` -- the appended-fallback renderer.
+- :func:`render_appended_section` -- the appended-fallback renderer;
+- the optional :class:`PictureCache` that serves images described in
+  earlier documents.
 """
 
 from __future__ import annotations
@@ -19,6 +21,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from app.etl_pipeline.picture_describer import (
+    CachedPicture,
     PictureDescription,
     PictureExtractionResult,
     describe_pictures,
@@ -970,3 +973,147 @@ def test_inject_figures_then_falls_through_to_docling_marker():
     assert "Image: scan.jpeg" not in out
     assert "**Embedded image:** `scan.jpeg`" in out
     assert "Scan description." in out
+
+
+# ---------------------------------------------------------------------------
+# describe_pictures: cross-document picture cache
+# ---------------------------------------------------------------------------
+
+
+class _DictPictureCache:
+    """In-memory PictureCache: a dict keyed by image sha256."""
+
+    def __init__(self, entries: dict[str, CachedPicture] | None = None) -> None:
+        self.entries = dict(entries or {})
+        self.remembered: dict[str, CachedPicture] = {}
+
+    async def recall(self, sha256s):
+        return {sha: self.entries[sha] for sha in sha256s if sha in self.entries}
+
+    async def remember(self, pictures):
+        self.remembered.update(pictures)
+        self.entries.update(pictures)
+
+
+def _pdf_with_images(tmp_path, mocker, *images):
+    pdf_file = tmp_path / "deck.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4 fake")
+    fake_reader = MagicMock()
+    fake_reader.pages = [MagicMock(images=list(images))]
+    mocker.patch("pypdf.PdfReader", return_value=fake_reader)
+    return str(pdf_file)
+
+
+async def test_describe_pictures_reuses_cache_across_documents(tmp_path, mocker):
+    """A second document embedding the same image costs no vision/OCR call."""
+    payload = b"\x89PNG\r\n\x1a\n" + b"\x42" * 2000
+    parse_mock = mocker.patch(
+        "app.etl_pipeline.parsers.vision_llm.parse_image_for_description",
+        new=AsyncMock(return_value="Company logo."),
+    )
+    ocr_runner = AsyncMock(return_value="ACME")
+    cache = _DictPictureCache()
+
+    first = await describe_pictures(
+        _pdf_with_images(tmp_path, mocker, _make_image_obj("logo.png", payload)),
+        "deck.pdf",
+        MagicMock(),
+        ocr_runner=ocr_runner,
+        cache=cache,
+    )
+    second = await describe_pictures(
+        _pdf_with_images(tmp_path, mocker, _make_image_obj("Im7.png", payload)),
+        "deck.pdf",
+        MagicMock(),
+        ocr_runner=ocr_runner,
+        cache=cache,
+    )
+
+    assert parse_mock.await_count == 1
+    assert ocr_runner.await_count == 1
+    assert (first.cached, second.cached) == (0, 1)
+    (desc,) = second.descriptions
+    assert (desc.name, desc.description, desc.ocr_text) == (
+        "Im7.png",
+        "Company logo.",
+        "ACME",
+    )
+
+
+async def test_describe_pictures_keeps_document_order_with_mixed_hits(tmp_path, mocker):
+    import hashlib
+
+    seen = b"\xff\xd8\xff\xe0" + b"\xab" * 2000
+    unseen = b"\x89PNG\r\n\x1a\n" + b"\xcd" * 2000
+    cache = _DictPictureCache(
+        {hashlib.sha256(seen).hexdigest(): CachedPicture(description="Cached.")}
+    )
+    parse_mock = mocker.patch(
+        "app.etl_pipeline.parsers.vision_llm.parse_image_for_description",
+        new=AsyncMock(return_value="Fresh."),
+    )
+
+    result = await describe_pictures(
+        _pdf_with_images(
+            tmp_path,
+            mocker,
+            _make_image_obj("Im0.png", unseen),
+            _make_image_obj("Im1.jpeg", seen),
+        ),
+        "deck.pdf",
+        MagicMock(),
+        cache=cache,
+    )
+
+    assert [d.description for d in result.descriptions] == ["Fresh.", "Cached."]
+    assert parse_mock.await_count == 1
+    assert list(cache.remembered) == [hashlib.sha256(unseen).hexdigest()]
+
+
+async def test_describe_pictures_runs_only_ocr_for_a_hit_without_ocr(tmp_path, mocker):
+    """A cached description without OCR skips the vision LLM, not the OCR."""
+    import hashlib
+
+    payload = b"\x89PNG\r\n\x1a\n" + b"\x42" * 2000
+    sha = hashlib.sha256(payload).hexdigest()
+    cache = _DictPictureCache({sha: CachedPicture(description="Company logo.")})
+    parse_mock = mocker.patch(
+        "app.etl_pipeline.parsers.vision_llm.parse_image_for_description",
+        new=AsyncMock(return_value="unused"),
+    )
+    ocr_runner = AsyncMock(return_value="ACME")
+
+    result = await describe_pictures(
+        _pdf_with_images(tmp_path, mocker, _make_image_obj("logo.png", payload)),
+        "deck.pdf",
+        MagicMock(),
+        ocr_runner=ocr_runner,
+        cache=cache,
+    )
+
+    parse_mock.assert_not_called()
+    assert ocr_runner.await_count == 1
+    assert result.descriptions[0].ocr_text == "ACME"
+    assert cache.remembered == {
+        sha: CachedPicture(description="Company logo.", ocr_text="ACME", ocr_done=True)
+    }
+
+
+async def test_describe_pictures_does_not_cache_failed_ocr_as_done(tmp_path, mocker):
+    payload = b"\x89PNG\r\n\x1a\n" + b"\x42" * 2000
+    mocker.patch(
+        "app.etl_pipeline.parsers.vision_llm.parse_image_for_description",
+        new=AsyncMock(return_value="Company logo."),
+    )
+    cache = _DictPictureCache()
+
+    await describe_pictures(
+        _pdf_with_images(tmp_path, mocker, _make_image_obj("logo.png", payload)),
+        "deck.pdf",
+        MagicMock(),
+        ocr_runner=AsyncMock(side_effect=RuntimeError("OCR down")),
+        cache=cache,
+    )
+
+    (picture,) = cache.remembered.values()
+    assert picture == CachedPicture(description="Company logo.")
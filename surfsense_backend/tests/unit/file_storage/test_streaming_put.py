@@ -0,0 +1,105 @@
+"""Uploads are spooled and stored chunk by chunk, hashed during the copy."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.file_storage.backends.local import LocalFileBackend
+from app.file_storage.service import store_document_file_from_path
+from app.utils.file_io import FileTooLargeError, spool_to_temp
+
+pytestmark = pytest.mark.unit
+
+
+class _Upload:
+    """``UploadFile.read`` stand-in that records the largest read requested."""
+
+    def __init__(self, data: bytes) -> None:
+        self._stream = io.BytesIO(data)
+        self.largest_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.largest_read = max(self.largest_read, size)
+        return self._stream.read(size)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_spool_hashes_while_copying_in_bounded_reads():
+    data = os.urandom(300_000)
+    upload = _Upload(data)
+
+    spooled = await spool_to_temp(upload.read, suffix=".pdf", chunk_size=64 * 1024)
+    try:
+        assert spooled.size == len(data)
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.path.endswith(".pdf")
+        with open(spooled.path, "rb") as handle:
+            assert handle.read() == data
+        assert upload.largest_read == 64 * 1024
+    finally:
+        os.unlink(spooled.path)
+
+
+async def test_spool_over_the_cap_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    with pytest.raises(FileTooLargeError) as exc_info:
+        await spool_to_temp(_Upload(b"x" * 10).read, max_bytes=9, chunk_size=4)
+
+    assert exc_info.value.size > 9
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_local_put_stream_writes_atomically(tmp_path):
+    backend = LocalFileBackend(str(tmp_path))
+
+    await backend.put_stream("a/b.bin", _chunks(b"one", b"two"))
+
+    assert (tmp_path / "a" / "b.bin").read_bytes() == b"onetwo"
+    assert [p.name for p in (tmp_path / "a").iterdir()] == ["b.bin"]
+
+
+async def test_local_put_stream_failure_keeps_the_old_object(tmp_path):
+    backend = LocalFileBackend(str(tmp_path))
+    await backend.put("k.bin", b"old")
+
+    async def _broken():
+        yield b"new"
+        raise OSError("client went away")
+
+    with pytest.raises(OSError):
+        await backend.put_stream("k.bin", _broken())
+
+    assert (tmp_path / "k.bin").read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["k.bin"]
+
+
+async def test_store_from_path_streams_and_records_size_and_checksum(tmp_path):
+    source = tmp_path / "upload.pdf"
+    source.write_bytes(b"%PDF-1.7 body")
+    backend = LocalFileBackend(str(tmp_path / "store"))
+    session = MagicMock()
+
+    record = await store_document_file_from_path(
+        session,
+        document_id=7,
+        workspace_id=3,
+        path=str(source),
+        filename="upload.pdf",
+        mime_type="application/pdf",
+        backend=backend,
+    )
+
+    assert record.size_bytes == len(b"%PDF-1.7 body")
+    assert record.checksum_sha256 == hashlib.sha256(b"%PDF-1.7 body").hexdigest()
+    assert await backend.exists(record.storage_key)
+    session.add.assert_called_once_with(record)
@@ -1,28 +1,166 @@
 from __future__ import annotations
 
 import asyncio
+import time
 
 import pytest
 
 from app.gateway import inbox_worker
+from app.gateway.inbox_processor import ClaimedInboundEvent
+
+
+def _claimed(inbox_id: int, conversation: str) -> ClaimedInboundEvent:
+    return ClaimedInboundEvent(
+        id=inbox_id,
+        platform="telegram",
+        ordering_key=conversation,
+        claimed_at=time.monotonic(),
+    )
+
+
+@pytest.fixture
+def queue(mocker, monkeypatch):
+    """Inbox rows served by a fake claim, oldest first."""
+    rows: list[ClaimedInboundEvent] = []
+
+    async def claim(*, skip_keys=(), window=1):
+        for position, row in enumerate(rows[:window]):
+            if row.ordering_key not in skip_keys:
+                return rows.pop(position)
+        return None
+
+    monkeypatch.setattr(inbox_worker.config, "GATEWAY_INBOX_NOTIFY_ENABLED", False)
+    monkeypatch.setattr(inbox_worker.config, "GATEWAY_INBOX_WORKER_CONCURRENCY", 4)
+    monkeypatch.setattr(inbox_worker, "claim_next_inbound_event", claim)
+    monkeypatch.setattr(
+        inbox_worker, "count_received_inbound_events", mocker.AsyncMock(return_value=0)
+    )
+    monkeypatch.setattr(
+        inbox_worker, "release_claimed_inbound_events", mocker.AsyncMock()
+    )
+    return rows
+
+
+async def _run_until(condition, timeout: float = 2.0) -> None:
+    worker = asyncio.create_task(inbox_worker._process_inbox_forever())
+    try:
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
+    finally:
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
 
 
 @pytest.mark.asyncio
 async def test_inbox_worker_claims_and_processes_in_fastapi_process(
-    mocker, monkeypatch
+    mocker, monkeypatch, queue
 ):
-    claim = mocker.AsyncMock(return_value=7)
-    process = mocker.AsyncMock(side_effect=asyncio.CancelledError)
-    monkeypatch.setattr(inbox_worker, "claim_next_inbound_event", claim)
+    process = mocker.AsyncMock()
     monkeypatch.setattr(inbox_worker, "process_inbound_event", process)
+    queue.append(_claimed(7, "1:100"))
 
-    with pytest.raises(asyncio.CancelledError):
-        await inbox_worker._process_inbox_forever()
+    await _run_until(lambda: process.await_count == 1)
 
-    claim.assert_awaited_once()
     process.assert_awaited_once_with(7)
 
 
+@pytest.mark.asyncio
+async def test_a_slow_turn_does_not_block_other_conversations(monkeypatch, queue):
+    release_slow = asyncio.Event()
+    done: list[int] = []
+
+    async def process(inbox_id: int) -> None:
+        if inbox_id == 1:
+            await release_slow.wait()
+        done.append(inbox_id)
+
+    monkeypatch.setattr(inbox_worker, "process_inbound_event", process)
+    queue.extend([_claimed(1, "1:slow"), _claimed(2, "1:fast"), _claimed(3, "2:x")])
+
+    await _run_until(lambda: done == [2, 3] or done == [3, 2])
+    release_slow.set()
+
+
+@pytest.mark.asyncio
+async def test_one_conversations_events_run_in_order_one_at_a_time(monkeypatch, queue):
+    started: list[int] = []
+    active = 0
+    overlapped = False
+
+    async def process(inbox_id: int) -> None:
+        nonlocal active, overlapped
+        active += 1
+        overlapped = overlapped or active > 1
+        started.append(inbox_id)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    monkeypatch.setattr(inbox_worker, "process_inbound_event", process)
+    queue.extend(_claimed(inbox_id, "1:100") for inbox_id in range(1, 6))
+
+    await _run_until(lambda: len(started) == 5 and active == 0)
+
+    assert started == [1, 2, 3, 4, 5]
+    assert not overlapped
+
+
+@pytest.mark.asyncio
+async def test_a_busy_thread_hands_back_the_events_queued_behind_it(monkeypatch, queue):
+    attempts: list[int] = []
+    first_started = asyncio.Event()
+    let_first_fail = asyncio.Event()
+
+    async def process(inbox_id: int) -> None:
+        attempts.append(inbox_id)
+        if inbox_id == 1:
+            first_started.set()
+            await let_first_fail.wait()
+            raise RuntimeError("gateway_thread_busy")
+
+    monkeypatch.setattr(inbox_worker, "process_inbound_event", process)
+    queue.append(_claimed(1, "1:100"))
+
+    async def queue_behind_busy_event() -> None:
+        await first_started.wait()
+        queue.extend([_claimed(2, "1:100"), _claimed(3, "1:100")])
+        # One event queues behind the running one; the lane is then full.
+        while len(queue) > 1:
+            await asyncio.sleep(0.01)
+        let_first_fail.set()
+
+    feeder = asyncio.create_task(queue_behind_busy_event())
+    await _run_until(lambda: inbox_worker.release_claimed_inbound_events.await_count)
+    await feeder
+
+    # Later calls are shutdown handing back what was claimed after it.
+    released = inbox_worker.release_claimed_inbound_events.await_args_list
+    assert released[0].args == ([2],)
+    assert attempts == [1]
+
+
+@pytest.mark.asyncio
+async def test_one_conversations_backlog_does_not_take_every_claim(monkeypatch, queue):
+    # Concurrency 4 allows 8 claims; one chat's 10-event backlog must not
+    # take them all while its first turn runs.
+    release_busy = asyncio.Event()
+    done: list[int] = []
+
+    async def process(inbox_id: int) -> None:
+        if inbox_id < 100:
+            await release_busy.wait()
+        done.append(inbox_id)
+
+    monkeypatch.setattr(inbox_worker, "process_inbound_event", process)
+    queue.extend(_claimed(inbox_id, "1:busy") for inbox_id in range(1, 11))
+    queue.append(_claimed(100, "2:other"))
+
+    await _run_until(lambda: done == [100])
+    assert [row.id for row in queue] == list(range(3, 11))
+    release_busy.set()
+
+
 @pytest.mark.asyncio
 async def test_start_stop_gateway_inbox_worker(mocker, monkeypatch):
     started = asyncio.Event()
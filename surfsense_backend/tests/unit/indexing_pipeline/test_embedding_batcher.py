@@ -0,0 +1,105 @@
+"""Concurrent embedding calls share model calls and still get their own vectors.
+
+Documents indexed in parallel each embed a handful of texts; the batcher must
+fold them into few, full calls, hand every caller back exactly its slice, and
+keep one caller's failure from failing the callers it was grouped with.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.indexing_pipeline.embedding_batcher import EmbeddingBatcher
+
+pytestmark = pytest.mark.unit
+
+
+class _RecordingEmbed:
+    def __init__(self, poison: str | None = None) -> None:
+        self.batches: list[list[str]] = []
+        self.poison = poison
+
+    def __call__(self, texts: list[str]) -> list[str]:
+        self.batches.append(list(texts))
+        if self.poison is not None and self.poison in texts:
+            raise RuntimeError("Embedding unavailable")
+        return [f"vec:{text}" for text in texts]
+
+
+async def test_concurrent_callers_share_one_call_and_get_their_own_vectors():
+    batcher = EmbeddingBatcher(max_batch_size=64, max_wait_ms=20)
+    embed = _RecordingEmbed()
+
+    results = await asyncio.gather(
+        batcher.embed(["a1", "a2"], embed),
+        batcher.embed(["b1"], embed),
+        batcher.embed(["c1", "c2", "c3"], embed),
+    )
+
+    assert embed.batches == [["a1", "a2", "b1", "c1", "c2", "c3"]]
+    assert results == [
+        ["vec:a1", "vec:a2"],
+        ["vec:b1"],
+        ["vec:c1", "vec:c2", "vec:c3"],
+    ]
+
+
+async def test_a_full_batch_is_sent_without_waiting_for_the_window():
+    batcher = EmbeddingBatcher(max_batch_size=2, max_wait_ms=60_000)
+    embed = _RecordingEmbed()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.embed(["a"], embed), batcher.embed(["b"], embed)),
+        timeout=5,
+    )
+
+    assert results == [["vec:a"], ["vec:b"]]
+    assert embed.batches == [["a", "b"]]
+
+
+async def test_an_oversized_request_is_split_into_model_sized_calls():
+    batcher = EmbeddingBatcher(max_batch_size=2, max_wait_ms=1)
+    embed = _RecordingEmbed()
+
+    result = await batcher.embed(["t1", "t2", "t3", "t4", "t5"], embed)
+
+    assert result == ["vec:t1", "vec:t2", "vec:t3", "vec:t4", "vec:t5"]
+    assert embed.batches == [["t1", "t2"], ["t3", "t4"], ["t5"]]
+
+
+async def test_one_callers_failure_does_not_fail_the_others():
+    batcher = EmbeddingBatcher(max_batch_size=64, max_wait_ms=20)
+    embed = _RecordingEmbed(poison="bad")
+
+    good, bad = await asyncio.gather(
+        batcher.embed(["ok"], embed),
+        batcher.embed(["bad"], embed),
+        return_exceptions=True,
+    )
+
+    assert good == ["vec:ok"]
+    assert isinstance(bad, RuntimeError)
+
+
+async def test_different_embed_functions_are_never_batched_together():
+    batcher = EmbeddingBatcher(max_batch_size=64, max_wait_ms=20)
+    first, second = _RecordingEmbed(), _RecordingEmbed()
+
+    await asyncio.gather(batcher.embed(["a"], first), batcher.embed(["b"], second))
+
+    assert first.batches == [["a"]]
+    assert second.batches == [["b"]]
+
+
+async def test_a_cancelled_caller_leaves_the_rest_of_its_batch_intact():
+    batcher = EmbeddingBatcher(max_batch_size=64, max_wait_ms=20)
+    embed = _RecordingEmbed()
+
+    leaver = asyncio.create_task(batcher.embed(["gone"], embed))
+    stayer = asyncio.create_task(batcher.embed(["kept"], embed))
+    await asyncio.sleep(0)
+    leaver.cancel()
+
+    assert await stayer == ["vec:kept"]
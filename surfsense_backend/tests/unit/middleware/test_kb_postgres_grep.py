@@ -0,0 +1,141 @@
+"""Unit tests for the KB grep/glob helpers that shape the indexed queries.
+
+The chunk scan itself needs Postgres; here we lock the pure pieces — pattern
+parsing, the glob title prefilter, folder scoping — plus grep over the state
+file cache, which never reaches the database outside ``/documents``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from app.agents.chat.multi_agent_chat.shared.middleware.filesystem.backends import (
+    kb_postgres,
+)
+from app.agents.chat.multi_agent_chat.shared.middleware.filesystem.backends.kb_postgres import (
+    KBPostgresBackend,
+    _folders_in_scope,
+    glob_title_fragment,
+    parse_grep_pattern,
+)
+from app.knowledge_store.paths import PathIndex
+
+pytestmark = pytest.mark.unit
+
+
+def _backend(state: dict) -> KBPostgresBackend:
+    return KBPostgresBackend(workspace_id=1, runtime=SimpleNamespace(state=state))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("needle", ("needle", False)),
+        ("/err(or)?\\s+\\d+/", ("err(or)?\\s+\\d+", True)),
+        ("/", ("/", False)),
+        ("//", ("//", False)),
+        ("/path/to", ("/path/to", False)),
+    ],
+)
+def test_parse_grep_pattern(pattern: str, expected: tuple[str, bool]) -> None:
+    assert parse_grep_pattern(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("**/*.xml", None),
+        ("*", None),
+        ("**/*budget*", "budget"),
+        ("/documents/Finance/*Q3-report*.xml", "Q3-report"),
+        ("*untitled*", None),
+        ("*[ab]c*", None),
+        ("*2024*", None),
+    ],
+)
+def test_glob_title_fragment(pattern: str, expected: str | None) -> None:
+    assert glob_title_fragment(pattern) == expected
+
+
+def test_glob_title_fragment_is_in_every_match() -> None:
+    pattern = "**/Team Notes/*plan?2025*"
+    fragment = glob_title_fragment(pattern)
+
+    assert fragment == "plan"
+    for path in [
+        "/documents/Team Notes/Launch plan 2025.xml",
+        "/documents/Team Notes/plan_2025 (42).xml",
+    ]:
+        assert fnmatch.fnmatchcase(path, pattern)
+        assert fragment in path
+
+
+def test_folders_in_scope_covers_subfolders_and_the_parent() -> None:
+    index = PathIndex(
+        folder_paths={
+            1: "/documents/a",
+            2: "/documents/a/b",
+            3: "/documents/a/b/c",
+            4: "/documents/z",
+        }
+    )
+
+    assert _folders_in_scope(index, "/documents") == {None, 1, 2, 3, 4}
+    assert _folders_in_scope(index, "/documents/a/b") == {1, 2, 3}
+    assert _folders_in_scope(index, "/documents/a/b/doc.xml") == {2}
+    assert _folders_in_scope(index, "/documents/doc.xml") == {None}
+    assert _folders_in_scope(index, "/scratch") == set()
+
+
+async def test_grep_rejects_an_invalid_regex() -> None:
+    result = await _backend({}).agrep_raw("/(unclosed/", path="/scratch")
+
+    assert isinstance(result, str)
+    assert result.startswith("Error: invalid regex")
+
+
+async def test_grep_reports_a_regex_only_postgres_rejects(monkeypatch) -> None:
+    class _RegexError(Exception):
+        sqlstate = "2201B"
+
+    orig = _RegexError("invalid regular expression")
+    orig.__cause__ = ValueError(
+        "invalid regular expression: quantifier operand invalid"
+    )
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    async def _grep_chunks(self, *args, **kwargs):
+        raise DBAPIError("SELECT ...", {}, orig)
+
+    monkeypatch.setattr(kb_postgres, "shielded_async_session", _session)
+    monkeypatch.setattr(KBPostgresBackend, "_grep_chunks", _grep_chunks)
+
+    result = await _backend({}).agrep_raw("/(?P<year>20\\d\\d)/", path="/documents")
+
+    assert result == (
+        "Error: invalid regex /(?P<year>20\\d\\d)/: "
+        "invalid regular expression: quantifier operand invalid"
+    )
+
+
+async def test_grep_matches_state_files_literally_or_by_regex() -> None:
+    state = {
+        "files": {
+            "/scratch/notes.md": {"content": ["Total: 1.5", "total 15", "other"]},
+        }
+    }
+    backend = _backend(state)
+
+    literal = await backend.agrep_raw("1.5", path="/scratch")
+    regex = await backend.agrep_raw("/^total:? 1.?5$/", path="/scratch")
+
+    assert [(m["line"], m["text"]) for m in literal] == [(1, "Total: 1.5")]
+    assert [m["line"] for m in regex] == [1, 2]
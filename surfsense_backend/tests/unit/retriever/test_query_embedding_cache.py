@@ -0,0 +1,161 @@
+"""The shared query-embedding cache computes each (model, query) once.
+
+Agents re-issue the same search across subagents and turns; a hit must skip
+the model entirely, concurrent identical misses must share one forward pass,
+and swapping the configured model must never serve the old model's vectors.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.retriever import query_embedding
+from app.retriever.query_embedding import QueryEmbeddingCache, normalize_query
+
+pytestmark = pytest.mark.unit
+
+
+class _CountingModel:
+    dimension = 3
+
+    def __init__(self, value: float = 1.0) -> None:
+        self.value = value
+        self.calls: list[str] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def embed(self, text: str) -> list[float]:
+        self.calls.append(text)
+        self.release.wait(timeout=5)
+        return [self.value, 0.0, 0.0]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    from app.config import config
+
+    model = _CountingModel()
+    monkeypatch.setattr(config, "embedding_model_instance", model)
+    monkeypatch.setattr(config, "QUERY_EMBEDDING_CACHE_REDIS_ENABLED", False)
+    return model
+
+
+def test_normalize_query_collapses_whitespace_but_keeps_case() -> None:
+    assert normalize_query("  Quarterly\n\tplan  ") == "Quarterly plan"
+    assert normalize_query("\uff21\uff22\uff23") == "ABC"
+    assert normalize_query("US") != normalize_query("us")
+
+
+async def test_repeat_and_near_identical_queries_embed_once(model) -> None:
+    cache = QueryEmbeddingCache(max_entries=8)
+
+    first = await cache.embed("quarterly plan")
+    second = await cache.embed("  quarterly   plan ")
+
+    assert first.tolist() == second.tolist()
+    assert model.calls == ["quarterly plan"]
+
+
+async def test_concurrent_misses_share_one_computation(model) -> None:
+    cache = QueryEmbeddingCache(max_entries=8)
+    model.release.clear()
+
+    waiters = [asyncio.create_task(cache.embed("budget")) for _ in range(5)]
+    while not model.calls:
+        await asyncio.sleep(0)
+    model.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert model.calls == ["budget"]
+    assert all(result.tolist() == results[0].tolist() for result in results)
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_computation(
+    model,
+) -> None:
+    cache = QueryEmbeddingCache(max_entries=8)
+    model.release.clear()
+
+    leaver = asyncio.create_task(cache.embed("budget"))
+    stayer = asyncio.create_task(cache.embed("budget"))
+    while not model.calls:
+        await asyncio.sleep(0)
+    leaver.cancel()
+    model.release.set()
+
+    assert (await stayer).tolist() == [1.0, 0.0, 0.0]
+    assert model.calls == ["budget"]
+
+
+async def test_least_recently_used_entry_is_evicted(model) -> None:
+    cache = QueryEmbeddingCache(max_entries=2)
+
+    await cache.embed("a")
+    await cache.embed("b")
+    await cache.embed("a")  # refresh "a"; "b" is now the coldest
+    await cache.embed("c")
+    await cache.embed("a")
+    await cache.embed("b")
+
+    assert model.calls == ["a", "b", "c", "b"]
+
+
+async def test_swapping_the_model_invalidates_cached_vectors(
+    model, monkeypatch
+) -> None:
+    from app.config import config
+
+    cache = QueryEmbeddingCache(max_entries=8)
+    await cache.embed("budget")
+
+    replacement = _CountingModel(value=2.0)
+    monkeypatch.setattr(config, "embedding_model_instance", replacement)
+
+    assert (await cache.embed("budget")).tolist() == [2.0, 0.0, 0.0]
+    assert replacement.calls == ["budget"]
+
+
+async def test_failures_are_not_cached(model) -> None:
+    cache = QueryEmbeddingCache(max_entries=8)
+    original = model.embed
+    model.embed = lambda _text: (_ for _ in ()).throw(RuntimeError("provider down"))
+
+    with pytest.raises(RuntimeError):
+        await cache.embed("budget")
+
+    model.embed = original
+    assert (await cache.embed("budget")).tolist() == [1.0, 0.0, 0.0]
+
+
+async def test_redis_hits_return_the_same_writable_array_as_a_computation(
+    model, monkeypatch
+) -> None:
+    from app.config import config
+
+    class _FakeRedis:
+        def __init__(self) -> None:
+            self.store: dict[str, bytes] = {}
+
+        async def get(self, key: str) -> bytes | None:
+            return self.store.get(key)
+
+        async def set(self, key: str, value: bytes, ex: int) -> None:
+            self.store[key] = value
+
+    fake = _FakeRedis()
+    monkeypatch.setattr(config, "QUERY_EMBEDDING_CACHE_REDIS_ENABLED", True)
+    monkeypatch.setattr(query_embedding, "_redis", lambda: fake)
+
+    computed = await QueryEmbeddingCache(max_entries=8).embed("budget")
+    from_redis = await QueryEmbeddingCache(max_entries=8).embed("budget")
+
+    assert model.calls == ["budget"]
+    for vector in (computed, from_redis):
+        assert isinstance(vector, np.ndarray)
+        assert vector.dtype == np.float32
+        assert vector.flags.writeable
+    assert from_redis.tolist() == computed.tolist()
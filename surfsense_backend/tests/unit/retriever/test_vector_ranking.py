@@ -0,0 +1,80 @@
+"""The nearest-neighbour leg orders by the quantized index, then re-scores exactly.
+
+The candidate expression must match ``app.db.quantized_vector_index`` or the
+planner falls back to a sequential scan, so the rendered SQL is what counts.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql
+
+from app.config import config
+from app.retriever.vector_ranking import nearest
+
+pytestmark = pytest.mark.unit
+
+_items = Table(
+    "items",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("embedding", Vector(3)),
+)
+
+
+def _compiled(quantization: str):
+    stmt = nearest(
+        select(_items.c.id),
+        _items.c.embedding,
+        [1.0, 0.0, 0.0],
+        10,
+        quantization=quantization,
+    )
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), sorted(
+        value for value in compiled.params.values() if isinstance(value, int)
+    )
+
+
+@pytest.fixture(autouse=True)
+def _rescore_factor(monkeypatch):
+    monkeypatch.setattr(config, "VECTOR_SEARCH_RESCORE_FACTOR", 4)
+
+
+def test_off_orders_by_exact_distance() -> None:
+    sql, limits = _compiled("off")
+
+    assert "ORDER BY items.embedding <=>" in sql
+    assert limits == [10]
+    assert "HALFVEC" not in sql and "binary_quantize" not in sql
+
+
+def test_halfvec_candidates_are_rescored_exactly() -> None:
+    sql, limits = _compiled("halfvec")
+
+    assert "ORDER BY CAST(items.embedding AS HALFVEC(3)) <=>" in sql
+    # The outer query re-ranks the candidates by full-precision distance.
+    assert "ORDER BY candidates.distance" in sql
+    assert limits == [10, 40]
+
+
+def test_binary_candidates_use_hamming_distance() -> None:
+    sql, limits = _compiled("binary")
+
+    assert "ORDER BY CAST(binary_quantize(items.embedding) AS BIT(3)) <~>" in sql
+    assert "ORDER BY candidates.distance" in sql
+    assert limits == [10, 40]
+
+
+def test_columns_are_unchanged_by_quantization() -> None:
+    for mode in ("off", "halfvec", "binary"):
+        stmt = nearest(
+            select(_items.c.id),
+            _items.c.embedding,
+            [1.0, 0.0, 0.0],
+            10,
+            quantization=mode,
+        )
+        assert [column.key for column in stmt.selected_columns] == ["id", "rank"]
@@ -0,0 +1,76 @@
+"""Pin when held text/reasoning deltas are released and how they are joined."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.streaming.coalescer import Delta, DeltaCoalescer
+
+pytestmark = pytest.mark.unit
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _coalescer(clock: _Clock, *, max_chars: int = 1000) -> DeltaCoalescer:
+    return DeltaCoalescer(window=0.05, max_chars=max_chars, clock=clock)
+
+
+def test_first_delta_of_a_block_is_released_at_once() -> None:
+    coalescer = _coalescer(_Clock())
+    assert coalescer.push("text", "t1", "Hel") == [Delta("text", "t1", "Hel")]
+    assert not coalescer.pending
+
+
+def test_deltas_inside_the_window_share_one_frame() -> None:
+    clock = _Clock()
+    coalescer = _coalescer(clock)
+    coalescer.push("text", "t1", "a")
+
+    clock.now += 0.01
+    assert coalescer.push("text", "t1", "b") == []
+    clock.now += 0.01
+    assert coalescer.push("text", "t1", "c") == []
+    clock.now += 0.05
+    assert coalescer.push("text", "t1", "d") == [Delta("text", "t1", "bcd")]
+
+
+def test_max_chars_releases_before_the_window_ends() -> None:
+    clock = _Clock()
+    coalescer = _coalescer(clock, max_chars=4)
+    coalescer.push("text", "t1", "a")
+
+    assert coalescer.push("text", "t1", "bc") == []
+    assert coalescer.push("text", "t1", "de") == [Delta("text", "t1", "bcde")]
+
+
+def test_a_new_block_releases_the_previous_one_first() -> None:
+    clock = _Clock()
+    coalescer = _coalescer(clock)
+    coalescer.push("reasoning", "r1", "think")
+    coalescer.push("reasoning", "r1", "ing")
+
+    assert coalescer.push("text", "t1", "answer") == [
+        Delta("reasoning", "r1", "ing"),
+        Delta("text", "t1", "answer"),
+    ]
+
+
+def test_flush_returns_held_text_once() -> None:
+    coalescer = _coalescer(_Clock())
+    coalescer.push("text", "t1", "a")
+    coalescer.push("text", "t1", "b")
+
+    assert coalescer.flush() == [Delta("text", "t1", "b")]
+    assert coalescer.flush() == []
+
+
+def test_zero_window_releases_every_delta() -> None:
+    coalescer = DeltaCoalescer(window=0, max_chars=1000, clock=_Clock())
+    assert coalescer.push("text", "t1", "a") == [Delta("text", "t1", "a")]
+    assert coalescer.push("text", "t1", "b") == [Delta("text", "t1", "b")]
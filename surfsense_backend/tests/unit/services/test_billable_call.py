@@ -110,7 +110,7 @@ def _patch_isolation_layer(
         )
         return finalize_result or _FakeQuotaResult(allowed=True)
 
-    async def _fake_release(*, db_session, user_id, reserved_micros):
+    async def _fake_release(*, db_session, user_id, reserved_micros, request_id=None):
         release_calls.append({"user_id": user_id, "reserved_micros": reserved_micros})
 
     record_calls: list[dict[str, Any]] = []
@@ -0,0 +1,98 @@
+"""Unit tests for the async rerank stage: ordering, batching and the score cache."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import config
+from app.services import reranker_service
+from app.services.reranker_service import RerankerService
+
+pytestmark = pytest.mark.unit
+
+
+class _LengthReranker:
+    """Scores a passage by its length; records every ``rank`` call."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def rank(self, query, docs):
+        self.calls.append([doc.text for doc in docs])
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(document=doc, score=float(len(doc.text)), rank=None)
+                for doc in docs
+            ]
+        )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    reranker_service.clear_rerank_score_cache()
+    yield
+    reranker_service.clear_rerank_score_cache()
+
+
+def _docs(*contents: str) -> list[dict]:
+    return [{"document_id": i, "content": c} for i, c in enumerate(contents)]
+
+
+async def test_orders_by_score_and_sets_rank() -> None:
+    service = RerankerService(_LengthReranker())
+
+    ranked = await service.arerank_documents("q", _docs("a", "ccc", "bb"))
+
+    assert [doc["content"] for doc in ranked] == ["ccc", "bb", "a"]
+    assert [doc["rank"] for doc in ranked] == [1, 2, 3]
+    assert ranked[0]["score"] == 3.0
+
+
+async def test_repeat_query_is_served_from_the_cache() -> None:
+    model = _LengthReranker()
+    service = RerankerService(model)
+
+    await service.arerank_documents("q", _docs("a", "bb"))
+    await service.arerank_documents("q", _docs("bb", "ccc"))
+
+    assert model.calls == [["a", "bb"], ["ccc"]]
+
+
+async def test_concurrent_requests_for_a_query_share_one_call(monkeypatch) -> None:
+    monkeypatch.setattr(config, "RERANKERS_BATCH_WINDOW_MS", 20, raising=False)
+    model = _LengthReranker()
+    service = RerankerService(model)
+
+    first, second = await asyncio.gather(
+        service.arerank_documents("q", _docs("a", "bb")),
+        service.arerank_documents("q", _docs("bb", "ccc")),
+    )
+
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0]) == ["a", "bb", "ccc"]
+    assert [doc["content"] for doc in first] == ["bb", "a"]
+    assert [doc["content"] for doc in second] == ["ccc", "bb"]
+
+
+async def test_passages_are_truncated(monkeypatch) -> None:
+    monkeypatch.setattr(config, "RERANKERS_MAX_PASSAGE_CHARS", 4, raising=False)
+    model = _LengthReranker()
+
+    await RerankerService(model).arerank_documents("q", _docs("abcdefgh", "xy"))
+
+    assert model.calls == [["abcd", "xy"]]
+
+
+async def test_a_failing_reranker_keeps_the_original_order() -> None:
+    class _Broken:
+        def rank(self, query, docs):
+            raise RuntimeError("model unavailable")
+
+    documents = _docs("a", "bb")
+
+    assert await RerankerService(_Broken()).arerank_documents("q", documents) == (
+        documents
+    )
@@ -7,12 +7,14 @@ from typing import Any
 
 import pytest
 
+from app.services.streaming.coalescer import DeltaCoalescer
 from app.tasks.chat.content_builder import AssistantContentBuilder
 from app.tasks.chat.streaming.graph_stream import stream_output
 from app.tasks.chat.streaming.graph_stream.result import StreamingResult
 from app.tasks.chat.streaming.handlers.chat_model_stream import (
     iter_chat_model_stream_frames,
 )
+from app.tasks.chat.streaming.relay.event_relay import EventRelay
 from app.tasks.chat.streaming.relay.state import AgentEventRelayState
 
 pytestmark = pytest.mark.unit
@@ -235,3 +237,50 @@ def test_reasoning_content_precedes_visible_string_from_same_chunk() -> None:
         "text_start:text-1",
         "text_delta:text-1:visible answer",
     ]
+
+
+async def test_held_deltas_are_merged_and_flushed_before_other_frames() -> None:
+    service = _StreamingService()
+    builder = AssistantContentBuilder()
+    state = AgentEventRelayState(
+        deltas=DeltaCoalescer(window=60, max_chars=1000, clock=lambda: 0.0)
+    )
+    tokens = ["Hel", "lo", " wor", "ld"]
+    events = [
+        {"event": "on_chat_model_stream", "data": {"chunk": _Chunk(content=token)}}
+        for token in tokens
+    ]
+    events.append(
+        {
+            "event": "on_chat_model_stream",
+            "data": {
+                "chunk": _Chunk(
+                    tool_call_chunks=[
+                        {"index": 0, "id": "call-1", "name": "ls", "args": "{}"}
+                    ]
+                )
+            },
+        }
+    )
+
+    async def _events():
+        for event in events:
+            yield event
+
+    result = StreamingResult()
+    frames = await _collect(
+        EventRelay(streaming_service=service).relay(
+            _events(), state=state, result=result, content_builder=builder
+        )
+    )
+
+    assert frames == [
+        "text_start:text-1",
+        "text_delta:text-1:Hel",
+        "text_delta:text-1:lo world",
+        "text_end:text-1",
+        "tool_start:call-1:ls",
+        "tool_delta:call-1:{}",
+    ]
+    assert state.accumulated_text == "Hello world"
+    assert builder.snapshot()[0] == {"type": "text", "text": "Hello world"}
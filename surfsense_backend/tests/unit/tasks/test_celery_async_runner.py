@@ -392,3 +392,133 @@ def test_runner_uses_proactor_loop_on_windows() -> None:
         run_async_celery_task(_body)
 
     assert observed == ["ProactorEventLoop"]
+
+
+@pytest.fixture
+def worker_loop(monkeypatch) -> Iterator[None]:
+    """Start the persistent worker loop, as ``worker_process_init`` does."""
+    from app.config import config
+    from app.tasks.celery_tasks import start_worker_event_loop, stop_worker_event_loop
+
+    monkeypatch.setattr(config, "CELERY_PERSISTENT_EVENT_LOOP", True)
+    engine_stub = _StaleLoopEngine()
+    cp_loops: list[int] = []
+    with _patch_shared_engine(engine_stub), _patch_checkpointer_close(cp_loops):
+        start_worker_event_loop()
+        try:
+            yield
+        finally:
+            stop_worker_event_loop()
+    # Shutdown closed the pools on the worker loop itself.
+    assert len(engine_stub.dispose_loop_ids) == 1
+    assert cp_loops[0] == engine_stub.dispose_loop_ids[0]
+
+
+def test_worker_loop_runs_every_task_on_one_loop(worker_loop) -> None:
+    """With the worker loop running, tasks share it and nothing is
+    disposed between them — pooled connections stay valid.
+    """
+    from app.tasks.celery_tasks import run_async_celery_task
+
+    loops: list[int] = []
+
+    async def _body() -> int:
+        loops.append(id(asyncio.get_running_loop()))
+        return len(loops)
+
+    assert [run_async_celery_task(_body) for _ in range(3)] == [1, 2, 3]
+    assert len(set(loops)) == 1
+
+
+def test_worker_loop_propagates_exceptions(worker_loop) -> None:
+    from app.tasks.celery_tasks import run_async_celery_task
+
+    async def _body() -> None:
+        raise ValueError("kaboom")
+
+    with pytest.raises(ValueError, match="kaboom"):
+        run_async_celery_task(_body)
+
+
+def test_stopped_worker_loop_falls_back_to_fresh_loops(worker_loop) -> None:
+    """After shutdown the runner goes back to one loop per task."""
+    from app.tasks.celery_tasks import run_async_celery_task, stop_worker_event_loop
+
+    stop_worker_event_loop()
+    loops: list[int] = []
+
+    async def _body() -> None:
+        loops.append(id(asyncio.get_running_loop()))
+
+    with _patch_shared_engine(_StaleLoopEngine()):
+        run_async_celery_task(_body)
+        run_async_celery_task(_body)
+
+    assert len(loops) == 2
+
+
+def test_shared_engine_task_on_and_off_the_worker_loop(monkeypatch) -> None:
+    """A beat task using the shared engine runs on the worker loop while it
+    is up (no dispose: the pool is that loop's), and on a fresh, disposed
+    loop once it is down — never on an ``asyncio.run`` loop of its own whose
+    connections would poison the shared pool.
+    """
+    from app.config import config
+    from app.tasks.celery_tasks import (
+        refresh_token_cleanup_task,
+        start_worker_event_loop,
+        stop_worker_event_loop,
+    )
+
+    monkeypatch.setattr(config, "CELERY_PERSISTENT_EVENT_LOOP", True)
+    engine_stub = _StaleLoopEngine()
+    loops: list[int] = []
+
+    async def _body() -> int:
+        loops.append(id(asyncio.get_running_loop()))
+        return 0
+
+    monkeypatch.setattr(refresh_token_cleanup_task, "_purge_refresh_tokens", _body)
+
+    with _patch_shared_engine(engine_stub), _patch_checkpointer_close([]):
+        start_worker_event_loop()
+        try:
+            refresh_token_cleanup_task.purge_refresh_tokens()
+            refresh_token_cleanup_task.purge_refresh_tokens()
+        finally:
+            stop_worker_event_loop()
+        assert len(set(loops)) == 1
+        # Only the shutdown dispose, on the worker loop itself.
+        assert engine_stub.dispose_loop_ids == [loops[0]]
+
+        refresh_token_cleanup_task.purge_refresh_tokens()
+
+    assert loops[2] != loops[0]
+    # Fresh loop: disposed before and after the body, on that loop.
+    assert engine_stub.dispose_loop_ids[1:] == [loops[2], loops[2]]
+
+
+def test_beat_tasks_use_runner_helper() -> None:
+    """No beat task may call ``asyncio.run``: with the persistent worker
+    loop on, its loop-bound connections would end up in the shared pool.
+    """
+    import inspect
+
+    from app.tasks.celery_tasks import (
+        model_compatibility_task,
+        refresh_token_cleanup_task,
+    )
+    from app.tasks.celery_tasks.knowledge_store import (
+        drift_monitor_task,
+        janitor_task,
+    )
+
+    for module in (
+        refresh_token_cleanup_task,
+        model_compatibility_task,
+        janitor_task,
+        drift_monitor_task,
+    ):
+        src = inspect.getsource(module)
+        assert "run_async_celery_task" in src
+        assert "asyncio.run(" not in src
@@ -0,0 +1,103 @@
+"""Tests for keyset cursors and the planner-estimate count helper."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db import Document, DocumentType
+from app.utils import pagination
+from app.utils.pagination import after_cursor, count_rows, decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.unit
+
+
+def _compile(clause):
+    return clause.compile(dialect=postgresql.dialect())
+
+
+def test_cursor_round_trips_sort_values():
+    created = datetime(2025, 3, 1, 12, 30, tzinfo=UTC)
+    cursor = encode_cursor("created_at:desc", [created, 42])
+
+    values = decode_cursor(cursor, "created_at:desc")
+    compiled = _compile(
+        after_cursor((Document.created_at, Document.id), values, descending=True)
+    )
+
+    assert "(documents.created_at, documents.id) <" in str(compiled)
+    assert list(compiled.params.values()) == [created, 42]
+
+
+def test_ascending_cursor_selects_later_rows_and_restores_enums():
+    cursor = encode_cursor("document_type:asc", [DocumentType.FILE, 7])
+    compiled = _compile(
+        after_cursor(
+            (Document.document_type, Document.id),
+            decode_cursor(cursor, "document_type:asc"),
+            descending=False,
+        )
+    )
+
+    assert "(documents.document_type, documents.id) >" in str(compiled)
+    assert list(compiled.params.values()) == [DocumentType.FILE, 7]
+
+
+@pytest.mark.parametrize("cursor", ["not base64 !", "bm90IGpzb24", "WzEsMl0"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError, match="Malformed cursor"):
+        decode_cursor(cursor, "created_at:desc")
+
+
+def test_cursor_from_another_sort_is_rejected():
+    cursor = encode_cursor("title:asc", ["Notes", 3])
+
+    with pytest.raises(ValueError, match="different sort order"):
+        decode_cursor(cursor, "created_at:desc")
+
+
+def test_cursor_values_must_fit_their_columns():
+    with pytest.raises(ValueError):
+        after_cursor(
+            (Document.created_at, Document.id), ["yesterday", 1], descending=True
+        )
+
+
+class _FakeSession:
+    def __init__(self, planner_rows: int, exact: int) -> None:
+        self.planner_rows = planner_rows
+        self.exact = exact
+        self.counted = False
+
+    async def scalar(self, stmt):
+        self.counted = True
+        return self.exact
+
+
+async def test_large_estimates_skip_the_count(monkeypatch):
+    session = _FakeSession(planner_rows=250_000, exact=249_731)
+
+    async def estimate(_session, _stmt):
+        return session.planner_rows
+
+    monkeypatch.setattr(pagination, "estimate_rows", estimate)
+    stmt = Document.__table__.select()
+
+    assert await count_rows(session, stmt, estimate=True) == (250_000, True)
+    assert not session.counted
+    assert await count_rows(session, stmt) == (249_731, False)
+
+
+async def test_small_estimates_fall_back_to_an_exact_count(monkeypatch):
+    session = _FakeSession(planner_rows=40, exact=37)
+
+    async def estimate(_session, _stmt):
+        return session.planner_rows
+
+    monkeypatch.setattr(pagination, "estimate_rows", estimate)
+
+    result = await count_rows(session, Document.__table__.select(), estimate=True)
+
+    assert result == (37, False)